@@ -0,0 +1,64 @@
+"""
+Benchmark: latencia de un envío aislado con arranque en frío frente al navegador residente
+Simula una invocación de cron (`whatsapp-send`): crear el Facade, autenticar y enviar un mensaje,
+primero lanzando Chromium en frío y después conectándose a `whatsapp-daemon` por CDP.
+Sin --phone mide hasta la sesión lista (lista de chats cargada).
+
+Uso:
+    python benchmarks/bench_daemon.py --session-dir session_data [--phone +58412... --message "ping"] [--repeat 3]
+"""
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from whatsapp_automation import WhatsAppBotFacade, SessionManager
+from whatsapp_automation.core.browser_daemon import find_daemon, stop_daemon
+
+
+def one_shot(session_dir: str, use_daemon: bool, phone: str = None, message: str = None) -> float:
+    """Segundos de una invocación completa (como un proceso de cron independiente)."""
+    SessionManager.reset_instance()
+    start = time.perf_counter()
+    with WhatsAppBotFacade(session_dir=session_dir, headless=True, use_daemon=use_daemon) as bot:
+        if phone:
+            if not bot.send_message(phone, message):
+                raise RuntimeError("El envío no se confirmó.")
+        elif not bot.authenticate(timeout_seconds=120):
+            raise RuntimeError("El perfil no está autenticado; inicia sesión antes de medir.")
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark del navegador residente")
+    parser.add_argument("--session-dir", default="session_data")
+    parser.add_argument("--phone", default=None)
+    parser.add_argument("--message", default="ping")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    cold = [one_shot(args.session_dir, False, args.phone, args.message) for _ in range(args.repeat)]
+
+    daemon = subprocess.Popen([sys.executable, "-m", "whatsapp_automation.daemon", "--session-dir", args.session_dir])
+    try:
+        deadline = time.monotonic() + 300
+        while not find_daemon(args.session_dir):
+            if daemon.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError("El demonio no arrancó.")
+            time.sleep(0.5)
+        warm = [one_shot(args.session_dir, True, args.phone, args.message) for _ in range(args.repeat)]
+    finally:
+        stop_daemon(args.session_dir)
+        daemon.wait(timeout=30)
+
+    print(f"{'modo':<22} {'media (s)':>10} {'mín (s)':>10}")
+    print(f"{'arranque en frío':<22} {sum(cold) / len(cold):>10.2f} {min(cold):>10.2f}")
+    print(f"{'navegador residente':<22} {sum(warm) / len(warm):>10.2f} {min(warm):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""
+Benchmark: extremo a extremo sin red contra el sustituto local de WhatsApp Web
+Lanza el servidor de benchmarks/whatsapp_standin.py con las latencias de un escenario, dirige el
+WhatsAppBotFacade real (Chromium, perfil temporal, sin navegador residente) hacia él con
+WHATSAPP_URL y envía un lote de mensajes. Informa la distribución de latencias por fase (tramos de
+telemetría) y de extremo a extremo por mensaje, y los mensajes por minuto.
+
+Cada ejecución se añade a un archivo JSON-lines con el commit y la configuración; la comparación
+con la ejecución anterior de la misma configuración señala las regresiones entre commits.
+
+Uso:
+    python benchmarks/bench_end_to_end.py [--scenario typical] [--open-strategy search direct]
+        [--messages 20] [--lines 1] [--cold] [--index-contacts] [--results benchmarks/results/end_to_end.jsonl]
+        [--threshold 0.15] [--fail-on-regression] [--no-save] [--json]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import socket
+import platform
+import tempfile
+import subprocess
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional, Sequence
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from whatsapp_standin import SCENARIOS, StandInServer, UiLatencies, make_contacts
+
+DEFAULT_RESULTS = os.path.join(ROOT, "benchmarks", "results", "end_to_end.jsonl")
+
+# Fases de arranque (una vez por ejecución) y de cada envío (tramos de telemetría)
+STARTUP_PHASES = ("session.start", "session.launch", "navigation", "auth", "chat.index")
+SEND_PHASES = ("send", "chat.open_indexed", "chat.search", "chat.open_direct", "compose", "compose.focus",
+               "compose.paste", "compose.type", "compose.confirm")
+
+# Métricas comparadas entre ejecuciones (menor es mejor salvo messages_per_minute)
+COMPARED = ("e2e.p50_ms", "e2e.p90_ms", "startup_ms", "messages_per_minute")
+
+
+def percentile(ordered: Sequence[float], q: float) -> float:
+    """Percentil `q` (0-100) con interpolación lineal sobre valores ya ordenados."""
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * q / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def distribution(seconds: Sequence[float]) -> Dict[str, float]:
+    """Resumen en milisegundos: cantidad, media, p50, p90, p99 y máximo."""
+    ordered = sorted(value * 1000.0 for value in seconds)
+    if not ordered:
+        return {"count": 0}
+    return {
+        "count": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered), 2),
+        "p50_ms": round(percentile(ordered, 50), 2),
+        "p90_ms": round(percentile(ordered, 90), 2),
+        "p99_ms": round(percentile(ordered, 99), 2),
+        "max_ms": round(ordered[-1], 2),
+    }
+
+
+def git_revision() -> Dict[str, Any]:
+    """Commit actual y si el árbol tiene cambios sin confirmar (vacío fuera de un repositorio)."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                                    capture_output=True, text=True, check=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+    return {"commit": commit, "dirty": dirty}
+
+
+def free_port() -> int:
+    """Puerto local libre; todas las configuraciones de un proceso comparten origen (WHATSAPP_URL)."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def run_scenario(
+    port: int,
+    latencies: UiLatencies,
+    open_strategy: str,
+    messages: int,
+    lines: int,
+    warmup: int,
+    cold: bool,
+    headless: bool,
+    insert_mode: str,
+    index_contacts: bool = False
+) -> Dict[str, Any]:
+    """Ejecuta un lote contra un sustituto nuevo y retorna las métricas de la ejecución."""
+    contacts = make_contacts(max(messages + warmup, 1))
+    with StandInServer(latencies, contacts=contacts, linked=not cold, port=port) as server:
+        # El origen se resuelve al importar los Page Objects: se fija antes de la primera importación
+        os.environ["WHATSAPP_URL"] = server.url
+        from whatsapp_automation import SessionManager, WhatsAppBotFacade, telemetry
+        from whatsapp_automation.pages.base_page import BasePage
+        if BasePage.WHATSAPP_URL != server.url:
+            raise RuntimeError("whatsapp_automation se importó antes de fijar WHATSAPP_URL.")
+
+        records: List[Dict[str, Any]] = []
+        telemetry.reset()
+        telemetry.configure(enabled=True, console_level="warning")
+        telemetry.add_hook(records.append)
+
+        body = "\n".join(f"Línea {i + 1} del mensaje de benchmark" for i in range(lines))
+        key = "phone" if open_strategy == "direct" else "name"
+        jobs = [{"phone": c[key], "message": f"{body} #{i}"} for i, c in enumerate(contacts[:messages + warmup])]
+
+        SessionManager.reset_instance()
+        with tempfile.TemporaryDirectory(prefix="whatsapp-bench-") as tmp:
+            bot = WhatsAppBotFacade(
+                session_dir=os.path.join(tmp, "profile"),
+                headless=headless,
+                use_daemon=False,
+                open_strategy=open_strategy,
+                insert_mode=insert_mode,
+                index_contacts=index_contacts
+            )
+            try:
+                start = time.perf_counter()
+                bot.initialize()
+                if not bot.authenticate(timeout_seconds=120):
+                    raise RuntimeError("El sustituto no llegó a la lista de chats.")
+                startup = time.perf_counter() - start
+
+                list(bot.iter_send(jobs[:warmup]))
+                mark = len(records)
+                batch_start = time.perf_counter()
+                results = list(bot.iter_send(jobs[warmup:]))
+                batch = time.perf_counter() - batch_start
+            finally:
+                bot.close()
+                telemetry.remove_hook(records.append)
+                telemetry.configure(enabled=False)
+
+        delivered = len(server.sent)
+
+    spans: Dict[str, List[float]] = {}
+    for index, record in enumerate(records):
+        if record["type"] != "span":
+            continue
+        if record["name"] in STARTUP_PHASES or index >= mark:
+            spans.setdefault(record["name"], []).append(record["duration"])
+
+    sent = sum(1 for r in results if r.success)
+    return {
+        "startup_ms": round(startup * 1000.0, 2),
+        "e2e": distribution([r.elapsed for r in results if r.success]),
+        "send_latency": distribution([r.send_latency for r in results if r.send_latency is not None]),
+        "phases": {name: distribution(spans[name]) for name in STARTUP_PHASES + SEND_PHASES if name in spans},
+        "sent": sent,
+        "failed": len(results) - sent,
+        "delivered": delivered,
+        "messages_per_minute": round(sent / batch * 60.0, 2) if batch > 0 else 0.0,
+        "errors": sorted({r.error for r in results if r.error})[:5],
+    }
+
+
+def config_key(config: Dict[str, Any]) -> str:
+    return json.dumps(config, sort_keys=True)
+
+
+def lookup(metrics: Dict[str, Any], path: str) -> Optional[float]:
+    value: Any = metrics
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+
+def previous_run(results_path: str, config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Última ejecución registrada con la misma configuración."""
+    if not os.path.exists(results_path):
+        return None
+    key = config_key(config)
+    found = None
+    with open(results_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if config_key(record.get("config", {})) == key:
+                found = record
+    return found
+
+
+def compare(current: Dict[str, Any], previous: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """Variación relativa de las métricas comparadas; `regression` si empeora más que `threshold`."""
+    rows = []
+    for path in COMPARED:
+        now, before = lookup(current, path), lookup(previous, path)
+        if not now or not before:
+            continue
+        change = (now - before) / before
+        worse = -change if path == "messages_per_minute" else change
+        rows.append({"metric": path, "before": before, "now": now, "change": round(change, 4), "regression": worse > threshold})
+    return rows
+
+
+def print_report(config: Dict[str, Any], metrics: Dict[str, Any]) -> None:
+    print(f"\n📊 {config['scenario']} · apertura {config['open_strategy']} · {config['messages']} mensajes "
+          f"de {config['lines']} línea(s){' · arranque en frío (QR)' if config['cold'] else ''}")
+    print(f"   arranque hasta la lista de chats: {metrics['startup_ms']:.0f} ms")
+    print(f"   {'fase':<20} {'n':>5} {'media':>9} {'p50':>9} {'p90':>9} {'p99':>9} {'máx':>9}  (ms)")
+    rows = [("extremo a extremo", metrics["e2e"]), ("latencia de envío", metrics["send_latency"])]
+    rows += list(metrics["phases"].items())
+    for name, dist in rows:
+        if not dist.get("count"):
+            continue
+        print(f"   {name:<20} {dist['count']:>5} {dist['mean_ms']:>9.1f} {dist['p50_ms']:>9.1f} "
+              f"{dist['p90_ms']:>9.1f} {dist['p99_ms']:>9.1f} {dist['max_ms']:>9.1f}")
+    print(f"   ✅ {metrics['sent']} enviados · ❌ {metrics['failed']} fallidos · 📥 {metrics['delivered']} recibidos "
+          f"por el sustituto · {metrics['messages_per_minute']:.1f} msg/min")
+    for error in metrics["errors"]:
+        print(f"   ⚠️  {error}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark extremo a extremo contra un WhatsApp Web local")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="typical")
+    parser.add_argument("--open-strategy", nargs="+", choices=["search", "direct"], default=["search", "direct"])
+    parser.add_argument("--messages", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=1, help="Envíos previos excluidos de las distribuciones")
+    parser.add_argument("--lines", type=int, default=1, help="Líneas de cada mensaje")
+    parser.add_argument("--insert-mode", choices=["paste", "keyboard"], default="paste")
+    parser.add_argument("--index-contacts", action="store_true", help="Abrir los chats desde el índice de contactos")
+    parser.add_argument("--cold", action="store_true", help="Perfil sin vincular: incluye el QR en el arranque")
+    parser.add_argument("--headed", action="store_true", help="Mostrar la ventana del navegador")
+    parser.add_argument("--results", default=DEFAULT_RESULTS, help="Archivo JSON-lines de resultados")
+    parser.add_argument("--no-save", action="store_true", help="No añadir la ejecución al archivo de resultados")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Empeoramiento relativo que cuenta como regresión")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Salir con código 1 si hay regresiones")
+    parser.add_argument("--json", action="store_true", help="Una línea JSON por configuración")
+    args = parser.parse_args()
+
+    latencies = SCENARIOS[args.scenario]
+    revision = git_revision()
+    port = free_port()
+    regressions = 0
+    for open_strategy in args.open_strategy:
+        config = {
+            "scenario": args.scenario,
+            "latencies": asdict(latencies),
+            "open_strategy": open_strategy,
+            "messages": args.messages,
+            "lines": args.lines,
+            "insert_mode": args.insert_mode,
+            "cold": args.cold,
+            "index_contacts": args.index_contacts,
+        }
+        metrics = run_scenario(port, latencies, open_strategy, args.messages, args.lines, args.warmup,
+                               args.cold, not args.headed, args.insert_mode, args.index_contacts)
+        record = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            **revision,
+            "python": platform.python_version(),
+            "config": config,
+            **metrics,
+        }
+        previous = previous_run(args.results, config)
+        comparison = compare(metrics, previous, args.threshold) if previous else []
+        regressions += sum(1 for row in comparison if row["regression"])
+
+        if args.json:
+            print(json.dumps({**record, "comparison": comparison}, ensure_ascii=False))
+        else:
+            print_report(config, metrics)
+            if previous:
+                print(f"   Comparado con {previous.get('commit') or '?'} ({previous.get('ts')}):")
+                for row in comparison:
+                    flag = "🔴 regresión" if row["regression"] else "  "
+                    print(f"     {row['metric']:<22} {row['before']:>10.1f} → {row['now']:>10.1f} "
+                          f"({row['change']:+.1%}) {flag}")
+
+        if not args.no_save:
+            os.makedirs(os.path.dirname(os.path.abspath(args.results)), exist_ok=True)
+            with open(args.results, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
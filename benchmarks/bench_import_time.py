@@ -0,0 +1,78 @@
+"""
+Benchmark: tiempo de importación del paquete y de arranque de las CLIs
+Cada caso se ejecuta en un intérprete nuevo (sin cachés de módulos) e informa la mediana y si
+Playwright llegó a cargarse. Con --json emite una línea por caso para seguir la métrica en CI.
+
+Uso:
+    python benchmarks/bench_import_time.py [--repeat 7] [--json]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Caso → código ejecutado con `python -c`
+CASES = {
+    "import whatsapp_automation": "import whatsapp_automation",
+    "from ... import MessageBuilder": "from whatsapp_automation import MessageBuilder",
+    "whatsapp-send --version": (
+        "import sys; sys.argv = ['whatsapp-send', '--version']\n"
+        "from whatsapp_automation.cli import main\n"
+        "try:\n    main()\nexcept SystemExit:\n    pass"
+    ),
+    "whatsapp-daemon --status": (
+        "import sys; sys.argv = ['whatsapp-daemon', '--status', '--session-dir', 'bench_import_nonexistent']\n"
+        "from whatsapp_automation.daemon import main\n"
+        "try:\n    main()\nexcept SystemExit:\n    pass"
+    ),
+    "from ... import WhatsAppBotFacade": "from whatsapp_automation import WhatsAppBotFacade",
+}
+
+_PROBE = "\nimport sys as _s; _s.__stdout__.write('\\nPLAYWRIGHT=%d\\n' % ('playwright' in _s.modules))"
+
+
+def run_case(code: str) -> tuple:
+    """Segundos de un intérprete que ejecuta `code` e indica si se importó Playwright."""
+    start = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", code + _PROBE],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    elapsed = time.perf_counter() - start
+    return elapsed, "PLAYWRIGHT=1" in output
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark del tiempo de importación")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--json", action="store_true", help="Una línea JSON por caso")
+    args = parser.parse_args()
+
+    # Línea base: intérprete vacío, para descontar el arranque de Python
+    baseline = statistics.median(run_case("pass")[0] for _ in range(args.repeat))
+
+    if not args.json:
+        print(f"{'caso':<36} {'mediana (ms)':>13} {'neto (ms)':>10} {'playwright':>11}")
+    for name, code in CASES.items():
+        runs = [run_case(code) for _ in range(args.repeat)]
+        median = statistics.median(elapsed for elapsed, _ in runs)
+        loaded = runs[-1][1]
+        if args.json:
+            print(json.dumps({
+                "case": name,
+                "median_ms": round(median * 1000, 1),
+                "net_ms": round((median - baseline) * 1000, 1),
+                "playwright_loaded": loaded,
+            }, ensure_ascii=False))
+        else:
+            print(f"{name:<36} {median * 1000:>13.1f} {(median - baseline) * 1000:>10.1f} {'sí' if loaded else 'no':>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Benchmark: mensajes entrantes por empuje frente a sondeo del DOM
+Sobre el sustituto local de WhatsApp Web (benchmarks/whatsapp_standin.py) la página inyecta mensajes
+entrantes a intervalos fijos, unos en la conversación abierta y otros en chats de la lista. Se mide
+la latencia desde la inserción en el DOM hasta su llegada a Python y el CPU del proceso Python en
+reposo, con el flujo entrante (InboundStream: observador + función expuesta) y con un bucle de
+sondeo equivalente a los `is_visible` periódicos de LoginPage.wait_for_authentication.
+
+Uso:
+    python benchmarks/bench_inbound.py [--messages 50] [--interval-ms 100] [--poll-ms 250]
+        [--idle 5] [--mode push poll] [--headed] [--json]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+from typing import Any, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from whatsapp_standin import SCENARIOS, StandInServer, make_contacts
+from bench_end_to_end import distribution, free_port
+
+# Inyección en la página: `count` mensajes cada `intervalMs`, alternando destinatarios
+INJECT_JS = """
+([phones, count, intervalMs, prefix]) => {
+    window.__standinInjected = [];
+    let i = 0;
+    const timer = setInterval(() => {
+        if (i >= count) { clearInterval(timer); return; }
+        const text = prefix + i;
+        window.__standinInjected.push({ text: text, ts: window.standinReceive(phones[i % phones.length], text) });
+        i += 1;
+    }, intervalMs);
+}
+"""
+
+# Línea base: instantánea de las burbujas entrantes y las vistas previas de la lista
+POLL_SNAPSHOT_JS = """
+() => Array.from(document.querySelectorAll('#main div.message-in, #pane-side span[title]'))
+    .map((el) => el.getAttribute('title') || el.innerText)
+"""
+
+
+def _latencies(page, arrivals: Dict[str, float]) -> List[float]:
+    injected = page.evaluate("() => window.__standinInjected")
+    return [arrivals[row["text"]] - row["ts"] / 1000.0 for row in injected if row["text"] in arrivals]
+
+
+def run_push(facade, phones: List[str], messages: int, interval_ms: int, idle: float) -> Dict[str, Any]:
+    stream = facade.open_inbound()
+    prefix = "Entrante push #"
+    facade.page.evaluate(INJECT_JS, [phones, messages, interval_ms, prefix])
+    arrivals: Dict[str, float] = {}
+    deadline = messages * interval_ms / 1000.0 + 10.0
+    for event in stream.events(timeout=deadline, types=["message"]):
+        if event.text and event.text.startswith(prefix):
+            arrivals.setdefault(event.text, event.received_at)
+            if len(arrivals) >= messages:
+                break
+    latencies = _latencies(facade.page, arrivals)
+
+    cpu = time.process_time()
+    for _ in stream.events(timeout=idle):
+        pass
+    idle_cpu = time.process_time() - cpu
+    stats = stream.stats()
+    stream.close()
+    return {"latency": distribution(latencies), "received": len(arrivals),
+            "idle_cpu_ms_per_s": round(idle_cpu * 1000.0 / idle, 3), "stream": stats}
+
+
+def run_poll(page, phones: List[str], messages: int, interval_ms: int, poll_ms: int, idle: float) -> Dict[str, Any]:
+    prefix = "Entrante poll #"
+    page.evaluate(INJECT_JS, [phones, messages, interval_ms, prefix])
+    arrivals: Dict[str, float] = {}
+    deadline = time.monotonic() + messages * interval_ms / 1000.0 + 10.0
+    while len(arrivals) < messages and time.monotonic() < deadline:
+        now = time.time()
+        for text in page.evaluate(POLL_SNAPSHOT_JS):
+            if text and text.startswith(prefix):
+                arrivals.setdefault(text, now)
+        time.sleep(poll_ms / 1000.0)
+    latencies = _latencies(page, arrivals)
+
+    cpu = time.process_time()
+    end = time.monotonic() + idle
+    while time.monotonic() < end:
+        page.evaluate(POLL_SNAPSHOT_JS)
+        time.sleep(poll_ms / 1000.0)
+    idle_cpu = time.process_time() - cpu
+    return {"latency": distribution(latencies), "received": len(arrivals),
+            "idle_cpu_ms_per_s": round(idle_cpu * 1000.0 / idle, 3)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de mensajes entrantes: empuje frente a sondeo")
+    parser.add_argument("--messages", type=int, default=50)
+    parser.add_argument("--interval-ms", type=int, default=100, help="Separación entre mensajes inyectados")
+    parser.add_argument("--poll-ms", type=int, default=250, help="Periodo del bucle de sondeo de referencia")
+    parser.add_argument("--idle", type=float, default=5.0, help="Segundos de reposo para medir el CPU")
+    parser.add_argument("--mode", nargs="+", choices=["push", "poll"], default=["push", "poll"])
+    parser.add_argument("--headed", action="store_true", help="Mostrar la ventana del navegador")
+    parser.add_argument("--json", action="store_true", help="Una línea JSON por modo")
+    args = parser.parse_args()
+
+    contacts = make_contacts(10)
+    with StandInServer(SCENARIOS["instant"], contacts=contacts, linked=True, port=free_port()) as server:
+        # El origen se resuelve al importar los Page Objects: se fija antes de la primera importación
+        os.environ["WHATSAPP_URL"] = server.url
+        from whatsapp_automation import WhatsAppBotFacade, telemetry
+        telemetry.configure(console_level="warning")
+
+        with tempfile.TemporaryDirectory(prefix="bench_inbound_") as profile:
+            facade = WhatsAppBotFacade(session_dir=profile, headless=not args.headed, wait_time=0.0,
+                                       adaptive_selectors=False, use_daemon=False, auto_close=False)
+            try:
+                if not facade.authenticate(timeout_seconds=60):
+                    raise RuntimeError("El sustituto de WhatsApp Web no quedó autenticado.")
+                # Conversación abierta con el primer contacto; el resto recibe en la lista de chats
+                facade.page.locator('#pane-side [data-testid="cell-frame-container"]').first.click()
+                facade.page.wait_for_selector("#main header")
+                phones = [c["phone"] for c in contacts[:4]]
+
+                for mode in args.mode:
+                    if mode == "push":
+                        metrics = run_push(facade, phones, args.messages, args.interval_ms, args.idle)
+                    else:
+                        metrics = run_poll(facade.page, phones, args.messages, args.interval_ms,
+                                           args.poll_ms, args.idle)
+                    record = {"mode": mode, "messages": args.messages, "interval_ms": args.interval_ms,
+                              "poll_ms": args.poll_ms if mode == "poll" else None, **metrics}
+                    if args.json:
+                        print(json.dumps(record, ensure_ascii=False))
+                        continue
+                    latency = metrics["latency"]
+                    print(f"\n📥 {mode}: {metrics['received']}/{args.messages} mensajes")
+                    if latency.get("count"):
+                        print(f"   Latencia DOM → Python: p50 {latency['p50_ms']:.1f} ms, "
+                              f"p90 {latency['p90_ms']:.1f} ms, máx {latency['max_ms']:.1f} ms")
+                    print(f"   CPU de Python en reposo: {metrics['idle_cpu_ms_per_s']:.2f} ms/s")
+            finally:
+                facade.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmark: modo de red ligero frente a la carga completa de WhatsApp Web
+Mide, sobre un perfil ya autenticado, el tiempo hasta la lista de chats y las peticiones/bytes
+descargados con `NetworkFilter.observe_only()` (línea base) y con el filtro por defecto.
+
+Uso:
+    python benchmarks/bench_lean_network.py --session-dir session_data [--repeat 3]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from whatsapp_automation import WhatsAppBotFacade, SessionManager, NetworkFilter
+
+
+def time_to_chat_list(session_dir: str, network_filter: NetworkFilter) -> float:
+    """Segundos desde el lanzamiento del navegador hasta la lista de chats cargada."""
+    SessionManager.reset_instance()
+    start = time.perf_counter()
+    with WhatsAppBotFacade(session_dir=session_dir, headless=True, lean_network=network_filter) as bot:
+        if not bot.authenticate(timeout_seconds=120):
+            raise RuntimeError("El perfil no está autenticado; inicia sesión antes de medir.")
+        return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark del modo de red ligero")
+    parser.add_argument("--session-dir", default="session_data")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    baseline = NetworkFilter.observe_only()
+    lean = NetworkFilter()
+    full_times = [time_to_chat_list(args.session_dir, baseline) for _ in range(args.repeat)]
+    lean_times = [time_to_chat_list(args.session_dir, lean) for _ in range(args.repeat)]
+
+    full_bytes = sum(baseline.bytes_loaded.values()) // args.repeat
+    lean_bytes = sum(lean.bytes_loaded.values()) // args.repeat
+    print(f"{'modo':<10} {'lista de chats (s)':>20} {'respuestas':>12} {'bytes':>14}")
+    print(f"{'completo':<10} {sum(full_times) / len(full_times):>20.2f} "
+          f"{sum(baseline.responses.values()) // args.repeat:>12} {full_bytes:>14}")
+    print(f"{'ligero':<10} {sum(lean_times) / len(lean_times):>20.2f} "
+          f"{sum(lean.responses.values()) // args.repeat:>12} {lean_bytes:>14}")
+    print(f"Peticiones evitadas por carga: {lean.stats()['requests_avoided'] // args.repeat}")
+    print(f"Bytes evitados por carga (estimado): {lean.estimated_bytes_avoided(baseline) // args.repeat}")
+
+
+if __name__ == "__main__":
+    main()
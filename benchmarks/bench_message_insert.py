@@ -0,0 +1,87 @@
+"""
+Benchmark: inserción del texto en el editor (pegado en bloque vs. tecleo línea a línea)
+Mide el tiempo de `ChatPage.type_and_send_message` frente al número de líneas del mensaje
+sobre una página local con un editor contenteditable que imita al de WhatsApp Web
+(procesa el pegado como una operación y Shift+Enter como salto de párrafo).
+
+Uso:
+    python benchmarks/bench_message_insert.py [--lines 1 10 50 200 1000] [--repeat 3]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from playwright.sync_api import sync_playwright
+
+from whatsapp_automation.pages.chat_page import ChatPage
+
+# Editor mínimo: pegado en una sola operación; Enter añade la burbuja saliente y vacía el editor
+EDITOR_HTML = """
+<!DOCTYPE html>
+<html><body>
+<div id="main"><header>Benchmark</header>
+  <div id="conversation"></div>
+  <footer>
+    <div contenteditable="true" role="textbox" data-tab="10" style="min-height:20px"></div>
+  </footer>
+</div>
+<script>
+  const editor = document.querySelector('footer div[contenteditable="true"]');
+  editor.addEventListener('paste', (event) => {
+    event.preventDefault();
+    const text = event.clipboardData.getData('text/plain');
+    document.execCommand('insertText', false, text);
+  });
+  editor.addEventListener('keydown', (event) => {
+    if (event.key === 'Enter' && !event.shiftKey) {
+      event.preventDefault();
+      const bubble = document.createElement('div');
+      bubble.className = 'message-out';
+      bubble.innerText = editor.innerText;
+      document.getElementById('conversation').appendChild(bubble);
+      editor.innerHTML = '';
+    }
+  });
+</script>
+</body></html>
+"""
+
+
+def bench(page, mode: str, lines: int, repeat: int) -> float:
+    """Tiempo medio (segundos) de redactar y enviar un mensaje de `lines` líneas."""
+    chat = ChatPage(page, ui_timeout=10.0, insert_mode=mode)
+    message = "\n".join(f"Línea {i}: texto de prueba del mensaje" for i in range(lines))
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        chat.type_and_send_message(message)
+        timings.append(time.perf_counter() - start)
+    return sum(timings) / len(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de inserción de texto en el editor")
+    parser.add_argument("--lines", type=int, nargs="+", default=[1, 10, 50, 200, 1000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        page = browser.new_page()
+        page.set_content(EDITOR_HTML)
+
+        print(f"{'líneas':>8} {'paste (s)':>12} {'keyboard (s)':>14} {'aceleración':>12}")
+        for lines in args.lines:
+            paste = bench(page, "paste", lines, args.repeat)
+            keyboard = bench(page, "keyboard", lines, args.repeat)
+            print(f"{lines:>8} {paste:>12.3f} {keyboard:>14.3f} {keyboard / paste:>11.1f}x")
+
+        browser.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark: perfil en disco frente a perfil copiado a disco RAM (tmpfs)
+Mide, sobre un perfil ya autenticado, el lanzamiento del contexto persistente, el tiempo hasta
+que WhatsApp Web termina de sincronizar (lista de chats) y el coste de copiar/escribir de vuelta.
+
+Uso:
+    python benchmarks/bench_profile_staging.py --session-dir session_data [--staging-root /dev/shm] [--repeat 3]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from playwright.sync_api import sync_playwright
+
+from whatsapp_automation import SessionManager
+from whatsapp_automation.core.profile_staging import ProfileStager, default_staging_root
+from whatsapp_automation.pages.login_page import LoginPage
+
+
+def run(session_dir: str, staging_root: str = None) -> dict:
+    """Tiempos de una carga completa: copia, lanzamiento, sincronización y escritura de vuelta."""
+    timings = {"stage": 0.0, "write_back": 0.0}
+    launch_dir = session_dir
+    stager = None
+    if staging_root:
+        stager = ProfileStager(session_dir, staging_root, sync_interval=0)
+        start = time.perf_counter()
+        launch_dir = stager.stage()
+        timings["stage"] = time.perf_counter() - start
+
+    with sync_playwright() as playwright:
+        start = time.perf_counter()
+        context = SessionManager.launch_context(playwright, launch_dir, headless=True)
+        timings["launch"] = time.perf_counter() - start
+
+        page = context.pages[0] if context.pages else context.new_page()
+        login_page = LoginPage(page)
+        start = time.perf_counter()
+        login_page.navigate_to_whatsapp()
+        if not login_page.wait_for_authentication(timeout_seconds=120):
+            raise RuntimeError("El perfil no está autenticado; inicia sesión antes de medir.")
+        timings["sync"] = time.perf_counter() - start
+        context.close()
+
+    if stager:
+        start = time.perf_counter()
+        stager.finalize()
+        timings["write_back"] = time.perf_counter() - start
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark del perfil en disco RAM")
+    parser.add_argument("--session-dir", default="session_data")
+    parser.add_argument("--staging-root", default=default_staging_root())
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    results = {
+        "disco": [run(args.session_dir) for _ in range(args.repeat)],
+        "tmpfs": [run(args.session_dir, args.staging_root) for _ in range(args.repeat)],
+    }
+
+    print(f"{'modo':<8} {'copia (s)':>10} {'lanzamiento (s)':>16} {'sincronización (s)':>19} {'escritura (s)':>14}")
+    for mode, runs in results.items():
+        mean = {key: sum(r[key] for r in runs) / len(runs) for key in runs[0]}
+        print(f"{mode:<8} {mean['stage']:>10.2f} {mean['launch']:>16.2f} {mean['sync']:>19.2f} {mean['write_back']:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
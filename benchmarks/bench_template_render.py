@@ -0,0 +1,94 @@
+"""
+Benchmark: mensajes personalizados renderizados por segundo
+Compara la construcción del reporte técnico tal como se hacía antes (lista de líneas, banner y
+`strftime` en cada llamada) con la plantilla compilada, tanto mensaje a mensaje (`build`) como en
+flujo (`render_many`), y una plantilla libre frente a `str.format`. No requiere navegador.
+
+Uso:
+    python benchmarks/bench_template_render.py [--messages 20000] [--repeat 5]
+"""
+
+import os
+import sys
+import time
+import argparse
+import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from whatsapp_automation.services.message_builder import (
+    DEFAULT_PATTERNS,
+    MessageTemplate,
+    TechnicalReportStrategy,
+)
+
+FREE_TEXT = "Hola {name}, tu pedido {order} por {amount:.2f} € sale hoy. Seguimiento: {url}"
+
+
+def legacy_report(recipient, developer="Jose Rivero", repo_url="https://github.com/jrivero20/whatsapp_automation"):
+    """Construcción previa del reporte técnico: todo el texto se rehace en cada llamada."""
+    timestamp = datetime.datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+    lines = [
+        f"Hola {recipient},",
+        "",
+        "🤖 *BOT DE AUTOMATIZACIÓN WHATSAPP (RPA)*",
+        f"👤 *Desarrollador:* {developer}",
+        f"🔗 *Repositorio:* {repo_url}",
+        f"📅 _Ejecución automatizada: {timestamp}_",
+        "",
+        "━━━━━━━━━━━━━━━━━━━━━━━━━━━━",
+        "📐 *PATRONES DE DISEÑO IMPLEMENTADOS*",
+        "━━━━━━━━━━━━━━━━━━━━━━━━━━━━",
+        ""
+    ]
+    for idx, pattern in enumerate(DEFAULT_PATTERNS, 1):
+        lines.append(f"*{idx}. {pattern['name']}* [{pattern['type']}]")
+        lines.append(f"   ↳ {pattern['desc']}")
+        lines.append("")
+    lines.append("━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+    lines.append("✅ *Persistencia de Sesión:* Cookies, LocalStorage e IndexedDB guardados en perfil local.")
+    lines.append("🚀 *Entregable:* Ejecutable interactivo `.bat` para escritorio.")
+    lines.append("━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+    return "\n".join(lines)
+
+
+def rate(fn, rows, repeat) -> float:
+    """Mejor tasa (mensajes/s) de `repeat` pasadas consumiendo todos los mensajes."""
+    best = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in fn(rows):
+            pass
+        best = max(best, len(rows) / (time.perf_counter() - start))
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de plantillas compiladas")
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = [
+        {"recipient": f"Cliente {i}", "name": f"Cliente {i}", "order": f"A-{i:06d}", "amount": i * 1.5,
+         "url": f"https://example.com/t/{i}"}
+        for i in range(args.messages)
+    ]
+    strategy = TechnicalReportStrategy()
+    template = MessageTemplate(FREE_TEXT)
+
+    cases = {
+        "reporte: construcción previa": lambda rs: (legacy_report(r["recipient"]) for r in rs),
+        "reporte: build() compilado": lambda rs: (strategy.build(**r) for r in rs),
+        "reporte: render_many": strategy.render_many,
+        "libre: str.format": lambda rs: (FREE_TEXT.format(**r) for r in rs),
+        "libre: MessageTemplate.render_many": template.render_many,
+    }
+
+    print(f"{'caso':<36} {'mensajes/s':>12}")
+    for name, fn in cases.items():
+        print(f"{name:<36} {rate(fn, rows, args.repeat):>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,461 @@
+"""
+Sustituto local de WhatsApp Web para benchmarks sin red
+Sirve desde 127.0.0.1 una imitación HTML/JS de la interfaz con los mismos selectores que usan los
+Page Objects: pantalla de carga, código QR, lista de chats, barra de búsqueda, cabecera de la
+conversación, editor tipo Lexical (párrafos, pegado en una sola operación, Shift+Enter), botón de
+enviar, burbujas salientes, ruta de envío por número (`/send?phone=&text=`) y diálogo de número
+inválido. Cada transición de la interfaz tiene una latencia configurable (con variación aleatoria
+reproducible) y los mensajes entregados se reportan al servidor para verificar el envío.
+
+El bot se dirige al sustituto con la variable de entorno WHATSAPP_URL (antes de importar el paquete).
+
+Uso manual:
+    python benchmarks/whatsapp_standin.py --port 8080 --search-ms 300 --send-ms 400
+    WHATSAPP_URL=http://127.0.0.1:8080 whatsapp-send "Contacto 001" "Hola" --session-dir /tmp/perfil
+"""
+
+import json
+import time
+import argparse
+import threading
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Sequence
+
+
+@dataclass
+class UiLatencies:
+    """
+    Latencias (ms) de las transiciones de la interfaz simulada.
+
+    Args:
+        boot_ms: Carga inicial hasta mostrar el QR o la lista de chats (cada navegación)
+        qr_scan_ms: Con el perfil sin vincular, tiempo hasta el "escaneo" del QR (None = nunca)
+        search_ms: Filtrado de la lista de chats tras escribir en la búsqueda
+        open_ms: Apertura de una conversación (clic, Enter o ruta por número)
+        input_ms: Procesamiento del pegado en el editor
+        send_ms: Desde Enter (o el botón) hasta la burbuja saliente en la conversación
+        jitter: Variación relativa de cada latencia (0.25 = ±25 %)
+    """
+
+    boot_ms: float = 0.0
+    qr_scan_ms: Optional[float] = None
+    search_ms: float = 0.0
+    open_ms: float = 0.0
+    input_ms: float = 0.0
+    send_ms: float = 0.0
+    jitter: float = 0.0
+
+
+# Perfiles de latencia predefinidos para los benchmarks
+SCENARIOS: Dict[str, UiLatencies] = {
+    # Interfaz instantánea: mide solo el coste propio del bot (viajes a Chromium, esperas, sondeos)
+    "instant": UiLatencies(qr_scan_ms=0.0),
+    "typical": UiLatencies(boot_ms=1200, qr_scan_ms=2000, search_ms=300, open_ms=250, input_ms=30, send_ms=350, jitter=0.25),
+    "slow": UiLatencies(boot_ms=4000, qr_scan_ms=5000, search_ms=900, open_ms=800, input_ms=120, send_ms=1200, jitter=0.4),
+}
+
+
+def make_contacts(count: int) -> List[Dict[str, str]]:
+    """Contactos sintéticos con nombre y número E.164 (`Contacto 001`, `+584120000001`...)."""
+    return [{"name": f"Contacto {i:03d}", "phone": f"+58412{i:07d}"} for i in range(1, count + 1)]
+
+
+STANDIN_HTML = """<!DOCTYPE html>
+<html lang="es"><head><meta charset="utf-8"><title>WhatsApp</title>
+<style>
+  body { margin: 0; font-family: sans-serif; }
+  #app { display: flex; height: 100vh; }
+  #side { width: 340px; border-right: 1px solid #ddd; display: flex; flex-direction: column; }
+  #side header { padding: 8px; }
+  #side input { width: 90%; padding: 6px; }
+  #pane-side { flex: 1; overflow: auto; }
+  .cell { padding: 10px; border-bottom: 1px solid #eee; cursor: pointer; }
+  #main { flex: 1; display: flex; flex-direction: column; }
+  #main header { padding: 10px; border-bottom: 1px solid #ddd; }
+  #conversation { flex: 1; overflow: auto; padding: 8px; }
+  .message-in { white-space: pre-wrap; background: #fff; border: 1px solid #eee; margin: 4px auto 4px 0; padding: 6px; max-width: 70%; }
+  .message-out { white-space: pre-wrap; background: #d9fdd3; margin: 4px 0 4px auto; padding: 6px; max-width: 70%; }
+  footer { display: flex; border-top: 1px solid #ddd; }
+  footer div[contenteditable] { flex: 1; min-height: 24px; padding: 6px; outline: none; }
+  footer p { margin: 0; }
+  footer button { display: none; }
+  footer button.ready { display: block; }
+  div[role="dialog"] { position: fixed; top: 30%; left: 30%; background: #fff; border: 1px solid #999; padding: 20px; }
+</style></head>
+<body><div id="app"></div>
+<script>
+const CONFIG = __CONFIG__;
+const L = CONFIG.latencies;
+const app = document.getElementById('app');
+const params = new URLSearchParams(location.search);
+const chats = {};
+const unread = {};
+const previews = {};
+let seed = CONFIG.seed >>> 0;
+let searchToken = 0;
+let main = null;
+let editor = null;
+let sendButton = null;
+let currentChat = null;
+
+// Variación reproducible (mulberry32) sembrada por el servidor en cada carga de página
+function rand() {
+  seed = (seed + 0x6D2B79F5) >>> 0;
+  let t = seed;
+  t = Math.imul(t ^ (t >>> 15), t | 1);
+  t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+  return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+}
+function later(name, fn) {
+  const base = L[name] || 0;
+  setTimeout(fn, Math.max(0, base * (1 + L.jitter * (2 * rand() - 1))));
+}
+function node(tag, attrs, text) {
+  const el = document.createElement(tag);
+  for (const [key, value] of Object.entries(attrs || {})) el.setAttribute(key, value);
+  if (text !== undefined) el.textContent = text;
+  return el;
+}
+function digits(value) { return (value || '').replace(/\\D/g, ''); }
+function linked() { return CONFIG.linked || localStorage.getItem('standin-linked') === '1'; }
+
+function boot() {
+  app.replaceChildren(node('div', { id: 'startup' }, 'WhatsApp'));
+  later('boot_ms', () => {
+    if (linked()) { renderApp(); routeSend(); } else { renderQr(); }
+  });
+}
+
+function renderQr() {
+  const landing = node('div', { 'data-ref': '2@standin' });
+  landing.appendChild(node('canvas', { role: 'img', 'aria-label': 'Scan me!', width: '264', height: '264' }));
+  app.replaceChildren(landing);
+  if (L.qr_scan_ms !== null) {
+    later('qr_scan_ms', () => { localStorage.setItem('standin-linked', '1'); renderApp(); routeSend(); });
+  }
+}
+
+function renderApp() {
+  const side = node('div', { id: 'side' });
+  const header = node('header', { 'data-testid': 'chatlist-header' });
+  const search = node('input', { type: 'text', 'data-tab': '3', role: 'textbox', 'aria-label': 'Buscar un chat', placeholder: 'Buscar un chat' });
+  search.addEventListener('input', () => {
+    const token = ++searchToken;
+    const query = search.value.trim().toLowerCase();
+    later('search_ms', () => { if (token === searchToken) renderList(filterContacts(query)); });
+  });
+  search.addEventListener('keydown', (event) => {
+    if (event.key !== 'Enter') return;
+    event.preventDefault();
+    const first = document.querySelector('#pane-side [data-testid="cell-frame-container"]');
+    if (first) openChat(JSON.parse(first.dataset.contact));
+  });
+  header.appendChild(search);
+  side.appendChild(header);
+  side.appendChild(node('div', { id: 'pane-side', 'data-testid': 'chat-list', role: 'grid', 'aria-label': 'Lista de chats' }));
+  app.replaceChildren(side);
+  main = null;
+  renderList(CONFIG.contacts.slice(0, 20));
+}
+
+function filterContacts(query) {
+  if (!query) return CONFIG.contacts.slice(0, 20);
+  const numeric = /^[+\\d\\s()-]+$/.test(query) ? digits(query) : '';
+  return CONFIG.contacts.filter((c) => c.name.toLowerCase().includes(query) || (numeric && digits(c.phone).includes(numeric)));
+}
+
+function renderList(contacts) {
+  const pane = document.getElementById('pane-side');
+  pane.replaceChildren();
+  if (!contacts.length) pane.appendChild(node('span', {}, 'No se encontró ningún chat'));
+  for (const contact of contacts) {
+    const row = node('div', { role: 'row' });
+    const cell = node('div', { 'data-testid': 'cell-frame-container', class: 'cell' });
+    cell.dataset.contact = JSON.stringify(contact);
+    cell.appendChild(node('span', { 'data-testid': 'cell-frame-title', title: contact.name }, contact.name));
+    if (previews[contact.phone]) cell.appendChild(node('span', { title: previews[contact.phone] }, previews[contact.phone]));
+    if (unread[contact.phone]) cell.appendChild(node('span', { 'aria-label': unread[contact.phone] + ' mensajes no leídos' }, String(unread[contact.phone])));
+    cell.addEventListener('click', () => openChat(contact));
+    row.appendChild(cell);
+    pane.appendChild(row);
+  }
+}
+
+// Ruta de envío por número: abre la conversación (o el diálogo de número inválido) y precarga el texto
+function routeSend() {
+  if (!location.pathname.startsWith('/send')) return;
+  const phone = digits(params.get('phone'));
+  if (!phone || CONFIG.invalid_phones.some((p) => digits(p) === phone)) {
+    later('open_ms', () => {
+      const dialog = node('div', { role: 'dialog', 'data-animate-modal-popup': 'true' }, 'El número de teléfono compartido a través de la dirección URL no es válido.');
+      document.body.appendChild(dialog);
+    });
+    return;
+  }
+  const contact = CONFIG.contacts.find((c) => digits(c.phone) === phone) || { name: '+' + phone, phone: '+' + phone };
+  openChat(contact, params.get('text'));
+}
+
+function openChat(contact, prefill) {
+  later('open_ms', () => {
+    if (!main) {
+      main = node('div', { id: 'main' });
+      app.appendChild(main);
+    }
+    currentChat = contact.phone;
+    if (unread[contact.phone]) {
+      delete unread[contact.phone];
+      refreshList();
+    }
+    const conversation = node('div', { id: 'conversation' });
+    for (const bubble of chats[currentChat] || []) conversation.appendChild(bubble);
+    const footer = node('footer');
+    editor = node('div', { contenteditable: 'true', role: 'textbox', 'data-tab': '10', 'aria-label': 'Escribe un mensaje' });
+    sendButton = node('button', { 'data-testid': 'compose-btn-send', 'aria-label': 'Enviar' }, '➤');
+    bindEditor();
+    footer.appendChild(editor);
+    footer.appendChild(sendButton);
+    main.replaceChildren(node('header', {}, contact.name), conversation, footer);
+    setText(prefill || '');
+  });
+}
+
+// Editor tipo Lexical: un párrafo <p> por línea, el pegado se procesa en una sola actualización
+function paragraph(line) {
+  const p = node('p', { class: 'selectable-text copyable-text', dir: 'auto' });
+  if (line) p.appendChild(node('span', {}, line)); else p.appendChild(node('br'));
+  return p;
+}
+function caretInto(el) {
+  const range = document.createRange();
+  range.selectNodeContents(el);
+  range.collapse(false);
+  const selection = window.getSelection();
+  selection.removeAllRanges();
+  selection.addRange(range);
+}
+function getText() {
+  return Array.from(editor.childNodes).map((n) => n.textContent || '').join('\\n');
+}
+function setText(text) {
+  editor.replaceChildren(...text.split('\\n').map(paragraph));
+  if (document.activeElement === editor) caretInto(editor.lastChild);
+  updateSendButton();
+}
+function updateSendButton() {
+  sendButton.className = getText().trim() ? 'ready' : '';
+}
+function bindEditor() {
+  editor.addEventListener('focus', () => {
+    if (!editor.firstChild) editor.appendChild(paragraph(''));
+    caretInto(editor.lastChild);
+  });
+  editor.addEventListener('input', () => {
+    if (!editor.firstChild) setText('');
+    updateSendButton();
+  });
+  editor.addEventListener('paste', (event) => {
+    event.preventDefault();
+    const pasted = event.clipboardData.getData('text/plain');
+    const target = editor;
+    later('input_ms', () => {
+      if (target !== editor) return;
+      const current = getText();
+      setText(current.trim() ? current + pasted : pasted);
+      caretInto(editor.lastChild);
+    });
+  });
+  editor.addEventListener('keydown', (event) => {
+    if (event.key !== 'Enter') return;
+    event.preventDefault();
+    if (event.shiftKey) {
+      const p = paragraph('');
+      editor.appendChild(p);
+      caretInto(p);
+    } else {
+      send();
+    }
+  });
+  sendButton.addEventListener('click', send);
+}
+
+function send() {
+  const text = getText().replace(/^\\n+|\\n+$/g, '');
+  if (!text.trim()) return;
+  const chat = currentChat;
+  setText('');
+  later('send_ms', () => {
+    const list = chats[chat] = chats[chat] || [];
+    const bubble = node('div', { class: 'message-out', 'data-id': 'true_' + digits(chat) + '_' + (list.length + 1) });
+    bubble.appendChild(node('span', { class: 'selectable-text copyable-text' }, text));
+    list.push(bubble);
+    if (chat === currentChat) document.getElementById('conversation').appendChild(bubble);
+    navigator.sendBeacon('/__sent', JSON.stringify({ chat: chat, text: text, ts: Date.now() }));
+  });
+}
+
+function refreshList() {
+  const search = document.querySelector('#side input');
+  if (search && !search.value.trim()) renderList(filterContacts(''));
+}
+
+// Mensaje entrante: burbuja en la conversación abierta o vista previa y no leídos en la lista;
+// el chat sube al principio de la lista. Retorna el instante de la inserción (ms)
+window.standinReceive = (phone, text) => {
+  const contact = CONFIG.contacts.find((c) => digits(c.phone) === digits(phone)) || { name: phone, phone: phone };
+  const list = chats[contact.phone] = chats[contact.phone] || [];
+  const bubble = node('div', { class: 'message-in', 'data-id': 'false_' + digits(contact.phone) + '_' + (list.length + 1) });
+  bubble.appendChild(node('span', { class: 'selectable-text copyable-text' }, text));
+  list.push(bubble);
+  previews[contact.phone] = text;
+  if (contact.phone === currentChat) document.getElementById('conversation').appendChild(bubble);
+  else unread[contact.phone] = (unread[contact.phone] || 0) + 1;
+  CONFIG.contacts = [contact].concat(CONFIG.contacts.filter((c) => c !== contact));
+  refreshList();
+  return Date.now();
+};
+
+boot();
+</script></body></html>
+"""
+
+
+class StandInServer:
+    """
+    Servidor HTTP local del sustituto de WhatsApp Web (en un hilo en segundo plano).
+
+    Args:
+        latencies: Latencias de la interfaz simulada
+        contacts: Contactos de la lista de chats (por defecto 50 sintéticos)
+        linked: Perfil ya vinculado (sin QR); con False el QR se muestra hasta `qr_scan_ms`
+        invalid_phones: Números que la ruta de envío por número rechaza con el diálogo de error
+        host: Interfaz de escucha (solo local por defecto)
+        port: Puerto (0 = uno libre)
+        seed: Semilla de la variación de latencias
+    """
+
+    def __init__(
+        self,
+        latencies: Optional[UiLatencies] = None,
+        contacts: Optional[Sequence[Dict[str, str]]] = None,
+        linked: bool = True,
+        invalid_phones: Sequence[str] = (),
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: int = 1
+    ):
+        self.latencies = latencies or UiLatencies()
+        self.contacts = list(contacts) if contacts is not None else make_contacts(50)
+        self.linked = linked
+        self.invalid_phones = list(invalid_phones)
+        self.seed = seed
+        self.page_loads = 0
+        self.sent: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        """Origen del sustituto (valor de WHATSAPP_URL)."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def render_page(self) -> bytes:
+        with self._lock:
+            self.page_loads += 1
+            seed = self.seed + self.page_loads
+        config = {
+            "latencies": asdict(self.latencies),
+            "contacts": self.contacts,
+            "linked": self.linked,
+            "invalid_phones": self.invalid_phones,
+            "seed": seed,
+        }
+        # `</` escapado para que un texto de configuración no pueda cerrar el <script>
+        payload = json.dumps(config, ensure_ascii=False).replace("</", "<\\/")
+        return STANDIN_HTML.replace("__CONFIG__", payload).encode("utf-8")
+
+    def record_sent(self, body: bytes) -> None:
+        try:
+            message = json.loads(body.decode("utf-8"))
+        except ValueError:
+            return
+        message["received_at"] = time.time()
+        with self._lock:
+            self.sent.append(message)
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.startswith("/favicon"):
+                    self.send_error(404)
+                    return
+                body = server.render_page()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Cache-Control", "no-store")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length)
+                if self.path == "/__sent":
+                    server.record_sent(body)
+                self.send_response(204)
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "StandInServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="whatsapp-standin", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sustituto local de WhatsApp Web")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="instant")
+    parser.add_argument("--unlinked", action="store_true", help="Mostrar el QR hasta el escaneo simulado")
+    for name in ("boot_ms", "qr_scan_ms", "search_ms", "open_ms", "input_ms", "send_ms", "jitter"):
+        parser.add_argument(f"--{name.replace('_', '-')}", type=float, dest=name)
+    args = parser.parse_args()
+
+    latencies = UiLatencies(**asdict(SCENARIOS[args.scenario]))
+    for name in asdict(latencies):
+        if getattr(args, name) is not None:
+            setattr(latencies, name, getattr(args, name))
+
+    with StandInServer(latencies, linked=not args.unlinked, port=args.port) as server:
+        print(f"🧪 Sustituto de WhatsApp Web en {server.url} (Ctrl+C para detener)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
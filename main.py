@@ -19,8 +19,6 @@ if current_dir not in sys.path:
 if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
-from whatsapp_automation import WhatsAppBotFacade, create_technical_report_message
-
 
 def load_config():
     """Carga la configuración desde config.json si existe."""
@@ -44,10 +42,16 @@ def main():
     parser.add_argument("--message", "-m", type=str, default=None, help="Mensaje personalizado a enviar")
     parser.add_argument("--session-dir", "-s", type=str, default=None, help="Directorio de persistencia de sesión")
     parser.add_argument("--headless", action="store_true", help="Ejecutar sin interfaz gráfica")
+    parser.add_argument("--batch", "-b", type=str, default=None, help="Archivo CSV/JSONL para envío masivo en una sola sesión")
+    parser.add_argument("--concurrency", type=int, default=1, help="Perfiles en paralelo para --batch")
+    parser.add_argument("--resume", action="store_true", help="Reanudar un --batch omitiendo los envíos ya realizados")
     args = parser.parse_args()
 
     config = load_config()
 
+    if args.batch:
+        return run_batch_mode(args, config)
+
     print("=" * 65)
     print("       🤖 BOT DE WHATSAPP RPA - AUTOMATIZACIÓN PLAYWRIGHT")
     print("=" * 65)
@@ -94,7 +98,9 @@ def main():
     print(f"   • Tipo de mensaje: {'Personalizado' if message else 'Reporte Técnico (Patrones de Diseño)'}")
     print("-" * 65)
 
-    # 3. Ejecución del Bot mediante Facade
+    # 3. Ejecución del Bot mediante Facade (importación diferida: --help no carga Playwright)
+    from whatsapp_automation import WhatsAppBotFacade
+
     try:
         with WhatsAppBotFacade(
             session_dir=session_dir,
@@ -102,9 +108,9 @@ def main():
             wait_time=wait_time
         ) as bot:
             if message:
-                bot.send_message(phone=target, message=message)
+                sent = bot.send_message(phone=target, message=message)
             else:
-                bot.send_technical_report(
+                sent = bot.send_technical_report(
                     phone=target,
                     recipient=recipient,
                     developer=developer,
@@ -112,6 +118,10 @@ def main():
                     custom_note=custom_note
                 )
 
+        if not sent:
+            print("\n❌ No se confirmó el envío: el mensaje no apareció en la conversación.")
+            return 1
+
         print("\n" + "=" * 65)
         print("✨ ¡EJECUCIÓN COMPLETADA EXITOSAMENTE! ✨")
         print("Las cookies y la sesión han quedado almacenadas para futuras ejecuciones.")
@@ -123,5 +133,35 @@ def main():
         return 1
 
 
+def run_batch_mode(args, config):
+    """Envío masivo desde `--batch` (plantilla opcional `batch_template` en config.json)."""
+    from whatsapp_automation import MailMerge, MessageBuilder
+    from whatsapp_automation.cli import batch_profiles
+    from whatsapp_automation.core.batch import run_batch
+
+    session_dir = args.session_dir or config.get("session_dir", os.path.join(current_dir, "session_data"))
+    template = config.get("batch_template")
+    try:
+        summary = run_batch(
+            args.batch,
+            batch_profiles(session_dir, args.concurrency),
+            merge=MailMerge(
+                args.batch,
+                builder=MessageBuilder().set_template(template) if template else None,
+                default_country_code=config.get("default_country_code")
+            ),
+            resume=args.resume,
+            headless=args.headless or config.get("headless", False),
+            wait_time=config.get("wait_time", 2)
+        )
+    except Exception as e:
+        print(f"\n❌ Ocurrió un error en el envío masivo: {e}")
+        return 1
+
+    print(f"\n🏁 {summary['sent']} enviados, {summary['failed']} fallidos, {summary['skipped']} omitidos. "
+          f"Resultados en {summary['results_path']}")
+    return 0 if summary["failed"] == 0 else 1
+
+
 if __name__ == "__main__":
     sys.exit(main())
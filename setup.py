@@ -40,6 +40,8 @@ setup(
     entry_points={
         "console_scripts": [
             "whatsapp-send=whatsapp_automation.cli:main",
+            "whatsapp-daemon=whatsapp_automation.daemon:main",
+            "whatsapp-compact=whatsapp_automation.maintenance:main",
         ],
     },
     include_package_data=True,
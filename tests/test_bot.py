@@ -4,8 +4,15 @@ Valida el funcionamiento de los Patrones de Diseño (POM, Facade, Singleton, Bui
 """
 
 import unittest
+import asyncio
 import os
 import sys
+import types
+import tempfile
+import json
+import threading
+import subprocess
+import http.server
 
 # Agregar path
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -22,8 +29,23 @@ from whatsapp_automation import (
     MessageBuilder,
     TechnicalReportStrategy,
     CustomMessageStrategy,
-    create_technical_report_message
+    MessageTemplate,
+    create_technical_report_message,
+    SendJob,
+    SendResult,
+    summarize_results,
+    SelectorCache,
+    AsyncWhatsAppBotFacade,
+    SessionPool,
+    OutboundQueue,
+    PacingScheduler,
+    Rate,
+    NetworkFilter,
+    MailMerge,
+    ContactIndex
 )
+from whatsapp_automation.services.contact_index import pick_result, title_matches
+from whatsapp_automation.core.browser_daemon import daemon_state_path, find_daemon
 
 
 class TestMessageBuilderAndStrategy(unittest.TestCase):
@@ -52,6 +74,159 @@ class TestMessageBuilderAndStrategy(unittest.TestCase):
         msg = builder.build()
         self.assertEqual(msg, "Mensaje simple")
 
+    def test_compiled_template_render(self):
+        template = MessageTemplate("Hola {name}, total {amount:.2f} {{literal}} {name}", defaults={"amount": 0})
+        self.assertEqual(template.fields, ("name", "amount"))
+        self.assertEqual(template.render(name="Ana", amount=3), "Hola Ana, total 3.00 {literal} Ana")
+        self.assertEqual(template.render({"name": "Ana"}, name="Luis"), "Hola Luis, total 0.00 {literal} Luis")
+        with self.assertRaises(KeyError):
+            template.render()
+        with self.assertRaises(ValueError):
+            MessageTemplate("Hola {user.name}")
+
+    def test_render_many_streams_rows(self):
+        consumed = []
+
+        def rows():
+            for name in ("Ana", "Luis"):
+                consumed.append(name)
+                yield {"name": name}
+
+        builder = MessageBuilder().set_template("Hola {name} de {sender}").add_custom_param("sender", "Soporte")
+        messages = builder.render_many(rows())
+        self.assertEqual(consumed, [])
+        self.assertEqual(next(messages), "Hola Ana de Soporte")
+        self.assertEqual(consumed, ["Ana"])
+        self.assertEqual(list(messages), ["Hola Luis de Soporte"])
+
+    def test_technical_report_is_precompiled(self):
+        strategy = TechnicalReportStrategy()
+        self.assertIs(strategy.template, TechnicalReportStrategy().template)
+        reports = list(strategy.render_many([{"recipient": "Ana"}, {"recipient": "Luis", "custom_note": "{x}"}],
+                                            timestamp="01/01/2026 10:00:00"))
+        self.assertTrue(reports[0].startswith("Hola Ana,"))
+        self.assertIn("Ejecución automatizada: 01/01/2026 10:00:00", reports[0])
+        self.assertNotIn("Nota adicional", reports[0])
+        self.assertTrue(reports[1].endswith("📝 *Nota adicional:* {x}"))
+        custom = TechnicalReportStrategy([{"name": "Patrón {A}", "type": "T", "desc": "D"}])
+        self.assertIn("*1. Patrón {A}* [T]", custom.build())
+
+
+class TestMailMerge(unittest.TestCase):
+    """Combinación de correspondencia en streaming desde CSV/JSONL hacia el Facade."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, name, content):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return path
+
+    def test_csv_rows_are_validated_and_rendered(self):
+        path = self._write("clientes.csv", (
+            "phone,nombre,pedido\n"
+            "0412-123.45.67,Ana,A-1\n"
+            ",Sin número,A-2\n"
+            "Luis Pérez,Luis,A-3\n"
+            "+584241234567,Eva\n"
+        ))
+        rejected = []
+        builder = MessageBuilder().set_template("Hola {nombre}, pedido {pedido}")
+        merge = MailMerge(path, builder=builder, default_country_code="58", on_reject=rejected.append)
+        jobs = list(merge.jobs())
+        self.assertEqual([(j.phone, j.message, j.job_id) for j in jobs],
+                         [("+584121234567", "Hola Ana, pedido A-1", "clientes.csv:2")])
+        self.assertEqual([r.line for r in rejected], [3, 4, 5])
+        self.assertIn("pedido", rejected[2].reason)
+        self.assertEqual(merge.stats(), {"read": 4, "accepted": 1, "rejected": 3})
+
+    def test_jsonl_rows_stream_lazily_with_read_ahead(self):
+        path = self._write("envios.jsonl", "\n".join([
+            json.dumps({"phone": 584121234567, "message": "uno", "job_id": "j1"}),
+            "",
+            "{no es json",
+            json.dumps({"phone": "+584241234567", "message": "dos"}),
+        ]))
+        merge = MailMerge(path)
+        jobs = merge.jobs()
+        self.assertEqual(merge.read, 0)
+        self.assertEqual(next(jobs).job_id, "j1")
+        self.assertEqual(merge.read, 1)
+        jobs.close()
+
+        ahead = list(MailMerge(path).jobs(read_ahead_size=2))
+        self.assertEqual([j.message for j in ahead], ["uno", "dos"])
+        self.assertEqual(ahead[1].job_id, "envios.jsonl:4")
+
+        # Un generador con lectura anticipada abandonado a medias detiene su hilo
+        partial = MailMerge(({"phone": f"+58412{i:07d}", "message": "x"} for i in range(1000))).jobs(read_ahead_size=4)
+        next(partial)
+        partial.close()
+
+    def test_facade_sends_merge(self):
+        path = self._write("lote.csv", "phone,nombre\n+584121234567,Ana\n123,Nadie\n+584241234567,Luis\n")
+        facade = WhatsAppBotFacade(headless=True, session_dir="temp_session", open_strategy="search")
+        facade.page = _FakePage()
+        facade.login_page = _FakeLoginPage()
+        facade.chat_page = _FakeChatPage()
+        builder = MessageBuilder().set_template("Hola {nombre}")
+        results = list(facade.iter_merge(path, builder=builder, read_ahead=2))
+        self.assertTrue(all(r.success for r in results))
+        self.assertEqual(facade.chat_page.sent, ["Hola Ana", "Hola Luis"])
+
+
+class TestContactIndex(unittest.TestCase):
+    """Índice de la lista de chats: búsqueda exacta, aproximada y elección verificada de resultados."""
+
+    def setUp(self):
+        self.index = ContactIndex(default_country_code="58")
+        self.index.update([
+            {"title": "José Pérez", "offset": 0},
+            {"title": "+58 412-123 4567", "offset": 72},
+            {"title": "Mariana Gómez", "offset": 144},
+            {"title": "Equipo Ventas", "offset": 216},
+        ])
+
+    def test_exact_lookup_by_phone_and_name(self):
+        self.assertEqual(self.index.lookup("04121234567").title, "+58 412-123 4567")
+        self.assertEqual(self.index.lookup("jose perez").offset, 0)
+        self.assertIsNone(self.index.lookup("+584149999999"))
+        self.assertIn("EQUIPO  ventas", self.index)
+
+    def test_fuzzy_lookup_is_unambiguous(self):
+        self.assertEqual(self.index.lookup("Mariana Gomes").title, "Mariana Gómez")
+        self.assertIsNone(self.index.lookup("Mariana Gomes", fuzzy=False))
+        self.assertEqual(self.index.lookup("Mariana Gmez").title, "Mariana Gómez")
+        self.index.add("Mariana Gámez")
+        # Dos nombres igual de cercanos: no se elige ninguno
+        self.assertIsNone(self.index.lookup("Mariana Gmez"))
+        self.index.remove("Mariana Gámez")
+        self.assertEqual(len(self.index), 4)
+
+    def test_pick_result_never_falls_back_to_first(self):
+        self.assertEqual(pick_result(["Mariana", "Ana"], "ana"), 1)
+        self.assertIsNone(pick_result(["Ana María", "Anabel"], "Ana"))
+        self.assertIsNone(pick_result(["Ana", "Ana"], "Ana"))
+        self.assertEqual(pick_result(["Equipo", "+58 412-123 4567"], "+584121234567"), 1)
+        # Número de un contacto guardado: solo se acepta si la búsqueda dejó un único resultado
+        self.assertEqual(pick_result(["José Pérez"], "+584121234567"), 0)
+        self.assertIsNone(pick_result(["José Pérez", "Mariana"], "+584121234567"))
+        # Nombre parcial: se acepta el único resultado que lo contiene como palabras completas
+        self.assertEqual(pick_result(["Juan Pérez"], "Juan"), 0)
+        self.assertEqual(pick_result(["María José Pérez"], "jose perez"), 0)
+        self.assertIsNone(pick_result(["Mariana"], "Ana"))
+        self.assertIsNone(pick_result(["Juan Pérez", "Juan Gómez"], "Juan"))
+        self.assertTrue(title_matches("José Pérez en línea", "jose perez"))
+        self.assertFalse(title_matches("Mariana", "jose perez"))
+        # Misma regla de palabras completas que pick_result: "Ana" no nombra a "Mariana"
+        self.assertFalse(title_matches("Mariana\nen línea", "Ana"))
+        self.assertTrue(title_matches("Ana (Trabajo)\nen línea", "ana"))
+
 
 class TestSessionManagerSingleton(unittest.TestCase):
     """Pruebas para el Patrón Singleton en SessionManager."""
@@ -76,6 +251,19 @@ class TestPageObjectSelectors(unittest.TestCase):
         self.assertTrue(len(ChatPage.MESSAGE_INPUT_SELECTORS) > 0)
         self.assertTrue(len(ChatPage.SEND_BUTTON_SELECTORS) > 0)
 
+    def test_whatsapp_url_is_configurable(self):
+        # El origen se lee de WHATSAPP_URL al importar (sustituto local de los benchmarks)
+        output = subprocess.run(
+            [sys.executable, "-c",
+             "from whatsapp_automation.pages.base_page import BasePage\n"
+             "from whatsapp_automation.aio import AsyncLoginPage\n"
+             "print(BasePage.WHATSAPP_URL, AsyncLoginPage.WHATSAPP_URL)"],
+            cwd=parent_dir, capture_output=True, text=True, check=True,
+            env={**os.environ, "WHATSAPP_URL": "http://127.0.0.1:8080/"}
+        ).stdout.strip()
+        self.assertEqual(output, "http://127.0.0.1:8080 http://127.0.0.1:8080")
+        self.assertEqual(LoginPage.WHATSAPP_URL, os.environ.get("WHATSAPP_URL", "https://web.whatsapp.com").rstrip("/"))
+
 
 class TestBotFacade(unittest.TestCase):
     """Pruebas para el Patrón Facade."""
@@ -85,6 +273,711 @@ class TestBotFacade(unittest.TestCase):
         self.assertIsNotNone(facade.session_manager)
         self.assertEqual(facade.headless, True)
 
+    def test_cli_exits_with_error_when_send_is_not_confirmed(self):
+        from unittest import mock
+        from whatsapp_automation import cli
+
+        bot = mock.MagicMock()
+        bot.__enter__.return_value.send_message.return_value = False
+        with mock.patch("whatsapp_automation.core.bot_facade.WhatsAppBotFacade", return_value=bot), \
+                mock.patch.object(sys, "argv", ["whatsapp-send", "+111", "Hola", "--no-daemon"]), \
+                mock.patch("sys.stderr"), mock.patch("sys.stdout"):
+            with self.assertRaises(SystemExit) as raised:
+                cli.main()
+        self.assertEqual(raised.exception.code, 1)
+
+
+class _FakePage:
+    """Doble mínimo de playwright Page."""
+
+    def __init__(self):
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed
+
+
+class _FakeDomPage(_FakePage):
+    """
+    Doble de Page que simula la evaluación de RESOLVE_SELECTORS_JS:
+    `visible` es el conjunto de selectores presentes y visibles en el DOM simulado.
+    """
+
+    def __init__(self, visible=()):
+        super().__init__()
+        self.visible = set(visible)
+        self.round_trips = 0
+
+    def _resolve(self, arg):
+        self.round_trips += 1
+        selectors, state = arg
+        for idx, selector in enumerate(selectors):
+            if (selector in self.visible) == (state == "visible"):
+                return {"index": idx}
+        return None
+
+    def evaluate(self, expression, arg=None):
+        return self._resolve(arg)
+
+    def wait_for_function(self, expression, arg=None, timeout=None, polling=None):
+        from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+        found = self._resolve(arg)
+        if not found:
+            raise PlaywrightTimeoutError("timeout")
+        return types.SimpleNamespace(json_value=lambda: found)
+
+    def locator(self, selector):
+        return types.SimpleNamespace(first=("locator", selector))
+
+
+class _FakeLoginPage:
+    """Doble de LoginPage que cuenta las navegaciones y autenticaciones."""
+
+    def __init__(self):
+        self.navigations = 0
+        self.logged_out = False
+
+    def navigate_to_whatsapp(self):
+        self.navigations += 1
+        self.logged_out = False
+
+    def is_session_ready(self):
+        return self.navigations > 0 and not self.logged_out
+
+    def wait_for_authentication(self, timeout_seconds=300):
+        return True
+
+
+class _FakeChatPage:
+    """Doble de ChatPage que registra los mensajes enviados."""
+
+    def __init__(self, unknown=()):
+        self.unknown = set(unknown)
+        self.sent = []
+        self.last_send_latency = 0.01
+
+    def search_and_select_contact(self, query):
+        return query not in self.unknown
+
+    def type_and_send_message(self, message):
+        self.sent.append(message)
+        return True
+
+
+class TestBatchSend(unittest.TestCase):
+    """Pruebas del modo lote de WhatsAppBotFacade."""
+
+    def _facade(self, unknown=()):
+        facade = WhatsAppBotFacade(headless=True, session_dir="temp_session")
+        facade.page = _FakePage()
+        facade.login_page = _FakeLoginPage()
+        facade.chat_page = _FakeChatPage(unknown)
+        return facade
+
+    def test_send_many_authenticates_once(self):
+        facade = self._facade()
+        results = facade.send_many([
+            ("+111", "uno"),
+            {"phone": "+222", "message": "dos"},
+            SendJob(phone="+333", message="tres", job_id="j3"),
+        ])
+        self.assertEqual(facade.login_page.navigations, 1)
+        self.assertEqual(facade.chat_page.sent, ["uno", "dos", "tres"])
+        self.assertTrue(all(r.success for r in results))
+        self.assertEqual(results[2].job.job_id, "j3")
+
+    def test_failed_job_does_not_stop_batch(self):
+        facade = self._facade(unknown={"+222"})
+        results = list(facade.iter_send([("+111", "a"), ("+222", "b"), ("+333", "c")]))
+        self.assertEqual([r.success for r in results], [True, False, True])
+        self.assertIn("+222", results[1].error)
+        summary = summarize_results(results)
+        self.assertEqual((summary["sent"], summary["failed"]), (2, 1))
+
+    def test_authenticate_reuses_ready_session(self):
+        facade = self._facade()
+        self.assertTrue(facade.authenticate())
+        self.assertTrue(facade.authenticate())
+        self.assertEqual(facade.login_page.navigations, 1)
+        self.assertTrue(facade.authenticated)
+
+    def test_authenticate_reloads_when_logged_out(self):
+        facade = self._facade()
+        facade.authenticate()
+        facade.login_page.logged_out = True
+        facade.authenticate()
+        self.assertEqual(facade.login_page.navigations, 2)
+
+
+class TestOutboundQueue(unittest.TestCase):
+    """Cola de salida persistente: idempotencia, estados y reanudación tras una caída."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "sesion.queue.sqlite3")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _facade(self, unknown=()):
+        facade = WhatsAppBotFacade(headless=True, session_dir="temp_session", adaptive_selectors=False)
+        facade.page = _FakePage()
+        facade.login_page = _FakeLoginPage()
+        facade.chat_page = _FakeChatPage(unknown)
+        return facade
+
+    def test_enqueue_is_idempotent(self):
+        with OutboundQueue(self.path) as queue:
+            self.assertEqual(queue.enqueue([("+111", "a"), ("+111", "a"), ("+111", "b")]), 2)
+            self.assertEqual(queue.enqueue([("+111", "a")]), 0)
+            self.assertEqual(queue.stats()["pending"], 2)
+
+    def test_drain_records_states_and_resumes_after_crash(self):
+        jobs = [("+111", "a"), ("+222", "b"), ("+333", "c"), ("+444", "d")]
+        queue = OutboundQueue(self.path, batch_size=2)
+        queue.enqueue(jobs)
+        # Caída simulada: un resultado registrado y el siguiente trabajo reclamado sin resultado
+        claimed = queue.iter_claimed()
+        first = next(claimed)
+        queue.complete(SendResult(job=first, success=True, started_at=0.0, elapsed=0.1))
+        next(claimed)
+        self.assertEqual(queue.stats()["in_flight"], 1)
+        self.assertEqual(queue.stats()["pending"], 2)
+        # Sin close() ni flush(): lo confirmado sobrevive y solo el trabajo en curso vuelve a la cola
+        queue._conn.close()
+
+        with OutboundQueue(self.path, batch_size=2) as queue:
+            self.assertEqual(queue.stats()["in_flight"], 0)
+            self.assertEqual(queue.stats()["sent"], 1)
+            facade = self._facade(unknown={"+333"})
+            stats = facade.drain_queue(queue)
+            self.assertEqual(facade.chat_page.sent, ["b", "d"])
+            self.assertEqual((stats["sent"], stats["failed"], stats["pending"]), (3, 1, 0))
+            self.assertEqual(queue.status_of("+333", "c"), "failed")
+
+        # Reejecutar la misma campaña no reenvía lo ya entregado
+        with OutboundQueue(self.path) as queue:
+            queue.enqueue(jobs)
+            facade = self._facade()
+            facade.drain_queue(queue)
+            self.assertEqual(facade.chat_page.sent, [])
+            self.assertEqual(queue.retry_failed(), 1)
+            facade.drain_queue(queue)
+            self.assertEqual(facade.chat_page.sent, ["c"])
+
+
+    def test_recovery_is_reported_through_telemetry(self):
+        from whatsapp_automation import telemetry
+        records = []
+        telemetry.reset()
+        telemetry.add_hook(records.append)
+        telemetry.configure(enabled=True, console_level="silent")
+        try:
+            queue = OutboundQueue(self.path)
+            queue.enqueue([("+111", "a"), ("+222", "b")])
+            queue.claim()
+            queue.close()
+            OutboundQueue(self.path).close()
+            events = [r for r in records if r.get("name") == "queue.recovered"]
+            self.assertEqual(events[0]["fields"], {"recovered": 1, "outcome": "pending"})
+            self.assertIn("queue_jobs_recovered", telemetry.prometheus_text())
+        finally:
+            telemetry.remove_hook(records.append)
+            telemetry.configure(enabled=False, console_level="info")
+            telemetry.reset()
+
+
+class _FakeClock:
+    """Reloj simulado: `sleep` avanza el tiempo sin esperar."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestPacingScheduler(unittest.TestCase):
+    """Cubetas de fichas global, por destinatario y por perfil."""
+
+    def test_rate_parsing(self):
+        self.assertEqual(Rate.parse("20/min"), Rate(20, 60))
+        self.assertEqual(Rate.parse("1/5s"), Rate(1, 5))
+        self.assertEqual(Rate.parse("300/h+10").capacity, 10)
+        with self.assertRaises(ValueError):
+            Rate.parse("rápido")
+        for spec in ("0/min", "5/0s", "20/min+0"):
+            with self.assertRaises(ValueError):
+                Rate.parse(spec)
+
+    def test_burst_then_sustained_rate(self):
+        clock = _FakeClock()
+        scheduler = PacingScheduler(global_rate="60/min+3", clock=clock, sleep=clock.sleep)
+        waits = [scheduler.acquire(f"+58412000000{i}") for i in range(5)]
+        self.assertEqual(waits[:3], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(waits[3], 1.0)
+        self.assertAlmostEqual(waits[4], 1.0)
+        self.assertAlmostEqual(scheduler.stats()["total_wait"], 2.0)
+
+    def test_per_recipient_and_profile_buckets(self):
+        clock = _FakeClock()
+        scheduler = PacingScheduler(per_recipient="1/10s", per_profile="2/min", clock=clock, sleep=clock.sleep)
+        self.assertEqual(scheduler.acquire("+584121234567", "perfil_a"), 0.0)
+        # Mismo número con otro formato: misma cubeta de destinatario
+        self.assertAlmostEqual(scheduler.acquire("0058 412 1234567", "perfil_b"), 10.0)
+        self.assertEqual(scheduler.acquire("+584241234567", "perfil_b"), 0.0)
+        # El perfil B agotó su ráfaga de 2: espera la siguiente ficha (30 s)
+        self.assertAlmostEqual(scheduler.acquire("+584161234567", "perfil_b"), 30.0)
+
+    def test_facade_reports_paced_seconds(self):
+        clock = _FakeClock()
+        facade = WhatsAppBotFacade(
+            headless=True,
+            session_dir="temp_session",
+            adaptive_selectors=False,
+            scheduler=PacingScheduler(global_rate="1/2s", clock=clock, sleep=clock.sleep)
+        )
+        facade.page = _FakePage()
+        facade.login_page = _FakeLoginPage()
+        facade.chat_page = _FakeChatPage()
+        results = facade.send_many([("+111", "a"), ("+222", "b")])
+        self.assertEqual([r.paced_seconds for r in results], [0.0, 2.0])
+        self.assertAlmostEqual(summarize_results(results)["paced_seconds"], 2.0)
+
+
+class TestSelectorResolution(unittest.TestCase):
+    """Pruebas del motor de resolución de selectores de BasePage."""
+
+    def test_first_listed_visible_selector_wins(self):
+        selectors = ChatPage.MESSAGE_INPUT_SELECTORS
+        page = _FakeDomPage(visible={selectors[5], selectors[2]})
+        chat = ChatPage(page)
+        match = chat.resolve_selector(selectors, timeout_ms=15000)
+        self.assertEqual(match.index, 2)
+        self.assertEqual(chat.find_first_visible(selectors), ("locator", selectors[2]))
+        self.assertEqual(page.round_trips, 2)
+
+    def test_wait_for_any_hidden_and_timeout(self):
+        page = _FakeDomPage(visible={"#a"})
+        base = BasePage(page)
+        self.assertEqual(base.wait_for_any(["#a", "#b"], state="hidden"), "#b")
+        self.assertIsNone(base.wait_for_any(["#c", "#d"], timeout_ms=10))
+        self.assertIsNone(base.find_first_visible([]))
+
+    def test_login_probes_use_single_evaluation(self):
+        page = _FakeDomPage(visible={LoginPage.LOGGED_IN_SELECTORS[-1]})
+        login = LoginPage(page)
+        self.assertTrue(login.is_logged_in())
+        self.assertFalse(login.is_qr_present())
+        self.assertEqual(page.round_trips, 2)
+
+
+class TestSelectorCache(unittest.TestCase):
+    """Pruebas del orden adaptativo de selectores."""
+
+    def test_winner_moves_first_and_order_recovers(self):
+        cache = SelectorCache(decay=0.5)
+        selectors = ["#a", "#b", "#c"]
+        self.assertEqual(cache.order("k", selectors), selectors)
+        cache.record("k", selectors, "#c", latency_ms=3.0)
+        self.assertEqual(cache.order("k", selectors), ["#c", "#a", "#b"])
+        # El DOM cambia: "#b" gana ahora y la decadencia permite que supere a "#c"
+        cache.record("k", selectors, "#b", latency_ms=1.0)
+        cache.record("k", selectors, "#b", latency_ms=1.0)
+        self.assertEqual(cache.order("k", selectors)[0], "#b")
+        self.assertEqual(cache.stats("k")["#b"]["hits"], 2)
+
+    def test_persistence_next_to_session_dir(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = SelectorCache.default_path(os.path.join(tmp, "session_data"))
+            self.assertTrue(path.endswith("session_data.selectors.json"))
+            cache = SelectorCache(path)
+            cache.record("k", ["#a", "#b"], "#b", latency_ms=2.0)
+            cache.save()
+            self.assertEqual(SelectorCache(path).order("k", ["#a", "#b"]), ["#b", "#a"])
+
+    def test_resolution_tries_cached_winner_first(self):
+        selectors = ["#old", "#new"]
+        cache = SelectorCache()
+        cache.record("k", selectors, "#new", latency_ms=1.0)
+        page = _FakeDomPage(visible={"#old", "#new"})
+        match = BasePage(page, selector_cache=cache).resolve_selector(selectors, key="k")
+        self.assertEqual(match, (1, "#new"))
+        self.assertEqual(cache.stats("k")["#new"]["hits"], 2)
+
+
+class _AsyncFakeLoginPage(_FakeLoginPage):
+    """Versión asíncrona de _FakeLoginPage."""
+
+    async def navigate_to_whatsapp(self):
+        super().navigate_to_whatsapp()
+
+    async def is_session_ready(self):
+        return super().is_session_ready()
+
+    async def wait_for_authentication(self, timeout_seconds=300):
+        return True
+
+
+class _AsyncFakeChatPage(_FakeChatPage):
+    """Versión asíncrona de _FakeChatPage."""
+
+    async def search_and_select_contact(self, query):
+        return super().search_and_select_contact(query)
+
+    async def type_and_send_message(self, message):
+        return super().type_and_send_message(message)
+
+
+class TestAsyncBotFacade(unittest.IsolatedAsyncioTestCase):
+    """Pruebas de paridad del Facade asíncrono."""
+
+    async def test_async_send_many_from_async_iterable(self):
+        facade = AsyncWhatsAppBotFacade(headless=True, session_dir="temp_session")
+        facade.page = _FakePage()
+        facade.login_page = _AsyncFakeLoginPage()
+        facade.chat_page = _AsyncFakeChatPage(unknown={"+222"})
+
+        async def jobs():
+            for phone in ("+111", "+222", "+333"):
+                yield (phone, f"hola {phone}")
+
+        results = await facade.send_many(jobs())
+        self.assertEqual([r.success for r in results], [True, False, True])
+        self.assertEqual(facade.login_page.navigations, 1)
+        self.assertTrue(await facade.authenticate())
+        self.assertEqual(facade.login_page.navigations, 1)
+
+
+class _FakeContext:
+    """Doble de BrowserContext persistente."""
+
+    def __init__(self, user_data_dir):
+        self.user_data_dir = user_data_dir
+        self.pages = [_FakePage()]
+        self.closed = False
+        self.routes = []
+        self.listeners = []
+
+    def route(self, pattern, handler):
+        self.routes.append((pattern, handler))
+
+    def on(self, event, handler):
+        self.listeners.append((event, handler))
+
+    def close(self):
+        self.closed = True
+        for page in self.pages:
+            page.closed = True
+
+
+class _FakePlaywright:
+    """Doble del driver de Playwright que registra los contextos lanzados."""
+
+    def __init__(self):
+        self.launched = []
+        self.stopped = False
+        self.chromium = types.SimpleNamespace(launch_persistent_context=self._launch)
+
+    def _launch(self, user_data_dir, **kwargs):
+        context = _FakeContext(user_data_dir)
+        self.launched.append(context)
+        return context
+
+    def stop(self):
+        self.stopped = True
+
+
+class TestSessionPool(unittest.TestCase):
+    """Pruebas del pool de sesiones por perfil."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.driver = _FakePlaywright()
+        self.pool = SessionPool(max_open=2, headless=True, playwright_factory=lambda: self.driver)
+
+    def tearDown(self):
+        self.pool.close_all()
+        self.tmp.cleanup()
+
+    def _dir(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_profiles_get_independent_contexts_and_facades(self):
+        with self.pool.lease(self._dir("a")) as page_a, self.pool.lease(self._dir("b")) as page_b:
+            self.assertIsNot(page_a, page_b)
+        self.assertEqual(len(self.driver.launched), 2)
+        facade_a = self.pool.facade(self._dir("a"))
+        self.assertIs(facade_a, self.pool.facade(self._dir("a")))
+        self.assertEqual(facade_a.session_dir, os.path.abspath(self._dir("a")))
+        self.assertFalse(facade_a.auto_close)
+
+    def test_lru_eviction_skips_sessions_in_use(self):
+        with self.pool.lease(self._dir("a")):
+            self.pool.get(self._dir("b")).initialize_session()
+            self.pool.get(self._dir("c")).initialize_session()
+            self.assertEqual(
+                sorted(os.path.basename(k) for k in self.pool.open_sessions()),
+                ["a", "c"]
+            )
+            with self.pool.lease(self._dir("c")):
+                with self.assertRaises(RuntimeError):
+                    self.pool.get(self._dir("d")).initialize_session()
+
+    def test_eviction_skips_a_session_whose_lock_is_held(self):
+        # Otro hilo tiene tomado el bloqueo de "b" (p. ej. a mitad de initialize_session) y espera al pool
+        a, b = self.pool.get(self._dir("a")), self.pool.get(self._dir("b"))
+        a.initialize_session()
+        b.initialize_session()
+        b.last_used = a.last_used - 1
+        holding, release = threading.Event(), threading.Event()
+
+        def hold_b():
+            with b.lock:
+                holding.set()
+                release.wait(5)
+
+        holder = threading.Thread(target=hold_b)
+        holder.start()
+        holding.wait(5)
+        opener = threading.Thread(target=self.pool.get(self._dir("c")).initialize_session)
+        opener.start()
+        opener.join(5)
+        release.set()
+        holder.join(5)
+        self.assertFalse(opener.is_alive(), "El desalojo esperó al bloqueo de una sesión ocupada.")
+        self.assertEqual(sorted(os.path.basename(k) for k in self.pool.open_sessions()), ["b", "c"])
+
+    def test_browser_options_are_rejected_for_pooled_facades(self):
+        with self.assertRaises(ValueError):
+            self.pool.facade(self._dir("a"), lean_network=True)
+        with self.assertRaises(ValueError):
+            self.pool.facade(self._dir("a"), use_daemon=False)
+        self.assertIsNotNone(self.pool.facade(self._dir("a"), ui_timeout=1.0))
+
+    def test_close_all_stops_shared_driver(self):
+        self.pool.get(self._dir("a")).initialize_session()
+        self.pool.close_all()
+        self.assertTrue(self.driver.stopped)
+        self.assertTrue(all(ctx.closed for ctx in self.driver.launched))
+
+    def test_network_filter_is_installed_on_every_context(self):
+        pool = SessionPool(headless=True, playwright_factory=lambda: self.driver, network_filter=NetworkFilter())
+        pool.get(self._dir("a")).initialize_session()
+        self.assertEqual(self.driver.launched[-1].routes[0][0], "**/*")
+        pool.close_all()
+
+
+class _FakeRoute:
+    """Doble de playwright Route que registra la acción aplicada."""
+
+    def __init__(self, url, resource_type):
+        self.request = types.SimpleNamespace(url=url, resource_type=resource_type)
+        self.action = None
+
+    def abort(self, error_code=None):
+        self.action = "abort"
+
+    def fulfill(self, **kwargs):
+        self.action = "fulfill"
+
+    def continue_(self):
+        self.action = "continue"
+
+
+class TestNetworkFilter(unittest.TestCase):
+    """Modo de red ligero: reglas, contadores y estimación de bytes evitados."""
+
+    def _route(self, network_filter, url, resource_type):
+        route = _FakeRoute(url, resource_type)
+        network_filter._handle(route, route.request)
+        return route.action
+
+    def _respond(self, network_filter, resource_type, length):
+        network_filter._on_response(types.SimpleNamespace(
+            request=types.SimpleNamespace(resource_type=resource_type),
+            headers={"content-length": str(length)}
+        ))
+
+    def test_rules_keep_application_assets_untouched(self):
+        lean = NetworkFilter()
+        self.assertEqual(self._route(lean, "https://pps.whatsapp.net/v/t61/avatar.jpg", "image"), "abort")
+        self.assertEqual(self._route(lean, "https://web.whatsapp.com/img/icon.png", "image"), "fulfill")
+        self.assertEqual(self._route(lean, "https://static.whatsapp.net/font.woff2", "font"), "abort")
+        self.assertEqual(self._route(lean, "https://web.whatsapp.com/app.js", "script"), "continue")
+        self.assertEqual(self._route(lean, "https://web.whatsapp.com/libsignal.wasm", "other"), "continue")
+        self.assertEqual(self._route(lean, "https://web.whatsapp.com/", "document"), "continue")
+        stats = lean.stats()
+        self.assertEqual(stats["blocked"], {"image": 1, "font": 1})
+        self.assertEqual(stats["requests_avoided"], 3)
+
+    def test_observe_only_baseline_estimates_bytes_avoided(self):
+        baseline = NetworkFilter.observe_only()
+        self.assertFalse(baseline.intercepts)
+        context = _FakeContext("perfil")
+        baseline.install(context)
+        self.assertEqual((context.routes, context.listeners[0][0]), ([], "response"))
+        for length in (1000, 3000):
+            self._respond(baseline, "image", length)
+
+        lean = NetworkFilter()
+        for i in range(3):
+            self._route(lean, f"https://web.whatsapp.com/img/{i}.png", "image")
+        self.assertEqual(lean.estimated_bytes_avoided(baseline), 6000)
+
+
+class _CdpVersionHandler(http.server.BaseHTTPRequestHandler):
+    """Responde /json/version como lo haría el endpoint CDP de Chromium."""
+
+    def do_GET(self):
+        self.send_response(200 if self.path == "/json/version" else 404)
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+class TestBrowserDaemon(unittest.TestCase):
+    """Descubrimiento del navegador residente y conexión de SessionManager por CDP."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.session_dir = os.path.join(self.tmp.name, "perfil")
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _CdpVersionHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.endpoint = f"http://127.0.0.1:{self.server.server_address[1]}"
+        SessionManager.reset_instance()
+
+    def tearDown(self):
+        SessionManager.reset_instance()
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmp.cleanup()
+
+    def _write_state(self, pid, endpoint):
+        with open(daemon_state_path(self.session_dir), "w", encoding="utf-8") as f:
+            json.dump({"pid": pid, "endpoint": endpoint}, f)
+
+    def test_find_daemon_discards_stale_state(self):
+        self.assertIsNone(find_daemon(self.session_dir))
+        dead = subprocess.Popen([sys.executable, "-c", "pass"])
+        dead.wait()
+        self._write_state(dead.pid, self.endpoint)
+        self.assertIsNone(find_daemon(self.session_dir))
+        self.assertFalse(os.path.exists(daemon_state_path(self.session_dir)))
+
+    def test_session_manager_attaches_to_running_daemon(self):
+        self._write_state(os.getpid(), self.endpoint)
+        self.assertEqual(find_daemon(self.session_dir), self.endpoint)
+
+        blank, whatsapp = _FakePage(), _FakePage()
+        blank.url, whatsapp.url = "about:blank", "https://web.whatsapp.com/"
+        context = _FakeContext(self.session_dir)
+        context.pages = [blank, whatsapp]
+        driver = _FakePlaywright()
+        driver.chromium.connect_over_cdp = lambda endpoint: types.SimpleNamespace(contexts=[context])
+
+        manager = SessionManager(session_dir=self.session_dir)
+        manager.playwright = driver
+        self.assertIs(manager.initialize_session(), whatsapp)
+        self.assertTrue(manager.attached)
+        self.assertEqual(driver.launched, [])
+        manager.close()
+        # Cerrar el cliente no cierra el navegador del demonio
+        self.assertFalse(context.closed)
+        self.assertTrue(driver.stopped)
+
+    def test_async_session_manager_attaches_and_filters_network(self):
+        from whatsapp_automation.aio import AsyncSessionManager
+        self._write_state(os.getpid(), self.endpoint)
+        whatsapp = _FakePage()
+        whatsapp.url = "https://web.whatsapp.com/"
+        context = _FakeContext(self.session_dir)
+        context.pages = [whatsapp]
+
+        async def route(pattern, handler):
+            context.routes.append((pattern, handler))
+
+        async def connect_over_cdp(endpoint):
+            return types.SimpleNamespace(contexts=[context])
+
+        async def stop():
+            driver.stopped = True
+
+        context.route = route
+        driver = types.SimpleNamespace(chromium=types.SimpleNamespace(connect_over_cdp=connect_over_cdp),
+                                       stop=stop, stopped=False)
+        manager = AsyncSessionManager(session_dir=self.session_dir, network_filter=NetworkFilter())
+        manager.playwright = driver
+
+        async def scenario():
+            page = await manager.initialize_session()
+            await manager.close()
+            return page
+
+        self.assertIs(asyncio.run(scenario()), whatsapp)
+        self.assertEqual(context.routes[0][0], "**/*")
+        self.assertEqual(context.listeners[0][0], "response")
+        self.assertFalse(context.closed)
+        self.assertTrue(driver.stopped)
+
+
+class TestLazyImports(unittest.TestCase):
+    """Carga diferida de los atributos públicos: importar el paquete no carga Playwright."""
+
+    def _run(self, code):
+        return subprocess.run(
+            [sys.executable, "-c", code], cwd=parent_dir, capture_output=True, text=True, check=True
+        ).stdout.strip()
+
+    def test_package_import_does_not_load_playwright(self):
+        output = self._run(
+            "import sys\n"
+            "from whatsapp_automation import MessageBuilder, split_message\n"
+            "import whatsapp_automation.cli, whatsapp_automation.daemon, whatsapp_automation.maintenance\n"
+            "print('playwright' in sys.modules)"
+        )
+        self.assertEqual(output, "False")
+
+    def test_main_help_does_not_load_playwright(self):
+        output = self._run(
+            "import sys, runpy\n"
+            "sys.argv = ['main.py', '--help']\n"
+            "try:\n"
+            "    runpy.run_path('main.py', run_name='__main__')\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "print('playwright' in sys.modules)"
+        )
+        self.assertEqual(output.splitlines()[-1], "False")
+
+    def test_async_api_does_not_load_sync_playwright(self):
+        output = self._run(
+            "import sys\n"
+            "from whatsapp_automation.aio import AsyncWhatsAppBotFacade, AsyncChatPage, AsyncLoginPage\n"
+            "print('playwright.async_api' in sys.modules, 'playwright.sync_api' in sys.modules)"
+        )
+        self.assertEqual(output, "True False")
+
+    def test_public_names_resolve(self):
+        import importlib
+        for package in ("whatsapp_automation", "whatsapp_automation.core", "whatsapp_automation.pages",
+                        "whatsapp_automation.services", "whatsapp_automation.aio"):
+            module = importlib.import_module(package)
+            for name in module.__all__:
+                self.assertIsNotNone(getattr(module, name), f"{package}.{name}")
+                self.assertIn(name, dir(module))
+            with self.assertRaises(AttributeError):
+                getattr(module, "NoExiste")
+        from whatsapp_automation.core.bot_facade import WhatsAppBotFacade as Facade
+        self.assertIs(Facade, WhatsAppBotFacade)
+
 
 if __name__ == "__main__":
     unittest.main()
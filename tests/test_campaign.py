@@ -0,0 +1,121 @@
+"""
+Pruebas del CampaignRunner: reparto estable por perfil, procesos trabajadores y fusión de resultados.
+Cada trabajador ejecuta el WhatsAppBotFacade real contra una página simulada de WhatsApp Web.
+"""
+
+import unittest
+import os
+import io
+import sys
+import json
+import tempfile
+
+# Agregar path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+for path in (parent_dir, current_dir):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from whatsapp_automation import WhatsAppBotFacade
+from whatsapp_automation import MailMerge
+from whatsapp_automation.core.batch import run_batch
+from whatsapp_automation.core.campaign import CampaignRunner, assign_worker
+from test_chat_page import SimulatedWhatsApp
+
+
+class _StandInSession:
+    """Sesión que entrega una página simulada en lugar de lanzar Chromium."""
+
+    def __init__(self, session_dir):
+        self.session_dir = session_dir
+        self.page = None
+
+    def initialize_session(self):
+        self.page = SimulatedWhatsApp(contacts={f"+{n}" for n in range(100, 120)})
+        return self.page
+
+    def close(self):
+        self.page = None
+
+
+def standin_facade_factory(profile_dir, **facade_kwargs):
+    """Fábrica de nivel de módulo (serializable) usada por los procesos trabajadores."""
+    return WhatsAppBotFacade(
+        session_manager=_StandInSession(profile_dir),
+        adaptive_selectors=False,
+        **facade_kwargs
+    )
+
+
+class TestCampaignRunner(unittest.TestCase):
+    """Pruebas del reparto multi-proceso de campañas."""
+
+    def test_assignment_is_stable_and_normalized(self):
+        self.assertEqual(assign_worker("+58 412-1234567", 3), assign_worker("584121234567", 3))
+        self.assertTrue(all(0 <= assign_worker(f"+{n}", 4) < 4 for n in range(50)))
+
+    def test_run_merges_results_in_job_order(self):
+        jobs = [(f"+{n}", f"Hola {n}") for n in range(100, 110)] + [("+999", "sin chat")]
+        runner = CampaignRunner(["perfil_a", "perfil_b"], facade_factory=standin_facade_factory, ui_timeout=0.05)
+        report = runner.run(jobs)
+
+        self.assertEqual([r.job.phone for r in report.results], [phone for phone, _ in jobs])
+        self.assertEqual([r.success for r in report.results], [True] * 10 + [False])
+        for result in report.results:
+            expected = runner.profiles[assign_worker(result.job.phone, 2)]
+            self.assertEqual(result.profile, expected)
+        self.assertEqual(sum(s["total"] for s in report.by_profile().values()), 11)
+        self.assertEqual(report.summary["sent"], 10)
+
+
+class TestBatchRun(unittest.TestCase):
+    """Envío masivo desde archivo: una sesión por perfil, registro de resultados y reanudación."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmp.name, "lote.csv")
+        with open(self.source, "w", encoding="utf-8") as f:
+            f.write("phone,message\n")
+            for n in range(100, 106):
+                f.write(f"+{n},Hola {n}\n")
+            f.write("+999,sin chat\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _run(self, profiles, resume=False):
+        return run_batch(
+            self.source,
+            profiles,
+            merge=MailMerge(self.source, allow_contact_names=True),
+            resume=resume,
+            progress_stream=io.StringIO(),
+            facade_factory=standin_facade_factory,
+            ui_timeout=0.05
+        )
+
+    def _records(self, summary):
+        with open(summary["results_path"], "r", encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def test_single_session_run_and_resume(self):
+        summary = self._run(["perfil_a"])
+        self.assertEqual((summary["sent"], summary["failed"]), (6, 1))
+        records = self._records(summary)
+        self.assertEqual([r["job_id"] for r in records], [f"lote.csv:{line}" for line in range(2, 9)])
+
+        # Reanudar solo reintenta el trabajo fallido y añade su resultado al registro
+        resumed = self._run(["perfil_a"], resume=True)
+        self.assertEqual((resumed["sent"], resumed["failed"], resumed["skipped"]), (0, 1, 6))
+        self.assertEqual(len(self._records(resumed)), 8)
+
+    def test_concurrent_profiles_write_every_result(self):
+        summary = self._run(["perfil_a", "perfil_b"])
+        self.assertEqual(summary["sent"] + summary["failed"], 7)
+        profiles = {r["profile"] for r in self._records(summary)}
+        self.assertEqual(profiles, {"perfil_a", "perfil_b"})
+
+
+if __name__ == "__main__":
+    unittest.main()
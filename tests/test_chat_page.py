@@ -0,0 +1,857 @@
+"""
+Pruebas del Page Object ChatPage contra un DOM simulado de WhatsApp Web.
+Valida que los flujos de búsqueda y envío esperen transiciones reales de la interfaz.
+"""
+
+import unittest
+import asyncio
+import os
+import sys
+import time
+import json
+import types
+import tempfile
+from urllib.parse import urlparse, parse_qs
+
+# Agregar path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from whatsapp_automation import ChatPage, PacingScheduler, WhatsAppBotFacade
+from whatsapp_automation.services.recipients import normalize_phone
+from whatsapp_automation.services.message_builder import split_message
+from whatsapp_automation.aio import AsyncChatPage
+from whatsapp_automation.pages import chat_page as chat_module
+from whatsapp_automation.pages import login_page as login_module
+from whatsapp_automation.pages.base_page import RESOLVE_SELECTORS_JS
+from whatsapp_automation.core.telemetry import Telemetry, telemetry
+from whatsapp_automation.core import inbound as inbound_module
+
+
+class SimulatedWhatsApp:
+    """
+    Doble de playwright Page que simula el estado de WhatsApp Web: barra de búsqueda,
+    lista de resultados, cabecera de la conversación y editor de redacción.
+    Las expresiones JavaScript de los Page Objects se interpretan en Python.
+    """
+
+    SEARCH = ChatPage.SEARCH_INPUT_SELECTORS[0]
+    RESULT = ChatPage.CONTACT_ITEM_SELECTORS[0]
+    COMPOSE = ChatPage.MESSAGE_INPUT_SELECTORS[0]
+    DIALOG = ChatPage.INVALID_NUMBER_DIALOG_SELECTORS[-1]
+
+    # Lista de chats virtualizada: filas de 10 px y solo `LIST_WINDOW` renderizadas a la vez
+    ROW_HEIGHT = 10
+    LIST_WINDOW = 4
+
+    def __init__(self, contacts=("+111", "+222"), paste_supported=True, render_bubbles=True, results=None):
+        self.contacts = set(contacts)
+        # Resultados que muestra la búsqueda por consulta (por defecto, el contacto si existe)
+        self.results = dict(results or {})
+        self.chat_list = sorted(self.contacts)
+        self.scroll_top = 0
+        self.observed = []
+        self.marked = None
+        # La conversación muestra (o no, p. ej. sin conexión) la burbuja de cada mensaje enviado
+        self.render_bubbles = render_bubbles
+        self.bubbles = []
+        # El editor procesa (o ignora) los eventos de pegado sintéticos
+        self.paste_supported = paste_supported
+        self.pastes = 0
+        self.typed_chunks = 0
+        self.search_text = ""
+        self.header = ""
+        self.compose_text = ""
+        self.outgoing = []
+        self.dialog = False
+        self.navigations = []
+        self.round_trips = 0
+        # Flujo entrante: funciones expuestas, scripts de inicio y eventos pendientes en la página
+        self.bindings = {}
+        self.init_scripts = []
+        self.inbound_config = None
+        self.inbound_pending = []
+        self.held_keys = set()
+        self.keyboard = types.SimpleNamespace(
+            insert_text=self._insert_text,
+            down=self.held_keys.add,
+            up=self.held_keys.discard,
+            press=self._keyboard_press
+        )
+
+    # --- Estado visible -------------------------------------------------
+    def _search_results(self):
+        if self.search_text in self.results:
+            return list(self.results[self.search_text])
+        return [self.search_text] if self.search_text in self.contacts else []
+
+    def _rendered_rows(self):
+        first = self.scroll_top // self.ROW_HEIGHT
+        return [
+            {"title": title, "offset": (first + i) * self.ROW_HEIGHT}
+            for i, title in enumerate(self.chat_list[first:first + self.LIST_WINDOW])
+        ]
+
+    def add_chat(self, title):
+        """Nuevo chat al principio de la lista (como un mensaje entrante); lo registra el observador."""
+        self.contacts.add(title)
+        self.chat_list.insert(0, title)
+        self.observed.append({"title": title, "offset": 0})
+
+    def receive(self, **event):
+        """Evento detectado por el observador de la página, a la espera de entregarse a Python."""
+        event.setdefault("ts", time.time() * 1000)
+        self.inbound_pending.append(event)
+
+    def expose_binding(self, name, callback):
+        if name in self.bindings:
+            raise RuntimeError(f"Function \"{name}\" has been already registered")
+        self.bindings[name] = callback
+
+    def add_init_script(self, script=None, path=None):
+        self.init_scripts.append(script)
+
+    def reload(self):
+        """Recarga de la página: los scripts de inicio del flujo entrante consultan su función expuesta."""
+        self.inbound_config = None
+        for script in self.init_scripts:
+            config = json.loads(script.split(inbound_module.INBOUND_OBSERVER_JS + ", ", 1)[1][:-1])
+            if self.bindings[config["binding"]](None, []) >= 0:
+                self.inbound_config = config
+
+    def _inbound_wait(self, timeout_ms):
+        """Entrega un lote (como `flush`) y retorna el estado; sin eventos agota la espera."""
+        config = self.inbound_config
+        if config is None:
+            return None
+        batch = self.inbound_pending[:config["batchSize"]]
+        accepted = self.bindings[config["binding"]](None, batch) if batch else 0
+        if accepted < 0:
+            # Flujo cerrado en Python: el observador se detiene
+            self.inbound_config = None
+            return None
+        del self.inbound_pending[:accepted]
+        if not accepted:
+            time.sleep(min(timeout_ms, 20) / 1000)
+        return {"delivered": accepted, "pending": len(self.inbound_pending), "dropped": 0}
+
+    def _visible(self):
+        visible = {self.SEARCH}
+        if self._search_results():
+            visible.add(self.RESULT)
+        if self.header:
+            visible.add(self.COMPOSE)
+        if self.dialog:
+            visible.add(self.DIALOG)
+        return visible
+
+    def _results_signature(self):
+        results = self._search_results()
+        if results:
+            return f"{self.RESULT}|{len(results)}|{results[0]}"
+        return ""
+
+    # --- Interacción ----------------------------------------------------
+    def _insert_text(self, text):
+        self.typed_chunks += 1
+        self.compose_text += text
+
+    def _paste(self, selector, text):
+        self.pastes += 1
+        if self.paste_supported and selector == self.COMPOSE and self.COMPOSE in self._visible():
+            self.compose_text += text
+        return selector in self._visible()
+
+    def _keyboard_press(self, key):
+        if key == "Delete":
+            self.compose_text = ""
+        elif key == "Enter" and "Shift" in self.held_keys:
+            self.compose_text += "\n"
+        elif key == "Enter" and self.compose_text:
+            self.outgoing.append(self.compose_text)
+            if self.render_bubbles:
+                self.bubbles.append(self.compose_text + "\n10:42")
+            self.compose_text = ""
+
+    def _click(self, selector):
+        if selector == chat_module.CHAT_ROW_MARKER and self.marked:
+            self.header = self.marked
+
+    def _press(self, selector, key):
+        if selector == self.SEARCH and key == "Backspace":
+            self.search_text = ""
+        elif selector == self.SEARCH and key == "Enter" and self._search_results():
+            self.header = self._search_results()[0]
+
+    def _fill(self, selector, text):
+        if selector == self.SEARCH:
+            self.search_text = text
+
+    def locator(self, selector):
+        loc = types.SimpleNamespace(
+            click=lambda: self._click(selector),
+            press=lambda key: self._press(selector, key),
+            fill=lambda text: self._fill(selector, text),
+            is_visible=lambda: selector in self._visible()
+        )
+        loc.first = loc
+        return loc
+
+    @property
+    def header(self):
+        return self._header
+
+    @header.setter
+    def header(self, value):
+        # Cada conversación abierta renderiza una cabecera nueva, sin la marca de la anterior
+        self._header = value
+        self.header_stale = False
+
+    def goto(self, url, **kwargs):
+        """Ruta de envío por número: abre el chat (precargado) o muestra el diálogo de número inválido."""
+        self.navigations.append(url)
+        parsed = urlparse(url)
+        if parsed.path == "/send":
+            query = parse_qs(parsed.query)
+            phone = "+" + query["phone"][0]
+            if phone in self.contacts:
+                self.header = phone
+                self.compose_text = query.get("text", [""])[0]
+            else:
+                self.dialog = True
+
+    def is_closed(self):
+        return False
+
+    # --- Evaluación de expresiones ---------------------------------------
+    def evaluate(self, expression, arg=None):
+        self.round_trips += 1
+        if expression == RESOLVE_SELECTORS_JS:
+            selectors, state = arg
+            for idx, selector in enumerate(selectors):
+                if (selector in self._visible()) == (state == "visible"):
+                    return {"index": idx}
+            return None
+        if expression == login_module._SESSION_READY_JS:
+            return True
+        if expression == chat_module._LIST_SIGNATURE_JS:
+            return self._results_signature()
+        if expression == chat_module._LIST_CHANGED_JS:
+            current = self._results_signature()
+            return current != "" and current != arg[1]
+        if expression == chat_module._HEADER_TEXT_JS:
+            return self.header
+        if expression == chat_module._MARK_HEADER_JS:
+            self.header_stale = bool(self.header)
+            return self.header
+        if expression == chat_module._FRESH_HEADER_JS:
+            return {"text": self.header, "fresh": not self.header_stale} if self.header else None
+        if expression == chat_module._CONVERSATION_OPENED_JS:
+            return self.header != arg[0] and self.COMPOSE in self._visible()
+        if expression == chat_module._COMPOSE_FILLED_JS:
+            return len(self.compose_text) > 0
+        if expression == chat_module._OUTGOING_SNAPSHOT_JS:
+            return {"count": len(self.bubbles), "lastId": str(len(self.bubbles))}
+        if expression == chat_module._OUTGOING_APPEARED_JS:
+            _, before, text = arg
+            expected = "".join(text.split())[:200]
+            return any(expected in "".join(b.split()) for b in self.bubbles[before["count"]:])
+        if expression == chat_module._RESULT_TITLES_JS:
+            results = self._search_results()
+            return {"selector": self.RESULT, "titles": results} if results else None
+        if expression == chat_module._MARK_RESULT_JS:
+            results = self._search_results()
+            self.marked = results[arg[1]] if arg[1] < len(results) else None
+            return self.marked is not None
+        if expression == chat_module._CHAT_ROWS_JS:
+            return {
+                "rows": self._rendered_rows(),
+                "scrollTop": self.scroll_top,
+                "scrollHeight": len(self.chat_list) * self.ROW_HEIGHT,
+                "clientHeight": self.LIST_WINDOW * self.ROW_HEIGHT
+            }
+        if expression == chat_module._SCROLL_CHAT_LIST_JS:
+            limit = max(len(self.chat_list) - self.LIST_WINDOW, 0) * self.ROW_HEIGHT
+            self.scroll_top = int(min(max(arg[1], 0), limit)) // self.ROW_HEIGHT * self.ROW_HEIGHT
+            return self.scroll_top
+        if expression == chat_module._CHAT_ROWS_CHANGED_JS:
+            return "\n".join(row["title"] for row in self._rendered_rows()) != arg[2]
+        if expression == chat_module._WATCH_CHAT_LIST_JS:
+            return True
+        if expression == chat_module._DRAIN_CHAT_LIST_JS:
+            rows, self.observed = self.observed, []
+            return rows
+        if expression == chat_module._FIND_CHAT_ROW_JS:
+            _, _, title, top = arg
+            if top is not None:
+                self.evaluate(chat_module._SCROLL_CHAT_LIST_JS, [None, top])
+            rendered = [row["title"] for row in self._rendered_rows()]
+            self.marked = title if title in rendered else None
+            return self.marked is not None
+        if expression == chat_module._PASTE_TEXT_JS:
+            return self._paste(*arg)
+        if expression == chat_module._COMPOSE_MATCHES_JS:
+            return "".join(self.compose_text.split()) == "".join(arg[1].split())
+        if expression == inbound_module.INBOUND_OBSERVER_JS:
+            self.inbound_config = arg
+            return True
+        if expression == inbound_module._WAIT_INBOUND_JS:
+            return self._inbound_wait(arg)
+        if expression == inbound_module._STOP_INBOUND_JS:
+            if self.inbound_config and self.inbound_config["binding"] == arg:
+                self.inbound_config = None
+            return None
+        raise AssertionError(f"Expresión no simulada: {expression[:60]}")
+
+    def wait_for_function(self, expression, arg=None, timeout=None, polling=None):
+        found = self.evaluate(expression, arg)
+        if not found:
+            raise PlaywrightTimeoutError("timeout")
+        return types.SimpleNamespace(json_value=lambda: found)
+
+
+def _awaitable(func):
+    async def wrapper(*args, **kwargs):
+        return func(*args, **kwargs)
+    return wrapper
+
+
+class AsyncSimulatedWhatsApp:
+    """Adaptador de SimulatedWhatsApp con la interfaz de playwright.async_api."""
+
+    def __init__(self, sim: SimulatedWhatsApp):
+        self.sim = sim
+        self.keyboard = types.SimpleNamespace(
+            **{name: _awaitable(getattr(sim.keyboard, name)) for name in ("insert_text", "down", "up", "press")}
+        )
+        self.evaluate = _awaitable(sim.evaluate)
+        self.is_closed = sim.is_closed
+        self.goto = _awaitable(lambda url, **kwargs: sim.goto(url, **kwargs))
+        self.expose_binding = _awaitable(sim.expose_binding)
+        self.add_init_script = _awaitable(sim.add_init_script)
+
+    async def wait_for_function(self, expression, arg=None, timeout=None, polling=None):
+        handle = self.sim.wait_for_function(expression, arg=arg, timeout=timeout, polling=polling)
+        return types.SimpleNamespace(json_value=_awaitable(handle.json_value))
+
+    def locator(self, selector):
+        sync_loc = self.sim.locator(selector)
+        loc = types.SimpleNamespace(
+            **{name: _awaitable(getattr(sync_loc, name)) for name in ("click", "press", "fill", "is_visible")}
+        )
+        loc.first = loc
+        return loc
+
+
+class TestChatPageEventDrivenWaits(unittest.TestCase):
+    """Los flujos de ChatPage avanzan con la interfaz y no con pausas fijas."""
+
+    def test_search_and_send_without_fixed_sleeps(self):
+        page = SimulatedWhatsApp()
+        chat = ChatPage(page, wait_time=5.0, ui_timeout=1.0)
+        start = time.time()
+        self.assertTrue(chat.search_and_select_contact("+111"))
+        self.assertTrue(chat.type_and_send_message("Hola\nMundo"))
+        self.assertLess(time.time() - start, 1.0)
+        self.assertEqual(page.outgoing, ["Hola\nMundo"])
+        self.assertEqual(page.header, "+111")
+
+    def test_send_is_confirmed_by_new_outgoing_bubble(self):
+        page = SimulatedWhatsApp()
+        chat = ChatPage(page, ui_timeout=0.05)
+        self.assertTrue(chat.search_and_select_contact("+111"))
+        self.assertTrue(chat.type_and_send_message("Hola"))
+        self.assertIsNotNone(chat.last_send_latency)
+
+        # Sin burbuja saliente el envío ya no se da por bueno
+        page.render_bubbles = False
+        self.assertFalse(chat.type_and_send_message("Hola otra vez"))
+        self.assertIsNone(chat.last_send_latency)
+
+    def test_unknown_contact_is_bounded_by_ui_timeout(self):
+        page = SimulatedWhatsApp()
+        chat = ChatPage(page, ui_timeout=0.05)
+        self.assertFalse(chat.search_and_select_contact("+999"))
+
+
+class TestBulkTextInsertion(unittest.TestCase):
+    """Inserción en bloque de mensajes largos y división por el límite de caracteres."""
+
+    def _open_chat(self, sim, **kwargs):
+        chat = ChatPage(sim, ui_timeout=0.05, **kwargs)
+        self.assertTrue(chat.search_and_select_contact("+111"))
+        return chat
+
+    def test_paste_inserts_multiline_message_in_one_operation(self):
+        sim = SimulatedWhatsApp()
+        message = "\n".join(f"Línea {i}" for i in range(200))
+        self.assertTrue(self._open_chat(sim).type_and_send_message(message))
+        self.assertEqual(sim.outgoing, [message])
+        self.assertEqual((sim.pastes, sim.typed_chunks), (1, 0))
+
+    def test_falls_back_to_keyboard_when_paste_is_ignored(self):
+        sim = SimulatedWhatsApp(paste_supported=False)
+        self.assertTrue(self._open_chat(sim).type_and_send_message("Hola\nMundo"))
+        self.assertEqual(sim.outgoing, ["Hola\nMundo"])
+        self.assertEqual((sim.pastes, sim.typed_chunks), (1, 2))
+
+    def test_ignored_paste_is_not_retried_and_waits_briefly(self):
+        sim = SimulatedWhatsApp(paste_supported=False)
+        chat = ChatPage(sim, ui_timeout=5.0, max_message_chars=8)
+        chat.PASTE_CONFIRM_TIMEOUT_MS = 20
+        self.assertTrue(chat.search_and_select_contact("+111"))
+        started = time.perf_counter()
+        self.assertTrue(chat.type_and_send_message("uno\ndos\ntres"))
+        # Una sola espera corta del pegado, no `ui_timeout` por cada parte
+        self.assertLess(time.perf_counter() - started, 1.0)
+        self.assertEqual(sim.outgoing, ["uno\ndos", "tres"])
+        self.assertEqual(sim.pastes, 1)
+
+    def test_keyboard_mode_and_invalid_mode(self):
+        sim = SimulatedWhatsApp()
+        self.assertTrue(self._open_chat(sim, insert_mode="keyboard").type_and_send_message("a\nb"))
+        self.assertEqual((sim.pastes, sim.outgoing), (0, ["a\nb"]))
+        with self.assertRaises(ValueError):
+            ChatPage(sim, insert_mode="clipboard")
+
+    def test_long_message_is_split_at_line_boundaries(self):
+        self.assertEqual(split_message("ab\ncd\nefghijk", 5), ["ab\ncd", "efghi", "jk"])
+        self.assertEqual(split_message("corto", 5), ["corto"])
+        sim = SimulatedWhatsApp()
+        self.assertTrue(self._open_chat(sim, max_message_chars=8).type_and_send_message("uno\ndos\ntres"))
+        self.assertEqual(sim.outgoing, ["uno\ndos", "tres"])
+
+    def test_partially_delivered_message_is_not_retried(self):
+        from whatsapp_automation import OutboundQueue
+        sim = SimulatedWhatsApp()
+        submit = sim.keyboard.press
+
+        def lose_connection_after_first_part(key):
+            submit(key)
+            if sim.outgoing:
+                sim.render_bubbles = False
+
+        sim.keyboard.press = lose_connection_after_first_part
+        facade = WhatsAppBotFacade(session_manager=_SimulatedSession(sim), adaptive_selectors=False,
+                                   open_strategy="search", ui_timeout=0.05)
+        facade.authenticate()
+        facade.chat_page.max_message_chars = 8
+        with tempfile.TemporaryDirectory() as tmp:
+            with OutboundQueue(os.path.join(tmp, "cola.sqlite3")) as queue:
+                queue.enqueue([("+111", "uno\ndos\ntres")])
+                stats = facade.drain_queue(queue)
+                self.assertEqual((stats["partial"], stats["failed"]), (1, 0))
+                self.assertEqual(queue.retry_failed(), 0)
+                facade.drain_queue(queue)
+        self.assertEqual(sim.outgoing, ["uno\ndos", "tres"])
+
+        sim.outgoing, sim.render_bubbles = [], True
+        result = facade.send_many([("+111", "uno\ndos\ntres")])[0]
+        self.assertTrue(result.partial)
+        self.assertEqual(result.parts_sent, 1)
+        self.assertIn("Envío parcial: 1 de 2", result.error)
+
+
+class _SimulatedSession:
+    """Sesión que entrega una página simulada en lugar de lanzar Chromium."""
+
+    def __init__(self, page):
+        self.session_dir = "sesion_simulada"
+        self.page = page
+
+    def initialize_session(self):
+        return self.page
+
+    def close(self):
+        pass
+
+
+class TestPhaseTelemetry(unittest.TestCase):
+    """Tramos anidados por fase y contadores al enviar contra la página simulada."""
+
+    def setUp(self):
+        self.records = []
+        telemetry.reset()
+        telemetry.add_hook(self.records.append)
+        telemetry.configure(enabled=True, console_level="silent")
+
+    def tearDown(self):
+        telemetry.remove_hook(self.records.append)
+        telemetry.configure(enabled=False, console_level="info")
+        telemetry.reset()
+
+    def test_send_phases_are_nested_spans(self):
+        facade = WhatsAppBotFacade(session_manager=_SimulatedSession(SimulatedWhatsApp()), adaptive_selectors=False,
+                                   open_strategy="search", ui_timeout=0.05)
+        self.assertTrue(facade.send_many([("+111", "Hola")])[0].success)
+
+        spans = {r["name"]: r for r in self.records if r["type"] == "span"}
+        for phase in ("send", "chat.search", "compose", "compose.focus", "compose.paste", "compose.confirm"):
+            self.assertIn(phase, spans)
+        self.assertEqual(spans["chat.search"]["parent_id"], spans["send"]["span_id"])
+        self.assertEqual(spans["compose.confirm"]["parent_id"], spans["compose"]["span_id"])
+        self.assertGreaterEqual(spans["send"]["duration"], spans["compose"]["duration"])
+        self.assertEqual(telemetry.snapshot()["counters"], {"messages_sent": 1})
+        # Los eventos conservan su nivel y el tramo en curso aunque la consola esté silenciada
+        confirmed = [r for r in self.records if r["type"] == "event" and r["name"] == "compose.confirmed"]
+        self.assertEqual(confirmed[0]["span_id"], spans["compose.confirm"]["span_id"])
+        self.assertIn('whatsapp_phase_seconds_count{phase="compose.confirm"} 1', telemetry.prometheus_text())
+
+    def test_disabled_telemetry_is_a_null_span_and_exporters_write_files(self):
+        quiet = Telemetry(console_level="silent")
+        with quiet.span("send") as span:
+            span.set(result="ok")
+        quiet.count("messages_sent")
+        self.assertEqual(quiet.snapshot(), {"spans": {}, "counters": {}})
+
+        with tempfile.TemporaryDirectory() as tmp:
+            jsonl_path = os.path.join(tmp, "metrics.jsonl")
+            prom_path = os.path.join(tmp, "metrics.prom")
+            quiet.configure(jsonl_path=jsonl_path, prometheus_path=prom_path)
+            self.assertTrue(quiet.enabled)
+            with quiet.span("send"):
+                quiet.event("compose.confirmed", "listo", level="debug")
+            quiet.count("messages_failed", reason="timeout")
+            quiet.close()
+            with open(jsonl_path, encoding="utf-8") as f:
+                self.assertEqual([json.loads(line)["type"] for line in f], ["event", "span", "counter"])
+            with open(prom_path, encoding="utf-8") as f:
+                self.assertIn('whatsapp_messages_failed_total{reason="timeout"} 1', f.read())
+
+
+class TestContactIndexPage(unittest.TestCase):
+    """Índice de contactos construido desde la lista de chats virtualizada y resultados verificados."""
+
+    def _facade(self, sim, **kwargs):
+        return WhatsAppBotFacade(
+            session_manager=_SimulatedSession(sim),
+            adaptive_selectors=False,
+            open_strategy="search",
+            ui_timeout=0.05,
+            **kwargs
+        )
+
+    def test_index_scrolls_the_whole_virtualized_list(self):
+        sim = SimulatedWhatsApp(contacts=[f"Contacto {i:02d}" for i in range(10)])
+        chat = ChatPage(sim, ui_timeout=0.05)
+        index = chat.build_contact_index()
+        self.assertEqual(len(index), 10)
+        self.assertEqual(index.lookup("contacto 09").offset, 90)
+        self.assertEqual(sim.scroll_top, 0)
+
+        sim.add_chat("Nuevo Cliente")
+        self.assertEqual(chat.refresh_contact_index(), 1)
+        self.assertIn("nuevo cliente", chat.contact_index)
+
+    def test_indexed_recipients_skip_the_search_box(self):
+        sim = SimulatedWhatsApp(contacts=[f"Contacto {i:02d}" for i in range(10)])
+        facade = self._facade(sim, index_contacts=True)
+        results = facade.send_many([("Contacto 08", "Hola"), ("contacto 02", "Adiós")])
+        self.assertEqual([r.success for r in results], [True, True])
+        self.assertEqual(sim.search_text, "")
+        self.assertEqual(sim.header, "Contacto 02")
+        self.assertEqual(sim.outgoing, ["Hola", "Adiós"])
+
+    def test_search_opens_the_matching_result_not_the_first(self):
+        sim = SimulatedWhatsApp(contacts={"Ana", "Mariana"}, results={"Ana": ["Mariana", "Ana"]})
+        self.assertTrue(self._facade(sim).send_many([("Ana", "Hola")])[0].success)
+        self.assertEqual(sim.header, "Ana")
+
+    def test_ambiguous_results_send_nothing(self):
+        sim = SimulatedWhatsApp(contacts={"Ana María", "Anabel"}, results={"Ana": ["Ana María", "Anabel"]})
+        result = self._facade(sim).send_many([("Ana", "Hola")])[0]
+        self.assertFalse(result.success)
+        self.assertEqual(sim.header, "")
+        self.assertEqual(sim.outgoing, [])
+
+    def test_enter_fallback_rejects_a_partial_word_header(self):
+        # La lista no mostró resultados a tiempo y Enter abre "Mariana", cuya cabecera no nombra a "Ana"
+        sim = SimulatedWhatsApp(contacts={"Mariana"}, results={"Ana": []})
+        press = sim._press
+        sim._press = lambda selector, key: (setattr(sim, "header", "Mariana\nen línea") if key == "Enter"
+                                            else press(selector, key))
+        result = self._facade(sim).send_many([("Ana", "Hola")])[0]
+        self.assertFalse(result.success)
+        self.assertEqual(sim.outgoing, [])
+
+
+class TestInboundStream(unittest.TestCase):
+    """Eventos entrantes empujados por la página a través de una función expuesta."""
+
+    def _facade(self, sim):
+        return WhatsAppBotFacade(
+            session_manager=_SimulatedSession(sim),
+            adaptive_selectors=False,
+            ui_timeout=0.05
+        )
+
+    def test_observer_is_installed_for_current_and_future_loads(self):
+        sim = SimulatedWhatsApp()
+        stream = inbound_module.InboundStream(sim).start()
+        self.assertIn(stream.binding, sim.bindings)
+        self.assertEqual(sim.inbound_config["incoming"], ChatPage.INCOMING_MESSAGE_SELECTORS)
+        self.assertEqual(len(sim.init_scripts), 1)
+        self.assertIn(json.dumps(stream.binding), sim.init_scripts[0])
+        sim.reload()
+        self.assertEqual(sim.inbound_config["binding"], stream.binding)
+
+        # Reabrir en la misma página usa otra función expuesta y sustituye al observador anterior
+        stream.close()
+        self.assertIsNone(sim.inbound_config)
+        other = inbound_module.InboundStream(sim).start()
+        self.assertNotEqual(other.binding, stream.binding)
+        self.assertEqual(sim.inbound_config["binding"], other.binding)
+
+        # Tras cerrar, las recargas no reinstalan el observador del flujo cerrado
+        other.close()
+        sim.reload()
+        self.assertIsNone(sim.inbound_config)
+
+    def test_bounded_buffer_leaves_the_rest_in_the_page(self):
+        sim = SimulatedWhatsApp()
+        stream = inbound_module.InboundStream(sim, max_buffer=2).start()
+        for i in range(5):
+            sim.receive(type="message", chat="Ana", text=f"m{i}", message_id=f"false_{i}", source="conversation")
+
+        first = stream.poll(timeout=0.05)
+        self.assertEqual([e.text for e in first], ["m0", "m1"])
+        self.assertEqual(stream.stats(), {"received": 2, "buffered": 0, "pending": 3, "dropped": 0})
+        self.assertEqual(len(sim.inbound_pending), 3)
+
+        rest = stream.poll(timeout=0.05) + stream.poll(timeout=0.05)
+        self.assertEqual([e.text for e in rest], ["m2", "m3", "m4"])
+        self.assertEqual(rest[-1].message_id, "false_4")
+        self.assertGreaterEqual(rest[-1].latency, 0.0)
+
+        stream.close()
+        sim.receive(type="unread", chat="Ana", unread=1)
+        self.assertEqual(stream.poll(timeout=0.05), [])
+
+    def test_facade_iterates_and_calls_back_until_timeout(self):
+        sim = SimulatedWhatsApp()
+        facade = self._facade(sim)
+        sim.receive(type="unread", chat="Ana", unread=2)
+        sim.receive(type="chat_updated", chat="Ana", preview="¿Llegó?", unread=2)
+        sim.receive(type="message", chat="Ana", text="¿Llegó?", source="chat_list")
+
+        started = time.monotonic()
+        messages = list(facade.iter_inbound(timeout=0.1, types=["message"]))
+        self.assertLess(time.monotonic() - started, 2.0)
+        self.assertEqual([(e.chat, e.text, e.source) for e in messages], [("Ana", "¿Llegó?", "chat_list")])
+        self.assertEqual(facade.inbound.stats()["received"], 3)
+
+        seen = []
+
+        def first_only(event):
+            seen.append(event.chat)
+            return False
+
+        sim.receive(type="unread", chat="Luis", unread=1)
+        sim.receive(type="unread", chat="Marta", unread=4)
+        delivered = facade.watch_inbound(first_only, timeout=1.0)
+        self.assertEqual((delivered, seen), (1, ["Luis"]))
+        self.assertEqual(len(sim.bindings), 1)
+
+        facade.close()
+        self.assertIsNone(sim.inbound_config)
+
+
+class TestDirectOpenByPhone(unittest.TestCase):
+    """Apertura directa de chats por número sin pasar por la barra de búsqueda."""
+
+    def _facade(self, sim, **kwargs):
+        return WhatsAppBotFacade(
+            session_manager=_SimulatedSession(sim),
+            adaptive_selectors=False,
+            ui_timeout=0.05,
+            **kwargs
+        )
+
+    def test_normalize_phone(self):
+        self.assertEqual(normalize_phone("+58 (412) 123-4567"), "+584121234567")
+        self.assertEqual(normalize_phone("0058 412 1234567"), "+584121234567")
+        self.assertEqual(normalize_phone("0412-1234567", default_country_code="+58"), "+584121234567")
+        self.assertIsNone(normalize_phone("Merza"))
+        self.assertIsNone(normalize_phone("+12"))
+
+    def test_phone_recipient_uses_prefilled_direct_route(self):
+        # El número no aparece en la búsqueda de la aplicación: se recurre a la ruta de envío
+        sim = SimulatedWhatsApp(contacts={"+584121234567"}, results={"+584121234567": []})
+        facade = self._facade(sim)
+        results = facade.send_many([("+58 412 1234567", "Hola\ndirecto")])
+        self.assertTrue(results[0].success)
+        self.assertIsNotNone(results[0].send_latency)
+        self.assertEqual(sim.outgoing, ["Hola\ndirecto"])
+        self.assertIn("/send?phone=584121234567&text=Hola%0Adirecto", sim.navigations[-1])
+
+    def test_known_phone_uses_in_app_search_and_reuses_open_chat(self):
+        sim = SimulatedWhatsApp(contacts={"+584121234567"})
+        facade = self._facade(sim, default_country_code="+58")
+        results = facade.send_many([("+58 412 1234567", "uno"), ("0412-1234567", "dos")])
+        self.assertEqual([r.success for r in results], [True, True])
+        self.assertEqual(sim.outgoing, ["uno", "dos"])
+        # Sin recargas de WhatsApp Web y una sola búsqueda: el segundo envío reutiliza el chat abierto
+        self.assertEqual(sim.navigations, [])
+        self.assertEqual(sim.search_text, "+584121234567")
+
+    def test_direct_route_requires_matching_header(self):
+        # La navegación no cambia de conversación: la caja de redacción visible es la del chat anterior
+        sim = SimulatedWhatsApp(contacts={"+222"})
+        sim.header = "+222"
+        sim.goto = lambda url, **kwargs: sim.navigations.append(url)
+        facade = self._facade(sim, open_strategy="direct")
+        result = facade.send_many([("+584121234567", "Hola")])[0]
+        self.assertFalse(result.success)
+        self.assertEqual(sim.outgoing, [])
+
+    def test_invalid_number_fails_and_names_use_search(self):
+        sim = SimulatedWhatsApp(contacts={"Merza"})
+        facade = self._facade(sim)
+        results = facade.send_many([("+584149999999", "x"), ("Merza", "Hola")])
+        self.assertEqual([r.success for r in results], [False, True])
+        self.assertEqual(sim.outgoing, ["Hola"])
+        with self.assertRaises(ValueError):
+            self._facade(sim, open_strategy="direct")._deliver("Merza", "Hola")
+
+    def test_unconfirmed_send_is_reported_as_failure(self):
+        sim = SimulatedWhatsApp(contacts={"+584121234567"}, render_bubbles=False)
+        result = self._facade(sim).send_many([("+584121234567", "Hola")])[0]
+        self.assertFalse(result.success)
+        self.assertIsNone(result.send_latency)
+        self.assertIn("No se confirmó", result.error)
+
+    def test_prefill_is_retyped_only_when_the_box_never_fills(self):
+        # Envío precargado sin confirmar: se informa el fallo sin volver a escribir el mensaje
+        sim = SimulatedWhatsApp(contacts={"+584121234567"}, results={"+584121234567": []}, render_bubbles=False)
+        self.assertFalse(self._facade(sim).send_many([("+584121234567", "Hola")])[0].success)
+        self.assertEqual((sim.outgoing, sim.pastes), (["Hola"], 0))
+
+        # La caja nunca recibió el texto precargado: se escribe
+        sim = SimulatedWhatsApp(contacts={"+584121234567"}, results={"+584121234567": []})
+        direct_open = sim.goto
+
+        def goto_without_prefill(url, **kwargs):
+            direct_open(url, **kwargs)
+            sim.compose_text = ""
+
+        sim.goto = goto_without_prefill
+        self.assertTrue(self._facade(sim).send_many([("+584121234567", "Hola")])[0].success)
+        self.assertEqual((sim.outgoing, sim.pastes), (["Hola"], 1))
+
+
+class TestAsyncChatPage(unittest.IsolatedAsyncioTestCase):
+    """AsyncChatPage mantiene paridad con el flujo síncrono."""
+
+    async def test_search_and_send(self):
+        sim = SimulatedWhatsApp()
+        chat = AsyncChatPage(AsyncSimulatedWhatsApp(sim), ui_timeout=1.0)
+        self.assertTrue(await chat.search_and_select_contact("+222"))
+        self.assertTrue(await chat.type_and_send_message("Hola\nasync"))
+        self.assertEqual(sim.outgoing, ["Hola\nasync"])
+        self.assertEqual(sim.pastes, 1)
+
+    async def test_long_messages_are_split_and_local_numbers_resolved(self):
+        sim = SimulatedWhatsApp(contacts={"+58 412 1234567"}, results={"0412-1234567": ["+58 412 1234567"]})
+        chat = AsyncChatPage(AsyncSimulatedWhatsApp(sim), ui_timeout=1.0, max_message_chars=10,
+                             default_country_code="+58")
+        self.assertTrue(await chat.search_and_select_contact("0412-1234567"))
+        self.assertTrue(await chat.type_and_send_message("uno dos tres cuatro"))
+        self.assertEqual(len(sim.outgoing), 2)
+        self.assertEqual("".join(sim.outgoing).replace(" ", ""), "unodostrescuatro")
+
+    def _facade(self, sim, **kwargs):
+        from whatsapp_automation.aio import AsyncWhatsAppBotFacade
+        facade = AsyncWhatsAppBotFacade(session_dir=tempfile.mkdtemp(), adaptive_selectors=False,
+                                        ui_timeout=0.05, **kwargs)
+        page = AsyncSimulatedWhatsApp(sim)
+        facade.session_manager.initialize_session = _awaitable(lambda: page)
+        facade.session_manager.close = _awaitable(lambda: None)
+        return facade
+
+    async def test_facade_opens_chats_like_the_sync_facade(self):
+        # Ruta de envío por número con el texto precargado cuando la búsqueda no encuentra el número
+        sim = SimulatedWhatsApp(contacts={"+584121234567"}, results={"+584121234567": []})
+        scheduler = PacingScheduler(per_recipient="20/s+1")
+        facade = self._facade(sim, scheduler=scheduler)
+        results = await facade.send_many([("+58 412 1234567", "Hola\ndirecto"), ("+584121234567", "otra")])
+        self.assertEqual([r.success for r in results], [True, True])
+        self.assertIn("/send?phone=584121234567&text=Hola%0Adirecto", sim.navigations[-1])
+        # El segundo envío reutiliza el chat abierto (sin otra navegación) tras la espera del planificador
+        self.assertEqual((len(sim.navigations), sim.outgoing), (1, ["Hola\ndirecto", "otra"]))
+        self.assertGreater(results[1].paced_seconds, 0)
+        self.assertEqual((results[0].profile, results[0].parts_sent), (facade.session_dir, 1))
+
+        # Índice de contactos: los destinatarios conocidos no pasan por la barra de búsqueda
+        sim = SimulatedWhatsApp(contacts=[f"Contacto {i:02d}" for i in range(10)])
+        facade = self._facade(sim, open_strategy="search", index_contacts=True)
+        self.assertTrue((await facade.send_many([("Contacto 08", "Hola")]))[0].success)
+        self.assertEqual((sim.search_text, sim.header), ("", "Contacto 08"))
+
+        with self.assertRaises(ValueError):
+            await self._facade(sim, open_strategy="direct")._deliver("Merza", "Hola")
+
+    async def test_facade_recovers_closed_page_between_jobs(self):
+        sim = SimulatedWhatsApp()
+        facade = self._facade(sim)
+        pages = []
+
+        def new_page():
+            pages.append(AsyncSimulatedWhatsApp(sim))
+            return pages[-1]
+
+        facade.session_manager.initialize_session = _awaitable(new_page)
+
+        async def jobs():
+            yield ("+111", "uno")
+            # La página se cerró entre trabajos: el siguiente se envía sobre una sesión recuperada
+            pages[-1].is_closed = lambda: True
+            yield ("+222", "dos")
+
+        results = await facade.send_many(jobs())
+        self.assertEqual([r.success for r in results], [True, True])
+        self.assertEqual((len(pages), facade.page), (2, pages[-1]))
+
+    async def test_facade_drains_queue_and_streams_inbound(self):
+        sim = SimulatedWhatsApp()
+        facade = self._facade(sim, open_strategy="search")
+        with facade.open_queue() as queue:
+            queue.enqueue([("+111", "uno"), ("+222", "dos")])
+        stats = await facade.drain_queue()
+        self.assertEqual((stats["sent"], stats["pending"]), (2, 0))
+        self.assertEqual(sim.outgoing, ["uno", "dos"])
+
+        sim.receive(type="unread", chat="Ana", unread=2)
+        sim.receive(type="message", chat="Ana", text="¿Llegó?", source="chat_list")
+        messages = [event async for event in facade.iter_inbound(timeout=0.1, types=["message"])]
+        self.assertEqual([(e.chat, e.text) for e in messages], [("Ana", "¿Llegó?")])
+
+        seen = []
+
+        async def first_only(event):
+            seen.append(event.chat)
+            return False
+
+        sim.receive(type="unread", chat="Luis", unread=1)
+        sim.receive(type="unread", chat="Marta", unread=4)
+        self.assertEqual(await facade.watch_inbound(first_only, timeout=1.0), 1)
+        self.assertEqual((seen, len(sim.bindings)), (["Luis"], 1))
+        await facade.close()
+        self.assertIsNone(sim.inbound_config)
+
+    def test_facade_passes_country_code_and_insert_mode(self):
+        from whatsapp_automation.aio import AsyncWhatsAppBotFacade
+        facade = AsyncWhatsAppBotFacade(session_dir=tempfile.mkdtemp(), adaptive_selectors=False,
+                                        default_country_code="+58", insert_mode="keyboard")
+        facade.page = AsyncSimulatedWhatsApp(SimulatedWhatsApp())
+        facade.session_manager.initialize_session = _awaitable(lambda: facade.page)
+        asyncio.run(facade.initialize())
+        self.assertEqual(facade.chat_page.default_country_code, "+58")
+        self.assertEqual(facade.chat_page.insert_mode, "keyboard")
+
+
+if __name__ == "__main__":
+    unittest.main()
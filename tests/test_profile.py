@@ -0,0 +1,184 @@
+"""
+Pruebas del mantenimiento del perfil persistente: poda de cachés reconstruibles
+conservando los almacenes de la sesión (cookies, IndexedDB, Local Storage).
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+import time
+
+# Agregar path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from whatsapp_automation import SessionManager
+from whatsapp_automation.core.profile_maintenance import compact_profile, profile_size
+from whatsapp_automation.core.profile_staging import ProfileStager
+
+# Perfil de Chromium mínimo: rutas relativas y tamaño de cada archivo
+PROFILE_FILES = {
+    "Default/Cookies": 2048,
+    "Default/IndexedDB/https_web.whatsapp.com_0.indexeddb.leveldb/000003.log": 4096,
+    "Default/IndexedDB/https_web.whatsapp.com_0.indexeddb.leveldb/LOG.old": 512,
+    "Default/Local Storage/leveldb/000005.ldb": 1024,
+    "Default/Service Worker/Database/000001.log": 256,
+    "Default/Service Worker/CacheStorage/abc/index": 8192,
+    "Default/Cache/Cache_Data/data_1": 16384,
+    "Default/Code Cache/js/index": 8192,
+    "Default/GPUCache/data_0": 4096,
+    "GrShaderCache/data_0": 4096,
+    "Crashpad/settings.dat": 128,
+}
+
+SESSION_FILES = (
+    "Default/Cookies",
+    "Default/IndexedDB/https_web.whatsapp.com_0.indexeddb.leveldb/000003.log",
+    "Default/Local Storage/leveldb/000005.ldb",
+    "Default/Service Worker/Database/000001.log",
+)
+
+
+def build_profile(root):
+    for relative, size in PROFILE_FILES.items():
+        path = os.path.join(root, *relative.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(b"\0" * size)
+
+
+class TestProfileCompaction(unittest.TestCase):
+    """Compactación del perfil y cota de tamaño al cerrar."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.profile = os.path.join(self.tmp.name, "session_data")
+        build_profile(self.profile)
+        SessionManager.reset_instance()
+
+    def tearDown(self):
+        SessionManager.reset_instance()
+        self.tmp.cleanup()
+
+    def test_compaction_keeps_session_stores(self):
+        preview = compact_profile(self.profile, dry_run=True)
+        self.assertEqual(profile_size(self.profile), sum(PROFILE_FILES.values()))
+
+        report = compact_profile(self.profile)
+        self.assertEqual(report.size_after, preview.size_after)
+        self.assertEqual(report.size_after, 2048 + 4096 + 1024 + 256)
+        self.assertEqual(report.freed, sum(PROFILE_FILES.values()) - report.size_after)
+        for relative in SESSION_FILES:
+            self.assertTrue(os.path.exists(os.path.join(self.profile, *relative.split("/"))), relative)
+        self.assertFalse(os.path.exists(os.path.join(self.profile, "Default", "Cache")))
+
+    def test_profile_in_use_is_refused(self):
+        os.symlink("host-1234", os.path.join(self.profile, "SingletonLock"))
+        with self.assertRaises(RuntimeError):
+            compact_profile(self.profile)
+
+    def test_size_cap_is_enforced_on_close(self):
+        manager = SessionManager(session_dir=self.profile, max_profile_mb=0.02)
+        manager.close()
+        self.assertLessEqual(profile_size(self.profile), 0.02 * 1024 * 1024)
+
+        # Con el navegador abierto no se compacta
+        manager.context = object()
+        with self.assertRaises(RuntimeError):
+            manager.compact_profile()
+        manager.context = None
+
+
+class TestProfileStaging(unittest.TestCase):
+    """Perfil en directorio rápido con escritura diferida atómica de las partes críticas."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.profile = os.path.join(self.tmp.name, "session_data")
+        self.fast = os.path.join(self.tmp.name, "tmpfs")
+        os.makedirs(self.fast)
+        build_profile(self.profile)
+        os.symlink("host-1234", os.path.join(self.profile, "SingletonLock"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _path(self, root, relative):
+        return os.path.join(root, *relative.split("/"))
+
+    def test_stage_skips_caches_and_lock(self):
+        stager = ProfileStager(self.profile, staging_root=self.fast, sync_interval=0)
+        staged = stager.stage()
+        self.assertTrue(staged.startswith(self.fast))
+        for relative in SESSION_FILES:
+            self.assertTrue(os.path.exists(self._path(staged, relative)), relative)
+        self.assertFalse(os.path.exists(self._path(staged, "Default/Cache")))
+        self.assertFalse(os.path.lexists(self._path(staged, "SingletonLock")))
+
+    def test_write_back_updates_auth_critical_parts(self):
+        stager = ProfileStager(self.profile, staging_root=self.fast, sync_interval=0)
+        staged = stager.stage()
+        idb = "Default/IndexedDB/https_web.whatsapp.com_0.indexeddb.leveldb"
+        with open(self._path(staged, "Default/Cookies"), "wb") as f:
+            f.write(b"nuevas cookies")
+        with open(self._path(staged, idb + "/000007.ldb"), "wb") as f:
+            f.write(b"sync")
+        os.makedirs(self._path(staged, "Default/Cache"))
+        with open(self._path(staged, "Default/Cache/data_2"), "wb") as f:
+            f.write(b"cache")
+
+        stager.finalize()
+        with open(self._path(self.profile, "Default/Cookies"), "rb") as f:
+            self.assertEqual(f.read(), b"nuevas cookies")
+        self.assertTrue(os.path.exists(self._path(self.profile, idb + "/000007.ldb")))
+        # Las cachés no se escriben de vuelta y la copia rápida se elimina
+        self.assertFalse(os.path.exists(self._path(self.profile, "Default/Cache/data_2")))
+        self.assertFalse(os.path.exists(staged))
+        leftovers = [n for _, dirs, files in os.walk(self.profile) for n in dirs + files if "staging-" in n]
+        self.assertEqual(leftovers, [])
+
+    def test_session_close_writes_back_even_if_browser_close_fails(self):
+        class _BrokenContext:
+            def close(self):
+                raise RuntimeError("navegador caído")
+
+        SessionManager.reset_instance()
+        self.addCleanup(SessionManager.reset_instance)
+        manager = SessionManager(session_dir=self.profile)
+        manager.stager = ProfileStager(self.profile, staging_root=self.fast, sync_interval=0)
+        staged = manager.stager.stage()
+        with open(self._path(staged, "Default/Cookies"), "wb") as f:
+            f.write(b"cookies de la sesion")
+        manager.context = _BrokenContext()
+
+        manager.close()
+        self.assertIsNone(manager.stager)
+        self.assertIsNone(manager.context)
+        self.assertFalse(os.path.exists(staged))
+        with open(self._path(self.profile, "Default/Cookies"), "rb") as f:
+            self.assertEqual(f.read(), b"cookies de la sesion")
+
+    def test_periodic_write_back_and_interrupted_swap_recovery(self):
+        stager = ProfileStager(self.profile, staging_root=self.fast, sync_interval=0.01)
+        stager.stage()
+        stager.start_periodic()
+        deadline = time.monotonic() + 5
+        while stager.write_backs == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        stager.stop_periodic()
+        self.assertGreater(stager.write_backs, 0)
+
+        # Caída a mitad de un intercambio: el destino ya se apartó y la copia nueva quedó a medias
+        local_storage = self._path(self.profile, "Default/Local Storage")
+        os.replace(local_storage, local_storage + ".staging-old")
+        os.makedirs(local_storage + ".staging-new")
+        ProfileStager(self.profile, staging_root=self.fast, sync_interval=0).stage()
+        self.assertTrue(os.path.exists(self._path(self.profile, "Default/Local Storage/leveldb/000005.ldb")))
+        self.assertFalse(os.path.exists(local_storage + ".staging-new"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,34 +1,128 @@
 """
 WhatsApp Automation Package - Bot RPA con Patrones de Diseño y Persistencia de Sesión
+Los atributos públicos se cargan bajo demanda: importar el paquete no importa Playwright.
 """
 
-from .core.bot_facade import WhatsAppBotFacade
-from .core.session_manager import SessionManager
-from .pages.base_page import BasePage
-from .pages.login_page import LoginPage
-from .pages.chat_page import ChatPage
-from .services.message_builder import (
-    MessageBuilder,
-    IMessageStrategy,
-    TechnicalReportStrategy,
-    CustomMessageStrategy,
-    create_technical_report_message
-)
-from .whatsapp_automation import WhatsAppAutomation, send_whatsapp_message
+from typing import TYPE_CHECKING
+
+from ._lazy import lazy_exports
+
 
 __version__ = "2.0.0"
 
+
+_EXPORTS = {
+    "WhatsAppBotFacade": ".core.bot_facade",
+    "SessionManager": ".core.session_manager",
+    "SessionPool": ".core.session_pool",
+    "CampaignRunner": ".core.campaign",
+    "SendJob": ".core.jobs",
+    "SendResult": ".core.jobs",
+    "summarize_results": ".core.jobs",
+    "OutboundQueue": ".core.outbound_queue",
+    "PacingScheduler": ".core.scheduler",
+    "Rate": ".core.scheduler",
+    "NetworkFilter": ".core.network_filter",
+    "telemetry": ".core.telemetry",
+    "InboundEvent": ".core.inbound",
+    "BasePage": ".pages.base_page",
+    "LoginPage": ".pages.login_page",
+    "ChatPage": ".pages.chat_page",
+    "SelectorCache": ".pages.selector_cache",
+    "MessageBuilder": ".services.message_builder",
+    "IMessageStrategy": ".services.message_builder",
+    "TechnicalReportStrategy": ".services.message_builder",
+    "CustomMessageStrategy": ".services.message_builder",
+    "TemplateStrategy": ".services.message_builder",
+    "MessageTemplate": ".services.message_builder",
+    "create_technical_report_message": ".services.message_builder",
+    "split_message": ".services.message_builder",
+    "normalize_phone": ".services.recipients",
+    "is_phone_number": ".services.recipients",
+    "MailMerge": ".services.mail_merge",
+    "ContactIndex": ".services.contact_index",
+    "AsyncWhatsAppBotFacade": ".aio.bot_facade",
+    "WhatsAppAutomation": ".whatsapp_automation",
+    "send_whatsapp_message": ".whatsapp_automation",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .core.bot_facade import WhatsAppBotFacade
+    from .core.session_manager import SessionManager
+    from .core.session_pool import SessionPool
+    from .core.campaign import CampaignRunner
+    from .core.jobs import (
+        SendJob,
+        SendResult,
+        summarize_results
+    )
+    from .core.outbound_queue import OutboundQueue
+    from .core.scheduler import (
+        PacingScheduler,
+        Rate
+    )
+    from .core.network_filter import NetworkFilter
+    from .core.telemetry import telemetry
+    from .core.inbound import InboundEvent
+    from .pages.base_page import BasePage
+    from .pages.login_page import LoginPage
+    from .pages.chat_page import ChatPage
+    from .pages.selector_cache import SelectorCache
+    from .services.message_builder import (
+        MessageBuilder,
+        IMessageStrategy,
+        TechnicalReportStrategy,
+        CustomMessageStrategy,
+        TemplateStrategy,
+        MessageTemplate,
+        create_technical_report_message,
+        split_message
+    )
+    from .services.recipients import (
+        normalize_phone,
+        is_phone_number
+    )
+    from .services.mail_merge import MailMerge
+    from .services.contact_index import ContactIndex
+    from .aio.bot_facade import AsyncWhatsAppBotFacade
+    from .whatsapp_automation import (
+        WhatsAppAutomation,
+        send_whatsapp_message
+    )
+
 __all__ = [
     "WhatsAppBotFacade",
+    "AsyncWhatsAppBotFacade",
     "SessionManager",
+    "SessionPool",
+    "CampaignRunner",
+    "SendJob",
+    "SendResult",
+    "summarize_results",
+    "OutboundQueue",
+    "PacingScheduler",
+    "Rate",
+    "NetworkFilter",
+    "telemetry",
+    "InboundEvent",
     "BasePage",
     "LoginPage",
     "ChatPage",
+    "SelectorCache",
     "MessageBuilder",
     "IMessageStrategy",
     "TechnicalReportStrategy",
     "CustomMessageStrategy",
+    "TemplateStrategy",
+    "MessageTemplate",
     "create_technical_report_message",
+    "split_message",
+    "normalize_phone",
+    "is_phone_number",
+    "MailMerge",
+    "ContactIndex",
     "WhatsAppAutomation",
     "send_whatsapp_message",
 ]
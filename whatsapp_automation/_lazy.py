@@ -0,0 +1,34 @@
+"""
+Carga diferida de los atributos públicos de un paquete (PEP 562)
+Los `__init__` declaran qué módulo define cada nombre exportado; el módulo solo se importa
+la primera vez que se accede al nombre, de modo que importar el paquete (o usar solo
+MessageBuilder) no arrastra Playwright.
+"""
+
+import importlib
+from typing import Callable, Dict, List, Tuple
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable[[str], object], Callable[[], List[str]]]:
+    """
+    Construye `__getattr__` y `__dir__` de nivel de módulo para `package`.
+
+    Args:
+        package: `__name__` del paquete
+        exports: Nombre exportado → módulo relativo que lo define (p. ej. ".core.bot_facade")
+    """
+    namespace = importlib.import_module(package).__dict__
+
+    def __getattr__(name: str):
+        module_name = exports.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module_name, package), name)
+        # Cachear en el espacio de nombres: los accesos siguientes no vuelven a pasar por aquí
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
@@ -0,0 +1,32 @@
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
+
+
+_EXPORTS = {
+    "AsyncSessionManager": ".session_manager",
+    "AsyncBasePage": ".base_page",
+    "AsyncLoginPage": ".login_page",
+    "AsyncChatPage": ".chat_page",
+    "AsyncWhatsAppBotFacade": ".bot_facade",
+    "AsyncInboundStream": ".inbound",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .session_manager import AsyncSessionManager
+    from .base_page import AsyncBasePage
+    from .login_page import AsyncLoginPage
+    from .chat_page import AsyncChatPage
+    from .bot_facade import AsyncWhatsAppBotFacade
+    from .inbound import AsyncInboundStream
+
+__all__ = [
+    "AsyncSessionManager",
+    "AsyncBasePage",
+    "AsyncLoginPage",
+    "AsyncChatPage",
+    "AsyncWhatsAppBotFacade",
+    "AsyncInboundStream",
+]
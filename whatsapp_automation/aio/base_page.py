@@ -0,0 +1,133 @@
+"""
+Módulo AsyncBasePage - Page Object Model (POM) asíncrono
+Equivalente de BasePage sobre playwright.async_api: mismas esperas por condición y el mismo
+motor de resolución de selectores, sin bloquear el bucle de eventos.
+"""
+
+import asyncio
+import logging
+from typing import List, Optional, Sequence, Union
+from playwright.async_api import Page, Locator, TimeoutError as PlaywrightTimeoutError
+
+from ..pages.selector_engine import RESOLVE_SELECTORS_JS, SelectorEngine, SelectorMatch
+from ..pages.selector_cache import SelectorCache
+
+logger = logging.getLogger("WhatsAppBot.AsyncPOM")
+
+
+class AsyncBasePage(SelectorEngine):
+    """Clase base para todos los Page Objects asíncronos de WhatsApp Web."""
+
+    def __init__(self, page: Page, wait_time: float = 2.0, selector_cache: Optional[SelectorCache] = None):
+        self.page = page
+        self.wait_time = wait_time
+        self.selector_cache = selector_cache
+
+    async def sleep(self, seconds: Optional[float] = None) -> None:
+        """Pausa la corrutina sin bloquear el bucle de eventos."""
+        delay = seconds if seconds is not None else self.wait_time
+        await asyncio.sleep(delay)
+
+    async def resolve_selector(
+        self,
+        selectors: Sequence[str],
+        state: str = "visible",
+        timeout_ms: int = 5000,
+        key: Optional[str] = None
+    ) -> Optional[SelectorMatch]:
+        """Versión asíncrona de BasePage.resolve_selector (mismo orden adaptativo, un solo viaje o una espera combinada)."""
+        plan = self._plan_selectors(selectors, state, key)
+        if plan is None:
+            return None
+
+        try:
+            if timeout_ms <= 0:
+                found = await self.page.evaluate(RESOLVE_SELECTORS_JS, [plan.ordered, state])
+            else:
+                handle = await self.page.wait_for_function(
+                    RESOLVE_SELECTORS_JS,
+                    arg=[plan.ordered, state],
+                    timeout=timeout_ms,
+                    polling=self.RESOLVE_POLLING_MS
+                )
+                found = await handle.json_value()
+        except PlaywrightTimeoutError:
+            return None
+        except Exception as e:
+            logger.debug(f"Error resolviendo selectores: {e}")
+            return None
+        return self._selector_match(plan, found)
+
+    async def find_first_visible(
+        self,
+        selectors: List[str],
+        timeout_ms: int = 5000,
+        key: Optional[str] = None
+    ) -> Optional[Locator]:
+        """Retorna el Locator de la primera alternativa visible o None."""
+        match = await self.resolve_selector(selectors, state="visible", timeout_ms=timeout_ms, key=key)
+        if not match:
+            return None
+        return self.page.locator(match.selector).first
+
+    async def wait_for_any(
+        self,
+        selectors: List[str],
+        state: str = "visible",
+        timeout_ms: int = 15000,
+        key: Optional[str] = None
+    ) -> Optional[str]:
+        """Espera a que cualquiera de los selectores cumpla el estado y retorna el que lo hizo."""
+        match = await self.resolve_selector(selectors, state=state, timeout_ms=timeout_ms, key=key)
+        return match.selector if match else None
+
+    async def wait_for_condition(self, expression: str, arg=None, timeout_ms: int = 5000) -> bool:
+        """Espera a que una expresión JavaScript sea verdadera; False si se agota el tiempo."""
+        try:
+            await self.page.wait_for_function(
+                expression,
+                arg=arg,
+                timeout=max(int(timeout_ms), 1),
+                polling=self.RESOLVE_POLLING_MS
+            )
+            return True
+        except PlaywrightTimeoutError:
+            return False
+        except Exception as e:
+            logger.debug(f"Error esperando condición: {e}")
+            return False
+
+    async def safe_click(self, selector_or_locator: Union[str, Locator], timeout_ms: int = 5000) -> bool:
+        """Hace clic de manera segura en un selector o Locator."""
+        try:
+            if isinstance(selector_or_locator, str):
+                loc = self.page.locator(selector_or_locator).first
+            else:
+                loc = selector_or_locator
+            await loc.wait_for(state="visible", timeout=timeout_ms)
+            await loc.click()
+            await self.sleep(0.5)
+            return True
+        except Exception as e:
+            logger.debug(f"Error en safe_click: {e}")
+            return False
+
+    async def safe_fill(self, selector_or_locator: Union[str, Locator], text: str, clear: bool = True) -> bool:
+        """Escribe texto en un campo de entrada asegurando el foco y limpieza previa."""
+        try:
+            if isinstance(selector_or_locator, str):
+                loc = self.page.locator(selector_or_locator).first
+            else:
+                loc = selector_or_locator
+            await loc.wait_for(state="visible", timeout=5000)
+            await loc.click()
+            if clear:
+                await loc.press("Control+a")
+                await loc.press("Delete")
+                await self.sleep(0.2)
+            await loc.fill(text)
+            await self.sleep(0.5)
+            return True
+        except Exception as e:
+            logger.debug(f"Error en safe_fill: {e}")
+            return False
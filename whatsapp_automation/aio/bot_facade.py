@@ -0,0 +1,365 @@
+"""
+Módulo AsyncWhatsAppBotFacade - Patrón Facade (Fachada) asíncrono
+Interfaz unificada del Bot RPA sobre playwright.async_api para integrarse en servicios asyncio
+(aiohttp, FastAPI) sin dedicar un hilo por bot. Mantiene paridad con WhatsAppBotFacade.
+"""
+
+import time
+import asyncio
+import inspect
+import logging
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Union
+
+from .session_manager import AsyncSessionManager
+from .login_page import AsyncLoginPage
+from .chat_page import AsyncChatPage
+from .inbound import AsyncInboundStream
+from ..core.jobs import JobLike, SendResult, coerce_job
+from ..core.delivery import OPEN_STRATEGIES, build_result, check_open_strategy, direct_phone, report_paced
+from ..core.inbound import InboundEvent
+from ..core.network_filter import NetworkFilter, resolve_network_filter
+from ..core.outbound_queue import OutboundQueue
+from ..core.scheduler import PacingScheduler
+from ..core.telemetry import telemetry
+from ..pages.selector_cache import SelectorCache
+from ..services.mail_merge import MailMerge
+from ..services.message_builder import MessageBuilder, TechnicalReportStrategy
+
+logger = logging.getLogger("WhatsAppBot.AsyncFacade")
+
+
+class AsyncWhatsAppBotFacade:
+    """
+    Patrón Facade asíncrono: orquesta autenticación, apertura de chats y envío sin bloquear el bucle
+    de eventos. Las rutas de apertura, el ritmo de envío y los resultados siguen las mismas reglas
+    que WhatsAppBotFacade (core.delivery).
+    """
+
+    OPEN_STRATEGIES = OPEN_STRATEGIES
+
+    def __init__(
+        self,
+        session_dir: Optional[str] = None,
+        headless: bool = False,
+        wait_time: float = 2.0,
+        auto_close: bool = True,
+        ui_timeout: float = 15.0,
+        adaptive_selectors: bool = True,
+        default_country_code: Optional[str] = None,
+        insert_mode: str = "paste",
+        open_strategy: str = "auto",
+        scheduler: Optional[PacingScheduler] = None,
+        lean_network: Union[bool, NetworkFilter] = False,
+        use_daemon: bool = True,
+        max_profile_mb: Optional[float] = None,
+        staging_dir: Union[bool, str, None] = None,
+        index_contacts: bool = False
+    ):
+        self.session_dir = session_dir
+        self.headless = headless
+        self.wait_time = wait_time
+        self.auto_close = auto_close
+        self.ui_timeout = ui_timeout
+        # Código de país para reconocer los números locales entre los resultados de búsqueda
+        self.default_country_code = default_country_code
+        # Inserción del texto: "paste" (un único evento de pegado) o "keyboard" (línea a línea)
+        self.insert_mode = insert_mode
+        # Apertura de chats: "auto", "search" o "direct" (ver WhatsAppBotFacade)
+        self.open_strategy = check_open_strategy(open_strategy)
+        # Ritmo de envío (cubetas global / por destinatario / por perfil); None = sin límite
+        self.scheduler = scheduler
+        # Índice de la lista de chats: los destinatarios conocidos se abren sin búsqueda ni recarga
+        self.index_contacts = index_contacts
+
+        self.network_filter = resolve_network_filter(lean_network)
+        self.session_manager = AsyncSessionManager(
+            session_dir=self.session_dir,
+            headless=self.headless,
+            wait_time=self.wait_time,
+            network_filter=self.network_filter,
+            use_daemon=use_daemon,
+            max_profile_mb=max_profile_mb,
+            staging_dir=staging_dir
+        )
+        self.session_dir = self.session_manager.session_dir
+        self.selector_cache: Optional[SelectorCache] = None
+        if adaptive_selectors:
+            self.selector_cache = SelectorCache(SelectorCache.default_path(self.session_manager.session_dir))
+        self.page = None
+        self.login_page: Optional[AsyncLoginPage] = None
+        self.chat_page: Optional[AsyncChatPage] = None
+        self.inbound: Optional[AsyncInboundStream] = None
+        self.authenticated = False
+        # Serializa el uso de la página compartida entre corrutinas concurrentes
+        self._lock = asyncio.Lock()
+
+    async def initialize(self) -> None:
+        """Inicia el navegador y los Page Objects asíncronos."""
+        self.page = await self.session_manager.initialize_session()
+        self.authenticated = False
+        self.login_page = AsyncLoginPage(self.page, wait_time=self.wait_time, selector_cache=self.selector_cache)
+        self.chat_page = AsyncChatPage(
+            self.page,
+            wait_time=self.wait_time,
+            ui_timeout=self.ui_timeout,
+            selector_cache=self.selector_cache,
+            insert_mode=self.insert_mode,
+            default_country_code=self.default_country_code
+        )
+
+    async def authenticate(self, timeout_seconds: int = 300) -> bool:
+        """Asegura la sesión; solo recarga si la página se cerró, salió del origen o perdió la sesión."""
+        if not self.login_page or not self.page or self.page.is_closed():
+            await self.initialize()
+
+        if await self.login_page.is_session_ready():
+            self.authenticated = True
+            return True
+
+        if self.authenticated:
+            logger.debug("La sesión dejó de estar lista; recargando WhatsApp Web.")
+        await self.login_page.navigate_to_whatsapp()
+        self.authenticated = await self.login_page.wait_for_authentication(timeout_seconds=timeout_seconds)
+        return self.authenticated
+
+    async def send_message(self, phone: str, message: str) -> bool:
+        """Envía un mensaje de texto a un destinatario a través de la interfaz gráfica."""
+        await self._pace(phone)
+        async with self._lock:
+            await self.authenticate()
+            success = await self._deliver(phone, message)
+
+        telemetry.count("messages_sent" if success else "messages_failed")
+        if success:
+            telemetry.event("send.completed", "\n🎉 ¡PROCESO COMPLETADO! Mensaje entregado con éxito a través de la UI.")
+
+        return success
+
+    async def iter_send(
+        self,
+        jobs: Union[Iterable[JobLike], AsyncIterable[JobLike]],
+        timeout_seconds: int = 300
+    ) -> AsyncIterator[SendResult]:
+        """
+        Modo lote en streaming: autentica una vez y produce un SendResult por trabajo.
+        Acepta iterables síncronos o asíncronos de trabajos.
+        """
+        async with self._lock:
+            if not await self.authenticate(timeout_seconds=timeout_seconds):
+                raise RuntimeError("No se pudo autenticar la sesión de WhatsApp Web para el envío por lotes.")
+
+        async for raw_job in _aiter_jobs(jobs):
+            job = coerce_job(raw_job)
+            paced_seconds = await self._pace(job.phone)
+            started_at = time.time()
+            error = None
+            async with self._lock:
+                self.chat_page.last_parts_sent = 0
+                try:
+                    # Sonda barata: recupera la sesión si la página se cerró entre trabajos
+                    await self.authenticate(timeout_seconds=timeout_seconds)
+                    success = await self._deliver(job.phone, job.message)
+                except Exception as e:
+                    logger.debug(f"Error enviando a {job.phone}: {e}")
+                    success = False
+                    error = str(e)
+                result = build_result(job, success, error, started_at, self.chat_page,
+                                      profile=self.session_dir, paced_seconds=paced_seconds)
+            yield result
+
+    async def send_many(
+        self,
+        jobs: Union[Iterable[JobLike], AsyncIterable[JobLike]],
+        timeout_seconds: int = 300
+    ) -> List[SendResult]:
+        """Envía un lote de mensajes reutilizando una única página autenticada."""
+        return [result async for result in self.iter_send(jobs, timeout_seconds=timeout_seconds)]
+
+    async def iter_merge(
+        self,
+        source,
+        builder: Optional[MessageBuilder] = None,
+        read_ahead: int = 32,
+        timeout_seconds: int = 300,
+        **merge_kwargs
+    ) -> AsyncIterator[SendResult]:
+        """Combinación de correspondencia en streaming (ver WhatsAppBotFacade.iter_merge)."""
+        if isinstance(source, MailMerge):
+            merge = source
+        else:
+            merge_kwargs.setdefault("default_country_code", self.default_country_code)
+            merge = MailMerge(source, builder=builder, **merge_kwargs)
+        jobs = merge.jobs(read_ahead_size=read_ahead)
+        try:
+            async for result in self.iter_send(jobs, timeout_seconds=timeout_seconds):
+                yield result
+        finally:
+            jobs.close()
+
+    def open_queue(self, **queue_kwargs) -> OutboundQueue:
+        """Abre la cola de salida persistente asociada al directorio de sesión."""
+        return OutboundQueue(OutboundQueue.default_path(self.session_dir), **queue_kwargs)
+
+    async def drain_queue(
+        self,
+        queue: Optional[OutboundQueue] = None,
+        timeout_seconds: int = 300
+    ) -> Dict[str, int]:
+        """
+        Envía todos los trabajos pendientes de la cola de salida persistente, reclamando cada uno
+        justo antes de enviarlo y confirmando su resultado al instante (ver WhatsAppBotFacade.drain_queue).
+        """
+        owned = queue is None
+        queue = queue or self.open_queue()
+        try:
+            async for result in self.iter_send(queue.iter_claimed(), timeout_seconds=timeout_seconds):
+                queue.complete(result)
+            queue.flush()
+            stats = queue.stats()
+        finally:
+            if owned:
+                queue.close()
+        telemetry.event("queue.drained", f"📬 Cola de salida: {stats['sent']} enviados, {stats['failed']} fallidos, "
+                                          f"{stats['partial']} parciales, {stats['pending']} pendientes.")
+        return stats
+
+    async def open_inbound(self, timeout_seconds: int = 300, **stream_kwargs) -> AsyncInboundStream:
+        """Flujo de eventos entrantes de la página autenticada (se instala una vez y se reutiliza)."""
+        async with self._lock:
+            if not await self.authenticate(timeout_seconds=timeout_seconds):
+                raise RuntimeError("No se pudo autenticar la sesión de WhatsApp Web.")
+            if self.inbound is None or self.inbound.closed or self.inbound.page is not self.page:
+                self.inbound = await AsyncInboundStream(self.page, **stream_kwargs).start()
+        return self.inbound
+
+    async def iter_inbound(
+        self,
+        timeout: Optional[float] = None,
+        types: Optional[Iterable[str]] = None,
+        **stream_kwargs
+    ) -> AsyncIterator[InboundEvent]:
+        """Iterador asíncrono de eventos entrantes ("message", "unread", "chat_updated")."""
+        stream = await self.open_inbound(**stream_kwargs)
+        async for event in stream.events(timeout=timeout, types=types):
+            telemetry.count("inbound_events", type=event.type)
+            telemetry.event("inbound.event", f"📥 {event.type} de {event.chat}: {event.text or event.unread or ''}", level="debug")
+            yield event
+
+    async def watch_inbound(
+        self,
+        callback: Callable[[InboundEvent], Union[Optional[bool], Awaitable[Optional[bool]]]],
+        timeout: Optional[float] = None,
+        types: Optional[Iterable[str]] = None,
+        **stream_kwargs
+    ) -> int:
+        """
+        Invoca `callback` (función o corrutina) con cada evento entrante hasta agotar `timeout`
+        o hasta que retorne False. Retorna el número de eventos entregados.
+        """
+        delivered = 0
+        async for event in self.iter_inbound(timeout=timeout, types=types, **stream_kwargs):
+            delivered += 1
+            outcome = callback(event)
+            if inspect.isawaitable(outcome):
+                outcome = await outcome
+            if outcome is False:
+                break
+        return delivered
+
+    @telemetry.traced("send.pacing")
+    async def _pace(self, phone: str) -> float:
+        """Espera sin bloquear el bucle lo que exija el planificador de ritmo y retorna la espera."""
+        if not self.scheduler:
+            return 0.0
+        waited = 0.0
+        while True:
+            delay = self.scheduler.try_acquire(phone, profile=self.session_dir, waited=waited)
+            if not delay:
+                return report_paced(phone, waited)
+            await asyncio.sleep(delay)
+            waited += delay
+
+    @telemetry.traced("send")
+    async def _deliver(self, phone: str, message: str) -> bool:
+        """Abre el chat por la misma ruta que WhatsAppBotFacade._deliver y envía el mensaje."""
+        telemetry.event("send.start", f"\n📨 Iniciando proceso de envío a: {phone}")
+
+        phone_e164 = direct_phone(phone, self.open_strategy, self.default_country_code)
+
+        # 0. La conversación del destinatario ya está abierta (envíos consecutivos): se reutiliza
+        if phone_e164 and await self.chat_page.is_chat_open(phone_e164):
+            return await self.chat_page.type_and_send_message(message)
+
+        # 1. Destinatario ya presente en la lista de chats: se abre su fila directamente
+        if self.index_contacts:
+            if self.chat_page.contact_index is None:
+                await self.chat_page.build_contact_index()
+            if await self.chat_page.open_indexed_chat(phone):
+                return await self.chat_page.type_and_send_message(message)
+
+        if phone_e164:
+            # 2. Búsqueda dentro de la aplicación en "auto"; la ruta por número (recarga) como último recurso
+            if self.open_strategy == "auto" and await self.chat_page.search_and_select_contact(phone_e164, enter_fallback=False):
+                return await self.chat_page.type_and_send_message(message)
+            if not await self.chat_page.open_chat_by_phone(phone_e164, prefill=message):
+                raise RuntimeError(f"No se pudo abrir el chat directo con '{phone_e164}' en WhatsApp Web.")
+            # 3. Texto precargado por la URL: un envío precargado sin confirmar no se repite
+            if self.chat_page.prefill_requested:
+                sent = await self.chat_page.send_prefilled_message()
+                if sent is not None:
+                    return sent
+            return await self.chat_page.type_and_send_message(message)
+
+        chat_selected = await self.chat_page.search_and_select_contact(phone)
+        if not chat_selected:
+            raise RuntimeError(f"No se pudo encontrar o abrir el chat para '{phone}' en la interfaz de WhatsApp.")
+
+        return await self.chat_page.type_and_send_message(message)
+
+    async def send_technical_report(
+        self,
+        phone: str,
+        recipient: str = "Merza",
+        developer: str = "Jose Rivero",
+        repo_url: str = "https://github.com/jrivero20/whatsapp_automation",
+        custom_note: Optional[str] = None
+    ) -> bool:
+        """Construye y envía el reporte técnico de patrones de diseño."""
+        telemetry.event("send.build_report", "📐 Generando reporte técnico de automatización y patrones de diseño...", level="debug")
+        builder = MessageBuilder(TechnicalReportStrategy())
+        builder.set_recipient(recipient)
+        builder.set_developer(developer)
+        builder.set_repo_url(repo_url)
+        if custom_note:
+            builder.set_custom_note(custom_note)
+
+        return await self.send_message(phone=phone, message=builder.build())
+
+    async def close(self) -> None:
+        """Cierra el bot y guarda el estado."""
+        if self.inbound:
+            await self.inbound.close()
+            self.inbound = None
+        if self.selector_cache:
+            self.selector_cache.save()
+        await self.session_manager.close()
+        self.authenticated = False
+        telemetry.flush()
+
+    async def __aenter__(self):
+        await self.initialize()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self.auto_close:
+            await self.close()
+
+
+async def _aiter_jobs(jobs: Union[Iterable[JobLike], AsyncIterable[JobLike]]) -> AsyncIterator[JobLike]:
+    """Recorre por igual iterables síncronos y asíncronos de trabajos."""
+    if hasattr(jobs, "__aiter__"):
+        async for job in jobs:
+            yield job
+    else:
+        for job in jobs:
+            yield job
@@ -0,0 +1,407 @@
+"""
+Módulo AsyncChatPage - Page Object Model (POM) asíncrono
+Búsqueda de contactos, apertura de chats (búsqueda, ruta de envío por número e índice de contactos)
+y envío de mensajes por interfaz gráfica sobre playwright.async_api. Comparte con ChatPage los
+selectores y las condiciones JavaScript (pages.chat_dom) y el modo de inserción (pegado en bloque
+o tecleo) con división de los mensajes largos.
+"""
+
+import time
+import asyncio
+import logging
+from typing import Optional
+from urllib.parse import quote
+from playwright.async_api import Page
+
+from .base_page import AsyncBasePage
+from ..core.telemetry import telemetry
+from ..pages.selector_cache import SelectorCache
+from ..pages.chat_dom import (
+    ChatSelectors,
+    CHAT_ROW_MARKER,
+    _RESULT_TITLES_JS,
+    _MARK_RESULT_JS,
+    _LIST_SIGNATURE_JS,
+    _LIST_CHANGED_JS,
+    _CHAT_ROWS_JS,
+    _SCROLL_CHAT_LIST_JS,
+    _CHAT_ROWS_CHANGED_JS,
+    _WATCH_CHAT_LIST_JS,
+    _DRAIN_CHAT_LIST_JS,
+    _FIND_CHAT_ROW_JS,
+    _HEADER_TEXT_JS,
+    _MARK_HEADER_JS,
+    _FRESH_HEADER_JS,
+    _CONVERSATION_OPENED_JS,
+    _COMPOSE_FILLED_JS,
+    _OUTGOING_SNAPSHOT_JS,
+    _OUTGOING_APPEARED_JS,
+    _PASTE_TEXT_JS,
+    _COMPOSE_MATCHES_JS
+)
+from ..services.contact_index import ContactIndex, pick_result, title_matches
+from ..services.message_builder import WHATSAPP_MAX_MESSAGE_CHARS, split_message
+
+logger = logging.getLogger("WhatsAppBot.AsyncChatPage")
+
+
+class AsyncChatPage(ChatSelectors, AsyncBasePage):
+    """Page Object asíncrono para la interacción y envío de mensajes vía Interfaz Gráfica."""
+
+    def __init__(
+        self,
+        page: Page,
+        wait_time: float = 2.0,
+        ui_timeout: float = 15.0,
+        selector_cache: Optional[SelectorCache] = None,
+        insert_mode: str = "paste",
+        max_message_chars: int = WHATSAPP_MAX_MESSAGE_CHARS,
+        default_country_code: Optional[str] = None
+    ):
+        super().__init__(page, wait_time=wait_time, selector_cache=selector_cache)
+        if insert_mode not in self.INSERT_MODES:
+            raise ValueError(f"insert_mode debe ser uno de {self.INSERT_MODES}.")
+        self.ui_timeout = ui_timeout
+        self.insert_mode = insert_mode
+        self._paste_rejected = False
+        self.max_message_chars = max_message_chars
+        self.default_country_code = default_country_code
+        self.last_send_latency: Optional[float] = None
+        self.last_parts_total = 0
+        self.last_parts_sent = 0
+        self._prefill_text = ""
+        self.prefill_requested = False
+        self.contact_index: Optional[ContactIndex] = None
+
+    @property
+    def ui_timeout_ms(self) -> int:
+        return int(self.ui_timeout * 1000)
+
+    @telemetry.traced("chat.search")
+    async def search_and_select_contact(self, query: str, enter_fallback: bool = True) -> bool:
+        """
+        Busca el contacto en la barra lateral y abre el resultado que corresponde al destinatario.
+        Con `enter_fallback=False` no se recurre a Enter cuando la búsqueda no deja resultados.
+        """
+        telemetry.event("chat.search_locate", f"🔍 Localizando barra de búsqueda en la interfaz...", level="debug")
+
+        search_input = await self.find_first_visible(
+            self.SEARCH_INPUT_SELECTORS,
+            timeout_ms=10000,
+            key="ChatPage.SEARCH_INPUT_SELECTORS"
+        )
+        if not search_input:
+            raise RuntimeError("No se encontró la barra de búsqueda de chats en la interfaz.")
+
+        telemetry.event("chat.search_query", f"✍️ Escribiendo '{query}' en la barra de búsqueda...", level="debug")
+        await search_input.click()
+        await search_input.press("Control+a")
+        await search_input.press("Backspace")
+
+        results_before = await self.page.evaluate(_LIST_SIGNATURE_JS, self.CONTACT_ITEM_SELECTORS)
+        await search_input.fill(query)
+        if not await self.wait_for_condition(
+            _LIST_CHANGED_JS,
+            arg=[self.CONTACT_ITEM_SELECTORS, results_before],
+            timeout_ms=min(self.SEARCH_RESULTS_TIMEOUT_MS, self.ui_timeout_ms)
+        ):
+            logger.debug("La lista de resultados no cambió tras la búsqueda; se continúa con la actual.")
+
+        telemetry.event("chat.search_results", "🎯 Buscando contacto en los resultados filtrados...", level="debug")
+        results = await self.page.evaluate(_RESULT_TITLES_JS, self.CONTACT_ITEM_SELECTORS)
+        if results and results["titles"]:
+            choice = pick_result(results["titles"], query, self.default_country_code)
+            if choice is None:
+                telemetry.event(
+                    "chat.search_ambiguous",
+                    f"⚠️ Ningún resultado de la búsqueda corresponde sin ambigüedad a '{query}'.",
+                    level="warning",
+                    results=len(results["titles"])
+                )
+                return False
+            try:
+                header_before = await self.page.evaluate(_HEADER_TEXT_JS)
+                if await self.page.evaluate(_MARK_RESULT_JS, [results["selector"], choice]):
+                    await self.page.locator(CHAT_ROW_MARKER).first.click()
+                    if await self.wait_for_conversation(header_before):
+                        telemetry.event("chat.opened", "✅ Contacto seleccionado y chat abierto con éxito.")
+                        return True
+            except Exception as e:
+                logger.debug(f"Error al abrir el resultado de búsqueda: {e}")
+
+        if not enter_fallback:
+            return False
+
+        try:
+            telemetry.event("chat.search_enter", "⌨️ Presionando Enter en la barra de búsqueda...", level="debug")
+            header_before = await self.page.evaluate(_HEADER_TEXT_JS)
+            await search_input.press("Enter")
+            # Sin resultados, una caja de redacción visible pertenece al chat anterior
+            if await self.wait_for_conversation(header_before, allow_same_chat=bool(results and results["titles"])):
+                if title_matches(await self.page.evaluate(_HEADER_TEXT_JS), query, self.default_country_code):
+                    telemetry.event("chat.opened", "✅ Chat abierto mediante Enter.")
+                    return True
+                telemetry.event("chat.search_mismatch", f"⚠️ El chat abierto con Enter no corresponde a '{query}'.", level="warning")
+        except Exception:
+            pass
+
+        return False
+
+    @telemetry.traced("chat.index")
+    async def build_contact_index(self) -> ContactIndex:
+        """Construye el índice de contactos recorriendo una vez la lista de chats, como ChatPage.build_contact_index."""
+        index = ContactIndex(default_country_code=self.default_country_code)
+        list_arg = [self.CHAT_LIST_SELECTORS, self.CHAT_ROW_SELECTORS]
+        if await self.page.evaluate(_CHAT_ROWS_JS, list_arg) is None:
+            raise RuntimeError("No se encontró la lista de chats para construir el índice de contactos.")
+
+        await self.page.evaluate(_SCROLL_CHAT_LIST_JS, [self.CHAT_LIST_SELECTORS, 0])
+        for _ in range(self.INDEX_MAX_PAGES):
+            snapshot = await self.page.evaluate(_CHAT_ROWS_JS, list_arg)
+            if snapshot is None:
+                break
+            index.update(snapshot["rows"])
+            if snapshot["scrollTop"] + snapshot["clientHeight"] >= snapshot["scrollHeight"] - 1:
+                break
+            target = snapshot["scrollTop"] + max(snapshot["clientHeight"] * 0.8, 1)
+            titles = "\n".join(row["title"] for row in snapshot["rows"])
+            position = await self.page.evaluate(_SCROLL_CHAT_LIST_JS, [self.CHAT_LIST_SELECTORS, target])
+            if position <= snapshot["scrollTop"]:
+                break
+            await self.wait_for_condition(_CHAT_ROWS_CHANGED_JS, arg=list_arg + [titles], timeout_ms=self.INDEX_SCROLL_TIMEOUT_MS)
+
+        await self.page.evaluate(_SCROLL_CHAT_LIST_JS, [self.CHAT_LIST_SELECTORS, 0])
+        await self.page.evaluate(_WATCH_CHAT_LIST_JS, list_arg)
+        self.contact_index = index
+        telemetry.event("chat.indexed", f"📇 Índice de contactos: {len(index)} chats.", chats=len(index))
+        return index
+
+    async def refresh_contact_index(self) -> int:
+        """Incorpora al índice las filas observadas desde la última lectura; retorna cuántas son nuevas."""
+        if self.contact_index is None:
+            return 0
+        rows = await self.page.evaluate(_DRAIN_CHAT_LIST_JS)
+        if rows is None:
+            list_arg = [self.CHAT_LIST_SELECTORS, self.CHAT_ROW_SELECTORS]
+            if not await self.page.evaluate(_WATCH_CHAT_LIST_JS, list_arg):
+                return 0
+            snapshot = await self.page.evaluate(_CHAT_ROWS_JS, list_arg)
+            rows = snapshot["rows"] if snapshot else []
+        return self.contact_index.update(rows)
+
+    @telemetry.traced("chat.open_indexed")
+    async def open_indexed_chat(self, query: str) -> bool:
+        """Abre el chat del destinatario desde el índice de contactos, sin usar la barra de búsqueda."""
+        if self.contact_index is None:
+            return False
+        await self.refresh_contact_index()
+        entry = self.contact_index.lookup(query)
+        if entry is None:
+            return False
+
+        header_before = await self.page.evaluate(_HEADER_TEXT_JS)
+        positions = [entry.offset, 0] if entry.offset else [0]
+        for top in positions:
+            if not await self.wait_for_condition(
+                _FIND_CHAT_ROW_JS,
+                arg=[self.CHAT_LIST_SELECTORS, self.CHAT_ROW_SELECTORS, entry.title, top],
+                timeout_ms=self.INDEX_SCROLL_TIMEOUT_MS
+            ):
+                continue
+            try:
+                await self.page.locator(CHAT_ROW_MARKER).first.click()
+            except Exception as e:
+                logger.debug(f"Error al abrir la fila indexada: {e}")
+                continue
+            if await self.wait_for_conversation(header_before):
+                telemetry.event("chat.opened", f"✅ Chat de '{entry.title}' abierto desde el índice de contactos.")
+                return True
+
+        logger.debug(f"La fila de '{entry.title}' no está donde la registró el índice; se descarta.")
+        self.contact_index.remove(entry.title)
+        return False
+
+    async def wait_for_conversation(self, header_before: str, allow_same_chat: bool = True) -> bool:
+        """Espera a que cambie la cabecera y aparezca la caja de redacción."""
+        if await self.wait_for_condition(
+            _CONVERSATION_OPENED_JS,
+            arg=[header_before, self.MESSAGE_INPUT_SELECTORS],
+            timeout_ms=self.ui_timeout_ms
+        ):
+            return True
+        return allow_same_chat and await self.is_message_box_ready(timeout_seconds=0)
+
+    async def is_message_box_ready(self, timeout_seconds: int = 5) -> bool:
+        """Verifica si el área de redacción del mensaje está visible."""
+        match = await self.resolve_selector(
+            self.MESSAGE_INPUT_SELECTORS,
+            timeout_ms=timeout_seconds * 1000,
+            key="ChatPage.MESSAGE_INPUT_SELECTORS"
+        )
+        return match is not None
+
+    async def is_chat_open(self, phone_e164: str) -> bool:
+        """Indica si la conversación abierta es la del número (cabecera con sus dígitos y caja de redacción visible)."""
+        header = await self.page.evaluate(_HEADER_TEXT_JS)
+        return bool(header) and title_matches(header, phone_e164) and await self.is_message_box_ready(timeout_seconds=0)
+
+    @telemetry.traced("chat.open_direct")
+    async def open_chat_by_phone(self, phone_e164: str, prefill: Optional[str] = None) -> bool:
+        """Abre la conversación por la ruta de envío por número (`/send?phone=`), como ChatPage.open_chat_by_phone."""
+        url = f"{self.WHATSAPP_URL}/send?phone={phone_e164.lstrip('+')}"
+        self.prefill_requested = False
+        if prefill:
+            encoded = quote(prefill, safe="")
+            if len(encoded) <= self.PREFILL_MAX_URL_CHARS:
+                url += f"&text={encoded}"
+                self.prefill_requested = True
+                self._prefill_text = prefill
+
+        telemetry.event("chat.open_direct", f"🔗 Abriendo chat directo con {phone_e164}...", level="debug")
+        await self.page.evaluate(_MARK_HEADER_JS)
+        await self.page.goto(url, wait_until="domcontentloaded")
+
+        candidates = self.MESSAGE_INPUT_SELECTORS + self.INVALID_NUMBER_DIALOG_SELECTORS
+        match = await self.resolve_selector(candidates, timeout_ms=self.DIRECT_OPEN_TIMEOUT_MS)
+        if not match or match.index >= len(self.MESSAGE_INPUT_SELECTORS):
+            logger.debug(f"No se pudo abrir el chat directo con {phone_e164}.")
+            return False
+
+        header = await self.page.evaluate(_FRESH_HEADER_JS)
+        if not header or not (header["fresh"] or title_matches(header["text"], phone_e164)):
+            telemetry.event("chat.open_direct_mismatch", f"⚠️ La conversación abierta no corresponde a {phone_e164}.", level="warning")
+            return False
+
+        telemetry.event("chat.opened", "✅ Chat abierto directamente por número.")
+        return True
+
+    async def send_prefilled_message(self) -> Optional[bool]:
+        """
+        Envía el texto precargado en la caja de redacción: None si la caja sigue vacía (el texto debe
+        escribirse), True/False según se confirme el envío (uno sin confirmar no se reescribe).
+        """
+        compose_selector = await self._focus_compose()
+        if not await self.wait_for_condition(_COMPOSE_FILLED_JS, arg=compose_selector, timeout_ms=self.ui_timeout_ms):
+            return None
+        return await self._submit(self._prefill_text)
+
+    @telemetry.traced("compose")
+    async def type_and_send_message(self, message: str) -> bool:
+        """
+        Redacta el mensaje y lo envía como ChatPage.type_and_send_message: pegado en bloque (con
+        respaldo al tecleo) o tecleo línea a línea, en varias partes si supera el límite de WhatsApp.
+        """
+        parts = split_message(message, self.max_message_chars)
+        if len(parts) > 1:
+            telemetry.event("compose.split", f"✂️ Mensaje de {len(message)} caracteres dividido en {len(parts)} partes.")
+
+        # Un editor que ignora el pegado lo ignora en todas las partes: se teclean sin reintentarlo
+        self._paste_rejected = False
+        self.last_parts_total = len(parts)
+        self.last_parts_sent = 0
+        total_latency = 0.0
+        for part in parts:
+            if not await self._compose_and_submit(part):
+                if self.last_parts_sent:
+                    telemetry.event(
+                        "compose.partial",
+                        f"⚠️ Envío parcial: {self.last_parts_sent} de {len(parts)} partes entregadas.",
+                        level="warning"
+                    )
+                return False
+            self.last_parts_sent += 1
+            total_latency += self.last_send_latency
+        self.last_send_latency = total_latency
+        return True
+
+    async def _compose_and_submit(self, message: str) -> bool:
+        """Redacta una parte del mensaje en la caja de redacción y la envía."""
+        compose_selector = await self._focus_compose()
+
+        telemetry.event("compose.insert", "✍️ Escribiendo mensaje...", level="debug")
+        use_paste = self.insert_mode == "paste" and not self._paste_rejected
+        if not (use_paste and await self._paste_text(compose_selector, message)):
+            self._paste_rejected = self._paste_rejected or use_paste
+            await self._type_text(message)
+
+        await self.wait_for_condition(_COMPOSE_FILLED_JS, arg=compose_selector, timeout_ms=self.ui_timeout_ms)
+        return await self._submit(message)
+
+    @telemetry.traced("compose.paste")
+    async def _paste_text(self, compose_selector: str, message: str) -> bool:
+        """Inserta el mensaje con un evento de pegado sintético; False si el editor no lo refleja."""
+        try:
+            if not await self.page.evaluate(_PASTE_TEXT_JS, [compose_selector, message]):
+                return False
+        except Exception as e:
+            logger.debug(f"Error en el pegado sintético: {e}")
+            return False
+
+        confirm_ms = min(self.PASTE_CONFIRM_TIMEOUT_MS, self.ui_timeout_ms)
+        if await self.wait_for_condition(_COMPOSE_MATCHES_JS, arg=[compose_selector, message], timeout_ms=confirm_ms):
+            return True
+
+        logger.debug("El editor no reflejó el pegado; se recurre al tecleo línea a línea.")
+        await self.page.keyboard.press("Control+a")
+        await self.page.keyboard.press("Delete")
+        return False
+
+    @telemetry.traced("compose.type")
+    async def _type_text(self, message: str) -> None:
+        """Teclea el mensaje línea a línea (saltos de línea con Shift+Enter)."""
+        lines = message.split("\n")
+        for idx, line in enumerate(lines):
+            if line:
+                await self.page.keyboard.insert_text(line)
+            if idx < len(lines) - 1:
+                await self.page.keyboard.down("Shift")
+                await self.page.keyboard.press("Enter")
+                await self.page.keyboard.up("Shift")
+                await asyncio.sleep(0.05)
+
+    @telemetry.traced("compose.focus")
+    async def _focus_compose(self) -> str:
+        """Localiza y enfoca la caja de redacción; retorna el selector que coincidió."""
+        telemetry.event("compose.focus", "💬 Localizando cuadro de redacción de mensaje...", level="debug")
+
+        match = await self.resolve_selector(
+            self.MESSAGE_INPUT_SELECTORS,
+            timeout_ms=self.ui_timeout_ms,
+            key="ChatPage.MESSAGE_INPUT_SELECTORS"
+        )
+        if not match:
+            raise RuntimeError("No se encontró la caja de redacción del mensaje en el chat abierto.")
+        await self.page.locator(match.selector).first.click()
+        return match.selector
+
+    @telemetry.traced("compose.confirm")
+    async def _submit(self, message: str) -> bool:
+        """Envía con Enter (o el botón de enviar) y confirma la burbuja saliente con el mismo texto."""
+        telemetry.event("compose.submit", "📤 Enviando mensaje...", level="debug")
+        before = await self.page.evaluate(_OUTGOING_SNAPSHOT_JS, self.OUTGOING_MESSAGE_SELECTORS)
+        appeared_arg = [self.OUTGOING_MESSAGE_SELECTORS, before, message]
+        start = time.perf_counter()
+        await self.page.keyboard.press("Enter")
+        sent = await self.wait_for_condition(_OUTGOING_APPEARED_JS, arg=appeared_arg, timeout_ms=self.ui_timeout_ms)
+
+        if not sent:
+            send_btn = await self.find_first_visible(
+                self.SEND_BUTTON_SELECTORS,
+                timeout_ms=0,
+                key="ChatPage.SEND_BUTTON_SELECTORS"
+            )
+            if send_btn:
+                try:
+                    await send_btn.click()
+                    sent = await self.wait_for_condition(_OUTGOING_APPEARED_JS, arg=appeared_arg, timeout_ms=self.ui_timeout_ms)
+                except Exception as e:
+                    logger.debug(f"Error al pulsar el botón de enviar: {e}")
+
+        if not sent:
+            self.last_send_latency = None
+            telemetry.event("compose.unconfirmed", "⚠️ No se detectó el mensaje enviado en la conversación.", level="warning")
+            return False
+
+        self.last_send_latency = time.perf_counter() - start
+        telemetry.event("compose.confirmed", f"✅ Mensaje enviado exitosamente a través de la interfaz ({self.last_send_latency:.2f} s).", latency=self.last_send_latency)
+        return True
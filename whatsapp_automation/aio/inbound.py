@@ -0,0 +1,84 @@
+"""
+Módulo AsyncInboundStream - Flujo de mensajes entrantes sobre playwright.async_api
+Mismo observador en la página, control de flujo y eventos que InboundStream (core.inbound); la espera
+de cada entrega es una corrutina, de modo que escuchar no bloquea el bucle de eventos.
+"""
+
+import json
+import time
+import logging
+from typing import AsyncIterator, Iterable, List, Optional
+
+from ..core.inbound import (
+    InboundEvent,
+    InboundStream,
+    INBOUND_OBSERVER_JS,
+    _INBOUND_BOOTSTRAP_JS,
+    _WAIT_INBOUND_JS,
+    _STOP_INBOUND_JS
+)
+from ..core.telemetry import telemetry
+
+logger = logging.getLogger("WhatsAppBot.AsyncInbound")
+
+
+class AsyncInboundStream(InboundStream):
+    """Flujo de eventos entrantes de una página asíncrona de WhatsApp Web."""
+
+    async def start(self) -> "AsyncInboundStream":
+        """Expone la función de entrega e instala el observador (también en las recargas futuras)."""
+        if self.started:
+            return self
+        config = self._config()
+        await self.page.expose_binding(self.binding, self._receive)
+        await self.page.add_init_script(script=f"({_INBOUND_BOOTSTRAP_JS})({INBOUND_OBSERVER_JS}, {json.dumps(config)})")
+        await self.page.evaluate(INBOUND_OBSERVER_JS, config)
+        self.started = True
+        telemetry.event("inbound.started", "📥 Escuchando mensajes entrantes...", level="debug")
+        return self
+
+    async def poll(self, timeout: float = 1.0) -> List[InboundEvent]:
+        """Eventos disponibles; con el búfer vacío espera a la siguiente entrega durante como mucho `timeout` s."""
+        if not self.started:
+            await self.start()
+        if not self._buffer and not self.closed:
+            try:
+                status = await self.page.evaluate(_WAIT_INBOUND_JS, max(int(timeout * 1000), 1))
+            except Exception as e:
+                logger.debug(f"Espera de eventos entrantes interrumpida: {e}")
+                status = None
+            if status:
+                self.pending = status["pending"]
+                self.dropped = status["dropped"]
+        events = list(self._buffer)
+        self._buffer.clear()
+        return events
+
+    async def events(self, timeout: Optional[float] = None, types: Optional[Iterable[str]] = None) -> AsyncIterator[InboundEvent]:
+        """Iterador asíncrono de eventos entrantes en el orden de llegada (ver InboundStream.events)."""
+        wanted = set(types) if types else None
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.closed:
+            remaining = self.wait_timeout if deadline is None else min(self.wait_timeout, deadline - time.monotonic())
+            if remaining <= 0:
+                return
+            for event in await self.poll(remaining):
+                if wanted is None or event.type in wanted:
+                    yield event
+
+    def __iter__(self):
+        raise TypeError("AsyncInboundStream se recorre con 'async for'.")
+
+    def __aiter__(self) -> AsyncIterator[InboundEvent]:
+        return self.events()
+
+    async def close(self) -> None:
+        """Detiene el observador de la página (las recargas posteriores no lo reinstalan)."""
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            if not self.page.is_closed():
+                await self.page.evaluate(_STOP_INBOUND_JS, self.binding)
+        except Exception as e:
+            logger.debug(f"Error deteniendo el observador de entrantes: {e}")
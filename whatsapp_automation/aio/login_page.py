@@ -0,0 +1,107 @@
+"""
+Módulo AsyncLoginPage - Page Object Model (POM) asíncrono
+Autenticación, detección de código QR, verificación de sesión y modales de bienvenida
+sobre playwright.async_api. Reutiliza los selectores y sondas de LoginPage.
+"""
+
+import logging
+from .base_page import AsyncBasePage
+from ..core.telemetry import telemetry
+from ..pages.login_dom import LoginSelectors, _SESSION_READY_JS
+
+logger = logging.getLogger("WhatsAppBot.AsyncLoginPage")
+
+
+class AsyncLoginPage(LoginSelectors, AsyncBasePage):
+    """Page Object asíncrono para la pantalla de inicio y autenticación de WhatsApp Web."""
+
+    @telemetry.traced("navigation")
+    async def navigate_to_whatsapp(self, timeout_ms: int = 60000) -> None:
+        """Navega a la URL oficial de WhatsApp Web."""
+        telemetry.event("login.navigate", f"🌐 Navegando a WhatsApp Web ({self.WHATSAPP_URL})...")
+        await self.page.goto(self.WHATSAPP_URL, timeout=timeout_ms, wait_until="domcontentloaded")
+        await self.sleep(2.0)
+
+    async def is_logged_in(self) -> bool:
+        """Verifica de inmediato si la sesión ya se encuentra autenticada."""
+        match = await self.resolve_selector(
+            self.LOGGED_IN_SELECTORS,
+            timeout_ms=0,
+            key="LoginPage.LOGGED_IN_SELECTORS"
+        )
+        return match is not None
+
+    async def is_session_ready(self) -> bool:
+        """Sonda rápida de un solo viaje: página abierta, en el origen y con la lista de chats."""
+        try:
+            if self.page.is_closed():
+                return False
+            return bool(await self.page.evaluate(_SESSION_READY_JS, [self.WHATSAPP_URL, self.LOGGED_IN_SELECTORS]))
+        except Exception as e:
+            logger.debug(f"Sonda de sesión fallida: {e}")
+            return False
+
+    async def is_qr_present(self) -> bool:
+        """Verifica si el código QR está visible en pantalla."""
+        match = await self.resolve_selector(self.QR_SELECTORS, timeout_ms=0, key="LoginPage.QR_SELECTORS")
+        return match is not None
+
+    @telemetry.traced("auth")
+    async def wait_for_authentication(self, timeout_seconds: int = 300) -> bool:
+        """
+        Espera a que el usuario complete la autenticación.
+        Si la sesión ya está guardada (cookies/storage), continúa de inmediato sin pedir QR.
+        """
+        telemetry.event("login.check", "🔍 Verificando estado de sesión...", level="debug")
+
+        if await self.is_logged_in():
+            telemetry.event("login.persistent_session", "⚡ ¡Sesión persistente detectada! No es necesario escanear QR.")
+            await self.handle_post_login_modals()
+            return True
+
+        telemetry.event("login.waiting_qr", "📱 Esperando código QR de autenticación...")
+        candidates = self.LOGGED_IN_SELECTORS + self.QR_SELECTORS
+        match = await self.resolve_selector(candidates, timeout_ms=25000)
+        if match and match.index < len(self.LOGGED_IN_SELECTORS):
+            telemetry.event("login.authenticated", "⚡ ¡Sesión iniciada exitosamente!")
+            await self.handle_post_login_modals()
+            return True
+
+        if match is not None:
+            telemetry.event("login.qr_shown", "📷 Código QR generado. Por favor, escanéalo con tu teléfono.")
+            telemetry.event("login.qr_waiting_scan", "⏳ Esperando que completes el escaneo en WhatsApp...")
+            if await self.resolve_selector(
+                self.LOGGED_IN_SELECTORS,
+                timeout_ms=timeout_seconds * 1000,
+                key="LoginPage.LOGGED_IN_SELECTORS"
+            ):
+                telemetry.event("login.authenticated", "✅ ¡Autenticación completada con éxito! Sesión guardada para futuros usos.")
+                await self.handle_post_login_modals()
+                return True
+
+            raise TimeoutError("Se agotó el tiempo de espera para escanear el código QR.")
+
+        if await self.is_logged_in():
+            telemetry.event("login.authenticated", "✅ Sesión activa confirmada.")
+            await self.handle_post_login_modals()
+            return True
+
+        return False
+
+    async def handle_post_login_modals(self, timeout_seconds: int = 5) -> None:
+        """Cierra modales emergentes post-login si aparecen."""
+        try:
+            for modal_sel in self.MODAL_SELECTORS:
+                modal = self.page.locator(modal_sel).first
+                if await modal.is_visible(timeout=timeout_seconds * 1000):
+                    telemetry.event("login.modal", "ℹ️ Modal post-login detectado. Cerrando...", level="debug")
+                    for btn_sel in self.MODAL_CLOSE_BUTTONS:
+                        btn = self.page.locator(btn_sel).first
+                        if await btn.is_visible():
+                            await btn.click()
+                            await self.sleep(1.0)
+                            return
+                    await self.page.keyboard.press("Escape")
+                    await self.sleep(0.5)
+        except Exception:
+            pass
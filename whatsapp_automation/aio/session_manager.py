@@ -0,0 +1,160 @@
+"""
+Módulo AsyncSessionManager - Sesión persistente sobre playwright.async_api
+Equivalente asíncrono de SessionManager: gestiona el ciclo de vida del navegador y la persistencia
+de sesión sin bloquear el bucle de eventos. Cada instancia es independiente (no es Singleton).
+"""
+
+import os
+import asyncio
+import logging
+from typing import Optional, Union
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright
+
+from ..core.browser_options import LAUNCH_ARGS, USER_AGENT
+from ..core.network_filter import NetworkFilter
+from ..core.browser_daemon import find_daemon
+from ..core.profile_maintenance import enforce_size_cap
+from ..core.profile_staging import ProfileStager
+from ..core.telemetry import telemetry
+from ..pages.selector_engine import SelectorEngine
+
+logger = logging.getLogger("WhatsAppBot.AsyncSessionManager")
+
+
+class AsyncSessionManager:
+    """
+    Administra un contexto persistente de Playwright desde asyncio, con las mismas opciones que
+    SessionManager: modo de red ligero, conexión al navegador residente, perfil en disco rápido
+    y cota de tamaño del perfil. Las operaciones de disco se ejecutan fuera del bucle de eventos.
+    """
+
+    def __init__(
+        self,
+        session_dir: Optional[str] = None,
+        headless: bool = False,
+        wait_time: float = 2.0,
+        network_filter: Optional[NetworkFilter] = None,
+        use_daemon: bool = True,
+        max_profile_mb: Optional[float] = None,
+        staging_dir: Union[bool, str, None] = None,
+        staging_sync_interval: float = 60.0
+    ):
+        self.session_dir = os.path.abspath(session_dir or os.path.join(os.getcwd(), "session_data"))
+        self.headless = headless
+        self.wait_time = wait_time
+        self.network_filter = network_filter
+        self.use_daemon = use_daemon
+        self.max_profile_mb = max_profile_mb
+        self.staging_dir = staging_dir
+        self.staging_sync_interval = staging_sync_interval
+        self.stager: Optional[ProfileStager] = None
+
+        self.playwright: Optional[Playwright] = None
+        self.browser: Optional[Browser] = None
+        self.context: Optional[BrowserContext] = None
+        self.page: Optional[Page] = None
+        self.attached = False
+
+    @telemetry.traced("session.start")
+    async def initialize_session(self) -> Page:
+        """
+        Inicia Playwright con un contexto persistente que almacena cookies,
+        IndexedDB y estado de autenticación en la carpeta `session_dir`.
+        """
+        if self.page and not self.page.is_closed():
+            return self.page
+
+        os.makedirs(self.session_dir, exist_ok=True)
+        telemetry.event("session.dir", f"📁 Directorio de sesión persistente: {self.session_dir}", level="debug")
+
+        if not self.playwright:
+            self.playwright = await async_playwright().start()
+
+        endpoint = await asyncio.to_thread(find_daemon, self.session_dir) if self.use_daemon else None
+        if endpoint:
+            await self._attach(endpoint)
+        else:
+            telemetry.event("session.launch", "🚀 Lanzando navegador con perfil de usuario persistente...", level="info")
+            self.context = await self.playwright.chromium.launch_persistent_context(
+                user_data_dir=await self._stage_profile(),
+                headless=self.headless,
+                args=LAUNCH_ARGS,
+                viewport=None,  # Usar tamaño de ventana real
+                user_agent=USER_AGENT
+            )
+            if self.stager:
+                self.stager.start_periodic()
+            self.page = self.context.pages[0] if len(self.context.pages) > 0 else await self.context.new_page()
+
+        if self.network_filter:
+            await self.network_filter.install_async(self.context)
+        return self.page
+
+    async def _stage_profile(self) -> str:
+        """Directorio desde el que se lanza Chromium: el perfil en disco o su copia en el directorio rápido."""
+        if not self.staging_dir:
+            return self.session_dir
+        staging_root = self.staging_dir if isinstance(self.staging_dir, str) else None
+        self.stager = ProfileStager(self.session_dir, staging_root, sync_interval=self.staging_sync_interval)
+        return await asyncio.to_thread(self.stager.stage)
+
+    @telemetry.traced("session.attach")
+    async def _attach(self, endpoint: str) -> None:
+        """Se conecta por CDP al navegador residente y reutiliza su pestaña de WhatsApp Web ya sincronizada."""
+        telemetry.event("session.attach", f"🔌 Conectando al navegador residente del perfil ({endpoint})...", level="info")
+        self.browser = await self.playwright.chromium.connect_over_cdp(endpoint)
+        self.context = self.browser.contexts[0]
+        pages = self.context.pages
+        whatsapp_pages = [p for p in pages if p.url.startswith(SelectorEngine.WHATSAPP_URL)]
+        self.page = (whatsapp_pages or pages or [None])[0] or await self.context.new_page()
+        self.attached = True
+
+    async def get_page(self) -> Page:
+        """Retorna la página activa o la inicializa si no existe."""
+        if not self.page or self.page.is_closed():
+            return await self.initialize_session()
+        return self.page
+
+    @telemetry.traced("session.close")
+    async def close(self) -> None:
+        """Cierra el contexto y libera los recursos de Playwright."""
+        try:
+            if self.attached:
+                # El navegador pertenece al demonio: solo se desconecta este cliente
+                telemetry.event("session.detach", "🔌 Desconectando del navegador residente (sigue en marcha).", level="info")
+                self.browser = None
+                self.context = None
+                self.page = None
+                self.attached = False
+            elif self.context:
+                telemetry.event("session.close", "🔒 Guardando cookies y cerrando sesión del navegador...", level="info")
+                try:
+                    await self.context.close()
+                finally:
+                    self.context = None
+                    self.page = None
+            if self.playwright:
+                try:
+                    await self.playwright.stop()
+                finally:
+                    self.playwright = None
+        except Exception as e:
+            logger.debug(f"Error al cerrar AsyncSessionManager: {e}")
+        finally:
+            # La copia en tmpfs no sobrevive al reinicio: se escribe al disco aunque el cierre haya fallado
+            if self.stager:
+                stager, self.stager = self.stager, None
+                try:
+                    await asyncio.to_thread(stager.finalize)
+                except Exception as e:
+                    telemetry.event("profile.write_back_failed", f"⚠️ No se pudo escribir el perfil de vuelta al disco: {e}", level="warning")
+        report = await asyncio.to_thread(enforce_size_cap, self.session_dir, self.max_profile_mb)
+        if report:
+            telemetry.event("profile.compacted", f"🧹 Perfil compactado al superar {self.max_profile_mb:g} MB: {report.summary()}", level="info")
+
+    async def __aenter__(self):
+        await self.initialize_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
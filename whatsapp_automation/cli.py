@@ -4,17 +4,17 @@ Interfaz de línea de comandos para WhatsApp Automation (RPA)
 
 import argparse
 import sys
-from .core.bot_facade import WhatsAppBotFacade
 
 
 def main():
     """CLI principal del bot de WhatsApp."""
     parser = argparse.ArgumentParser(
         description='Bot de Automatización de WhatsApp (RPA)',
-        epilog='Ejemplo: whatsapp-send +1234567890 "Hola Mundo"'
+        epilog='Ejemplos: whatsapp-send +1234567890 "Hola Mundo" | '
+               'whatsapp-send --batch clientes.csv --template "Hola {nombre}" --resume'
     )
     
-    parser.add_argument('phone', help='Número de teléfono o nombre del contacto')
+    parser.add_argument('phone', nargs='?', default=None, help='Número de teléfono o nombre del contacto')
     parser.add_argument('message', nargs='?', default=None,
                         help='Mensaje a enviar. Si se omite, envía el reporte técnico con patrones de diseño.')
     parser.add_argument('--wait-time', type=int, default=2, 
@@ -23,28 +23,125 @@ def main():
                         help='Ejecutar en segundo plano sin interfaz gráfica')
     parser.add_argument('--session-dir', type=str, default='session_data',
                         help='Directorio de persistencia de sesión/cookies')
+    parser.add_argument('--no-daemon', action='store_true',
+                        help='No conectarse al navegador residente (whatsapp-daemon) aunque esté en marcha')
     parser.add_argument('--note', type=str, default=None,
                         help='Nota personalizada opcional para el reporte')
     parser.add_argument('--version', action='version', version='%(prog)s 2.0.0')
+    parser.add_argument('--log-level', choices=['debug', 'info', 'warning', 'error', 'silent'], default=None,
+                        help='Nivel mínimo de los eventos mostrados en consola (default: info)')
+    parser.add_argument('--metrics-jsonl', metavar='FILE', default=None,
+                        help='Registrar tramos por fase, eventos y contadores en un archivo JSON-lines')
+    parser.add_argument('--metrics-prom', metavar='FILE', default=None,
+                        help='Escribir las métricas en formato de texto de Prometheus al terminar')
+
+    batch = parser.add_argument_group('envío masivo')
+    batch.add_argument('--batch', metavar='FILE', default=None,
+                       help='Archivo CSV/TSV/JSONL con una fila por envío (columnas phone y message o variables de --template)')
+    batch.add_argument('--template', type=str, default=None,
+                       help='Plantilla del mensaje con variables {columna} de cada fila')
+    batch.add_argument('--phone-column', type=str, default='phone',
+                       help='Columna con el destinatario (default: phone)')
+    batch.add_argument('--country-code', type=str, default=None,
+                       help='Código de país que sustituye al prefijo troncal 0 de los números locales (p. ej. 58: 0412... → +58412...); no se aplica a números sin 0 inicial')
+    batch.add_argument('--concurrency', type=int, default=1,
+                       help='Perfiles enviando en paralelo, un proceso por perfil (default: 1)')
+    batch.add_argument('--profile', action='append', default=None, metavar='DIR',
+                       help='Perfil autenticado para --concurrency (repetible); por defecto <session-dir>, <session-dir>_2, ...')
+    batch.add_argument('--results', metavar='FILE', default=None,
+                       help='Archivo JSONL de resultados (default: <batch>.results.jsonl)')
+    batch.add_argument('--resume', action='store_true',
+                       help='Omitir los trabajos ya enviados según el archivo de resultados')
+    batch.add_argument('--index-contacts', action='store_true',
+                       help='Indexar la lista de chats una vez y abrir los chats conocidos sin búsqueda')
     
     args = parser.parse_args()
-    
+
+    from .core.telemetry import telemetry
+    telemetry.configure(
+        console_level=args.log_level,
+        jsonl_path=args.metrics_jsonl,
+        prometheus_path=args.metrics_prom
+    )
+
+    if args.batch:
+        code = _run_batch(args)
+        telemetry.close()
+        sys.exit(code)
+    if not args.phone:
+        parser.error('indica un destinatario o --batch FILE')
+
+    # Importación diferida: --help/--version no cargan Playwright
+    from .core.bot_facade import WhatsAppBotFacade
+
     try:
         with WhatsAppBotFacade(
             session_dir=args.session_dir,
             headless=args.headless,
-            wait_time=args.wait_time
+            wait_time=args.wait_time,
+            use_daemon=not args.no_daemon
         ) as bot:
             if args.message:
-                bot.send_message(phone=args.phone, message=args.message)
+                sent = bot.send_message(phone=args.phone, message=args.message)
             else:
-                bot.send_technical_report(phone=args.phone, custom_note=args.note)
-                
-            print("🎉 ¡Mensaje enviado con éxito!")
-            
+                sent = bot.send_technical_report(phone=args.phone, custom_note=args.note)
+
+        if not sent:
+            print("❌ Error: no se confirmó el envío; el mensaje no apareció en la conversación.", file=sys.stderr)
+            sys.exit(1)
+        print("🎉 ¡Mensaje enviado con éxito!")
+
     except Exception as e:
         print(f"❌ Error: {str(e)}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        telemetry.close()
+
+
+def batch_profiles(session_dir: str, concurrency: int, profiles=None):
+    """Perfiles del envío masivo: los indicados o `<session_dir>`, `<session_dir>_2`, ... hasta `concurrency`."""
+    if concurrency < 1:
+        raise ValueError("--concurrency debe ser al menos 1.")
+    profiles = list(profiles or [session_dir])
+    for index in range(len(profiles) + 1, concurrency + 1):
+        profiles.append(f"{session_dir.rstrip('/')}_{index}")
+    return profiles[:concurrency]
+
+
+def _run_batch(args) -> int:
+    """Modo masivo: todos los envíos de `--batch` en una sesión por perfil, con progreso y reanudación."""
+    from .core.batch import run_batch
+    from .services.mail_merge import MailMerge
+    from .services.message_builder import MessageBuilder
+
+    try:
+        profiles = batch_profiles(args.session_dir, args.concurrency, args.profile)
+        merge = MailMerge(
+            args.batch,
+            builder=MessageBuilder().set_template(args.template) if args.template else None,
+            phone_field=args.phone_column,
+            default_country_code=args.country_code
+        )
+        print(f"📦 Envío masivo desde {args.batch} con {len(profiles)} perfil(es): {', '.join(profiles)}")
+        summary = run_batch(
+            args.batch,
+            profiles,
+            merge=merge,
+            results_path=args.results,
+            resume=args.resume,
+            headless=args.headless,
+            wait_time=args.wait_time,
+            use_daemon=not args.no_daemon,
+            index_contacts=args.index_contacts
+        )
+    except Exception as e:
+        print(f"❌ Error: {str(e)}", file=sys.stderr)
+        return 1
+
+    print(f"🏁 {summary['sent']} enviados, {summary['failed']} fallidos, {summary['skipped']} omitidos, "
+          f"{summary['rejected']} filas inválidas ({summary['messages_per_minute']:.1f} msg/min). "
+          f"Resultados en {summary['results_path']}")
+    return 0 if summary['failed'] == 0 else 1
 
 
 if __name__ == "__main__":
@@ -1,7 +1,85 @@
-from .session_manager import SessionManager
-from .bot_facade import WhatsAppBotFacade
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
+
+
+_EXPORTS = {
+    "SessionManager": ".session_manager",
+    "WhatsAppBotFacade": ".bot_facade",
+    "SessionPool": ".session_pool",
+    "PooledSession": ".session_pool",
+    "CampaignRunner": ".campaign",
+    "CampaignReport": ".campaign",
+    "SendJob": ".jobs",
+    "SendResult": ".jobs",
+    "summarize_results": ".jobs",
+    "OutboundQueue": ".outbound_queue",
+    "idempotency_key": ".outbound_queue",
+    "PacingScheduler": ".scheduler",
+    "TokenBucket": ".scheduler",
+    "Rate": ".scheduler",
+    "NetworkFilter": ".network_filter",
+    "Telemetry": ".telemetry",
+    "telemetry": ".telemetry",
+    "InboundStream": ".inbound",
+    "InboundEvent": ".inbound",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .session_manager import SessionManager
+    from .bot_facade import WhatsAppBotFacade
+    from .session_pool import (
+        SessionPool,
+        PooledSession
+    )
+    from .campaign import (
+        CampaignRunner,
+        CampaignReport
+    )
+    from .jobs import (
+        SendJob,
+        SendResult,
+        summarize_results
+    )
+    from .outbound_queue import (
+        OutboundQueue,
+        idempotency_key
+    )
+    from .scheduler import (
+        PacingScheduler,
+        TokenBucket,
+        Rate
+    )
+    from .network_filter import NetworkFilter
+    from .telemetry import (
+        Telemetry,
+        telemetry
+    )
+    from .inbound import (
+        InboundStream,
+        InboundEvent
+    )
 
 __all__ = [
     "SessionManager",
     "WhatsAppBotFacade",
+    "SessionPool",
+    "PooledSession",
+    "CampaignRunner",
+    "CampaignReport",
+    "SendJob",
+    "SendResult",
+    "summarize_results",
+    "OutboundQueue",
+    "idempotency_key",
+    "PacingScheduler",
+    "TokenBucket",
+    "Rate",
+    "NetworkFilter",
+    "Telemetry",
+    "telemetry",
+    "InboundStream",
+    "InboundEvent",
 ]
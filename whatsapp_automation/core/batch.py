@@ -0,0 +1,223 @@
+"""
+Módulo Batch - Envío masivo desde un archivo CSV/JSONL en una sola sesión de navegador
+Lee la fuente con MailMerge, envía con un único WhatsAppBotFacade (o con CampaignRunner repartido
+en varios perfiles), muestra una línea de progreso con el ritmo de envío y registra cada resultado
+en un archivo JSONL que permite reanudar la ejecución omitiendo los trabajos ya enviados.
+"""
+
+import os
+import csv
+import sys
+import json
+import time
+import logging
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Sequence, Set, TextIO
+
+from .jobs import SendJob, SendResult
+from .campaign import CampaignRunner, default_facade_factory
+from .telemetry import telemetry
+from ..services.mail_merge import MailMerge, detect_format
+
+logger = logging.getLogger("WhatsAppBot.Batch")
+
+
+def default_results_path(source: str) -> str:
+    """Archivo de resultados por defecto junto a la fuente (`<fuente>.results.jsonl`)."""
+    return f"{source}.results.jsonl"
+
+
+def load_completed(results_path: str) -> Set[str]:
+    """
+    Identificadores de los trabajos que no deben repetirse según un archivo de resultados previo:
+    los enviados con éxito y los parciales (repetirlos duplicaría las partes ya entregadas).
+    """
+    completed: Set[str] = set()
+    if not os.path.exists(results_path):
+        return completed
+    with open(results_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Última línea truncada por una interrupción: ese trabajo se reintenta
+                continue
+            if (record.get("success") or record.get("partial")) and record.get("job_id"):
+                completed.add(record["job_id"])
+    return completed
+
+
+def count_rows(source: str) -> int:
+    """Número de filas de la fuente (una pasada en streaming, sin cargarla en memoria)."""
+    source_format = detect_format(source)
+    with open(source, "r", encoding="utf-8-sig", newline="") as f:
+        if source_format == "jsonl":
+            return sum(1 for line in f if line.strip())
+        return max(sum(1 for _ in csv.reader(f, delimiter="\t" if source_format == "tsv" else ",")) - 1, 0)
+
+
+class ResultLog:
+    """Registro JSONL de resultados: una línea por trabajo, escrita y volcada al terminar cada envío."""
+
+    def __init__(self, path: str, append: bool = False):
+        self.path = path
+        self._file = open(path, "a" if append else "w", encoding="utf-8")
+        # Una interrupción pudo dejar la última línea sin terminar: no se mezcla con la siguiente
+        if append and self._file.tell() > 0:
+            with open(path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    self._file.write("\n")
+
+    def write(self, result: SendResult) -> None:
+        self._file.write(json.dumps(result.to_dict(), ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class BatchProgress:
+    """
+    Línea de progreso en vivo: enviados, fallidos, mensajes por minuto y tiempo restante estimado.
+    En una terminal se reescribe en el sitio; en otra salida se imprime una línea cada `interval` s.
+    """
+
+    def __init__(self, total: Optional[int] = None, stream: Optional[TextIO] = None, interval: Optional[float] = None):
+        self.total = total
+        self.stream = stream or sys.stderr
+        self.interactive = hasattr(self.stream, "isatty") and self.stream.isatty()
+        self.interval = interval if interval is not None else (0.5 if self.interactive else 5.0)
+        self.sent = 0
+        self.failed = 0
+        self.skipped = 0
+        self.rejected = 0
+        self.started = time.time()
+        self._last_render = 0.0
+
+    @property
+    def done(self) -> int:
+        return self.sent + self.failed
+
+    def update(self, result: SendResult) -> None:
+        if result.success:
+            self.sent += 1
+        else:
+            self.failed += 1
+        now = time.time()
+        if now - self._last_render >= self.interval:
+            self._last_render = now
+            self.render()
+
+    def line(self) -> str:
+        elapsed = max(time.time() - self.started, 1e-9)
+        rate = self.done / elapsed * 60
+        text = f"⏳ {self.done}"
+        if self.total is not None:
+            text += f"/{self.total}"
+        text += f" procesados · ✅ {self.sent} · ❌ {self.failed}"
+        if self.skipped or self.rejected:
+            text += f" · ⏭️  {self.skipped} omitidos · ⚠️  {self.rejected} inválidos"
+        text += f" · {rate:.1f} msg/min"
+        if self.total is not None and self.done:
+            remaining = max(self.total - self.skipped - self.rejected - self.done, 0) / (self.done / elapsed)
+            text += f" · ETA {int(remaining // 60)}m{int(remaining % 60):02d}s"
+        return text
+
+    def render(self) -> None:
+        if self.interactive:
+            self.stream.write("\r\033[K" + self.line())
+        else:
+            self.stream.write(self.line() + "\n")
+        self.stream.flush()
+
+    def finish(self) -> None:
+        self.render()
+        if self.interactive:
+            self.stream.write("\n")
+            self.stream.flush()
+
+    def summary(self) -> Dict[str, Any]:
+        elapsed = time.time() - self.started
+        return {
+            "total": self.done,
+            "sent": self.sent,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "rejected": self.rejected,
+            "duration_seconds": elapsed,
+            "messages_per_minute": (self.done / elapsed * 60) if elapsed > 0 else 0.0,
+        }
+
+
+def _skip_completed(jobs: Iterable[SendJob], completed: Set[str], progress: BatchProgress) -> Iterator[SendJob]:
+    for job in jobs:
+        if job.job_id in completed:
+            progress.skipped += 1
+            continue
+        yield job
+
+
+def run_batch(
+    source: str,
+    profiles: Sequence[str],
+    merge: Optional[MailMerge] = None,
+    results_path: Optional[str] = None,
+    resume: bool = False,
+    read_ahead: int = 32,
+    progress_stream: Optional[TextIO] = None,
+    facade_factory: Callable[..., Any] = default_facade_factory,
+    **facade_kwargs
+) -> Dict[str, Any]:
+    """
+    Envía todos los trabajos de `source` y retorna el resumen de la ejecución.
+    Con un perfil se usa una única sesión en streaming; con varios, un proceso por perfil.
+
+    Args:
+        source: Archivo CSV/TSV/JSONL con los destinatarios (y mensajes o variables de plantilla)
+        profiles: Directorios de perfil autenticados (uno por proceso trabajador)
+        merge: MailMerge ya configurado (plantilla, columnas); por defecto uno con la columna "message"
+        results_path: Archivo JSONL de resultados (por defecto `<source>.results.jsonl`)
+        resume: Omitir los trabajos con resultado exitoso en `results_path` y añadir al archivo
+        read_ahead: Filas preparadas por adelantado mientras se envía (solo con un perfil)
+        facade_factory: Fábrica `factory(profile_dir, **kwargs)` del Facade de cada perfil
+        **facade_kwargs: Argumentos para el Facade (headless, wait_time, use_daemon...)
+    """
+    if not profiles:
+        raise ValueError("Se requiere al menos un perfil de sesión para el envío masivo.")
+    merge = merge or MailMerge(source)
+    results_path = results_path or default_results_path(source)
+    completed = load_completed(results_path) if resume else set()
+
+    progress = BatchProgress(total=count_rows(source), stream=progress_stream)
+    if completed:
+        telemetry.event("batch.resume", f"🔁 Reanudando: {len(completed)} trabajos ya enviados en {results_path} se omitirán.")
+
+    with ResultLog(results_path, append=resume) as log:
+        def record(result: SendResult) -> None:
+            log.write(result)
+            progress.rejected = merge.rejected
+            progress.update(result)
+
+        if len(profiles) == 1:
+            jobs = merge.jobs(read_ahead_size=read_ahead)
+            try:
+                with facade_factory(profiles[0], **facade_kwargs) as bot:
+                    for result in bot.iter_send(_skip_completed(jobs, completed, progress)):
+                        record(result)
+            finally:
+                jobs.close()
+        else:
+            runner = CampaignRunner(profiles, facade_factory=facade_factory, **facade_kwargs)
+            runner.run(_skip_completed(merge.jobs(), completed, progress), on_result=record)
+
+    progress.rejected = merge.rejected
+    progress.finish()
+    summary = progress.summary()
+    summary["results_path"] = results_path
+    return summary
@@ -7,12 +7,22 @@ ocultando la complejidad de sincronización de Playwright, Page Objects y Sessio
 import sys
 import time
 import logging
-from typing import Optional
+from contextlib import nullcontext
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Union
 
 from .session_manager import SessionManager
+from .jobs import JobLike, SendResult, coerce_job
+from .delivery import OPEN_STRATEGIES, build_result, check_open_strategy, direct_phone, report_paced
+from .outbound_queue import OutboundQueue
+from .scheduler import PacingScheduler
+from .network_filter import NetworkFilter, resolve_network_filter
+from .telemetry import telemetry
+from .inbound import InboundEvent, InboundStream
 from ..pages.login_page import LoginPage
 from ..pages.chat_page import ChatPage
+from ..pages.selector_cache import SelectorCache
 from ..services.message_builder import MessageBuilder, TechnicalReportStrategy, CustomMessageStrategy
+from ..services.mail_merge import MailMerge
 
 logger = logging.getLogger("WhatsAppBot.Facade")
 
@@ -23,44 +33,114 @@ class WhatsAppBotFacade:
     Interactúa 100% a través de la interfaz gráfica (búsqueda lateral, selección de chat y redacción).
     """
 
+    OPEN_STRATEGIES = OPEN_STRATEGIES
+
     def __init__(
         self,
         session_dir: Optional[str] = None,
         headless: bool = False,
         wait_time: float = 2.0,
-        auto_close: bool = True
+        auto_close: bool = True,
+        ui_timeout: float = 15.0,
+        adaptive_selectors: bool = True,
+        session_manager=None,
+        open_strategy: str = "auto",
+        default_country_code: Optional[str] = None,
+        insert_mode: str = "paste",
+        scheduler: Optional[PacingScheduler] = None,
+        lean_network: Union[bool, NetworkFilter] = False,
+        use_daemon: bool = True,
+        max_profile_mb: Optional[float] = None,
+        staging_dir: Union[bool, str, None] = None,
+        index_contacts: bool = False
     ):
         self.session_dir = session_dir
         self.headless = headless
         self.wait_time = wait_time
         self.auto_close = auto_close
+        # Cota superior de cada espera por condición en la interfaz (segundos)
+        self.ui_timeout = ui_timeout
+        # Apertura de chats: "auto" (números: chat abierto, búsqueda y como último recurso la ruta
+        # de envío por número; nombres: búsqueda), "search" o "direct" (siempre la ruta por número)
+        self.open_strategy = check_open_strategy(open_strategy)
+        self.default_country_code = default_country_code
+        # Inserción del texto: "paste" (un único evento de pegado) o "keyboard" (línea a línea)
+        self.insert_mode = insert_mode
+        # Ritmo de envío (cubetas global / por destinatario / por perfil); None = sin límite
+        self.scheduler = scheduler
+        # Índice de la lista de chats: los destinatarios conocidos se abren sin búsqueda ni recarga
+        self.index_contacts = index_contacts
 
-        # Singleton Session Manager
-        self.session_manager = SessionManager(
+        # Singleton Session Manager (o una sesión inyectada, p. ej. de un SessionPool)
+        if session_manager is not None:
+            # Las opciones del navegador pertenecen a la sesión inyectada (p. ej. SessionPool(network_filter=...)):
+            # se rechazan en lugar de ignorarlas en silencio
+            browser_options = {"lean_network": (lean_network, False), "use_daemon": (use_daemon, True),
+                               "max_profile_mb": (max_profile_mb, None), "staging_dir": (staging_dir, None)}
+            ignored = [name for name, (value, default) in browser_options.items() if value is not default and value != default]
+            if ignored:
+                raise ValueError(
+                    f"{', '.join(ignored)} no se aplica(n) con una sesión inyectada; configúralo(s) en la sesión "
+                    f"o en el SessionPool que la crea."
+                )
+        # Modo de red ligero: True usa las reglas por defecto; también acepta un NetworkFilter propio
+        self.network_filter = resolve_network_filter(lean_network)
+        self.session_manager = session_manager or SessionManager(
             session_dir=self.session_dir,
             headless=self.headless,
-            wait_time=self.wait_time
+            wait_time=self.wait_time,
+            network_filter=self.network_filter,
+            # Conexión al navegador residente (whatsapp-daemon) si está en marcha para el perfil
+            use_daemon=use_daemon,
+            # Cota de tamaño del perfil comprobada al cerrar (poda de cachés reconstruibles)
+            max_profile_mb=max_profile_mb,
+            # Perfil en disco RAM (tmpfs) con escritura diferida de las partes críticas
+            staging_dir=staging_dir
         )
+        self.session_dir = self.session_manager.session_dir
+        # Orden adaptativo de selectores persistido junto al directorio de sesión
+        self.selector_cache: Optional[SelectorCache] = None
+        if adaptive_selectors:
+            self.selector_cache = SelectorCache(SelectorCache.default_path(self.session_manager.session_dir))
         self.page = None
         self.login_page: Optional[LoginPage] = None
         self.chat_page: Optional[ChatPage] = None
+        self.inbound: Optional[InboundStream] = None
+        self.authenticated = False
 
     def initialize(self) -> None:
         """Inicia el navegador y los Page Objects."""
         self.page = self.session_manager.initialize_session()
-        self.login_page = LoginPage(self.page, wait_time=self.wait_time)
-        self.chat_page = ChatPage(self.page, wait_time=self.wait_time)
+        self.authenticated = False
+        self.login_page = LoginPage(self.page, wait_time=self.wait_time, selector_cache=self.selector_cache)
+        self.chat_page = ChatPage(
+            self.page,
+            wait_time=self.wait_time,
+            ui_timeout=self.ui_timeout,
+            selector_cache=self.selector_cache,
+            insert_mode=self.insert_mode,
+            default_country_code=self.default_country_code
+        )
 
     def authenticate(self, timeout_seconds: int = 300) -> bool:
         """
-        Navega a WhatsApp Web y asegura que la sesión esté lista.
-        Si la sesión ya fue guardada en el perfil, se inicia instantáneamente.
+        Asegura que la sesión de WhatsApp Web esté lista.
+        Si la página ya está autenticada (abierta, en web.whatsapp.com y con la lista de chats
+        cargada) se reutiliza sin recargar; solo se navega de nuevo si la página se cerró,
+        salió del origen o perdió la sesión.
         """
-        if not self.login_page:
+        if not self.login_page or not self.page or self.page.is_closed():
             self.initialize()
 
+        if self.login_page.is_session_ready():
+            self.authenticated = True
+            return True
+
+        if self.authenticated:
+            logger.debug("La sesión dejó de estar lista; recargando WhatsApp Web.")
         self.login_page.navigate_to_whatsapp()
-        return self.login_page.wait_for_authentication(timeout_seconds=timeout_seconds)
+        self.authenticated = self.login_page.wait_for_authentication(timeout_seconds=timeout_seconds)
+        return self.authenticated
 
     def send_message(self, phone: str, message: str) -> bool:
         """
@@ -73,24 +153,223 @@ class WhatsAppBotFacade:
         Returns:
             bool: True si el mensaje se envió con éxito
         """
-        self.authenticate()
+        self._pace(phone)
+        with self._session_in_use():
+            self.authenticate()
+            success = self._deliver(phone, message)
+
+        telemetry.count("messages_sent" if success else "messages_failed")
+        if success:
+            telemetry.event("send.completed", "\n🎉 ¡PROCESO COMPLETADO! Mensaje entregado con éxito a través de la UI.")
+
+        return success
+
+    def iter_send(self, jobs: Iterable[JobLike], timeout_seconds: int = 300) -> Iterator[SendResult]:
+        """
+        Modo lote en streaming: autentica una sola vez, conserva la página cargada
+        y procesa cada trabajo a través de ChatPage, produciendo un SendResult por trabajo.
+        Los errores de un trabajo se registran en su resultado y no detienen el lote.
+
+        Args:
+            jobs: Iterable de SendJob, diccionarios {"phone", "message"} o tuplas (phone, message)
+            timeout_seconds: Tiempo máximo de espera para la autenticación inicial
+        """
+        with self._session_in_use():
+            if not self.authenticate(timeout_seconds=timeout_seconds):
+                raise RuntimeError("No se pudo autenticar la sesión de WhatsApp Web para el envío por lotes.")
+
+        for raw_job in jobs:
+            job = coerce_job(raw_job)
+            paced_seconds = self._pace(job.phone)
+            started_at = time.time()
+            error = None
+            self.chat_page.last_parts_sent = 0
+            try:
+                with self._session_in_use():
+                    # Sonda barata: recupera la sesión si la página se cerró (p. ej. desalojo del pool)
+                    self.authenticate(timeout_seconds=timeout_seconds)
+                    success = self._deliver(job.phone, job.message)
+            except Exception as e:
+                logger.debug(f"Error enviando a {job.phone}: {e}")
+                success = False
+                error = str(e)
+            yield build_result(job, success, error, started_at, self.chat_page,
+                               profile=self.session_dir, paced_seconds=paced_seconds)
+
+    def send_many(self, jobs: Iterable[JobLike], timeout_seconds: int = 300) -> List[SendResult]:
+        """
+        Envía un lote de mensajes reutilizando una única página autenticada.
+        Equivale a consumir `iter_send` por completo.
+        """
+        return list(self.iter_send(jobs, timeout_seconds=timeout_seconds))
+
+    def iter_merge(
+        self,
+        source,
+        builder: Optional[MessageBuilder] = None,
+        read_ahead: int = 32,
+        timeout_seconds: int = 300,
+        **merge_kwargs
+    ) -> Iterator[SendResult]:
+        """
+        Combinación de correspondencia en streaming: lee la fuente CSV/JSONL fila a fila, renderiza
+        cada mensaje con `builder` y lo envía en cuanto está listo (memoria constante).
+
+        Args:
+            source: Ruta CSV/TSV/JSONL, iterable de diccionarios o un MailMerge ya configurado
+            builder: MessageBuilder a renderizar por fila (sin él se usa la columna "message")
+            read_ahead: Filas leídas y renderizadas por adelantado en segundo plano (0 = sin solape)
+            **merge_kwargs: Opciones adicionales de MailMerge (phone_field, on_reject, ...)
+        """
+        if isinstance(source, MailMerge):
+            merge = source
+        else:
+            merge_kwargs.setdefault("default_country_code", self.default_country_code)
+            merge = MailMerge(source, builder=builder, **merge_kwargs)
+        jobs = merge.jobs(read_ahead_size=read_ahead)
+        try:
+            yield from self.iter_send(jobs, timeout_seconds=timeout_seconds)
+        finally:
+            jobs.close()
+
+    def open_queue(self, **queue_kwargs) -> OutboundQueue:
+        """Abre la cola de salida persistente asociada al directorio de sesión."""
+        return OutboundQueue(OutboundQueue.default_path(self.session_dir), **queue_kwargs)
+
+    def drain_queue(
+        self,
+        queue: Optional[OutboundQueue] = None,
+        timeout_seconds: int = 300
+    ) -> Dict[str, int]:
+        """
+        Envía todos los trabajos pendientes de la cola de salida persistente.
+        Cada trabajo se reclama justo antes de enviarlo y su resultado se confirma en la cola al
+        instante, de modo que una ejecución interrumpida se reanuda en el siguiente `drain_queue`
+        sin reenviar lo ya enviado (solo el trabajo en curso durante la caída queda `in_flight`).
+
+        Args:
+            queue: Cola a vaciar (por defecto la asociada al directorio de sesión)
+            timeout_seconds: Tiempo máximo de espera para la autenticación inicial
+
+        Returns:
+            Dict[str, int]: Conteo final de trabajos por estado
+        """
+        owned = queue is None
+        queue = queue or self.open_queue()
+        try:
+            for result in self.iter_send(queue.iter_claimed(), timeout_seconds=timeout_seconds):
+                queue.complete(result)
+            queue.flush()
+            stats = queue.stats()
+        finally:
+            if owned:
+                queue.close()
+        telemetry.event("queue.drained", f"📬 Cola de salida: {stats['sent']} enviados, {stats['failed']} fallidos, "
+                                          f"{stats['partial']} parciales, {stats['pending']} pendientes.")
+        return stats
+
+    def open_inbound(self, timeout_seconds: int = 300, **stream_kwargs) -> InboundStream:
+        """
+        Flujo de eventos entrantes de la página autenticada (se instala una vez y se reutiliza).
+        Los argumentos adicionales (`max_buffer`, `max_pending`, `batch_size`) se pasan a InboundStream.
+        """
+        with self._session_in_use():
+            if not self.authenticate(timeout_seconds=timeout_seconds):
+                raise RuntimeError("No se pudo autenticar la sesión de WhatsApp Web.")
+            if self.inbound is None or self.inbound.closed or self.inbound.page is not self.page:
+                self.inbound = InboundStream(self.page, **stream_kwargs).start()
+        return self.inbound
+
+    def iter_inbound(
+        self,
+        timeout: Optional[float] = None,
+        types: Optional[Iterable[str]] = None,
+        **stream_kwargs
+    ) -> Iterator[InboundEvent]:
+        """
+        Iterador de eventos entrantes ("message", "unread", "chat_updated") a medida que la página
+        los empuja; entre eventos no hay sondeo del DOM.
+
+        Args:
+            timeout: Duración total de la escucha en segundos (None = indefinida)
+            types: Tipos de evento a producir (por defecto todos)
+        """
+        stream = self.open_inbound(**stream_kwargs)
+        for event in stream.events(timeout=timeout, types=types):
+            telemetry.count("inbound_events", type=event.type)
+            telemetry.event("inbound.event", f"📥 {event.type} de {event.chat}: {event.text or event.unread or ''}", level="debug")
+            yield event
+
+    def watch_inbound(
+        self,
+        callback: Callable[[InboundEvent], Optional[bool]],
+        timeout: Optional[float] = None,
+        types: Optional[Iterable[str]] = None,
+        **stream_kwargs
+    ) -> int:
+        """
+        Invoca `callback` con cada evento entrante hasta agotar `timeout` o hasta que retorne False.
+        Retorna el número de eventos entregados.
+        """
+        delivered = 0
+        for event in self.iter_inbound(timeout=timeout, types=types, **stream_kwargs):
+            delivered += 1
+            if callback(event) is False:
+                break
+        return delivered
+
+    @telemetry.traced("send.pacing")
+    def _pace(self, phone: str) -> float:
+        """Espera lo que exija el planificador de ritmo (fuera del uso de la sesión) y retorna la espera."""
+        if not self.scheduler:
+            return 0.0
+        return report_paced(phone, self.scheduler.acquire(phone, profile=self.session_dir))
+
+    def _session_in_use(self):
+        """Marca la sesión como ocupada si lo soporta (sesiones de SessionPool)."""
+        using = getattr(self.session_manager, "using", None)
+        return using() if using else nullcontext()
+
+    @telemetry.traced("send")
+    def _deliver(self, phone: str, message: str) -> bool:
+        """Abre el chat y envía el mensaje sobre la página ya autenticada."""
+        telemetry.event("send.start", f"\n📨 Iniciando proceso de envío a: {phone}")
+
+        phone_e164 = direct_phone(phone, self.open_strategy, self.default_country_code)
+
+        # 0. La conversación del destinatario ya está abierta (envíos consecutivos): se reutiliza
+        if phone_e164 and self.chat_page.is_chat_open(phone_e164):
+            return self.chat_page.type_and_send_message(message)
+
+        # 1. Destinatario ya presente en la lista de chats: se abre su fila directamente
+        if self.index_contacts:
+            if self.chat_page.contact_index is None:
+                self.chat_page.build_contact_index()
+            if self.chat_page.open_indexed_chat(phone):
+                return self.chat_page.type_and_send_message(message)
+
+        if phone_e164:
+            # 2. En "auto" el número se busca dentro de la aplicación (sin recargar WhatsApp Web);
+            # la ruta de envío por número, que recarga la página, queda para los chats que no aparecen
+            if self.open_strategy == "auto" and self.chat_page.search_and_select_contact(phone_e164, enter_fallback=False):
+                return self.chat_page.type_and_send_message(message)
+            if not self.chat_page.open_chat_by_phone(phone_e164, prefill=message):
+                raise RuntimeError(f"No se pudo abrir el chat directo con '{phone_e164}' en WhatsApp Web.")
+            # 3. Enviar el texto precargado por la URL; se escribe solo si no cupo en ella o la
+            # caja nunca se llenó (un envío precargado sin confirmar no se repite)
+            if self.chat_page.prefill_requested:
+                sent = self.chat_page.send_prefilled_message()
+                if sent is not None:
+                    return sent
+            return self.chat_page.type_and_send_message(message)
 
-        print(f"\n📨 Iniciando proceso de envío a: {phone}")
-        
-        # 1. Búsqueda y selección visual en la barra lateral
         chat_selected = self.chat_page.search_and_select_contact(phone)
 
         if not chat_selected:
             raise RuntimeError(f"No se pudo encontrar o abrir el chat para '{phone}' en la interfaz de WhatsApp.")
 
         # 2. Escribir y enviar el mensaje
-        success = self.chat_page.type_and_send_message(message)
-        
-        if success:
-            print("\n🎉 ¡PROCESO COMPLETADO! Mensaje entregado con éxito a través de la UI.")
-            time.sleep(3.0)
-            
-        return success
+        return self.chat_page.type_and_send_message(message)
 
     def send_technical_report(
         self,
@@ -104,7 +383,7 @@ class WhatsAppBotFacade:
         Construye y envía el reporte técnico con el saludo a Merza,
         datos del desarrollador (Jose Rivero), enlace al repositorio y patrones de diseño.
         """
-        print("📐 Generando reporte técnico de automatización y patrones de diseño...")
+        telemetry.event("send.build_report", "📐 Generando reporte técnico de automatización y patrones de diseño...", level="debug")
         builder = MessageBuilder(TechnicalReportStrategy())
         builder.set_recipient(recipient)
         builder.set_developer(developer)
@@ -117,7 +396,14 @@ class WhatsAppBotFacade:
 
     def close(self) -> None:
         """Cierra el bot y guarda el estado."""
+        if self.inbound:
+            self.inbound.close()
+            self.inbound = None
+        if self.selector_cache:
+            self.selector_cache.save()
         self.session_manager.close()
+        self.authenticated = False
+        telemetry.flush()
 
     def __enter__(self):
         self.initialize()
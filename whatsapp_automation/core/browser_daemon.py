@@ -0,0 +1,177 @@
+"""
+Módulo BrowserDaemon - Navegador residente con el perfil autenticado
+Mantiene Chromium abierto con el perfil persistente y WhatsApp Web ya sincronizado, exponiendo
+el endpoint CDP solo en localhost. SessionManager se conecta a él cuando está en marcha (sin
+arranque en frío ni nueva sincronización) y lanza el navegador como siempre cuando no lo está.
+El estado del demonio (pid y endpoint) se publica en `<session_dir>.daemon.json`.
+"""
+
+import os
+import json
+import time
+import socket
+import signal
+import logging
+import urllib.request
+from typing import Any, Dict, Optional
+
+from .telemetry import telemetry
+
+logger = logging.getLogger("WhatsAppBot.BrowserDaemon")
+
+DAEMON_HOST = "127.0.0.1"
+
+
+def daemon_state_path(session_dir: str) -> str:
+    """Archivo de estado del demonio junto al directorio de sesión (`<session_dir>.daemon.json`)."""
+    return os.path.abspath(session_dir).rstrip(os.sep) + ".daemon.json"
+
+
+def _read_state(session_dir: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(daemon_state_path(session_dir), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def _endpoint_alive(endpoint: str, timeout: float = 0.5) -> bool:
+    try:
+        with urllib.request.urlopen(f"{endpoint}/json/version", timeout=timeout) as response:
+            return response.status == 200
+    except Exception:
+        return False
+
+
+def find_daemon(session_dir: str) -> Optional[str]:
+    """
+    Retorna el endpoint CDP del demonio del perfil si está en marcha y responde; None si no.
+    Un archivo de estado huérfano (proceso muerto o endpoint caído) se elimina.
+    """
+    state = _read_state(session_dir)
+    if not state:
+        return None
+    endpoint = state.get("endpoint")
+    if endpoint and _pid_alive(int(state.get("pid", 0))) and _endpoint_alive(endpoint):
+        return endpoint
+    logger.debug(f"Estado de demonio huérfano para {session_dir}; se elimina.")
+    try:
+        os.remove(daemon_state_path(session_dir))
+    except OSError:
+        pass
+    return None
+
+
+def _free_port(host: str = DAEMON_HOST) -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+class BrowserDaemon:
+    """
+    Demonio de navegador residente para un perfil de sesión.
+
+    Args:
+        session_dir: Directorio del perfil persistente (ya autenticado)
+        headless: Ejecutar Chromium sin interfaz
+        port: Puerto CDP en localhost (0 = uno libre)
+        auth_timeout: Tiempo máximo de espera a que WhatsApp Web quede listo al arrancar
+    """
+
+    def __init__(self, session_dir: str, headless: bool = True, port: int = 0, auth_timeout: int = 300):
+        self.session_dir = os.path.abspath(session_dir)
+        self.headless = headless
+        self.port = port or _free_port()
+        self.auth_timeout = auth_timeout
+        self.endpoint = f"http://{DAEMON_HOST}:{self.port}"
+        self._running = False
+
+    def serve(self) -> None:
+        """Lanza el navegador, deja WhatsApp Web sincronizado y atiende hasta recibir SIGINT/SIGTERM."""
+        from playwright.sync_api import sync_playwright
+
+        from .session_manager import SessionManager
+        from ..pages.login_page import LoginPage
+
+        if find_daemon(self.session_dir):
+            raise RuntimeError(f"Ya hay un demonio en marcha para el perfil {self.session_dir}.")
+
+        os.makedirs(self.session_dir, exist_ok=True)
+        playwright = sync_playwright().start()
+        context = None
+        try:
+            telemetry.event("daemon.start", f"🚀 Iniciando navegador residente (CDP en {self.endpoint})...", level="info")
+            context = SessionManager.launch_context(
+                playwright,
+                self.session_dir,
+                self.headless,
+                extra_args=[f"--remote-debugging-port={self.port}", f"--remote-debugging-address={DAEMON_HOST}"]
+            )
+            page = context.pages[0] if context.pages else context.new_page()
+            login_page = LoginPage(page)
+            login_page.navigate_to_whatsapp()
+            if not login_page.wait_for_authentication(timeout_seconds=self.auth_timeout):
+                raise RuntimeError("WhatsApp Web no quedó autenticado; inicia sesión con el perfil antes del demonio.")
+
+            self._write_state()
+            telemetry.event("daemon.ready", f"✅ Navegador residente listo: {self.endpoint}", level="info")
+            self._running = True
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                signal.signal(signum, self._stop)
+            while self._running and not page.is_closed():
+                # Bombea los eventos de Playwright mientras el demonio está en marcha
+                page.wait_for_timeout(1000)
+        finally:
+            self._remove_state()
+            if context:
+                telemetry.event("daemon.stop", "🔒 Cerrando navegador residente...", level="info")
+                try:
+                    context.close()
+                except Exception as e:
+                    logger.debug(f"Error al cerrar el contexto del demonio: {e}")
+            playwright.stop()
+
+    def _stop(self, signum, frame) -> None:
+        self._running = False
+
+    def _write_state(self) -> None:
+        state = {"pid": os.getpid(), "endpoint": self.endpoint, "started_at": time.time()}
+        path = daemon_state_path(self.session_dir)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+
+    def _remove_state(self) -> None:
+        state = _read_state(self.session_dir)
+        if state and state.get("pid") == os.getpid():
+            try:
+                os.remove(daemon_state_path(self.session_dir))
+            except OSError:
+                pass
+
+
+def stop_daemon(session_dir: str, timeout: float = 15.0) -> bool:
+    """Detiene el demonio del perfil (SIGTERM) y espera a que libere el estado; retorna si había uno."""
+    state = _read_state(session_dir)
+    if not state or not _pid_alive(int(state.get("pid", 0))):
+        find_daemon(session_dir)
+        return False
+    os.kill(int(state["pid"]), signal.SIGTERM)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and os.path.exists(daemon_state_path(session_dir)):
+        time.sleep(0.2)
+    return True
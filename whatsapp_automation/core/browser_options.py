@@ -0,0 +1,20 @@
+"""
+Módulo BrowserOptions - Opciones de lanzamiento de Chromium
+Argumentos y agente de usuario comunes a SessionManager (playwright.sync_api) y AsyncSessionManager
+(playwright.async_api); no importa ninguna de las dos API de Playwright.
+"""
+
+from typing import List
+
+# Argumentos para evitar detección de bot y garantizar estabilidad
+LAUNCH_ARGS: List[str] = [
+    "--disable-blink-features=AutomationControlled",
+    "--start-maximized",
+    "--no-sandbox",
+    "--disable-setuid-sandbox"
+]
+
+USER_AGENT: str = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
@@ -0,0 +1,199 @@
+"""
+Módulo CampaignRunner - Campañas repartidas en varios procesos y perfiles
+La API síncrona de Playwright solo puede manejar un navegador por hilo, así que las campañas grandes
+se reparten en un proceso por perfil de sesión (cada uno con su propio WhatsAppBotFacade).
+Los destinatarios se asignan de forma estable a cada perfil y los resultados se fusionan en el padre.
+"""
+
+import time
+import queue
+import hashlib
+import logging
+import multiprocessing
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .jobs import JobLike, SendJob, SendResult, coerce_job, summarize_results
+from .telemetry import telemetry
+
+logger = logging.getLogger("WhatsAppBot.Campaign")
+
+
+def default_facade_factory(profile_dir: str, **facade_kwargs):
+    """Crea el WhatsAppBotFacade de un proceso trabajador para el perfil indicado."""
+    from .bot_facade import WhatsAppBotFacade
+    return WhatsAppBotFacade(session_dir=profile_dir, **facade_kwargs)
+
+
+def assign_worker(phone: str, workers: int) -> int:
+    """
+    Asigna un destinatario a un trabajador de forma estable entre ejecuciones y procesos
+    (no depende del hash aleatorio de Python), de modo que cada número siempre sale del mismo perfil.
+    """
+    key = "".join(ch for ch in phone if ch.isalnum()).lower() or phone
+    digest = hashlib.sha1(key.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % workers
+
+
+def _campaign_worker(
+    profile: str,
+    indexed_jobs: List[Tuple[int, SendJob]],
+    facade_factory: Callable[..., Any],
+    facade_kwargs: Dict[str, Any],
+    results_queue
+) -> None:
+    """Proceso trabajador: envía su fracción de la campaña y reporta cada resultado al padre."""
+    try:
+        with facade_factory(profile, **facade_kwargs) as bot:
+            jobs = [job for _, job in indexed_jobs]
+            for (index, _), result in zip(indexed_jobs, bot.iter_send(jobs)):
+                results_queue.put(("result", profile, (
+                    index, result.success, result.started_at, result.elapsed, result.error,
+                    result.send_latency, result.paced_seconds, result.parts_sent
+                )))
+    except Exception as e:
+        results_queue.put(("error", profile, str(e)))
+    finally:
+        results_queue.put(("done", profile, None))
+
+
+@dataclass
+class CampaignReport:
+    """Resultados fusionados de una campaña: en el orden original de los trabajos y por perfil."""
+
+    results: List[SendResult]
+    duration: float
+    worker_errors: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def summary(self) -> Dict[str, Any]:
+        """Resumen global (enviados, fallidos, mensajes por minuto)."""
+        return summarize_results(self.results)
+
+    def by_profile(self) -> Dict[str, Dict[str, Any]]:
+        """Resumen por perfil de sesión."""
+        grouped: Dict[str, List[SendResult]] = {}
+        for result in self.results:
+            grouped.setdefault(result.profile, []).append(result)
+        return {profile: summarize_results(results) for profile, results in grouped.items()}
+
+
+class CampaignRunner:
+    """
+    Ejecuta una campaña con un proceso trabajador por perfil de sesión ya autenticado.
+
+    Args:
+        profiles: Directorios de perfil (uno por cuenta/número) con la sesión iniciada
+        facade_factory: Función de nivel de módulo `factory(profile_dir, **kwargs)` que crea el Facade
+            de cada trabajador; permite sustituir WhatsApp Web por una página local en pruebas
+        start_method: Método de multiprocessing ("spawn", "fork"...); por defecto el de la plataforma
+        **facade_kwargs: Argumentos para el Facade de cada trabajador (headless, wait_time...)
+    """
+
+    def __init__(
+        self,
+        profiles: Sequence[str],
+        facade_factory: Callable[..., Any] = default_facade_factory,
+        start_method: Optional[str] = None,
+        **facade_kwargs
+    ):
+        if not profiles:
+            raise ValueError("Se requiere al menos un perfil de sesión para la campaña.")
+        self.profiles = list(profiles)
+        self.facade_factory = facade_factory
+        self.facade_kwargs = facade_kwargs
+        self._mp = multiprocessing.get_context(start_method)
+
+    def shard(self, jobs: Iterable[JobLike]) -> Dict[str, List[Tuple[int, SendJob]]]:
+        """Reparte los trabajos (con su posición original) entre los perfiles."""
+        shards: Dict[str, List[Tuple[int, SendJob]]] = {profile: [] for profile in self.profiles}
+        for index, raw_job in enumerate(jobs):
+            job = coerce_job(raw_job)
+            profile = self.profiles[assign_worker(job.phone, len(self.profiles))]
+            shards[profile].append((index, job))
+        return shards
+
+    def run(self, jobs: Iterable[JobLike], on_result: Optional[Callable[[SendResult], None]] = None) -> CampaignReport:
+        """
+        Lanza un proceso por perfil con trabajos, espera y fusiona los resultados.
+        `on_result` se invoca en el proceso padre con cada resultado según llega (progreso, registro).
+        """
+        shards = self.shard(jobs)
+        pending = {index: (profile, job) for profile, items in shards.items() for index, job in items}
+        merged: Dict[int, SendResult] = {}
+        worker_errors: Dict[str, str] = {}
+
+        results_queue = self._mp.Queue()
+        processes = {}
+        start = time.time()
+        for profile, items in shards.items():
+            if not items:
+                continue
+            process = self._mp.Process(
+                target=_campaign_worker,
+                args=(profile, items, self.facade_factory, self.facade_kwargs, results_queue),
+                name=f"whatsapp-campaign-{len(processes)}"
+            )
+            process.start()
+            processes[profile] = process
+        telemetry.event("campaign.start", f"🚚 Campaña iniciada: {len(pending)} mensajes en {len(processes)} perfiles.")
+
+        running = set(processes)
+        while running:
+            try:
+                kind, profile, payload = results_queue.get(timeout=0.5)
+            except queue.Empty:
+                # Un trabajador que murió sin avisar (p. ej. señal) deja de contarse
+                for profile in [p for p in running if not processes[p].is_alive()]:
+                    worker_errors.setdefault(profile, f"El proceso terminó con código {processes[profile].exitcode}.")
+                    running.discard(profile)
+                continue
+
+            if kind == "result":
+                index, success, started_at, elapsed, error, send_latency, paced_seconds, parts_sent = payload
+                _, job = pending[index]
+                merged[index] = SendResult(
+                    job=job,
+                    success=success,
+                    started_at=started_at,
+                    elapsed=elapsed,
+                    error=error,
+                    profile=profile,
+                    send_latency=send_latency,
+                    paced_seconds=paced_seconds,
+                    parts_sent=parts_sent
+                )
+                if on_result:
+                    on_result(merged[index])
+            elif kind == "error":
+                worker_errors[profile] = payload
+            elif kind == "done":
+                running.discard(profile)
+
+        for process in processes.values():
+            process.join()
+
+        # Trabajos sin resultado: su trabajador falló antes de procesarlos
+        for index, (profile, job) in pending.items():
+            if index not in merged:
+                reason = worker_errors.get(profile, "El trabajador no reportó resultado.")
+                merged[index] = SendResult(
+                    job=job,
+                    success=False,
+                    started_at=start,
+                    elapsed=0.0,
+                    error=reason,
+                    profile=profile
+                )
+                if on_result:
+                    on_result(merged[index])
+
+        report = CampaignReport(
+            results=[merged[index] for index in sorted(merged)],
+            duration=time.time() - start,
+            worker_errors=worker_errors
+        )
+        summary = report.summary
+        telemetry.event("campaign.finished", f"🏁 Campaña finalizada: {summary['sent']}/{summary['total']} enviados "
+                                             f"({summary['messages_per_minute']:.1f} msg/min).")
+        return report
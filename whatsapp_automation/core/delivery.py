@@ -0,0 +1,80 @@
+"""
+Módulo Delivery - Decisiones de envío compartidas por WhatsAppBotFacade y AsyncWhatsAppBotFacade
+Qué ruta de apertura corresponde a cada destinatario y cómo se traduce el desenlace de un envío
+(confirmado, sin confirmar, parcial o con error) en un SendResult y sus contadores. Ambos Facades
+ejecutan la misma secuencia de pasos; solo difieren en la API de Playwright (síncrona o asíncrona).
+"""
+
+import time
+from typing import Optional
+
+from .jobs import SendJob, SendResult
+from .telemetry import telemetry
+from ..services.recipients import normalize_phone
+
+# Apertura de chats: "auto" (números: chat abierto, búsqueda y como último recurso la ruta de envío
+# por número; nombres: búsqueda), "search" o "direct" (siempre la ruta por número)
+OPEN_STRATEGIES = ("auto", "search", "direct")
+
+UNCONFIRMED_ERROR = "No se confirmó el envío: el mensaje no apareció en la conversación."
+
+
+def check_open_strategy(open_strategy: str) -> str:
+    """Valida la estrategia de apertura de chats."""
+    if open_strategy not in OPEN_STRATEGIES:
+        raise ValueError(f"open_strategy debe ser uno de {OPEN_STRATEGIES}.")
+    return open_strategy
+
+
+def direct_phone(phone: str, open_strategy: str, default_country_code: Optional[str] = None) -> Optional[str]:
+    """
+    Número E.164 con el que abrir el chat sin pasar por la búsqueda por nombre; None si el destinatario
+    se busca por nombre. Con la estrategia "direct" un destinatario que no es un número es un error.
+    """
+    if open_strategy == "search":
+        return None
+    phone_e164 = normalize_phone(phone, default_country_code)
+    if open_strategy == "direct" and not phone_e164:
+        raise ValueError(f"'{phone}' no es un número telefónico válido para la apertura directa.")
+    return phone_e164
+
+
+def report_paced(phone: str, waited: float) -> float:
+    """Registra la espera introducida por el planificador de ritmo antes de un envío."""
+    if waited > 0:
+        telemetry.count("paced_seconds", waited)
+        telemetry.event("send.paced", f"⏳ Ritmo de envío: {waited:.1f} s de espera antes de enviar a {phone}.")
+    return waited
+
+
+def build_result(
+    job: SendJob,
+    success: bool,
+    error: Optional[str],
+    started_at: float,
+    chat_page,
+    profile: Optional[str] = None,
+    paced_seconds: float = 0.0
+) -> SendResult:
+    """
+    Resultado de un trabajo a partir del desenlace del envío y del estado de la página de chat
+    (partes confirmadas y latencia). Un envío parcial se informa como tal: no debe reintentarse.
+    """
+    if not success and error is None:
+        error = UNCONFIRMED_ERROR
+    parts_sent = max(chat_page.last_parts_sent, 1) if success else chat_page.last_parts_sent
+    if not success and parts_sent:
+        error = (f"Envío parcial: {parts_sent} de {chat_page.last_parts_total} partes entregadas "
+                 f"({error}); no se reintenta para no duplicarlas.")
+    telemetry.count("messages_sent" if success else "messages_partial" if parts_sent else "messages_failed")
+    return SendResult(
+        job=job,
+        success=success,
+        started_at=started_at,
+        elapsed=time.time() - started_at,
+        error=error,
+        profile=profile,
+        send_latency=chat_page.last_send_latency if success else None,
+        paced_seconds=paced_seconds,
+        parts_sent=parts_sent
+    )
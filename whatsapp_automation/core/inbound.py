@@ -0,0 +1,448 @@
+"""
+Módulo Inbound - Flujo de mensajes entrantes por empuje (push) desde la página
+Instala en WhatsApp Web un observador de mutaciones sobre la lista de chats y la conversación abierta
+que detecta mensajes nuevos, cambios del contador de no leídos y chats actualizados, y los envía a
+Python por lotes a través de una función expuesta (`page.expose_binding`). No hay sondeo del DOM:
+la página solo trabaja cuando cambia la interfaz y Python espera en una promesa que se resuelve con
+cada entrega, por lo que la latencia es la del renderizado y el consumo en reposo es prácticamente nulo.
+
+Control de flujo: un único lote en vuelo por página; Python acepta como mucho lo que cabe en su búfer
+(`max_buffer`) y la página conserva el resto en una cola acotada (`max_pending`) en la que los eventos
+de estado (no leídos, chat actualizado) se fusionan por chat y, si se llena, se descartan los mensajes
+más antiguos (contados en `dropped`).
+"""
+
+import json
+import time
+import logging
+import itertools
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional
+
+from .telemetry import telemetry
+from ..pages.chat_dom import ChatSelectors
+
+logger = logging.getLogger("WhatsAppBot.Inbound")
+
+# Tipos de evento entrante
+EVENT_TYPES = ("message", "unread", "chat_updated")
+
+# Observador en la página: estado de las filas de la lista de chats y burbujas entrantes de la
+# conversación abierta; cola acotada con fusión por chat y entrega por lotes con confirmación
+INBOUND_OBSERVER_JS = """
+(config) => {
+    const existing = window.__whatsappInbound;
+    if (existing && existing.active && existing.binding === config.binding) return true;
+    if (existing) existing.stop();
+
+    const state = {
+        binding: config.binding, active: true, queue: [], inflight: false, waiters: [],
+        unacked: 0, dropped: 0, rows: new Map(), seen: new Set(), seenOrder: [],
+        pane: null, openChat: null, observer: null
+    };
+    window.__whatsappInbound = state;
+
+    const first = (root, selectors) => {
+        for (const selector of selectors) {
+            let el = null;
+            try { el = root.querySelector(selector); } catch (e) { continue; }
+            if (el) return el;
+        }
+        return null;
+    };
+    const all = (root, selectors) => {
+        for (const selector of selectors) {
+            let els = [];
+            try { els = root.querySelectorAll(selector); } catch (e) { continue; }
+            if (els.length) return Array.from(els);
+        }
+        return [];
+    };
+    const rowState = (row) => {
+        const titles = Array.from(row.querySelectorAll('span[title]'))
+            .map((el) => (el.getAttribute('title') || '').trim()).filter(Boolean);
+        const badge = first(row, config.unread);
+        const count = badge ? parseInt((badge.textContent || '').replace(/\\D/g, ''), 10) : 0;
+        return { chat: titles[0] || '', preview: titles[1] || '', unread: badge ? (count || 1) : 0 };
+    };
+    const remember = (key) => {
+        state.seen.add(key);
+        state.seenOrder.push(key);
+        if (state.seenOrder.length > config.maxSeen) state.seen.delete(state.seenOrder.shift());
+    };
+
+    const push = (event) => {
+        event.ts = Date.now();
+        if (event.type !== 'message') {
+            // Eventos de estado: solo interesa el último de cada chat
+            const index = state.queue.findIndex((e) => e.type === event.type && e.chat === event.chat);
+            if (index >= 0) { state.queue[index] = event; return; }
+        }
+        if (state.queue.length >= config.maxPending) {
+            const oldest = state.queue.findIndex((e) => e.type === 'message');
+            state.queue.splice(oldest >= 0 ? oldest : 0, 1);
+            state.dropped += 1;
+        }
+        state.queue.push(event);
+    };
+
+    // Atributos y texto solo dentro de la lista de chats (contadores, vistas previas); en el resto
+    // del documento basta con las altas y bajas de nodos (montajes, burbujas nuevas)
+    const watchPane = (pane) => {
+        state.observer.observe(pane, {
+            subtree: true, characterData: true, attributes: true, attributeFilter: ['title', 'aria-label']
+        });
+    };
+
+    const scanList = (baseline) => {
+        const pane = first(document, config.chatList);
+        if (!pane) { state.pane = null; return; }
+        // Lista recién montada (carga de la página): sus filas son la línea base
+        if (pane !== state.pane) {
+            state.pane = pane;
+            baseline = true;
+            if (state.observer) watchPane(pane);
+        }
+        all(pane, config.rows).forEach((row, position) => {
+            const current = rowState(row);
+            if (!current.chat) return;
+            const before = state.rows.get(current.chat);
+            state.rows.set(current.chat, current);
+            if (baseline) return;
+            if (!before) {
+                // Fila que aparece arriba con no leídos: un chat que subió por actividad nueva
+                if (position === 0 && pane.scrollTop === 0 && current.unread > 0) {
+                    push({ type: 'unread', chat: current.chat, unread: current.unread });
+                    push({ type: 'message', chat: current.chat, text: current.preview, source: 'chat_list' });
+                }
+                return;
+            }
+            if (current.unread !== before.unread) {
+                push({ type: 'unread', chat: current.chat, unread: current.unread });
+            }
+            if (current.preview !== before.preview) {
+                push({ type: 'chat_updated', chat: current.chat, preview: current.preview, unread: current.unread });
+                if (current.unread > before.unread) {
+                    push({ type: 'message', chat: current.chat, text: current.preview, source: 'chat_list' });
+                }
+            }
+        });
+    };
+
+    const scanConversation = (baseline) => {
+        const main = document.querySelector('#main');
+        if (!main) { state.openChat = null; return; }
+        const header = first(main, ['header span[title]', 'header']);
+        const chat = header ? (header.getAttribute('title') || header.textContent || '').trim() : '';
+        // Al abrir otro chat su historial es la línea base, no mensajes nuevos
+        const silent = baseline || chat !== state.openChat;
+        state.openChat = chat;
+        let lastSeen = -1;
+        const bubbles = all(main, config.incoming).map((bubble, index) => {
+            const holder = bubble.getAttribute('data-id') ? bubble : bubble.querySelector('[data-id]');
+            const id = holder ? holder.getAttribute('data-id') : '';
+            const textNode = first(bubble, ['span.selectable-text']) || bubble;
+            const text = (textNode.innerText || textNode.textContent || '').trim();
+            const key = id || chat + '|' + text;
+            if (state.seen.has(key)) lastSeen = index;
+            return { id: id, text: text, key: key };
+        });
+        bubbles.forEach((bubble, index) => {
+            if (state.seen.has(bubble.key)) return;
+            remember(bubble.key);
+            // Solo las burbujas añadidas al final: el historial cargado hacia arriba no es nuevo
+            if (!silent && index > lastSeen) {
+                push({ type: 'message', chat: chat, text: bubble.text, message_id: bubble.id || null, source: 'conversation' });
+            }
+        });
+    };
+
+    const wake = () => { state.waiters.splice(0).forEach((done) => done()); };
+
+    const flush = async () => {
+        if (state.inflight || !state.queue.length || !state.active) return;
+        state.inflight = true;
+        const batch = state.queue.splice(0, config.batchSize);
+        let accepted = 0;
+        try { accepted = await window[config.binding](batch); } catch (e) { accepted = 0; }
+        // Flujo cerrado en Python: el observador se detiene aunque no recibiera la orden de parada
+        if (accepted < 0) { state.inflight = false; state.stop(); return; }
+        accepted = Math.max(0, Math.min(accepted | 0, batch.length));
+        // Lo que Python no aceptó vuelve al principio de la cola
+        if (accepted < batch.length) state.queue.unshift(...batch.slice(accepted));
+        state.inflight = false;
+        if (accepted > 0) {
+            state.unacked += accepted;
+            wake();
+            if (state.queue.length) flush();
+        }
+    };
+
+    // Espera de Python: se resuelve con la siguiente entrega o al agotar `timeoutMs`
+    state.wait = (timeoutMs) => new Promise((resolve) => {
+        let timer = null;
+        const done = () => {
+            if (timer !== null) clearTimeout(timer);
+            const delivered = state.unacked;
+            state.unacked = 0;
+            resolve({ delivered: delivered, pending: state.queue.length, dropped: state.dropped });
+        };
+        if (state.unacked > 0 || !state.active) { done(); return; }
+        timer = setTimeout(() => {
+            state.waiters = state.waiters.filter((waiter) => waiter !== done);
+            done();
+        }, timeoutMs);
+        state.waiters.push(done);
+        flush();
+    });
+
+    state.stop = () => {
+        state.active = false;
+        if (state.observer) state.observer.disconnect();
+        wake();
+    };
+
+    const start = () => {
+        if (!state.active) return;
+        state.observer = new MutationObserver((mutations) => {
+            const pane = first(document, config.chatList);
+            const main = document.querySelector('#main');
+            let list = false;
+            let conversation = false;
+            for (const mutation of mutations) {
+                if (!list && pane && pane.contains(mutation.target)) list = true;
+                if (!conversation && main && main.contains(mutation.target)) conversation = true;
+                // Lista o conversación recién montadas (carga inicial, cambio de chat)
+                if (!list && pane && mutation.target.contains(pane)) list = true;
+                if (!conversation && main && mutation.target.contains(main)) conversation = true;
+            }
+            if (list) scanList(false);
+            if (conversation || (!main && state.openChat !== null)) scanConversation(false);
+            flush();
+        });
+        state.observer.observe(document.documentElement, { childList: true, subtree: true });
+        scanList(true);
+        scanConversation(true);
+    };
+    if (document.documentElement) start();
+    else document.addEventListener('readystatechange', start, { once: true });
+    return true;
+}
+"""
+
+# Script de inicio (cada carga de la página): pregunta a Python por la función expuesta si el flujo
+# sigue abierto (un lote vacío retorna -1 tras `close()`) y solo entonces instala el observador
+_INBOUND_BOOTSTRAP_JS = """
+(install, config) => {
+    const push = window[config.binding];
+    if (typeof push !== 'function') return;
+    push([]).then((accepted) => { if (accepted >= 0) install(config); }, () => {});
+}
+"""
+
+_WAIT_INBOUND_JS = """
+(timeoutMs) => {
+    const state = window.__whatsappInbound;
+    if (state && state.active) return state.wait(timeoutMs);
+    // Página recargándose: el script de inicio vuelve a instalar el observador
+    return new Promise((resolve) => setTimeout(() => resolve(null), Math.min(timeoutMs, 250)));
+}
+"""
+
+_STOP_INBOUND_JS = """
+(binding) => {
+    const state = window.__whatsappInbound;
+    if (state && state.binding === binding) state.stop();
+}
+"""
+
+
+@dataclass
+class InboundEvent:
+    """
+    Evento entrante detectado en la página.
+
+    Args:
+        type: "message" (mensaje nuevo), "unread" (contador de no leídos) o "chat_updated"
+        chat: Título del chat (nombre o número tal como se muestra)
+        text: Texto del mensaje o vista previa del último mensaje del chat
+        unread: Mensajes no leídos del chat (eventos de la lista de chats)
+        message_id: Identificador `data-id` de la burbuja (mensajes de la conversación abierta)
+        source: Origen en la interfaz: "conversation" o "chat_list"
+        detected_at: Momento de la detección en la página (epoch, s)
+        received_at: Momento de la recepción en Python (epoch, s)
+    """
+
+    type: str
+    chat: str
+    text: Optional[str] = None
+    unread: Optional[int] = None
+    message_id: Optional[str] = None
+    source: Optional[str] = None
+    detected_at: float = 0.0
+    received_at: float = 0.0
+
+    @classmethod
+    def from_page(cls, raw: Dict[str, Any], received_at: float) -> "InboundEvent":
+        return cls(
+            type=raw.get("type", ""),
+            chat=raw.get("chat", ""),
+            text=raw.get("text", raw.get("preview")),
+            unread=raw.get("unread"),
+            message_id=raw.get("message_id"),
+            source=raw.get("source", "chat_list" if raw.get("type") != "message" else None),
+            detected_at=(raw.get("ts") or 0) / 1000.0,
+            received_at=received_at
+        )
+
+    @property
+    def latency(self) -> float:
+        """Segundos desde la detección en la página hasta la recepción en Python."""
+        return max(self.received_at - self.detected_at, 0.0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class InboundStream:
+    """
+    Flujo de eventos entrantes de una página de WhatsApp Web.
+
+    Args:
+        page: Página de Playwright (API síncrona) con WhatsApp Web cargado
+        max_buffer: Eventos retenidos en Python sin consumir; el resto espera en la página
+        max_pending: Tamaño máximo de la cola en la página (los mensajes más antiguos se descartan)
+        batch_size: Eventos por entrega de la página a Python
+        wait_timeout: Espera máxima (s) de cada ciclo de `events()` antes de revisar la cota de tiempo
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(
+        self,
+        page,
+        max_buffer: int = 1000,
+        max_pending: int = 5000,
+        batch_size: int = 100,
+        wait_timeout: float = 30.0
+    ):
+        if max_buffer < 1 or batch_size < 1:
+            raise ValueError("max_buffer y batch_size deben ser positivos.")
+        self.page = page
+        self.max_buffer = max_buffer
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.wait_timeout = wait_timeout
+        # Nombre propio por flujo: reabrir en la misma página no choca con una función ya expuesta
+        self.binding = f"__whatsappInboundPush{next(self._ids)}"
+        self._buffer: Deque[InboundEvent] = deque()
+        self.received = 0
+        self.pending = 0
+        self.dropped = 0
+        self.started = False
+        self.closed = False
+
+    def _config(self) -> Dict[str, Any]:
+        return {
+            "binding": self.binding,
+            "chatList": ChatSelectors.CHAT_LIST_SELECTORS,
+            "rows": ChatSelectors.CHAT_ROW_SELECTORS,
+            "incoming": ChatSelectors.INCOMING_MESSAGE_SELECTORS,
+            "unread": ChatSelectors.UNREAD_BADGE_SELECTORS,
+            "maxPending": self.max_pending,
+            "batchSize": self.batch_size,
+            "maxSeen": 5000,
+        }
+
+    def start(self) -> "InboundStream":
+        """Expone la función de entrega e instala el observador (también en las recargas futuras)."""
+        if self.started:
+            return self
+        config = self._config()
+        self.page.expose_binding(self.binding, self._receive)
+        self.page.add_init_script(script=f"({_INBOUND_BOOTSTRAP_JS})({INBOUND_OBSERVER_JS}, {json.dumps(config)})")
+        self.page.evaluate(INBOUND_OBSERVER_JS, config)
+        self.started = True
+        telemetry.event("inbound.started", "📥 Escuchando mensajes entrantes...", level="debug")
+        return self
+
+    def _receive(self, source, batch: List[Dict[str, Any]]) -> int:
+        """
+        Entrega de la página: acepta lo que cabe en el búfer y retorna cuántos eventos tomó.
+        Con el flujo cerrado retorna -1: la página detiene su observador y no lo reinstala al recargar.
+        """
+        if self.closed:
+            return -1
+        room = self.max_buffer - len(self._buffer)
+        accepted = batch[:max(room, 0)]
+        now = time.time()
+        for raw in accepted:
+            self._buffer.append(InboundEvent.from_page(raw, now))
+        self.received += len(accepted)
+        return len(accepted)
+
+    def poll(self, timeout: float = 1.0) -> List[InboundEvent]:
+        """
+        Eventos disponibles. Si el búfer está vacío espera (sin sondeo) a la siguiente entrega de la
+        página durante como mucho `timeout` segundos; mientras espera, Playwright atiende las entregas.
+        """
+        if not self.started:
+            self.start()
+        if not self._buffer and not self.closed:
+            try:
+                status = self.page.evaluate(_WAIT_INBOUND_JS, max(int(timeout * 1000), 1))
+            except Exception as e:
+                # Navegación en curso (contexto destruido): el observador se reinstala al cargar
+                logger.debug(f"Espera de eventos entrantes interrumpida: {e}")
+                status = None
+            if status:
+                self.pending = status["pending"]
+                self.dropped = status["dropped"]
+        events = list(self._buffer)
+        self._buffer.clear()
+        return events
+
+    def events(self, timeout: Optional[float] = None, types: Optional[Iterable[str]] = None) -> Iterator[InboundEvent]:
+        """
+        Iterador de eventos entrantes en el orden de llegada.
+
+        Args:
+            timeout: Duración total de la escucha en segundos (None = hasta cerrar el flujo)
+            types: Tipos de evento a producir (por defecto todos)
+        """
+        wanted = set(types) if types else None
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.closed:
+            remaining = self.wait_timeout if deadline is None else min(self.wait_timeout, deadline - time.monotonic())
+            if remaining <= 0:
+                return
+            for event in self.poll(remaining):
+                if wanted is None or event.type in wanted:
+                    yield event
+
+    def __iter__(self) -> Iterator[InboundEvent]:
+        return self.events()
+
+    def stats(self) -> Dict[str, int]:
+        """Eventos recibidos, retenidos en Python, pendientes en la página y descartados por desbordamiento."""
+        return {
+            "received": self.received,
+            "buffered": len(self._buffer),
+            "pending": self.pending,
+            "dropped": self.dropped,
+        }
+
+    def close(self) -> None:
+        """
+        Detiene el observador de la página. El script de inicio y la función expuesta permanecen
+        registrados, pero rechazan el flujo cerrado: las recargas posteriores no reinstalan el observador.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            if not self.page.is_closed():
+                self.page.evaluate(_STOP_INBOUND_JS, self.binding)
+        except Exception as e:
+            logger.debug(f"Error deteniendo el observador de entrantes: {e}")
@@ -0,0 +1,103 @@
+"""
+Módulo Jobs - Trabajos y resultados de envío por lotes
+Define las unidades de trabajo (destinatario + mensaje) que procesa WhatsAppBotFacade en modo lote
+y los resultados individuales con sus tiempos, junto con utilidades para medir el rendimiento.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+
+@dataclass
+class SendJob:
+    """Trabajo de envío: un destinatario (número o nombre) y el texto a entregar."""
+
+    phone: str
+    message: str
+    job_id: Optional[str] = None
+
+
+@dataclass
+class SendResult:
+    """Resultado individual de un trabajo de envío dentro de un lote."""
+
+    job: SendJob
+    success: bool
+    started_at: float
+    elapsed: float
+    error: Optional[str] = None
+    profile: Optional[str] = None
+    # Desde Enter hasta la aparición de la burbuja saliente en la conversación (s)
+    send_latency: Optional[float] = None
+    # Espera introducida por el planificador de ritmo antes del envío (s)
+    paced_seconds: float = 0.0
+    # Partes del mensaje confirmadas en la conversación (los mensajes largos se dividen)
+    parts_sent: int = 0
+
+    @property
+    def partial(self) -> bool:
+        """Fallo con partes ya entregadas: reintentarlo duplicaría esas partes."""
+        return not self.success and self.parts_sent > 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Representación serializable (JSON) del resultado."""
+        return {
+            "job_id": self.job.job_id,
+            "phone": self.job.phone,
+            "success": self.success,
+            "started_at": self.started_at,
+            "elapsed": self.elapsed,
+            "error": self.error,
+            "profile": self.profile,
+            "send_latency": self.send_latency,
+            "paced_seconds": self.paced_seconds,
+            "parts_sent": self.parts_sent,
+            "partial": self.partial,
+        }
+
+
+JobLike = Union[SendJob, Dict[str, Any], tuple]
+
+
+def coerce_job(job: JobLike) -> SendJob:
+    """
+    Normaliza un trabajo recibido como SendJob, diccionario ({"phone", "message"})
+    o tupla (phone, message) a una instancia de SendJob.
+    """
+    if isinstance(job, SendJob):
+        return job
+    if isinstance(job, dict):
+        return SendJob(
+            phone=str(job["phone"]),
+            message=str(job["message"]),
+            job_id=job.get("job_id")
+        )
+    if isinstance(job, tuple) and len(job) in (2, 3):
+        return SendJob(*job)
+    raise TypeError(f"Trabajo de envío no soportado: {job!r}")
+
+
+def summarize_results(results: Iterable[SendResult]) -> Dict[str, Any]:
+    """
+    Resume un lote de resultados: enviados, fallidos (de ellos, parciales), duración total,
+    mensajes por minuto y espera total introducida por el planificador de ritmo.
+    La duración se mide desde el inicio del primer trabajo hasta el fin del último.
+    """
+    results: List[SendResult] = list(results)
+    sent = sum(1 for r in results if r.success)
+    if results:
+        start = min(r.started_at for r in results)
+        end = max(r.started_at + r.elapsed for r in results)
+        duration = max(end - start, 0.0)
+    else:
+        duration = 0.0
+
+    return {
+        "total": len(results),
+        "sent": sent,
+        "failed": len(results) - sent,
+        "partial": sum(1 for r in results if r.partial),
+        "duration": duration,
+        "messages_per_minute": (sent * 60.0 / duration) if duration > 0 else 0.0,
+        "paced_seconds": sum(r.paced_seconds for r in results),
+    }
@@ -0,0 +1,188 @@
+"""
+Módulo NetworkFilter - Modo de red ligero (intercepción de peticiones)
+Instala una ruta sobre el contexto persistente que bloquea o sustituye por respuestas vacías
+los recursos que no intervienen en el envío (fotos de perfil, miniaturas, stickers, fuentes),
+sin tocar el JavaScript, los WebSockets ni los recursos criptográficos (WASM) de WhatsApp Web.
+Lleva contadores de peticiones evitadas y de bytes descargados por tipo de recurso.
+
+Nota: Playwright desactiva la caché HTTP del contexto mientras haya rutas instaladas, y las
+peticiones atendidas por el Service Worker de WhatsApp Web no pasan por la ruta; por eso el modo
+es opcional y conviene medirlo (`observe_only`) en cada despliegue.
+"""
+
+import re
+import base64
+import logging
+import threading
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Pattern, Sequence
+
+if TYPE_CHECKING:
+    from playwright.sync_api import BrowserContext, Request, Route
+
+logger = logging.getLogger("WhatsAppBot.NetworkFilter")
+
+BLOCK = "block"
+STUB = "stub"
+ALLOW = "allow"
+
+# Tipos de recurso de Playwright que nunca se interceptan: la aplicación y su canal de datos
+PROTECTED_RESOURCE_TYPES = ("document", "script", "xhr", "fetch", "websocket", "eventsource", "manifest")
+
+# JavaScript y módulos criptográficos (libsignal en WASM) siempre pasan, sea cual sea su tipo
+PROTECTED_URL_PATTERNS = (r"\.m?js(\?|$)", r"\.wasm(\?|$)")
+
+DEFAULT_BLOCK_RESOURCE_TYPES = ("media", "font")
+DEFAULT_STUB_RESOURCE_TYPES = ("image",)
+# Fotos de perfil, multimedia y stickers servidos por los CDN de WhatsApp
+DEFAULT_BLOCK_URL_PATTERNS = (
+    r"^https://pps\.whatsapp\.net/",
+    r"^https://mmg\.whatsapp\.net/",
+    r"^https://media[-.\w]*\.whatsapp\.net/",
+    r"\.webp(\?|$)",
+)
+
+# GIF transparente de 1x1: evita iconos de imagen rota y reflujos al sustituir imágenes
+_TRANSPARENT_GIF = base64.b64decode("R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7")
+
+
+def _compile(patterns: Iterable[str]) -> Sequence[Pattern]:
+    return tuple(re.compile(pattern, re.IGNORECASE) for pattern in patterns)
+
+
+class NetworkFilter:
+    """
+    Reglas de intercepción del modo de red ligero.
+
+    Args:
+        block_resource_types: Tipos de recurso que se abortan ("media", "font"...)
+        stub_resource_types: Tipos de recurso que se responden con un cuerpo vacío (o GIF transparente)
+        block_url_patterns: Expresiones regulares de URL que se abortan
+        stub_url_patterns: Expresiones regulares de URL que se responden vacías
+    """
+
+    def __init__(
+        self,
+        block_resource_types: Iterable[str] = DEFAULT_BLOCK_RESOURCE_TYPES,
+        stub_resource_types: Iterable[str] = DEFAULT_STUB_RESOURCE_TYPES,
+        block_url_patterns: Iterable[str] = DEFAULT_BLOCK_URL_PATTERNS,
+        stub_url_patterns: Iterable[str] = ()
+    ):
+        self.block_resource_types = frozenset(block_resource_types)
+        self.stub_resource_types = frozenset(stub_resource_types)
+        self._block_patterns = _compile(block_url_patterns)
+        self._stub_patterns = _compile(stub_url_patterns)
+        self._protected_patterns = _compile(PROTECTED_URL_PATTERNS)
+        self._lock = threading.Lock()
+        self.blocked: Counter = Counter()
+        self.stubbed: Counter = Counter()
+        self.responses: Counter = Counter()
+        self.bytes_loaded: Counter = Counter()
+
+    @classmethod
+    def observe_only(cls) -> "NetworkFilter":
+        """Filtro que no intercepta nada: solo mide (línea base para estimar el ahorro)."""
+        return cls(block_resource_types=(), stub_resource_types=(), block_url_patterns=())
+
+    def classify(self, url: str, resource_type: str) -> str:
+        """Decide la acción ("block", "stub" o "allow") para una petición."""
+        if resource_type in PROTECTED_RESOURCE_TYPES or any(p.search(url) for p in self._protected_patterns):
+            return ALLOW
+        if resource_type in self.block_resource_types or any(p.search(url) for p in self._block_patterns):
+            return BLOCK
+        if resource_type in self.stub_resource_types or any(p.search(url) for p in self._stub_patterns):
+            return STUB
+        return ALLOW
+
+    @property
+    def intercepts(self) -> bool:
+        """Indica si hay alguna regla de intercepción (sin reglas no se instala la ruta ni se pierde la caché)."""
+        return bool(
+            self.block_resource_types or self.stub_resource_types or self._block_patterns or self._stub_patterns
+        )
+
+    def install(self, context: "BrowserContext") -> None:
+        """Instala la ruta de intercepción (si hay reglas) y el medidor de respuestas en el contexto."""
+        if self.intercepts:
+            context.route("**/*", self._handle)
+        context.on("response", self._on_response)
+        logger.debug("Modo de red ligero activo en el contexto del navegador.")
+
+    async def install_async(self, context) -> None:
+        """Equivalente de `install` para un contexto de playwright.async_api."""
+        if self.intercepts:
+            await context.route("**/*", self._handle_async)
+        context.on("response", self._on_response)
+        logger.debug("Modo de red ligero activo en el contexto del navegador.")
+
+    def _decide(self, request: "Request") -> str:
+        """Clasifica la petición y cuenta las bloqueadas y sustituidas."""
+        resource_type = request.resource_type
+        action = self.classify(request.url, resource_type)
+        if action != ALLOW:
+            with self._lock:
+                (self.blocked if action == BLOCK else self.stubbed)[resource_type] += 1
+        return action
+
+    @staticmethod
+    def _stub_response(resource_type: str) -> Dict:
+        if resource_type == "image":
+            return {"status": 200, "content_type": "image/gif", "body": _TRANSPARENT_GIF}
+        return {"status": 204, "body": b""}
+
+    def _handle(self, route: "Route", request: "Request") -> None:
+        action = self._decide(request)
+        if action == BLOCK:
+            route.abort("blockedbyclient")
+        elif action == STUB:
+            route.fulfill(**self._stub_response(request.resource_type))
+        else:
+            route.continue_()
+
+    async def _handle_async(self, route, request) -> None:
+        action = self._decide(request)
+        if action == BLOCK:
+            await route.abort("blockedbyclient")
+        elif action == STUB:
+            await route.fulfill(**self._stub_response(request.resource_type))
+        else:
+            await route.continue_()
+
+    def _on_response(self, response) -> None:
+        """Cuenta las respuestas de red y suma su tamaño declarado (Content-Length) por tipo de recurso."""
+        resource_type = response.request.resource_type
+        length = response.headers.get("content-length")
+        with self._lock:
+            self.responses[resource_type] += 1
+            if length and length.isdigit():
+                self.bytes_loaded[resource_type] += int(length)
+
+    def estimated_bytes_avoided(self, baseline: "NetworkFilter") -> int:
+        """
+        Estima los bytes evitados a partir de una ejecución de referencia sin filtrar
+        (`NetworkFilter.observe_only()`): peticiones evitadas × tamaño medio observado por tipo.
+        """
+        avoided = 0
+        for resource_type, count in (self.blocked + self.stubbed).items():
+            seen = baseline.responses.get(resource_type, 0)
+            if seen:
+                avoided += count * baseline.bytes_loaded.get(resource_type, 0) // seen
+        return avoided
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Contadores por tipo de recurso: bloqueadas, sustituidas, respuestas recibidas y bytes descargados."""
+        with self._lock:
+            return {
+                "blocked": dict(self.blocked),
+                "stubbed": dict(self.stubbed),
+                "responses": dict(self.responses),
+                "bytes_loaded": dict(self.bytes_loaded),
+                "requests_avoided": sum(self.blocked.values()) + sum(self.stubbed.values()),
+            }
+
+
+def resolve_network_filter(lean_network) -> Optional[NetworkFilter]:
+    """Convierte la opción `lean_network` (False, True o un NetworkFilter) en un filtro o None."""
+    if isinstance(lean_network, NetworkFilter):
+        return lean_network
+    return NetworkFilter() if lean_network else None
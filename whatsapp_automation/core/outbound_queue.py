@@ -0,0 +1,240 @@
+"""
+Módulo OutboundQueue - Cola de salida persistente (SQLite)
+Registra cada trabajo de envío en un archivo SQLite junto al directorio de sesión y lo hace avanzar
+por los estados pending → in_flight → sent/failed/partial. Cada trabajo lleva una clave de idempotencia
+(destinatario + hash del contenido), de modo que volver a encolar una campaña no duplica envíos
+y una ejecución interrumpida se reanuda exactamente donde se detuvo.
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .jobs import JobLike, SendJob, SendResult, coerce_job
+from .telemetry import telemetry
+from ..services.recipients import normalize_phone
+
+logger = logging.getLogger("WhatsAppBot.OutboundQueue")
+
+PENDING = "pending"
+IN_FLIGHT = "in_flight"
+SENT = "sent"
+FAILED = "failed"
+# Mensaje dividido del que solo se entregaron algunas partes: terminal, nunca se reintenta
+PARTIAL = "partial"
+STATES = (PENDING, IN_FLIGHT, SENT, FAILED, PARTIAL)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbound (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    phone TEXT NOT NULL,
+    message TEXT NOT NULL,
+    job_id TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    elapsed REAL
+);
+CREATE INDEX IF NOT EXISTS outbound_status ON outbound (status, id);
+"""
+
+
+def idempotency_key(phone: str, message: str) -> str:
+    """
+    Clave de idempotencia de un trabajo: destinatario normalizado + hash SHA-256 del contenido.
+    El mismo texto al mismo número produce siempre la misma clave.
+    """
+    recipient = normalize_phone(phone) or phone.strip().lower()
+    content = hashlib.sha256(message.encode("utf-8")).hexdigest()
+    return f"{recipient}:{content}"
+
+
+class OutboundQueue:
+    """
+    Cola de salida durable sobre SQLite.
+
+    Cada trabajo se reclama (`in_flight`, con `attempts` incrementado) y se confirma en disco justo
+    antes de enviarlo, y su resultado se confirma en cuanto se conoce: la campaña nunca reside
+    completa en memoria y, tras una caída, como mucho un trabajo queda en estado incierto. Al
+    abrir la cola, ese trabajo `in_flight` vuelve a `pending` (o pasa a `failed` con
+    `retry_in_flight=False`, si se prefiere no arriesgar el reenvío de un mensaje que pudo haber
+    salido); los ya enviados o fallidos nunca se repiten.
+
+    Args:
+        path: Archivo SQLite (por defecto `<session_dir>.queue.sqlite3`, ver `default_path`)
+        batch_size: Trabajos insertados por transacción al encolar
+        retry_in_flight: Reintentar (True) o marcar como fallidos (False) los trabajos interrumpidos
+    """
+
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = 50,
+        retry_in_flight: bool = True
+    ):
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._recover(retry_in_flight)
+
+    @staticmethod
+    def default_path(session_dir: str) -> str:
+        """Archivo de la cola junto al directorio de sesión (`<session_dir>.queue.sqlite3`)."""
+        return os.path.abspath(session_dir).rstrip(os.sep) + ".queue.sqlite3"
+
+    def _recover(self, retry_in_flight: bool) -> None:
+        """Reanuda tras una caída: los trabajos `in_flight` vuelven a la cola o se dan por fallidos."""
+        with self._lock:
+            if retry_in_flight:
+                cursor = self._conn.execute(
+                    "UPDATE outbound SET status = ?, updated_at = ? WHERE status = ?",
+                    (PENDING, time.time(), IN_FLIGHT)
+                )
+            else:
+                cursor = self._conn.execute(
+                    "UPDATE outbound SET status = ?, error = ?, updated_at = ? WHERE status = ?",
+                    (FAILED, "Ejecución interrumpida durante el envío.", time.time(), IN_FLIGHT)
+                )
+            self._conn.commit()
+        if cursor.rowcount:
+            outcome = PENDING if retry_in_flight else FAILED
+            telemetry.count("queue_jobs_recovered", cursor.rowcount, outcome=outcome)
+            telemetry.event(
+                "queue.recovered",
+                f"♻️ {cursor.rowcount} trabajos interrumpidos recuperados de la cola "
+                f"({'se reintentarán' if retry_in_flight else 'marcados como fallidos'}).",
+                level="info", recovered=cursor.rowcount, outcome=outcome
+            )
+
+    def enqueue(self, jobs: Iterable[JobLike]) -> int:
+        """
+        Encola trabajos en streaming (por bloques de `batch_size`).
+        Los trabajos con una clave de idempotencia ya registrada se ignoran.
+
+        Returns:
+            int: Número de trabajos nuevos añadidos
+        """
+        added = 0
+        chunk: List[tuple] = []
+        for raw_job in jobs:
+            job = coerce_job(raw_job)
+            now = time.time()
+            chunk.append((idempotency_key(job.phone, job.message), job.phone, job.message, job.job_id, now, now))
+            if len(chunk) >= self.batch_size:
+                added += self._insert(chunk)
+                chunk = []
+        if chunk:
+            added += self._insert(chunk)
+        return added
+
+    def _insert(self, rows: List[tuple]) -> int:
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO outbound "
+                "(idempotency_key, phone, message, job_id, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+            return self._conn.total_changes - before
+
+    def claim(self, limit: int = 1) -> List[SendJob]:
+        """
+        Reclama hasta `limit` trabajos pendientes (en orden de llegada) y los marca `in_flight`
+        en una transacción confirmada antes de retornar.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, phone, message, job_id FROM outbound WHERE status = ? ORDER BY id LIMIT ?",
+                (PENDING, limit)
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE outbound SET status = ?, attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                [(IN_FLIGHT, time.time(), row[0]) for row in rows]
+            )
+            self._conn.commit()
+        return [SendJob(phone=phone, message=message, job_id=job_id) for _, phone, message, job_id in rows]
+
+    def iter_claimed(self) -> Iterator[SendJob]:
+        """
+        Recorre la cola reclamando un trabajo cada vez, en el momento en que se consume: ningún
+        trabajo queda `in_flight` mientras espera detrás de otros envíos.
+        """
+        while True:
+            batch = self.claim()
+            if not batch:
+                return
+            yield batch[0]
+
+    def complete(self, result: SendResult) -> None:
+        """Registra y confirma de inmediato el resultado de un trabajo reclamado."""
+        job = result.job
+        with self._lock:
+            self._conn.execute(
+                "UPDATE outbound SET status = ?, error = ?, elapsed = ?, updated_at = ? WHERE idempotency_key = ?",
+                (
+                    SENT if result.success else PARTIAL if result.partial else FAILED,
+                    result.error,
+                    result.elapsed,
+                    time.time(),
+                    idempotency_key(job.phone, job.message)
+                )
+            )
+            self._conn.commit()
+
+    def flush(self) -> None:
+        """Confirma cualquier escritura pendiente (los resultados ya se confirman uno a uno)."""
+        with self._lock:
+            self._conn.commit()
+
+    def retry_failed(self) -> int:
+        """
+        Devuelve los trabajos fallidos a la cola; retorna cuántos se reactivaron.
+        Los envíos parciales (`partial`) no se reactivan: repetirlos duplicaría las partes entregadas.
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE outbound SET status = ?, error = NULL, updated_at = ? WHERE status = ?",
+                (PENDING, time.time(), FAILED)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def stats(self) -> Dict[str, int]:
+        """Conteo de trabajos por estado."""
+        counts = {state: 0 for state in STATES}
+        with self._lock:
+            for status, count in self._conn.execute("SELECT status, COUNT(*) FROM outbound GROUP BY status"):
+                counts[status] = count
+        return counts
+
+    def status_of(self, phone: str, message: str) -> Optional[str]:
+        """Estado actual del trabajo (destinatario, mensaje), o None si no está en la cola."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status FROM outbound WHERE idempotency_key = ?",
+                (idempotency_key(phone, message),)
+            ).fetchone()
+        return row[0] if row else None
+
+    def close(self) -> None:
+        """Confirma lo pendiente y cierra la conexión."""
+        self.flush()
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
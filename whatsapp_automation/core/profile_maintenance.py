@@ -0,0 +1,156 @@
+"""
+Módulo ProfileMaintenance - Compactación del perfil persistente de Chromium
+El directorio `session_dir` acumula cachés reconstruibles (HTTP Cache, Code Cache, cachés de GPU y
+de shaders, CacheStorage del Service Worker, informes de fallos y métricas) que ralentizan
+`launch_persistent_context` y encarecen las copias de seguridad. Este módulo las elimina
+conservando lo que mantiene la sesión iniciada: Cookies, IndexedDB, Local Storage y el registro
+del Service Worker.
+"""
+
+import os
+import glob
+import shutil
+import logging
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+logger = logging.getLogger("WhatsAppBot.ProfileMaintenance")
+
+# Rutas (relativas al perfil, con comodines) que Chromium reconstruye bajo demanda
+PRUNABLE_PATHS = (
+    "*/Cache",
+    "*/Code Cache",
+    "*/GPUCache",
+    "*/DawnCache",
+    "*/DawnGraphiteCache",
+    "*/DawnWebGPUCache",
+    "*/Service Worker/CacheStorage",
+    "*/Service Worker/ScriptCache",
+    "*/optimization_guide_hint_cache_store",
+    "*/IndexedDB/*/LOG.old",
+    "*/Local Storage/leveldb/LOG.old",
+    "GrShaderCache",
+    "GraphiteDawnCache",
+    "ShaderCache",
+    "Crashpad",
+    "BrowserMetrics",
+    "BrowserMetrics-spare.pma",
+    "component_crx_cache",
+    "extensions_crx_cache",
+    "optimization_guide_model_store",
+    "Safe Browsing",
+)
+
+# Nunca se tocan: la sesión de WhatsApp Web vive aquí
+PROTECTED_NAMES = ("Cookies", "IndexedDB", "Local Storage", "Session Storage", "blob_storage", "Preferences")
+
+# Marcador de Chromium de perfil en uso (enlace simbólico en Linux/macOS, archivo en Windows)
+_SINGLETON_LOCK = "SingletonLock"
+
+
+@dataclass
+class CompactionReport:
+    """Resultado de compactar un perfil: tamaños y, opcionalmente, tiempos de arranque."""
+
+    size_before: int
+    size_after: int
+    removed: List[str] = field(default_factory=list)
+    startup_before: Optional[float] = None
+    startup_after: Optional[float] = None
+
+    @property
+    def freed(self) -> int:
+        return self.size_before - self.size_after
+
+    def summary(self) -> str:
+        text = (f"{_mb(self.size_before)} → {_mb(self.size_after)} "
+                f"({_mb(self.freed)} liberados, {len(self.removed)} rutas)")
+        if self.startup_before is not None and self.startup_after is not None:
+            text += f"; arranque {self.startup_before:.2f} s → {self.startup_after:.2f} s"
+        return text
+
+
+def _mb(size: int) -> str:
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+def profile_size(session_dir: str) -> int:
+    """Tamaño total en bytes del perfil (sin seguir enlaces simbólicos)."""
+    total = 0
+    for root, _, files in os.walk(session_dir):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def is_profile_in_use(session_dir: str) -> bool:
+    """Indica si un Chromium tiene abierto el perfil (marcador SingletonLock presente)."""
+    return os.path.lexists(os.path.join(session_dir, _SINGLETON_LOCK))
+
+
+def prunable_paths(session_dir: str) -> List[str]:
+    """Rutas existentes del perfil que pueden eliminarse sin perder la sesión."""
+    paths = set()
+    for pattern in PRUNABLE_PATHS:
+        for path in glob.glob(os.path.join(glob.escape(session_dir), pattern)):
+            relative = os.path.relpath(path, session_dir).split(os.sep)
+            # Protección explícita: una coincidencia nunca puede ser un almacén de la sesión
+            if relative[-1] in PROTECTED_NAMES:
+                continue
+            paths.add(path)
+    return sorted(paths)
+
+
+def compact_profile(session_dir: str, dry_run: bool = False) -> CompactionReport:
+    """
+    Elimina las cachés reconstruibles del perfil conservando cookies, IndexedDB y Local Storage.
+    El perfil no debe estar abierto por ningún navegador.
+
+    Args:
+        session_dir: Directorio del perfil persistente
+        dry_run: Solo calcular lo que se eliminaría
+    """
+    if is_profile_in_use(session_dir):
+        raise RuntimeError(f"El perfil {session_dir} está en uso por un navegador; ciérralo antes de compactarlo.")
+
+    size_before = profile_size(session_dir)
+    removed = prunable_paths(session_dir)
+    if not dry_run:
+        for path in removed:
+            try:
+                if os.path.isdir(path) and not os.path.islink(path):
+                    shutil.rmtree(path)
+                else:
+                    os.remove(path)
+            except OSError as e:
+                logger.debug(f"No se pudo eliminar {path}: {e}")
+    size_after = size_before - sum(_path_size(p) for p in removed) if dry_run else profile_size(session_dir)
+    return CompactionReport(size_before=size_before, size_after=size_after, removed=removed)
+
+
+def enforce_size_cap(session_dir: str, max_profile_mb: Optional[float]) -> Optional[CompactionReport]:
+    """
+    Compacta el perfil si supera `max_profile_mb` y no está en uso.
+    Retorna el informe de la compactación, o None si no hizo falta (o no fue posible).
+    """
+    if not max_profile_mb or not os.path.isdir(session_dir) or is_profile_in_use(session_dir):
+        return None
+    if profile_size(session_dir) <= max_profile_mb * 1024 * 1024:
+        return None
+    try:
+        return compact_profile(session_dir)
+    except Exception as e:
+        logger.debug(f"Error al compactar el perfil: {e}")
+        return None
+
+
+def _path_size(path: str) -> int:
+    if os.path.isdir(path) and not os.path.islink(path):
+        return profile_size(path)
+    try:
+        return os.lstat(path).st_size
+    except OSError:
+        return 0
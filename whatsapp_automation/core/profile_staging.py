@@ -0,0 +1,182 @@
+"""
+Módulo ProfileStager - Perfil persistente en disco RAM (tmpfs) con escritura diferida
+Copia `session_dir` a un directorio rápido (por defecto /dev/shm) al iniciar y ejecuta Chromium desde
+ahí; las partes críticas para la autenticación (cookies, IndexedDB, Local Storage, registro del
+Service Worker, preferencias) se escriben de vuelta al disco de forma atómica al cerrar y
+periódicamente, de modo que una caída pierde como mucho un intervalo.
+
+Nota: la copia periódica se toma con el navegador en marcha; LevelDB puede estar a mitad de una
+escritura y la instantánea intermedia ser menos consistente que la final, que se hace con el
+navegador ya cerrado.
+"""
+
+import os
+import glob
+import shutil
+import hashlib
+import logging
+import tempfile
+import threading
+from typing import List, Optional
+
+from .profile_maintenance import PRUNABLE_PATHS
+from .telemetry import telemetry
+
+logger = logging.getLogger("WhatsAppBot.ProfileStager")
+
+# Partes del perfil de las que depende la sesión de WhatsApp Web (relativas, con comodines)
+AUTH_CRITICAL_PATHS = (
+    "Local State",
+    "*/Cookies",
+    "*/Cookies-journal",
+    "*/Network/Cookies",
+    "*/Network/Cookies-journal",
+    "*/IndexedDB",
+    "*/Local Storage",
+    "*/Session Storage",
+    "*/Service Worker/Database",
+    "*/Preferences",
+    "*/Secure Preferences",
+)
+
+# Marcadores de perfil en uso: nunca se copian
+_SINGLETON_PREFIX = "Singleton"
+
+_NEW_SUFFIX = ".staging-new"
+_OLD_SUFFIX = ".staging-old"
+
+
+def default_staging_root() -> str:
+    """Directorio rápido por defecto: /dev/shm (tmpfs) si existe, si no el temporal del sistema."""
+    return "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+
+class ProfileStager:
+    """
+    Gestiona la copia del perfil en un directorio rápido y su escritura diferida al disco.
+
+    Args:
+        session_dir: Perfil persistente en disco (fuente de verdad)
+        staging_root: Directorio rápido donde copiar el perfil (por defecto `default_staging_root()`)
+        sync_interval: Segundos entre escrituras periódicas de las partes críticas (0 = solo al cerrar)
+    """
+
+    def __init__(self, session_dir: str, staging_root: Optional[str] = None, sync_interval: float = 60.0):
+        self.session_dir = os.path.abspath(session_dir)
+        self.staging_root = staging_root or default_staging_root()
+        digest = hashlib.sha1(self.session_dir.encode("utf-8")).hexdigest()[:12]
+        self.staged_dir = os.path.join(self.staging_root, f"whatsapp-profile-{digest}")
+        self.sync_interval = sync_interval
+        self._sync_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.write_backs = 0
+
+    def stage(self) -> str:
+        """Copia el perfil (sin cachés reconstruibles ni marcadores de bloqueo) al directorio rápido."""
+        self._recover_interrupted_swaps()
+        os.makedirs(self.session_dir, exist_ok=True)
+        if os.path.exists(self.staged_dir):
+            shutil.rmtree(self.staged_dir)
+        skipped = {os.path.normpath(path) for path in self._matches(self.session_dir, PRUNABLE_PATHS)}
+
+        def ignore(directory, names):
+            return [
+                name for name in names
+                if name.startswith(_SINGLETON_PREFIX) or os.path.normpath(os.path.join(directory, name)) in skipped
+            ]
+
+        shutil.copytree(self.session_dir, self.staged_dir, ignore=ignore, symlinks=True)
+        telemetry.event("profile.staged", f"⚡ Perfil copiado a {self.staged_dir} (escritura diferida cada {self.sync_interval:g} s).", level="info")
+        return self.staged_dir
+
+    @staticmethod
+    def _matches(root: str, patterns) -> List[str]:
+        paths = []
+        for pattern in patterns:
+            paths.extend(glob.glob(os.path.join(glob.escape(root), pattern)))
+        return sorted(set(paths))
+
+    def write_back(self) -> None:
+        """
+        Escribe las partes críticas del perfil rápido en el disco. Cada archivo o directorio se
+        copia primero junto a su destino y luego se intercambia por renombrado, de modo que el
+        disco nunca queda con una copia a medias (un intercambio interrumpido se repara en `stage`).
+        """
+        with self._sync_lock:
+            for staged_path in self._matches(self.staged_dir, AUTH_CRITICAL_PATHS):
+                relative = os.path.relpath(staged_path, self.staged_dir)
+                self._swap_in(staged_path, os.path.join(self.session_dir, relative))
+            self.write_backs += 1
+
+    @staticmethod
+    def _swap_in(source: str, destination: str) -> None:
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        new_path, old_path = destination + _NEW_SUFFIX, destination + _OLD_SUFFIX
+        if os.path.isdir(source):
+            if os.path.exists(new_path):
+                shutil.rmtree(new_path)
+            shutil.copytree(source, new_path, symlinks=True)
+            if os.path.exists(destination):
+                os.replace(destination, old_path)
+            os.replace(new_path, destination)
+            if os.path.exists(old_path):
+                shutil.rmtree(old_path)
+        else:
+            shutil.copy2(source, new_path)
+            os.replace(new_path, destination)
+
+    def _recover_interrupted_swaps(self) -> None:
+        """Repara intercambios interrumpidos por una caída: restaura la copia anterior si falta el destino."""
+        if not os.path.isdir(self.session_dir):
+            return
+        for root, dirs, files in os.walk(self.session_dir):
+            for name in list(dirs) + files:
+                path = os.path.join(root, name)
+                if name.endswith(_OLD_SUFFIX):
+                    destination = path[:-len(_OLD_SUFFIX)]
+                    if os.path.exists(destination):
+                        _remove(path)
+                    else:
+                        os.replace(path, destination)
+                elif name.endswith(_NEW_SUFFIX):
+                    _remove(path)
+
+    def start_periodic(self) -> None:
+        """Inicia la escritura periódica en segundo plano."""
+        if self.sync_interval <= 0 or self._thread:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._periodic, name="whatsapp-profile-sync", daemon=True)
+        self._thread.start()
+
+    def _periodic(self) -> None:
+        while not self._stop_event.wait(self.sync_interval):
+            try:
+                self.write_back()
+            except Exception as e:
+                logger.debug(f"Error en la escritura periódica del perfil: {e}")
+
+    def stop_periodic(self) -> None:
+        """Detiene la escritura periódica."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def finalize(self) -> None:
+        """Con el navegador ya cerrado: última escritura y eliminación de la copia rápida."""
+        self.stop_periodic()
+        self.write_back()
+        shutil.rmtree(self.staged_dir, ignore_errors=True)
+        telemetry.event("profile.written_back", "💾 Perfil escrito de vuelta al disco.", level="info")
+
+
+def _remove(path: str) -> None:
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,194 @@
+"""
+Módulo PacingScheduler - Ritmo de envío con cubetas de fichas (token bucket)
+Limita los envíos por minuto/hora de forma global, por destinatario y por perfil de sesión,
+permitiendo ráfagas hasta la capacidad de cada cubeta. Sustituye el relleno de pausas fijas
+en cada interacción de la interfaz por una única espera antes de cada envío, que se reporta.
+"""
+
+import re
+import time
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from ..services.recipients import normalize_phone
+
+logger = logging.getLogger("WhatsAppBot.Scheduler")
+
+_UNITS = {"s": 1.0, "sec": 1.0, "min": 60.0, "m": 60.0, "h": 3600.0, "hour": 3600.0, "d": 86400.0, "day": 86400.0}
+_RATE_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*/\s*(\d+(?:\.\d+)?)?\s*([a-z]+)\s*(?:\+\s*(\d+))?\s*$", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class Rate:
+    """
+    Tasa de envío: `count` envíos cada `per_seconds` segundos, con ráfagas de hasta `burst`
+    envíos seguidos (por defecto `count`).
+    """
+
+    count: float
+    per_seconds: float
+    burst: Optional[float] = None
+
+    def __post_init__(self):
+        if self.count <= 0 or self.per_seconds <= 0:
+            raise ValueError(f"La tasa debe ser positiva (recibido: {self.count:g} cada {self.per_seconds:g} s).")
+        if self.burst is not None and self.burst < 1:
+            raise ValueError(f"La ráfaga debe permitir al menos un envío (recibido: {self.burst:g}).")
+
+    @property
+    def capacity(self) -> float:
+        return self.burst if self.burst is not None else max(self.count, 1.0)
+
+    @property
+    def per_second(self) -> float:
+        return self.count / self.per_seconds
+
+    @classmethod
+    def parse(cls, spec: str) -> "Rate":
+        """
+        Interpreta una tasa en texto: "20/min", "300/h", "1/5s", o con ráfaga explícita "20/min+5".
+        """
+        match = _RATE_PATTERN.match(spec)
+        if not match or match.group(3).lower() not in _UNITS:
+            raise ValueError(f"Tasa no válida: '{spec}' (ejemplos: '20/min', '300/h', '1/5s', '20/min+5').")
+        count, multiplier, unit, burst = match.groups()
+        per_seconds = float(multiplier or 1) * _UNITS[unit.lower()]
+        return cls(float(count), per_seconds, float(burst) if burst else None)
+
+
+class TokenBucket:
+    """Cubeta de fichas: se rellena a `rate.per_second` hasta `rate.capacity`; cada envío consume una."""
+
+    def __init__(self, rate: Rate, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self._clock = clock
+        self.tokens = rate.capacity
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.rate.capacity, self.tokens + (now - self._updated) * self.rate.per_second)
+        self._updated = now
+
+    def delay(self, tokens: float = 1.0) -> float:
+        """Segundos que faltan para disponer de `tokens` fichas (0 si ya están disponibles)."""
+        self._refill()
+        missing = tokens - self.tokens
+        return max(missing / self.rate.per_second, 0.0)
+
+    def consume(self, tokens: float = 1.0) -> None:
+        self._refill()
+        self.tokens -= tokens
+
+    @property
+    def is_full(self) -> bool:
+        self._refill()
+        return self.tokens >= self.rate.capacity
+
+
+class PacingScheduler:
+    """
+    Planificador de ritmo delante de la ruta de envío del Facade.
+    Antes de cada envío espera lo mínimo necesario para respetar todas las cubetas aplicables
+    (global, del destinatario y del perfil) y retorna la espera introducida.
+
+    Args:
+        global_rate: Tasa máxima del proceso ("30/min" o Rate)
+        per_recipient: Tasa máxima hacia un mismo destinatario
+        per_profile: Tasa máxima de cada perfil de sesión (cuenta de WhatsApp)
+        clock / sleep: Reloj monótono y función de espera (inyectables en pruebas)
+        max_tracked_recipients: Cubetas de destinatario retenidas antes de descartar las llenas (inactivas)
+    """
+
+    def __init__(
+        self,
+        global_rate=None,
+        per_recipient=None,
+        per_profile=None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        max_tracked_recipients: int = 10000
+    ):
+        self.global_rate = self._coerce(global_rate)
+        self.per_recipient = self._coerce(per_recipient)
+        self.per_profile = self._coerce(per_profile)
+        self._clock = clock
+        self._sleep = sleep
+        self.max_tracked_recipients = max_tracked_recipients
+        self._lock = threading.Lock()
+        self._global = TokenBucket(self.global_rate, clock) if self.global_rate else None
+        self._recipients: Dict[str, TokenBucket] = {}
+        self._profiles: Dict[str, TokenBucket] = {}
+        self.acquisitions = 0
+        self.total_wait = 0.0
+
+    @staticmethod
+    def _coerce(rate) -> Optional[Rate]:
+        if rate is None or isinstance(rate, Rate):
+            return rate
+        return Rate.parse(rate)
+
+    def _buckets(self, recipient: str, profile: Optional[str]) -> List[TokenBucket]:
+        buckets = [self._global] if self._global else []
+        if self.per_recipient:
+            key = normalize_phone(recipient) or recipient.strip().lower()
+            if key not in self._recipients and len(self._recipients) >= self.max_tracked_recipients:
+                self._prune_recipients()
+            buckets.append(self._recipients.setdefault(key, TokenBucket(self.per_recipient, self._clock)))
+        if self.per_profile and profile is not None:
+            buckets.append(self._profiles.setdefault(profile, TokenBucket(self.per_profile, self._clock)))
+        return buckets
+
+    def _prune_recipients(self) -> None:
+        """Descarta las cubetas de destinatario llenas: equivalen a una cubeta nueva."""
+        for key in [key for key, bucket in self._recipients.items() if bucket.is_full]:
+            del self._recipients[key]
+
+    def acquire(self, recipient: str, profile: Optional[str] = None) -> float:
+        """
+        Bloquea hasta que el envío a `recipient` desde `profile` respete todas las tasas configuradas.
+
+        Returns:
+            float: Segundos de espera introducidos por el planificador
+        """
+        waited = 0.0
+        while True:
+            delay = self.try_acquire(recipient, profile, waited=waited)
+            if not delay:
+                return waited
+            logger.debug(f"Ritmo de envío: esperando {delay:.2f} s antes de enviar a {recipient}.")
+            self._sleep(delay)
+            waited += delay
+
+    def try_acquire(self, recipient: str, profile: Optional[str] = None, waited: float = 0.0) -> float:
+        """
+        Intento sin bloqueo: si todas las cubetas lo permiten consume el envío y retorna 0.0; si no,
+        retorna los segundos que faltan (el llamador espera a su manera, p. ej. con asyncio.sleep).
+        `waited` es la espera ya acumulada por el llamador, sumada a las estadísticas al autorizar.
+        """
+        with self._lock:
+            buckets = self._buckets(recipient, profile)
+            delay = max((bucket.delay() for bucket in buckets), default=0.0)
+            if delay > 1e-9:
+                return delay
+            for bucket in buckets:
+                bucket.consume()
+            self.acquisitions += 1
+            self.total_wait += waited
+            return 0.0
+
+    def __getstate__(self):
+        # Permite pasar el planificador a los procesos de CampaignRunner (cada uno con sus cubetas)
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def stats(self) -> Dict[str, float]:
+        """Envíos autorizados y espera total introducida."""
+        return {"acquisitions": self.acquisitions, "total_wait": self.total_wait}
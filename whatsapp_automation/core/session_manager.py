@@ -6,9 +6,18 @@ utilizando el contexto persistente de Playwright.
 
 import os
 import sys
+import time
 import logging
-from typing import Optional
-from playwright.sync_api import sync_playwright, BrowserContext, Page, Playwright
+from typing import List, Optional, Union
+from playwright.sync_api import sync_playwright, Browser, BrowserContext, Page, Playwright
+
+from .browser_options import LAUNCH_ARGS, USER_AGENT
+from .network_filter import NetworkFilter
+from .browser_daemon import find_daemon
+from .profile_maintenance import CompactionReport, compact_profile, enforce_size_cap
+from .profile_staging import ProfileStager
+from .telemetry import telemetry
+from ..pages.base_page import BasePage
 
 logger = logging.getLogger("WhatsAppBot.SessionManager")
 
@@ -20,6 +29,10 @@ class SessionManager:
     """
     _instance: Optional["SessionManager"] = None
 
+    # Argumentos de lanzamiento y agente de usuario (compartidos con AsyncSessionManager)
+    LAUNCH_ARGS: List[str] = LAUNCH_ARGS
+    USER_AGENT: str = USER_AGENT
+
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
             cls._instance = super(SessionManager, cls).__new__(cls)
@@ -30,7 +43,12 @@ class SessionManager:
         self,
         session_dir: Optional[str] = None,
         headless: bool = False,
-        wait_time: float = 2.0
+        wait_time: float = 2.0,
+        network_filter: Optional[NetworkFilter] = None,
+        use_daemon: bool = True,
+        max_profile_mb: Optional[float] = None,
+        staging_dir: Union[bool, str, None] = None,
+        staging_sync_interval: float = 60.0
     ):
         if self._initialized:
             # Actualizar configuraciones si se reinicializa
@@ -38,17 +56,35 @@ class SessionManager:
                 self.session_dir = os.path.abspath(session_dir)
             self.headless = headless
             self.wait_time = wait_time
+            self.network_filter = network_filter
+            self.use_daemon = use_daemon
+            self.max_profile_mb = max_profile_mb
+            self.staging_dir = staging_dir
+            self.staging_sync_interval = staging_sync_interval
             return
 
         self.session_dir = os.path.abspath(session_dir or os.path.join(os.getcwd(), "session_data"))
         self.headless = headless
         self.wait_time = wait_time
+        # Modo de red ligero opcional (intercepción de imágenes, multimedia y fuentes)
+        self.network_filter = network_filter
+        # Conectarse al navegador residente del perfil (BrowserDaemon) si está en marcha
+        self.use_daemon = use_daemon
+        # Tamaño máximo del perfil: al cerrar, si se supera, se podan las cachés reconstruibles
+        self.max_profile_mb = max_profile_mb
+        # Copia del perfil en disco RAM: True (tmpfs por defecto) o ruta de un directorio rápido
+        self.staging_dir = staging_dir
+        self.staging_sync_interval = staging_sync_interval
+        self.stager: Optional[ProfileStager] = None
 
         self.playwright: Optional[Playwright] = None
+        self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
+        self.attached = False
         self._initialized = True
 
+    @telemetry.traced("session.start")
     def initialize_session(self) -> Page:
         """
         Inicia Playwright con un contexto persistente que almacena cookies,
@@ -59,54 +95,140 @@ class SessionManager:
 
         # Asegurar existencia del directorio de sesión
         os.makedirs(self.session_dir, exist_ok=True)
-        print(f"📁 Directorio de sesión persistente: {self.session_dir}")
+        telemetry.event("session.dir", f"📁 Directorio de sesión persistente: {self.session_dir}", level="debug")
 
         if not self.playwright:
             self.playwright = sync_playwright().start()
 
-        # Argumentos para evitar detección de bot y garantizar estabilidad
-        launch_args = [
-            "--disable-blink-features=AutomationControlled",
-            "--start-maximized",
-            "--no-sandbox",
-            "--disable-setuid-sandbox"
-        ]
-
-        print("🚀 Lanzando navegador con perfil de usuario persistente...")
-        self.context = self.playwright.chromium.launch_persistent_context(
-            user_data_dir=self.session_dir,
-            headless=self.headless,
-            args=launch_args,
-            viewport=None,  # Usar tamaño de ventana real
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        )
-
-        if len(self.context.pages) > 0:
-            self.page = self.context.pages[0]
+        endpoint = find_daemon(self.session_dir) if self.use_daemon else None
+        if endpoint:
+            self._attach(endpoint)
         else:
-            self.page = self.context.new_page()
-
+            telemetry.event("session.launch", "🚀 Lanzando navegador con perfil de usuario persistente...", level="info")
+            self.context = self.launch_context(self.playwright, self._stage_profile(), self.headless)
+            if self.stager:
+                self.stager.start_periodic()
+            self.page = self.context.pages[0] if len(self.context.pages) > 0 else self.context.new_page()
+
+        if self.network_filter:
+            self.network_filter.install(self.context)
         return self.page
 
+    def _stage_profile(self) -> str:
+        """Directorio desde el que se lanza Chromium: el perfil en disco o su copia en el directorio rápido."""
+        if not self.staging_dir:
+            return self.session_dir
+        staging_root = self.staging_dir if isinstance(self.staging_dir, str) else None
+        self.stager = ProfileStager(self.session_dir, staging_root, sync_interval=self.staging_sync_interval)
+        return self.stager.stage()
+
+    @telemetry.traced("session.attach")
+    def _attach(self, endpoint: str) -> None:
+        """Se conecta por CDP al navegador residente y reutiliza su pestaña de WhatsApp Web ya sincronizada."""
+        telemetry.event("session.attach", f"🔌 Conectando al navegador residente del perfil ({endpoint})...", level="info")
+        self.browser = self.playwright.chromium.connect_over_cdp(endpoint)
+        self.context = self.browser.contexts[0]
+        pages = self.context.pages
+        whatsapp_pages = [p for p in pages if p.url.startswith(BasePage.WHATSAPP_URL)]
+        self.page = (whatsapp_pages or pages or [None])[0] or self.context.new_page()
+        self.attached = True
+
+    @classmethod
+    @telemetry.traced("session.launch")
+    def launch_context(
+        cls,
+        playwright: Playwright,
+        session_dir: str,
+        headless: bool,
+        extra_args: Optional[List[str]] = None
+    ) -> BrowserContext:
+        """Lanza Chromium con el perfil persistente `session_dir` y los argumentos del bot."""
+        return playwright.chromium.launch_persistent_context(
+            user_data_dir=session_dir,
+            headless=headless,
+            args=cls.LAUNCH_ARGS + list(extra_args or []),
+            viewport=None,  # Usar tamaño de ventana real
+            user_agent=cls.USER_AGENT
+        )
+
     def get_page(self) -> Page:
         """Retorna la página activa o la inicializa si no existe."""
         if not self.page or self.page.is_closed():
             return self.initialize_session()
         return self.page
 
+    @telemetry.traced("session.close")
     def close(self) -> None:
         """Cierra el contexto y libera los recursos de Playwright."""
         try:
-            if self.context:
-                print("🔒 Guardando cookies y cerrando sesión del navegador...")
-                self.context.close()
+            if self.attached:
+                # El navegador pertenece al demonio: solo se desconecta este cliente
+                telemetry.event("session.detach", "🔌 Desconectando del navegador residente (sigue en marcha).", level="info")
+                self.browser = None
                 self.context = None
                 self.page = None
+                self.attached = False
+            elif self.context:
+                telemetry.event("session.close", "🔒 Guardando cookies y cerrando sesión del navegador...", level="info")
+                try:
+                    self.context.close()
+                finally:
+                    self.context = None
+                    self.page = None
             if self.playwright:
-                self.playwright.stop()
-                self.playwright = None
+                try:
+                    self.playwright.stop()
+                finally:
+                    self.playwright = None
         except Exception as e:
             logger.debug(f"Error al cerrar SessionManager: {e}")
+        finally:
+            # Última escritura del perfil rápido al disco aunque el cierre del navegador haya fallado:
+            # la copia en tmpfs no sobrevive al reinicio y perderla es perder la sesión
+            if self.stager:
+                stager, self.stager = self.stager, None
+                try:
+                    stager.finalize()
+                except Exception as e:
+                    telemetry.event("profile.write_back_failed", f"⚠️ No se pudo escribir el perfil de vuelta al disco: {e}", level="warning")
+        self._enforce_size_cap()
+
+    def _enforce_size_cap(self) -> None:
+        """Compacta el perfil al cerrar si supera `max_profile_mb`."""
+        report = enforce_size_cap(self.session_dir, self.max_profile_mb)
+        if report:
+            telemetry.event("profile.compacted", f"🧹 Perfil compactado al superar {self.max_profile_mb:g} MB: {report.summary()}", level="info")
+
+    def compact_profile(self, dry_run: bool = False, measure_startup: bool = False) -> CompactionReport:
+        """
+        Poda las cachés reconstruibles del perfil (HTTP Cache, Code Cache, GPU, CacheStorage, logs)
+        conservando cookies, IndexedDB y Local Storage. Requiere la sesión cerrada.
+
+        Args:
+            dry_run: Solo informar de lo que se eliminaría
+            measure_startup: Medir el arranque del contexto persistente antes y después
+        """
+        if self.context:
+            raise RuntimeError("Cierra la sesión del navegador antes de compactar el perfil.")
+        startup_before = self.measure_startup() if measure_startup else None
+        report = compact_profile(self.session_dir, dry_run=dry_run)
+        if measure_startup:
+            report.startup_before = startup_before
+            report.startup_after = self.measure_startup()
+        telemetry.event("profile.compaction", f"🧹 Compactación del perfil{' (simulación)' if dry_run else ''}: {report.summary()}")
+        return report
+
+    def measure_startup(self) -> float:
+        """Segundos que tarda en lanzarse (sin interfaz) el contexto persistente del perfil."""
+        playwright = sync_playwright().start()
+        try:
+            start = time.perf_counter()
+            context = self.launch_context(playwright, self.session_dir, headless=True)
+            elapsed = time.perf_counter() - start
+            context.close()
+            return elapsed
+        finally:
+            playwright.stop()
 
     @classmethod
     def reset_instance(cls):
@@ -0,0 +1,231 @@
+"""
+Módulo SessionPool - Pool de sesiones persistentes por perfil
+Alternativa al Singleton SessionManager para manejar varias cuentas de WhatsApp en un mismo proceso:
+cada directorio de perfil tiene su propio contexto persistente sobre un único driver de Playwright,
+con un límite de contextos abiertos y desalojo LRU de los que estén inactivos.
+"""
+
+import os
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+from playwright.sync_api import sync_playwright, BrowserContext, Page, Playwright
+
+from .session_manager import SessionManager
+from .network_filter import NetworkFilter
+from .telemetry import telemetry
+
+logger = logging.getLogger("WhatsAppBot.SessionPool")
+
+
+class PooledSession:
+    """
+    Sesión de un perfil dentro del pool. Expone la misma interfaz que SessionManager
+    (`initialize_session`, `get_page`, `close`) para que WhatsAppBotFacade la use sin cambios.
+    """
+
+    def __init__(self, pool: "SessionPool", session_dir: str):
+        self.pool = pool
+        self.session_dir = session_dir
+        self.headless = pool.headless
+        self.wait_time = pool.wait_time
+        self.context: Optional[BrowserContext] = None
+        self.page: Optional[Page] = None
+        self.last_used = time.monotonic()
+        # Bloqueo por sesión y contador de usos activos (una sesión en uso nunca se desaloja)
+        self.lock = threading.RLock()
+        self.busy = 0
+
+    @property
+    def is_open(self) -> bool:
+        return self.context is not None
+
+    def initialize_session(self) -> Page:
+        """Abre (o reutiliza) el contexto persistente de este perfil dentro del pool."""
+        with self.lock:
+            self.last_used = time.monotonic()
+            if self.page and not self.page.is_closed():
+                return self.page
+            return self.pool._open(self)
+
+    def get_page(self) -> Page:
+        """Retorna la página activa o la inicializa si no existe."""
+        return self.initialize_session()
+
+    @contextmanager
+    def using(self) -> Iterator["PooledSession"]:
+        """Marca la sesión como ocupada durante el bloque (exclusión y protección frente al desalojo)."""
+        with self.lock:
+            self.busy += 1
+            try:
+                yield self
+            finally:
+                self.busy -= 1
+                self.last_used = time.monotonic()
+
+    def close(self) -> None:
+        """Cierra el contexto de este perfil; el driver compartido sigue activo."""
+        with self.lock:
+            if self.context:
+                try:
+                    telemetry.event("pool.close", f"🔒 Guardando cookies y cerrando perfil: {self.session_dir}", level="info")
+                    self.context.close()
+                except Exception as e:
+                    logger.debug(f"Error al cerrar el perfil {self.session_dir}: {e}")
+            self.context = None
+            self.page = None
+
+
+class SessionPool:
+    """
+    Pool de sesiones persistentes indexado por directorio de perfil.
+    El driver de Playwright (API síncrona) es compartido y pertenece al hilo que creó el pool.
+    """
+
+    def __init__(
+        self,
+        max_open: int = 3,
+        headless: bool = False,
+        wait_time: float = 2.0,
+        playwright_factory: Optional[Callable[[], Playwright]] = None,
+        network_filter: Optional[NetworkFilter] = None
+    ):
+        if max_open < 1:
+            raise ValueError("max_open debe ser al menos 1.")
+        self.max_open = max_open
+        self.headless = headless
+        self.wait_time = wait_time
+        # Modo de red ligero compartido por todos los contextos del pool (contadores agregados)
+        self.network_filter = network_filter
+        self._playwright_factory = playwright_factory or (lambda: sync_playwright().start())
+        self.playwright: Optional[Playwright] = None
+        self._sessions: Dict[str, PooledSession] = {}
+        self._facades: Dict[str, "WhatsAppBotFacade"] = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _key(session_dir: str) -> str:
+        return os.path.abspath(session_dir)
+
+    def get(self, session_dir: str) -> PooledSession:
+        """Retorna la sesión del perfil, creándola (sin abrir el navegador) si no existe."""
+        key = self._key(session_dir)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = PooledSession(self, key)
+                self._sessions[key] = session
+            return session
+
+    @contextmanager
+    def lease(self, session_dir: str) -> Iterator[Page]:
+        """Uso exclusivo de la página de un perfil durante el bloque."""
+        session = self.get(session_dir)
+        with session.using():
+            yield session.initialize_session()
+
+    def facade(self, session_dir: str, **facade_kwargs) -> "WhatsAppBotFacade":
+        """
+        Retorna el WhatsAppBotFacade asociado al perfil (uno por perfil, reutilizado entre llamadas).
+        Por defecto no cierra el contexto al salir del bloque `with` para mantenerlo caliente en el pool.
+        Las opciones del navegador (`lean_network`, `use_daemon`, ...) no se aceptan aquí: el modo de red
+        ligero se configura en el pool (`network_filter`) y se aplica a todos sus contextos.
+        """
+        from .bot_facade import WhatsAppBotFacade
+
+        key = self._key(session_dir)
+        with self._lock:
+            facade = self._facades.get(key)
+            if facade is None:
+                facade_kwargs.setdefault("auto_close", False)
+                facade = WhatsAppBotFacade(
+                    headless=self.headless,
+                    wait_time=self.wait_time,
+                    session_manager=self.get(key),
+                    **facade_kwargs
+                )
+                self._facades[key] = facade
+            return facade
+
+    def open_sessions(self) -> Dict[str, PooledSession]:
+        """Sesiones con el contexto del navegador abierto."""
+        with self._lock:
+            return {key: s for key, s in self._sessions.items() if s.is_open}
+
+    def _open(self, session: PooledSession) -> Page:
+        """Lanza el contexto persistente de una sesión respetando el límite de contextos abiertos."""
+        with self._lock:
+            self._ensure_capacity(exclude=session)
+            os.makedirs(session.session_dir, exist_ok=True)
+            if not self.playwright:
+                self.playwright = self._playwright_factory()
+
+            telemetry.event("pool.launch", f"🚀 Lanzando perfil persistente del pool: {session.session_dir}", level="info")
+            session.context = SessionManager.launch_context(self.playwright, session.session_dir, self.headless)
+            if self.network_filter:
+                self.network_filter.install(session.context)
+            pages = session.context.pages
+            session.page = pages[0] if len(pages) > 0 else session.context.new_page()
+            session.last_used = time.monotonic()
+            return session.page
+
+    def _ensure_capacity(self, exclude: PooledSession) -> None:
+        """Desaloja los contextos inactivos menos usados recientemente hasta tener un hueco libre."""
+        while True:
+            open_sessions = [s for s in self._sessions.values() if s.is_open and s is not exclude]
+            if len(open_sessions) < self.max_open:
+                return
+            if not any(self._evict(victim) for victim in sorted(open_sessions, key=lambda s: s.last_used)):
+                raise RuntimeError(
+                    f"El pool alcanzó el máximo de {self.max_open} sesiones abiertas y todas están en uso."
+                )
+
+    def _evict(self, victim: PooledSession) -> bool:
+        """
+        Cierra una sesión inactiva (con el bloqueo del pool ya tomado). El bloqueo de la víctima se
+        intenta sin esperar: una sesión cuyo bloqueo está tomado se considera en uso y se omite, de modo
+        que este orden (pool → sesión) nunca espera al inverso de `using()` (sesión → pool).
+        """
+        if not victim.lock.acquire(blocking=False):
+            return False
+        try:
+            if victim.busy or not victim.is_open:
+                return False
+            logger.debug(f"Desalojando sesión inactiva (LRU): {victim.session_dir}")
+            victim.close()
+        finally:
+            victim.lock.release()
+        facade = self._facades.get(victim.session_dir)
+        if facade:
+            facade.authenticated = False
+        return True
+
+    def close(self, session_dir: str) -> None:
+        """Cierra el contexto de un perfil y lo retira del pool."""
+        key = self._key(session_dir)
+        with self._lock:
+            session = self._sessions.pop(key, None)
+            facade = self._facades.pop(key, None)
+        if facade and facade.selector_cache:
+            facade.selector_cache.save()
+        if session:
+            session.close()
+
+    def close_all(self) -> None:
+        """Cierra todos los contextos y detiene el driver compartido de Playwright."""
+        for key in list(self._sessions):
+            self.close(key)
+        if self.playwright:
+            try:
+                self.playwright.stop()
+            except Exception as e:
+                logger.debug(f"Error al detener Playwright: {e}")
+            self.playwright = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close_all()
@@ -0,0 +1,333 @@
+"""
+Módulo Telemetry - Tramos de tiempo por fase, contadores y eventos estructurados
+Instrumenta cada fase de un envío (lanzamiento, navegación, autenticación, búsqueda, redacción,
+confirmación) con temporizadores monótonos y tramos anidados, cuenta envíos y fallos y sustituye
+los `print` de progreso por eventos con nivel seleccionable. Exporta a un archivo JSON-lines, a un
+archivo en formato de texto de Prometheus y a ganchos propios (`add_hook`).
+
+Desactivada (por defecto) solo imprime los eventos del nivel de consola elegido: los tramos son un
+objeto nulo compartido y los contadores retornan de inmediato.
+"""
+
+import os
+import re
+import json
+import time
+import inspect
+import logging
+import threading
+import functools
+import itertools
+import contextvars
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("WhatsAppBot.Telemetry")
+
+LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40, "silent": 100}
+
+# Tramo activo del contexto actual (hilo o tarea de asyncio): permite anidar tramos
+_current_span: contextvars.ContextVar = contextvars.ContextVar("whatsapp_current_span", default=None)
+
+_METRIC_NAME = re.compile(r"[^a-zA-Z0-9_]")
+
+
+class _NullSpan:
+    """Tramo nulo compartido cuando la telemetría está desactivada."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+    def set(self, **attrs) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """Tramo temporizado con `time.perf_counter`; se registra al salir del bloque `with`."""
+
+    __slots__ = ("telemetry", "name", "attrs", "span_id", "parent_id", "depth", "start", "_token")
+
+    def __init__(self, telemetry: "Telemetry", name: str, attrs: Dict[str, Any]):
+        self.telemetry = telemetry
+        self.name = name
+        self.attrs = attrs
+        self.span_id = next(telemetry._ids)
+        self.parent_id = None
+        self.depth = 0
+        self.start = 0.0
+        self._token = None
+
+    def set(self, **attrs) -> None:
+        """Añade atributos al tramo (p. ej. el resultado de la fase)."""
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        parent = _current_span.get()
+        if parent is not None:
+            self.parent_id = parent.span_id
+            self.depth = parent.depth + 1
+        self._token = _current_span.set(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        duration = time.perf_counter() - self.start
+        _current_span.reset(self._token)
+        self.telemetry._finish_span(self, duration, exc_type)
+        return False
+
+
+class Telemetry:
+    """
+    Telemetría del bot (Singleton de módulo: `telemetry`). Se configura con `configure`.
+
+    Args:
+        enabled: Registrar tramos, contadores y eventos en los exportadores y ganchos
+        console_level: Nivel mínimo de los eventos mostrados en consola ("debug", "info",
+            "warning", "error" o "silent")
+        jsonl_path: Archivo JSON-lines donde se añade un registro por tramo, evento y contador
+        prometheus_path: Archivo en formato de texto de Prometheus reescrito en cada `flush`
+        prefix: Prefijo de las métricas de Prometheus
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        console_level: str = "info",
+        jsonl_path: Optional[str] = None,
+        prometheus_path: Optional[str] = None,
+        prefix: str = "whatsapp"
+    ):
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._hooks: List[Callable[[Dict[str, Any]], None]] = []
+        self._jsonl = None
+        self.enabled = False
+        self.jsonl_path = None
+        self.prometheus_path = None
+        self.prefix = prefix
+        self.console_threshold = LEVELS["info"]
+        self.reset()
+        self.configure(enabled, console_level, jsonl_path, prometheus_path)
+
+    def configure(
+        self,
+        enabled: Optional[bool] = None,
+        console_level: Optional[str] = None,
+        jsonl_path: Optional[str] = None,
+        prometheus_path: Optional[str] = None,
+        prefix: Optional[str] = None
+    ) -> "Telemetry":
+        """
+        Ajusta la telemetría en el sitio (los módulos conservan la misma instancia).
+        Indicar un exportador activa la telemetría salvo que se pase `enabled=False`.
+        """
+        if console_level is not None:
+            if console_level not in LEVELS:
+                raise ValueError(f"Nivel no válido: '{console_level}' (usa {', '.join(LEVELS)}).")
+            self.console_threshold = LEVELS[console_level]
+        if prefix is not None:
+            self.prefix = prefix
+        if jsonl_path is not None and jsonl_path != self.jsonl_path:
+            self._close_jsonl()
+            self.jsonl_path = jsonl_path
+            # Con búfer de línea: cada registro llega completo al archivo (varios procesos pueden compartirlo)
+            self._jsonl = open(jsonl_path, "a", encoding="utf-8", buffering=1)
+        if prometheus_path is not None:
+            self.prometheus_path = prometheus_path
+        if enabled is None:
+            enabled = self.enabled or jsonl_path is not None or prometheus_path is not None
+        self.enabled = enabled
+        return self
+
+    def reset(self) -> None:
+        """Descarta los contadores y agregados acumulados."""
+        with self._lock:
+            self._counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+            self._spans: Dict[str, List[float]] = {}
+
+    def add_hook(self, hook: Callable[[Dict[str, Any]], None]) -> None:
+        """Registra un colector propio: recibe cada registro (tramo, evento o contador) como diccionario."""
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook: Callable[[Dict[str, Any]], None]) -> None:
+        if hook in self._hooks:
+            self._hooks.remove(hook)
+
+    # ------------------------------------------------------------------ instrumentación
+
+    def span(self, name: str, **attrs):
+        """Tramo temporizado (`with telemetry.span("chat.search"):`); anidable."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, attrs)
+
+    def traced(self, name: str) -> Callable:
+        """Decorador que envuelve cada llamada (síncrona o asíncrona) en un tramo."""
+        def decorator(func):
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    if not self.enabled:
+                        return await func(*args, **kwargs)
+                    with Span(self, name, {}):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with Span(self, name, {}):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def count(self, name: str, value: float = 1, **labels) -> None:
+        """Incrementa un contador (con etiquetas opcionales)."""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+        self._emit({"type": "counter", "name": name, "value": value, "labels": labels})
+
+    def event(self, name: str, message: str, level: str = "info", **fields) -> None:
+        """
+        Evento estructurado: se muestra en consola si alcanza el nivel configurado y, con la
+        telemetría activa, se registra con su nivel, campos y tramo en curso.
+        """
+        severity = LEVELS[level]
+        if severity >= self.console_threshold:
+            print(message)
+        if severity >= LEVELS["warning"]:
+            logger.log(logging.ERROR if severity >= LEVELS["error"] else logging.WARNING, f"{name}: {message}")
+        if not self.enabled:
+            return
+        parent = _current_span.get()
+        self._emit({
+            "type": "event",
+            "name": name,
+            "level": level,
+            "message": message,
+            "span_id": parent.span_id if parent else None,
+            "fields": fields,
+        })
+
+    # ------------------------------------------------------------------ registro y exportación
+
+    def _finish_span(self, span: Span, duration: float, exc_type) -> None:
+        with self._lock:
+            aggregate = self._spans.get(span.name)
+            if aggregate is None:
+                # [cantidad, suma, máximo, errores]
+                aggregate = self._spans[span.name] = [0, 0.0, 0.0, 0]
+            aggregate[0] += 1
+            aggregate[1] += duration
+            aggregate[2] = max(aggregate[2], duration)
+            if exc_type is not None:
+                aggregate[3] += 1
+        self._emit({
+            "type": "span",
+            "name": span.name,
+            "duration": duration,
+            "span_id": span.span_id,
+            "parent_id": span.parent_id,
+            "depth": span.depth,
+            "error": exc_type.__name__ if exc_type else None,
+            "attrs": span.attrs,
+        })
+
+    def _emit(self, record: Dict[str, Any]) -> None:
+        record["ts"] = time.time()
+        if self._jsonl is not None:
+            line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+            with self._lock:
+                self._jsonl.write(line)
+        for hook in self._hooks:
+            try:
+                hook(record)
+            except Exception as e:
+                logger.debug(f"Error en el gancho de telemetría: {e}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Agregados actuales: por tramo (cantidad, suma, máximo, media, errores) y contadores."""
+        with self._lock:
+            spans = {
+                name: {"count": c, "sum": s, "max": m, "mean": s / c if c else 0.0, "errors": e}
+                for name, (c, s, m, e) in self._spans.items()
+            }
+            counters = {
+                name + ("{" + ",".join(f"{k}={v}" for k, v in labels) + "}" if labels else ""): value
+                for (name, labels), value in self._counters.items()
+            }
+        return {"spans": spans, "counters": counters}
+
+    def prometheus_text(self) -> str:
+        """Métricas en formato de texto de exposición de Prometheus."""
+        prefix = self.prefix
+        lines = []
+        with self._lock:
+            spans = sorted(self._spans.items())
+            counters = sorted(self._counters.items())
+        if spans:
+            lines.append(f"# HELP {prefix}_phase_seconds Duración de cada fase instrumentada.")
+            lines.append(f"# TYPE {prefix}_phase_seconds summary")
+            for name, (count, total, _, _) in spans:
+                lines.append(f'{prefix}_phase_seconds_count{{phase="{_escape(name)}"}} {count}')
+                lines.append(f'{prefix}_phase_seconds_sum{{phase="{_escape(name)}"}} {total:.6f}')
+            lines.append(f"# HELP {prefix}_phase_seconds_max Duración máxima observada de cada fase.")
+            lines.append(f"# TYPE {prefix}_phase_seconds_max gauge")
+            for name, (_, _, maximum, _) in spans:
+                lines.append(f'{prefix}_phase_seconds_max{{phase="{_escape(name)}"}} {maximum:.6f}')
+            lines.append(f"# HELP {prefix}_phase_errors_total Fases terminadas con excepción.")
+            lines.append(f"# TYPE {prefix}_phase_errors_total counter")
+            for name, (_, _, _, errors) in spans:
+                lines.append(f'{prefix}_phase_errors_total{{phase="{_escape(name)}"}} {errors}')
+        declared = set()
+        for (name, labels), value in counters:
+            metric = f"{prefix}_{_METRIC_NAME.sub('_', name)}_total"
+            if metric not in declared:
+                declared.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            label_text = ",".join(f'{_METRIC_NAME.sub("_", k)}="{_escape(v)}"' for k, v in labels)
+            lines.append(f"{metric}{{{label_text}}} {value:g}" if label_text else f"{metric} {value:g}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def flush(self) -> None:
+        """Vuelca el JSON-lines y reescribe (de forma atómica) el archivo de Prometheus."""
+        if self._jsonl is not None:
+            with self._lock:
+                self._jsonl.flush()
+        if self.enabled and self.prometheus_path:
+            tmp_path = f"{self.prometheus_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(self.prometheus_text())
+            os.replace(tmp_path, self.prometheus_path)
+
+    def _close_jsonl(self) -> None:
+        if self._jsonl is not None:
+            self._jsonl.close()
+            self._jsonl = None
+            self.jsonl_path = None
+
+    def close(self) -> None:
+        """Vuelca los exportadores y cierra el archivo JSON-lines."""
+        self.flush()
+        self._close_jsonl()
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Instancia compartida por todos los módulos del paquete
+_env_level = os.environ.get("WHATSAPP_LOG_LEVEL", "info").lower()
+telemetry = Telemetry(console_level=_env_level if _env_level in LEVELS else "info")
@@ -0,0 +1,49 @@
+"""
+Interfaz de línea de comandos del navegador residente (whatsapp-daemon)
+Mantiene el perfil autenticado abierto para que `whatsapp-send` y el Facade se conecten sin arranque en frío.
+"""
+
+import argparse
+import sys
+
+from .core.browser_daemon import BrowserDaemon, find_daemon, stop_daemon
+
+
+def main():
+    """CLI del navegador residente: iniciar, consultar o detener el demonio de un perfil."""
+    parser = argparse.ArgumentParser(
+        description='Navegador residente de WhatsApp Web (CDP en localhost)',
+        epilog='Ejemplo: whatsapp-daemon --session-dir session_data'
+    )
+    parser.add_argument('--session-dir', type=str, default='session_data',
+                        help='Directorio de persistencia de sesión/cookies (ya autenticado)')
+    parser.add_argument('--port', type=int, default=0,
+                        help='Puerto CDP en localhost (default: uno libre)')
+    parser.add_argument('--headed', action='store_true',
+                        help='Mostrar la ventana del navegador')
+    parser.add_argument('--status', action='store_true',
+                        help='Indicar si el demonio del perfil está en marcha')
+    parser.add_argument('--stop', action='store_true',
+                        help='Detener el demonio del perfil')
+
+    args = parser.parse_args()
+
+    if args.status:
+        endpoint = find_daemon(args.session_dir)
+        print(f"🟢 Demonio en marcha: {endpoint}" if endpoint else "⚪ No hay demonio en marcha para el perfil.")
+        sys.exit(0 if endpoint else 1)
+
+    if args.stop:
+        stopped = stop_daemon(args.session_dir)
+        print("🛑 Demonio detenido." if stopped else "⚪ No hay demonio en marcha para el perfil.")
+        sys.exit(0)
+
+    try:
+        BrowserDaemon(args.session_dir, headless=not args.headed, port=args.port).serve()
+    except Exception as e:
+        print(f"❌ Error: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
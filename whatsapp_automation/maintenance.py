@@ -0,0 +1,41 @@
+"""
+Interfaz de línea de comandos de mantenimiento del perfil (whatsapp-compact)
+Poda las cachés reconstruibles de `session_dir` conservando cookies, IndexedDB y Local Storage.
+"""
+
+import argparse
+import sys
+
+
+def main():
+    """CLI de compactación del perfil persistente de WhatsApp Web."""
+    parser = argparse.ArgumentParser(
+        description='Compactación del perfil persistente (cachés de Chromium)',
+        epilog='Ejemplo: whatsapp-compact --session-dir session_data --measure-startup'
+    )
+    parser.add_argument('--session-dir', type=str, default='session_data',
+                        help='Directorio de persistencia de sesión/cookies')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Mostrar lo que se eliminaría sin borrar nada')
+    parser.add_argument('--measure-startup', action='store_true',
+                        help='Medir el arranque del navegador antes y después de compactar')
+
+    args = parser.parse_args()
+
+    # Importación diferida: --help no carga Playwright
+    from .core.session_manager import SessionManager
+
+    try:
+        report = SessionManager(session_dir=args.session_dir).compact_profile(
+            dry_run=args.dry_run,
+            measure_startup=args.measure_startup
+        )
+        for path in report.removed:
+            print(f"   • {path}")
+    except Exception as e:
+        print(f"❌ Error: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,26 @@
-from .base_page import BasePage
-from .login_page import LoginPage
-from .chat_page import ChatPage
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
+
+
+_EXPORTS = {
+    "BasePage": ".base_page",
+    "LoginPage": ".login_page",
+    "ChatPage": ".chat_page",
+    "SelectorCache": ".selector_cache",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .base_page import BasePage
+    from .login_page import LoginPage
+    from .chat_page import ChatPage
+    from .selector_cache import SelectorCache
 
 __all__ = [
     "BasePage",
     "LoginPage",
     "ChatPage",
+    "SelectorCache",
 ]
@@ -5,58 +5,112 @@ Encapsula la instancia de Playwright Page y provee métodos de interacción robu
 
 import time
 import logging
-from typing import List, Optional, Union
-from playwright.sync_api import Page, Locator
+from typing import List, Optional, Sequence, Union
+from playwright.sync_api import Page, Locator, TimeoutError as PlaywrightTimeoutError
+
+from .selector_cache import SelectorCache
+from .selector_engine import RESOLVE_SELECTORS_JS, SelectorEngine, SelectorMatch
 
 logger = logging.getLogger("WhatsAppBot.POM")
 
 
-class BasePage:
+class BasePage(SelectorEngine):
     """Clase base para todos los Page Objects de WhatsApp Web."""
 
-    def __init__(self, page: Page, wait_time: float = 2.0):
+    def __init__(self, page: Page, wait_time: float = 2.0, selector_cache: Optional[SelectorCache] = None):
         self.page = page
         self.wait_time = wait_time
+        self.selector_cache = selector_cache
 
     def sleep(self, seconds: Optional[float] = None) -> None:
         """Pausa la ejecución por un tiempo determinado."""
         delay = seconds if seconds is not None else self.wait_time
         time.sleep(delay)
 
-    def find_first_visible(self, selectors: List[str], timeout_ms: int = 5000) -> Optional[Locator]:
+    def resolve_selector(
+        self,
+        selectors: Sequence[str],
+        state: str = "visible",
+        timeout_ms: int = 5000,
+        key: Optional[str] = None
+    ) -> Optional[SelectorMatch]:
+        """
+        Motor único de resolución de selectores alternativos.
+        Evalúa todas las alternativas en un solo viaje al navegador (o en una única espera
+        combinada si `timeout_ms` > 0) respetando el orden de prioridad de la lista.
+        Con `key` y una SelectorCache, la lista se reordena para probar primero la alternativa
+        ganadora de ejecuciones anteriores y se registra el acierto.
+        Retorna la alternativa que coincidió (índice en la lista original) o None.
+        """
+        plan = self._plan_selectors(selectors, state, key)
+        if plan is None:
+            return None
+
+        try:
+            if timeout_ms <= 0:
+                found = self.page.evaluate(RESOLVE_SELECTORS_JS, [plan.ordered, state])
+            else:
+                handle = self.page.wait_for_function(
+                    RESOLVE_SELECTORS_JS,
+                    arg=[plan.ordered, state],
+                    timeout=timeout_ms,
+                    polling=self.RESOLVE_POLLING_MS
+                )
+                found = handle.json_value()
+        except PlaywrightTimeoutError:
+            return None
+        except Exception as e:
+            logger.debug(f"Error resolviendo selectores: {e}")
+            return None
+        return self._selector_match(plan, found)
+
+    def find_first_visible(
+        self,
+        selectors: List[str],
+        timeout_ms: int = 5000,
+        key: Optional[str] = None
+    ) -> Optional[Locator]:
         """
         Evalúa una lista de selectores alternativos y retorna el primer Locator visible.
         Útil para selectores multiidioma y variaciones de interfaz de WhatsApp Web.
         """
-        for selector in selectors:
-            try:
-                locator = self.page.locator(selector).first
-                if locator.is_visible(timeout=timeout_ms):
-                    return locator
-            except Exception:
-                continue
-        return None
+        match = self.resolve_selector(selectors, state="visible", timeout_ms=timeout_ms, key=key)
+        if not match:
+            return None
+        return self.page.locator(match.selector).first
 
-    def wait_for_any(self, selectors: List[str], state: str = "visible", timeout_ms: int = 15000) -> Optional[str]:
+    def wait_for_any(
+        self,
+        selectors: List[str],
+        state: str = "visible",
+        timeout_ms: int = 15000,
+        key: Optional[str] = None
+    ) -> Optional[str]:
         """
         Espera hasta que cualquiera de los selectores coincida con el estado solicitado.
         Retorna el selector que tuvo éxito o None.
         """
-        start_time = time.time()
-        timeout_sec = timeout_ms / 1000.0
-        
-        while (time.time() - start_time) < timeout_sec:
-            for selector in selectors:
-                try:
-                    locator = self.page.locator(selector).first
-                    if state == "visible" and locator.is_visible():
-                        return selector
-                    elif state == "hidden" and not locator.is_visible():
-                        return selector
-                except Exception:
-                    pass
-            time.sleep(0.5)
-        return None
+        match = self.resolve_selector(selectors, state=state, timeout_ms=timeout_ms, key=key)
+        return match.selector if match else None
+
+    def wait_for_condition(self, expression: str, arg=None, timeout_ms: int = 5000) -> bool:
+        """
+        Espera a que una expresión JavaScript retorne un valor verdadero dentro del navegador.
+        Retorna False si se agota `timeout_ms` o la evaluación falla.
+        """
+        try:
+            self.page.wait_for_function(
+                expression,
+                arg=arg,
+                timeout=max(int(timeout_ms), 1),
+                polling=self.RESOLVE_POLLING_MS
+            )
+            return True
+        except PlaywrightTimeoutError:
+            return False
+        except Exception as e:
+            logger.debug(f"Error esperando condición: {e}")
+            return False
 
     def safe_click(self, selector_or_locator: Union[str, Locator], timeout_ms: int = 5000) -> bool:
         """Hace clic de manera segura en un selector o Locator con reintentos."""
@@ -0,0 +1,371 @@
+"""
+Módulo ChatDom - Contrato con el DOM de WhatsApp Web para los chats
+Selectores y condiciones JavaScript compartidos por ChatPage (playwright.sync_api) y AsyncChatPage
+(playwright.async_api). No importa ninguna de las dos API de Playwright.
+"""
+
+from typing import List
+
+from .selector_engine import RESOLVE_SELECTORS_JS
+
+
+# Firma de la lista de resultados: primer selector con coincidencias, cantidad y texto del primero
+_LIST_SIGNATURE_JS = """
+(selectors) => {
+    for (const selector of selectors) {
+        let nodes = [];
+        try { nodes = document.querySelectorAll(selector); } catch (e) { continue; }
+        if (nodes.length > 0) {
+            return selector + '|' + nodes.length + '|' + (nodes[0].textContent || '').slice(0, 200);
+        }
+    }
+    return '';
+}
+"""
+
+_LIST_CHANGED_JS = f"""
+([selectors, before]) => {{
+    const current = ({_LIST_SIGNATURE_JS})(selectors);
+    return current !== '' && current !== before;
+}}
+"""
+
+# Funciones comunes de la lista de chats: contenedor, filas renderizadas, título y posición de cada fila
+_CHAT_LIST_HELPERS = """
+    const findPane = (selectors) => {
+        for (const selector of selectors) {
+            let el = null;
+            try { el = document.querySelector(selector); } catch (e) { continue; }
+            if (el) return el;
+        }
+        return null;
+    };
+    const rowsOf = (root, selectors) => {
+        for (const selector of selectors) {
+            let rows = [];
+            try { rows = root.querySelectorAll(selector); } catch (e) { continue; }
+            if (rows.length > 0) return { selector: selector, rows: Array.from(rows) };
+        }
+        return { selector: null, rows: [] };
+    };
+    const titleOf = (row) => {
+        const titled = row.matches('span[title]') ? row : row.querySelector('span[title]');
+        if (titled && titled.getAttribute('title')) return titled.getAttribute('title').trim();
+        const cell = row.querySelector('[data-testid="cell-frame-title"]');
+        const text = (cell || row).textContent || '';
+        return text.trim().split('\\n')[0].slice(0, 200);
+    };
+    const offsetOf = (pane, row) => row.getBoundingClientRect().top - pane.getBoundingClientRect().top + pane.scrollTop;
+    const rowsWithTitles = (pane, selectors) => rowsOf(pane, selectors).rows
+        .map((row) => ({ title: titleOf(row), offset: offsetOf(pane, row) }))
+        .filter((row) => row.title);
+"""
+
+# Filas renderizadas de la lista de chats (virtualizada) y estado de su desplazamiento
+_CHAT_ROWS_JS = f"""
+([paneSelectors, rowSelectors]) => {{
+    {_CHAT_LIST_HELPERS}
+    const pane = findPane(paneSelectors);
+    if (!pane) return null;
+    return {{
+        rows: rowsWithTitles(pane, rowSelectors),
+        scrollTop: pane.scrollTop,
+        scrollHeight: pane.scrollHeight,
+        clientHeight: pane.clientHeight
+    }};
+}}
+"""
+
+# Desplaza la lista de chats a `top` y retorna la posición efectiva
+_SCROLL_CHAT_LIST_JS = f"""
+([paneSelectors, top]) => {{
+    {_CHAT_LIST_HELPERS}
+    const pane = findPane(paneSelectors);
+    if (!pane) return -1;
+    pane.scrollTop = top;
+    return pane.scrollTop;
+}}
+"""
+
+# Cambió el conjunto de filas renderizadas tras desplazar la lista
+_CHAT_ROWS_CHANGED_JS = f"""
+([paneSelectors, rowSelectors, before]) => {{
+    {_CHAT_LIST_HELPERS}
+    const pane = findPane(paneSelectors);
+    if (!pane) return false;
+    return rowsWithTitles(pane, rowSelectors).map((row) => row.title).join('\\n') !== before;
+}}
+"""
+
+# Observador de mutaciones de la lista de chats: acumula las filas renderizadas, movidas o renombradas
+_WATCH_CHAT_LIST_JS = f"""
+([paneSelectors, rowSelectors]) => {{
+    {_CHAT_LIST_HELPERS}
+    const pane = findPane(paneSelectors);
+    if (!pane) return false;
+    const state = window.__whatsappChatIndex;
+    if (state && state.pane === pane) return true;
+    if (state) state.observer.disconnect();
+    const pending = new Map();
+    const observer = new MutationObserver(() => {{
+        for (const row of rowsWithTitles(pane, rowSelectors)) pending.set(row.title, row.offset);
+    }});
+    observer.observe(pane, {{
+        childList: true, subtree: true, characterData: true,
+        attributes: true, attributeFilter: ['style', 'title']
+    }});
+    window.__whatsappChatIndex = {{ pane: pane, observer: observer, pending: pending }};
+    return true;
+}}
+"""
+
+# Filas observadas desde la última lectura (null si el observador se perdió, p. ej. tras recargar)
+_DRAIN_CHAT_LIST_JS = """
+() => {
+    const state = window.__whatsappChatIndex;
+    if (!state || !state.pane.isConnected) return null;
+    const rows = Array.from(state.pending, ([title, offset]) => ({ title: title, offset: offset }));
+    state.pending.clear();
+    return rows;
+}
+"""
+
+# Atributo con el que se marca la fila elegida para hacer clic en ella con un Locator
+CHAT_ROW_MARKER = '[data-whatsapp-bot-target="1"]'
+
+_MARK_ROW_JS = """
+    const mark = (row) => {
+        document.querySelectorAll('[data-whatsapp-bot-target]').forEach((el) => el.removeAttribute('data-whatsapp-bot-target'));
+        row.setAttribute('data-whatsapp-bot-target', '1');
+        return true;
+    };
+"""
+
+# Desplaza la lista a la posición indexada y marca la fila con el título exacto si está renderizada
+_FIND_CHAT_ROW_JS = f"""
+([paneSelectors, rowSelectors, title, top]) => {{
+    {_CHAT_LIST_HELPERS}
+    {_MARK_ROW_JS}
+    const pane = findPane(paneSelectors);
+    if (!pane) return false;
+    if (top !== null && Math.abs(pane.scrollTop - top) > 1) pane.scrollTop = top;
+    const row = rowsOf(pane, rowSelectors).rows.find((candidate) => titleOf(candidate) === title);
+    return row ? mark(row) : false;
+}}
+"""
+
+# Títulos de los resultados de búsqueda (primer selector con coincidencias)
+_RESULT_TITLES_JS = f"""
+(selectors) => {{
+    {_CHAT_LIST_HELPERS}
+    const found = rowsOf(document, selectors);
+    if (!found.selector) return null;
+    return {{ selector: found.selector, titles: found.rows.map(titleOf) }};
+}}
+"""
+
+# Marca el resultado de búsqueda elegido (posición dentro del selector que coincidió)
+_MARK_RESULT_JS = f"""
+([selector, index]) => {{
+    {_MARK_ROW_JS}
+    const rows = document.querySelectorAll(selector);
+    return rows[index] ? mark(rows[index]) : false;
+}}
+"""
+
+_HEADER_TEXT_JS = """
+() => {
+    const header = document.querySelector('#main header');
+    // innerText separa el nombre y el estado ("en línea") en líneas distintas
+    return header ? (header.innerText || header.textContent || '') : '';
+}
+"""
+
+# Marca la cabecera de la conversación actual antes de una navegación y retorna su texto
+_MARK_HEADER_JS = """
+() => {
+    const header = document.querySelector('#main header');
+    if (!header) return '';
+    header.setAttribute('data-whatsapp-bot-stale', '1');
+    return header.innerText || header.textContent || '';
+}
+"""
+
+# Cabecera actual: texto y si se renderizó después de la marca (null si no hay conversación abierta)
+_FRESH_HEADER_JS = """
+() => {
+    const header = document.querySelector('#main header');
+    if (!header) return null;
+    return { text: header.innerText || header.textContent || '', fresh: !header.hasAttribute('data-whatsapp-bot-stale') };
+}
+"""
+
+# Conversación abierta: cambió la cabecera y la caja de redacción está visible
+_CONVERSATION_OPENED_JS = f"""
+([before, selectors]) => {{
+    const header = ({_HEADER_TEXT_JS})();
+    return header !== before && ({RESOLVE_SELECTORS_JS})([selectors, 'visible']) !== null;
+}}
+"""
+
+# Longitud del texto en la caja de redacción (-1 si no existe)
+_COMPOSE_LENGTH_JS = """
+(selector) => {
+    const el = document.querySelector(selector);
+    return el ? (el.innerText || el.textContent || '').trim().length : -1;
+}
+"""
+
+_COMPOSE_FILLED_JS = f"(selector) => ({_COMPOSE_LENGTH_JS})(selector) > 0"
+
+
+# Instantánea de las burbujas salientes de la conversación: cantidad y data-id de la última
+_OUTGOING_SNAPSHOT_JS = """
+(selectors) => {
+    const rows = document.querySelectorAll(selectors.join(','));
+    const last = rows[rows.length - 1];
+    return { count: rows.length, lastId: last ? (last.getAttribute('data-id') || '') : '' };
+}
+"""
+
+# Apareció una burbuja saliente nueva cuyo texto coincide con el enviado (ignorando espacios;
+# se compara un prefijo porque WhatsApp recorta los mensajes largos con "Leer más")
+_OUTGOING_APPEARED_JS = """
+([selectors, before, text]) => {
+    const rows = Array.from(document.querySelectorAll(selectors.join(',')));
+    const last = rows[rows.length - 1];
+    if (!last) return false;
+    const lastId = last.getAttribute('data-id') || '';
+    let fresh = rows.slice(before.count);
+    if (!fresh.length && lastId !== before.lastId) fresh = [last];
+    const strip = (value) => (value || '').replace(/\\s+/g, '');
+    const expected = strip(text).slice(0, 200);
+    return fresh.some((row) => strip(row.innerText || row.textContent).includes(expected));
+}
+"""
+
+# Inserción en bloque: evento de pegado sintético que el editor Lexical procesa en una sola operación
+# (conserva los saltos de línea como párrafos)
+_PASTE_TEXT_JS = """
+([selector, text]) => {
+    const el = document.querySelector(selector);
+    if (!el) return false;
+    el.focus();
+    const data = new DataTransfer();
+    data.setData('text/plain', text);
+    const event = new ClipboardEvent('paste', { clipboardData: data, bubbles: true, cancelable: true });
+    el.dispatchEvent(event);
+    return true;
+}
+"""
+
+# El editor contiene exactamente el texto esperado (ignorando espacios en blanco y saltos de línea)
+_COMPOSE_MATCHES_JS = """
+([selector, text]) => {
+    const el = document.querySelector(selector);
+    if (!el) return false;
+    const strip = (value) => value.replace(/\\s+/g, '');
+    return strip(el.innerText || el.textContent || '') === strip(text);
+}
+"""
+
+
+class ChatSelectors:
+    """Selectores alternativos y cotas de espera de la lista de chats, la búsqueda y la redacción."""
+
+    # 1. Barra de búsqueda de la izquierda (DOM exacto)
+    SEARCH_INPUT_SELECTORS: List[str] = [
+        'input[data-tab="3"]',
+        'input[role="textbox"][aria-label*="Buscar" i]',
+        'input[role="textbox"][aria-label*="Search" i]',
+        'input[placeholder*="Buscar un chat" i]',
+        'input[placeholder*="Search" i]',
+        'div.html-div input[type="text"]',
+        'div[data-tab="3"][contenteditable="true"]'
+    ]
+
+    # 2. Ficha de contacto en los resultados de búsqueda (DOM exacto)
+    CONTACT_ITEM_SELECTORS: List[str] = [
+        'div[data-testid="cell-frame-container"]',
+        'div[data-testid="cell-frame-title"]',
+        'div[data-testid^="list-item-"]',
+        'div[role="row"] div[role="gridcell"]',
+        'div[role="listitem"] div[role="button"]'
+    ]
+
+    # 3. Caja de texto para redactar mensaje (DOM exacto con editor Lexical de WhatsApp)
+    MESSAGE_INPUT_SELECTORS: List[str] = [
+        'footer div[contenteditable="true"]',
+        'p.selectable-text.copyable-text',
+        'footer p[dir="auto"]',
+        'div[contenteditable="true"][role="textbox"]',
+        'div[data-tab="10"][contenteditable="true"]',
+        'div[data-testid="conversation-compose-box-input"]',
+        'footer [contenteditable="true"]'
+    ]
+
+    # 4. Botón de Enviar mensaje
+    SEND_BUTTON_SELECTORS: List[str] = [
+        'button[data-testid="compose-btn-send"]',
+        'span[data-icon="send"]',
+        'button[aria-label*="Send" i]',
+        'button[aria-label*="Enviar" i]',
+        'button[data-tab="11"]'
+    ]
+
+    # 5. Filas de mensajes salientes en la conversación abierta (confirmación del envío)
+    OUTGOING_MESSAGE_SELECTORS: List[str] = [
+        '#main div.message-out',
+        '#main div[data-id^="true_"]'
+    ]
+
+    # Mensajes entrantes de la conversación abierta y contador de no leídos de una fila (flujo entrante)
+    INCOMING_MESSAGE_SELECTORS: List[str] = [
+        '#main div.message-in',
+        '#main div[data-id^="false_"]'
+    ]
+
+    UNREAD_BADGE_SELECTORS: List[str] = [
+        'span[aria-label*="no leído" i]',
+        'span[aria-label*="unread" i]',
+        'span[data-testid="icon-unread-count"]'
+    ]
+
+    # 6. Contenedor desplazable de la lista de chats (virtualizada) y sus filas
+    CHAT_LIST_SELECTORS: List[str] = [
+        '#pane-side',
+        'div[data-testid="chat-list"]',
+        'div[aria-label="Lista de chats"]',
+        'div[aria-label="Chat list"]'
+    ]
+
+    CHAT_ROW_SELECTORS: List[str] = [
+        'div[role="listitem"]',
+        'div[role="row"]',
+        'div[data-testid="cell-frame-container"]'
+    ]
+
+    # 7. Diálogo de número inválido al abrir un chat por la ruta de envío por número
+    INVALID_NUMBER_DIALOG_SELECTORS: List[str] = [
+        'div[data-animate-modal-popup="true"]',
+        'div[role="dialog"]'
+    ]
+
+    # Cota de la espera a que la lista de resultados se filtre (antes era una pausa fija de 2.5 s)
+    SEARCH_RESULTS_TIMEOUT_MS: int = 2500
+
+    # La ruta de envío por número recarga WhatsApp Web: su espera incluye la sincronización inicial
+    DIRECT_OPEN_TIMEOUT_MS: int = 60000
+
+    # Cota de la confirmación del pegado sintético: el editor lo refleja en el mismo fotograma o lo ignora
+    PASTE_CONFIRM_TIMEOUT_MS: int = 1000
+
+    # Longitud máxima del texto codificado en la URL para precargar la caja de redacción
+    PREFILL_MAX_URL_CHARS: int = 4000
+
+    # Índice de contactos: páginas recorridas como máximo y espera al renderizado tras cada desplazamiento
+    INDEX_MAX_PAGES: int = 500
+    INDEX_SCROLL_TIMEOUT_MS: int = 1000
+
+    # Modos de inserción del texto: pegado en bloque o tecleo línea a línea (Shift+Enter)
+    INSERT_MODES = ("paste", "keyboard")
@@ -7,142 +7,401 @@ Compatible con modo Claro y Oscuro, y con cualquier número o contacto.
 
 import time
 import logging
-from typing import List, Optional
-from playwright.sync_api import Locator
+from typing import Optional
+from urllib.parse import quote
+from playwright.sync_api import Page
 from .base_page import BasePage
+from .chat_dom import (
+    ChatSelectors,
+    _LIST_SIGNATURE_JS,
+    _LIST_CHANGED_JS,
+    _CHAT_ROWS_JS,
+    _SCROLL_CHAT_LIST_JS,
+    _CHAT_ROWS_CHANGED_JS,
+    _WATCH_CHAT_LIST_JS,
+    _DRAIN_CHAT_LIST_JS,
+    CHAT_ROW_MARKER,
+    _FIND_CHAT_ROW_JS,
+    _RESULT_TITLES_JS,
+    _MARK_RESULT_JS,
+    _HEADER_TEXT_JS,
+    _MARK_HEADER_JS,
+    _FRESH_HEADER_JS,
+    _CONVERSATION_OPENED_JS,
+    _COMPOSE_FILLED_JS,
+    _OUTGOING_SNAPSHOT_JS,
+    _OUTGOING_APPEARED_JS,
+    _PASTE_TEXT_JS,
+    _COMPOSE_MATCHES_JS
+)
+from .selector_cache import SelectorCache
+from ..core.telemetry import telemetry
+from ..services.contact_index import ContactIndex, pick_result, title_matches
+from ..services.message_builder import WHATSAPP_MAX_MESSAGE_CHARS, split_message
 
 logger = logging.getLogger("WhatsAppBot.ChatPage")
 
 
-class ChatPage(BasePage):
+class ChatPage(ChatSelectors, BasePage):
     """Page Object para la interacción y envío de mensajes vía Interfaz Gráfica."""
 
-    # 1. Barra de búsqueda de la izquierda (DOM exacto)
-    SEARCH_INPUT_SELECTORS: List[str] = [
-        'input[data-tab="3"]',
-        'input[role="textbox"][aria-label*="Buscar" i]',
-        'input[role="textbox"][aria-label*="Search" i]',
-        'input[placeholder*="Buscar un chat" i]',
-        'input[placeholder*="Search" i]',
-        'div.html-div input[type="text"]',
-        'div[data-tab="3"][contenteditable="true"]'
-    ]
-
-    # 2. Ficha de contacto en los resultados de búsqueda (DOM exacto)
-    CONTACT_ITEM_SELECTORS: List[str] = [
-        'div[data-testid="cell-frame-container"]',
-        'div[data-testid="cell-frame-title"]',
-        'div[data-testid^="list-item-"]',
-        'div[role="row"] div[role="gridcell"]',
-        'div[role="listitem"] div[role="button"]'
-    ]
-
-    # 3. Caja de texto para redactar mensaje (DOM exacto con editor Lexical de WhatsApp)
-    MESSAGE_INPUT_SELECTORS: List[str] = [
-        'footer div[contenteditable="true"]',
-        'p.selectable-text.copyable-text',
-        'footer p[dir="auto"]',
-        'div[contenteditable="true"][role="textbox"]',
-        'div[data-tab="10"][contenteditable="true"]',
-        'div[data-testid="conversation-compose-box-input"]',
-        'footer [contenteditable="true"]'
-    ]
-
-    # 4. Botón de Enviar mensaje
-    SEND_BUTTON_SELECTORS: List[str] = [
-        'button[data-testid="compose-btn-send"]',
-        'span[data-icon="send"]',
-        'button[aria-label*="Send" i]',
-        'button[aria-label*="Enviar" i]',
-        'button[data-tab="11"]'
-    ]
-
-    def search_and_select_contact(self, query: str) -> bool:
-        """
-        Busca el contacto o número a través de la barra de búsqueda visual
-        y hace clic en el primer resultado filtrado.
-        """
-        print(f"🔍 Localizando barra de búsqueda en la interfaz...")
+    def __init__(
+        self,
+        page: Page,
+        wait_time: float = 2.0,
+        ui_timeout: float = 15.0,
+        selector_cache: Optional[SelectorCache] = None,
+        insert_mode: str = "paste",
+        max_message_chars: int = WHATSAPP_MAX_MESSAGE_CHARS,
+        default_country_code: Optional[str] = None
+    ):
+        super().__init__(page, wait_time=wait_time, selector_cache=selector_cache)
+        if insert_mode not in self.INSERT_MODES:
+            raise ValueError(f"insert_mode debe ser uno de {self.INSERT_MODES}.")
+        # Cota superior de cada espera por condición (transiciones reales de la interfaz)
+        self.ui_timeout = ui_timeout
+        self.insert_mode = insert_mode
+        # El editor ignoró el pegado en una parte del mensaje en curso
+        self._paste_rejected = False
+        self.max_message_chars = max_message_chars
+        # Latencia medida del último envío: desde Enter hasta la aparición de la burbuja saliente (s)
+        self.last_send_latency: Optional[float] = None
+        # Partes del último mensaje: total y confirmadas (un envío parcial no debe repetirse)
+        self.last_parts_total = 0
+        self.last_parts_sent = 0
+        self._prefill_text = ""
+        # Si la última apertura directa incluyó el texto del mensaje en la URL
+        self.prefill_requested = False
+        self.default_country_code = default_country_code
+        # Índice de la lista de chats (build_contact_index); None hasta construirlo
+        self.contact_index: Optional[ContactIndex] = None
+
+    @property
+    def ui_timeout_ms(self) -> int:
+        return int(self.ui_timeout * 1000)
+
+    @telemetry.traced("chat.search")
+    def search_and_select_contact(self, query: str, enter_fallback: bool = True) -> bool:
+        """
+        Busca el contacto o número a través de la barra de búsqueda visual y abre el resultado
+        que corresponde al destinatario (nunca el primero a ciegas: si ningún resultado coincide
+        de forma inequívoca, no se abre ningún chat).
+        Cada paso espera la transición real de la interfaz (lista filtrada, cabecera
+        de la conversación) acotada por `ui_timeout`, en lugar de pausas fijas.
+        Con `enter_fallback=False` no se recurre a Enter cuando la búsqueda no deja resultados
+        (el llamador dispone de otra vía de apertura, p. ej. la ruta de envío por número).
+        """
+        telemetry.event("chat.search_locate", f"🔍 Localizando barra de búsqueda en la interfaz...", level="debug")
 
         # 1. Encontrar la barra de búsqueda
-        search_input = self.find_first_visible(self.SEARCH_INPUT_SELECTORS, timeout_ms=10000)
+        search_input = self.find_first_visible(
+            self.SEARCH_INPUT_SELECTORS,
+            timeout_ms=10000,
+            key="ChatPage.SEARCH_INPUT_SELECTORS"
+        )
         if not search_input:
             raise RuntimeError("No se encontró la barra de búsqueda de chats en la interfaz.")
 
-        print(f"✍️ Escribiendo '{query}' en la barra de búsqueda...")
+        telemetry.event("chat.search_query", f"✍️ Escribiendo '{query}' en la barra de búsqueda...", level="debug")
         search_input.click()
-        self.sleep(0.3)
-        
+
         # Limpiar cualquier texto previo
         search_input.press("Control+a")
         search_input.press("Backspace")
-        self.sleep(0.2)
 
-        # Escribir el número o nombre del contacto
+        # Escribir el número o nombre del contacto y esperar a que la lista de resultados cambie
+        results_before = self.page.evaluate(_LIST_SIGNATURE_JS, self.CONTACT_ITEM_SELECTORS)
         search_input.fill(query)
-        self.sleep(2.5)  # Espera para que la lista de resultados filtre
+        if not self.wait_for_condition(
+            _LIST_CHANGED_JS,
+            arg=[self.CONTACT_ITEM_SELECTORS, results_before],
+            timeout_ms=min(self.SEARCH_RESULTS_TIMEOUT_MS, self.ui_timeout_ms)
+        ):
+            logger.debug("La lista de resultados no cambió tras la búsqueda; se continúa con la actual.")
 
-        # 2. Seleccionar el resultado en la lista
-        print("🎯 Buscando contacto en los resultados filtrados...")
-        
-        # Primero intentar hacer clic en el contenedor del chat encontrado
-        for selector in self.CONTACT_ITEM_SELECTORS:
+        # 2. Seleccionar en la lista el resultado que corresponde al destinatario
+        telemetry.event("chat.search_results", "🎯 Buscando contacto en los resultados filtrados...", level="debug")
+
+        results = self.page.evaluate(_RESULT_TITLES_JS, self.CONTACT_ITEM_SELECTORS)
+        if results and results["titles"]:
+            choice = pick_result(results["titles"], query, self.default_country_code)
+            if choice is None:
+                telemetry.event(
+                    "chat.search_ambiguous",
+                    f"⚠️ Ningún resultado de la búsqueda corresponde sin ambigüedad a '{query}'.",
+                    level="warning",
+                    results=len(results["titles"])
+                )
+                return False
             try:
-                items = self.page.locator(selector)
-                if items.count() > 0:
-                    first_item = items.first
-                    if first_item.is_visible():
-                        first_item.click()
-                        self.sleep(2.0)
-                        if self.is_message_box_ready():
-                            print("✅ Contacto seleccionado y chat abierto con éxito.")
-                            return True
-            except Exception:
-                continue
+                header_before = self.page.evaluate(_HEADER_TEXT_JS)
+                if self.page.evaluate(_MARK_RESULT_JS, [results["selector"], choice]):
+                    self.page.locator(CHAT_ROW_MARKER).first.click()
+                    if self.wait_for_conversation(header_before):
+                        telemetry.event("chat.opened", "✅ Contacto seleccionado y chat abierto con éxito.")
+                        return True
+            except Exception as e:
+                logger.debug(f"Error al abrir el resultado de búsqueda: {e}")
+
+        if not enter_fallback:
+            return False
 
-        # Alternativa: presionar Enter directamente en el campo de búsqueda
+        # Alternativa: presionar Enter en el campo de búsqueda y verificar la cabecera del chat abierto
         try:
-            print("⌨️ Presionando Enter en la barra de búsqueda...")
+            telemetry.event("chat.search_enter", "⌨️ Presionando Enter en la barra de búsqueda...", level="debug")
+            header_before = self.page.evaluate(_HEADER_TEXT_JS)
             search_input.press("Enter")
-            self.sleep(2.0)
-            if self.is_message_box_ready():
-                print("✅ Chat abierto mediante Enter.")
-                return True
+            # Sin resultados, una caja de redacción visible pertenece al chat anterior
+            if self.wait_for_conversation(header_before, allow_same_chat=bool(results and results["titles"])):
+                if title_matches(self.page.evaluate(_HEADER_TEXT_JS), query, self.default_country_code):
+                    telemetry.event("chat.opened", "✅ Chat abierto mediante Enter.")
+                    return True
+                telemetry.event("chat.search_mismatch", f"⚠️ El chat abierto con Enter no corresponde a '{query}'.", level="warning")
         except Exception:
             pass
 
         return False
 
+    @telemetry.traced("chat.index")
+    def build_contact_index(self) -> ContactIndex:
+        """
+        Construye el índice de contactos recorriendo una vez la lista de chats virtualizada
+        (desplazamiento página a página hasta el final) y deja un observador de mutaciones que
+        lo mantiene al día con las filas que aparecen, se mueven o cambian de título.
+        """
+        index = ContactIndex(default_country_code=self.default_country_code)
+        snapshot = self.page.evaluate(_CHAT_ROWS_JS, [self.CHAT_LIST_SELECTORS, self.CHAT_ROW_SELECTORS])
+        if snapshot is None:
+            raise RuntimeError("No se encontró la lista de chats para construir el índice de contactos.")
+
+        self.page.evaluate(_SCROLL_CHAT_LIST_JS, [self.CHAT_LIST_SELECTORS, 0])
+        for _ in range(self.INDEX_MAX_PAGES):
+            snapshot = self.page.evaluate(_CHAT_ROWS_JS, [self.CHAT_LIST_SELECTORS, self.CHAT_ROW_SELECTORS])
+            if snapshot is None:
+                break
+            index.update(snapshot["rows"])
+            if snapshot["scrollTop"] + snapshot["clientHeight"] >= snapshot["scrollHeight"] - 1:
+                break
+            # Se avanza algo menos de una página para que ninguna fila quede entre dos lecturas
+            target = snapshot["scrollTop"] + max(snapshot["clientHeight"] * 0.8, 1)
+            titles = "\n".join(row["title"] for row in snapshot["rows"])
+            position = self.page.evaluate(_SCROLL_CHAT_LIST_JS, [self.CHAT_LIST_SELECTORS, target])
+            if position <= snapshot["scrollTop"]:
+                break
+            self.wait_for_condition(
+                _CHAT_ROWS_CHANGED_JS,
+                arg=[self.CHAT_LIST_SELECTORS, self.CHAT_ROW_SELECTORS, titles],
+                timeout_ms=self.INDEX_SCROLL_TIMEOUT_MS
+            )
+
+        self.page.evaluate(_SCROLL_CHAT_LIST_JS, [self.CHAT_LIST_SELECTORS, 0])
+        self.page.evaluate(_WATCH_CHAT_LIST_JS, [self.CHAT_LIST_SELECTORS, self.CHAT_ROW_SELECTORS])
+        self.contact_index = index
+        telemetry.event("chat.indexed", f"📇 Índice de contactos: {len(index)} chats.", chats=len(index))
+        return index
+
+    def refresh_contact_index(self) -> int:
+        """Incorpora al índice las filas observadas desde la última lectura; retorna cuántas son nuevas."""
+        if self.contact_index is None:
+            return 0
+        rows = self.page.evaluate(_DRAIN_CHAT_LIST_JS)
+        if rows is None:
+            # La página se recargó o la lista se reemplazó: se vuelve a observar y se leen las filas visibles
+            if not self.page.evaluate(_WATCH_CHAT_LIST_JS, [self.CHAT_LIST_SELECTORS, self.CHAT_ROW_SELECTORS]):
+                return 0
+            snapshot = self.page.evaluate(_CHAT_ROWS_JS, [self.CHAT_LIST_SELECTORS, self.CHAT_ROW_SELECTORS])
+            rows = snapshot["rows"] if snapshot else []
+        return self.contact_index.update(rows)
+
+    @telemetry.traced("chat.open_indexed")
+    def open_indexed_chat(self, query: str) -> bool:
+        """
+        Abre el chat del destinatario desde el índice de contactos, sin usar la barra de búsqueda:
+        desplaza la lista a la posición registrada (o al principio, donde suben los chats con
+        actividad reciente) y hace clic en la fila con el título exacto.
+        Retorna False si el destinatario no está indexado o su fila ya no se encuentra.
+        """
+        if self.contact_index is None:
+            return False
+        self.refresh_contact_index()
+        entry = self.contact_index.lookup(query)
+        if entry is None:
+            return False
+
+        header_before = self.page.evaluate(_HEADER_TEXT_JS)
+        positions = [entry.offset, 0] if entry.offset else [0]
+        for top in positions:
+            if not self.wait_for_condition(
+                _FIND_CHAT_ROW_JS,
+                arg=[self.CHAT_LIST_SELECTORS, self.CHAT_ROW_SELECTORS, entry.title, top],
+                timeout_ms=self.INDEX_SCROLL_TIMEOUT_MS
+            ):
+                continue
+            try:
+                self.page.locator(CHAT_ROW_MARKER).first.click()
+            except Exception as e:
+                logger.debug(f"Error al abrir la fila indexada: {e}")
+                continue
+            if self.wait_for_conversation(header_before):
+                telemetry.event("chat.opened", f"✅ Chat de '{entry.title}' abierto desde el índice de contactos.")
+                return True
+
+        logger.debug(f"La fila de '{entry.title}' no está donde la registró el índice; se descarta.")
+        self.contact_index.remove(entry.title)
+        return False
+
+    def wait_for_conversation(self, header_before: str, allow_same_chat: bool = True) -> bool:
+        """
+        Espera a que se abra la conversación: la cabecera cambia y la caja de redacción aparece.
+        Si la conversación ya estaba abierta (la cabecera no cambia) y `allow_same_chat` lo permite,
+        basta con la caja visible.
+        """
+        if self.wait_for_condition(
+            _CONVERSATION_OPENED_JS,
+            arg=[header_before, self.MESSAGE_INPUT_SELECTORS],
+            timeout_ms=self.ui_timeout_ms
+        ):
+            return True
+        return allow_same_chat and self.is_message_box_ready(timeout_seconds=0)
+
     def is_message_box_ready(self, timeout_seconds: int = 5) -> bool:
         """Verifica si el área de redacción del mensaje está visible."""
-        start = time.time()
-        while (time.time() - start) < timeout_seconds:
-            for selector in self.MESSAGE_INPUT_SELECTORS:
-                try:
-                    locator = self.page.locator(selector).first
-                    if locator.is_visible():
-                        return True
-                except Exception:
-                    continue
-            time.sleep(0.5)
-        return False
+        match = self.resolve_selector(
+            self.MESSAGE_INPUT_SELECTORS,
+            timeout_ms=timeout_seconds * 1000,
+            key="ChatPage.MESSAGE_INPUT_SELECTORS"
+        )
+        return match is not None
+
+    def is_chat_open(self, phone_e164: str) -> bool:
+        """Indica si la conversación abierta es la del número (cabecera con sus dígitos y caja de redacción visible)."""
+        header = self.page.evaluate(_HEADER_TEXT_JS)
+        return bool(header) and title_matches(header, phone_e164) and self.is_message_box_ready(timeout_seconds=0)
 
+    @telemetry.traced("chat.open_direct")
+    def open_chat_by_phone(self, phone_e164: str, prefill: Optional[str] = None) -> bool:
+        """
+        Abre la conversación directamente mediante la ruta de envío por número de WhatsApp Web
+        (`/send?phone=`), sin usar la barra de búsqueda. Si `prefill` cabe en la URL, la caja
+        de redacción queda precargada con el texto.
+
+        Args:
+            phone_e164: Número en formato E.164 (ver services.recipients.normalize_phone)
+            prefill: Texto opcional para precargar en la caja de redacción
+        """
+        url = f"{self.WHATSAPP_URL}/send?phone={phone_e164.lstrip('+')}"
+        self.prefill_requested = False
+        if prefill:
+            encoded = quote(prefill, safe="")
+            if len(encoded) <= self.PREFILL_MAX_URL_CHARS:
+                url += f"&text={encoded}"
+                self.prefill_requested = True
+                self._prefill_text = prefill
+
+        telemetry.event("chat.open_direct", f"🔗 Abriendo chat directo con {phone_e164}...", level="debug")
+        # La cabecera actual se marca: una caja de redacción del chat anterior no cuenta como apertura
+        self.page.evaluate(_MARK_HEADER_JS)
+        self.page.goto(url, wait_until="domcontentloaded")
+
+        # Espera combinada: caja de redacción (chat abierto) o diálogo de número inválido
+        candidates = self.MESSAGE_INPUT_SELECTORS + self.INVALID_NUMBER_DIALOG_SELECTORS
+        match = self.resolve_selector(candidates, timeout_ms=self.DIRECT_OPEN_TIMEOUT_MS)
+        if not match or match.index >= len(self.MESSAGE_INPUT_SELECTORS):
+            logger.debug(f"No se pudo abrir el chat directo con {phone_e164}.")
+            return False
+
+        # Confirmación por la cabecera: nombra el número o se renderizó tras la navegación
+        # (los contactos guardados muestran su nombre, no el número)
+        header = self.page.evaluate(_FRESH_HEADER_JS)
+        if not header or not (header["fresh"] or title_matches(header["text"], phone_e164)):
+            telemetry.event("chat.open_direct_mismatch", f"⚠️ La conversación abierta no corresponde a {phone_e164}.", level="warning")
+            return False
+
+        telemetry.event("chat.opened", "✅ Chat abierto directamente por número.")
+        return True
+
+    def send_prefilled_message(self) -> Optional[bool]:
+        """
+        Envía el texto precargado en la caja de redacción.
+        Retorna None sin enviar si la caja sigue vacía al agotar `ui_timeout` (el texto debe
+        escribirse), y True/False según se confirme o no la burbuja del mensaje enviado. Un envío
+        no confirmado no debe reescribirse: el mensaje pudo haber salido.
+        """
+        compose_selector = self._focus_compose()
+        if not self.wait_for_condition(_COMPOSE_FILLED_JS, arg=compose_selector, timeout_ms=self.ui_timeout_ms):
+            return None
+        return self._submit(compose_selector, self._prefill_text)
+
+    @telemetry.traced("compose")
     def type_and_send_message(self, message: str) -> bool:
         """
         Hace clic en el cuadro de texto del chat, redacta el mensaje y lo envía.
-        Soporta saltos de línea correctamente mediante Shift+Enter.
+        En modo "paste" el texto completo se inserta en el editor Lexical con un único evento
+        de pegado (con respaldo al tecleo si el editor no lo refleja); en modo "keyboard" se teclea
+        línea a línea con Shift+Enter. Los mensajes que superan el límite de WhatsApp se envían en partes.
         """
-        print("💬 Localizando cuadro de redacción de mensaje...")
+        parts = split_message(message, self.max_message_chars)
+        if len(parts) > 1:
+            telemetry.event("compose.split", f"✂️ Mensaje de {len(message)} caracteres dividido en {len(parts)} partes.")
 
-        message_box = self.find_first_visible(self.MESSAGE_INPUT_SELECTORS, timeout_ms=15000)
-        if not message_box:
-            raise RuntimeError("No se encontró la caja de redacción del mensaje en el chat abierto.")
+        # Un editor que ignora el pegado lo ignora en todas las partes: se teclean sin reintentarlo
+        self._paste_rejected = False
+        self.last_parts_total = len(parts)
+        self.last_parts_sent = 0
+        total_latency = 0.0
+        for part in parts:
+            if not self._compose_and_submit(part):
+                if self.last_parts_sent:
+                    telemetry.event(
+                        "compose.partial",
+                        f"⚠️ Envío parcial: {self.last_parts_sent} de {len(parts)} partes entregadas.",
+                        level="warning"
+                    )
+                return False
+            self.last_parts_sent += 1
+            total_latency += self.last_send_latency
+        self.last_send_latency = total_latency
+        return True
 
-        # Enfocar la caja de texto
-        message_box.click()
-        self.sleep(0.4)
+    def _compose_and_submit(self, message: str) -> bool:
+        """Redacta una parte del mensaje en la caja de redacción y la envía."""
+        compose_selector = self._focus_compose()
+
+        telemetry.event("compose.insert", "✍️ Escribiendo mensaje...", level="debug")
+        use_paste = self.insert_mode == "paste" and not self._paste_rejected
+        if not (use_paste and self._paste_text(compose_selector, message)):
+            self._paste_rejected = self._paste_rejected or use_paste
+            self._type_text(compose_selector, message)
+
+        # Esperar a que el editor refleje el texto antes de enviar
+        self.wait_for_condition(_COMPOSE_FILLED_JS, arg=compose_selector, timeout_ms=self.ui_timeout_ms)
+        return self._submit(compose_selector, message)
 
-        print("✍️ Escribiendo mensaje...")
+    @telemetry.traced("compose.paste")
+    def _paste_text(self, compose_selector: str, message: str) -> bool:
+        """
+        Inserta el mensaje completo con un evento de pegado sintético.
+        Si el editor no refleja el texto, lo vacía y retorna False para recurrir al tecleo.
+        """
+        try:
+            if not self.page.evaluate(_PASTE_TEXT_JS, [compose_selector, message]):
+                return False
+        except Exception as e:
+            logger.debug(f"Error en el pegado sintético: {e}")
+            return False
+
+        confirm_ms = min(self.PASTE_CONFIRM_TIMEOUT_MS, self.ui_timeout_ms)
+        if self.wait_for_condition(_COMPOSE_MATCHES_JS, arg=[compose_selector, message], timeout_ms=confirm_ms):
+            return True
+
+        logger.debug("El editor no reflejó el pegado; se recurre al tecleo línea a línea.")
+        self.page.keyboard.press("Control+a")
+        self.page.keyboard.press("Delete")
+        return False
+
+    @telemetry.traced("compose.type")
+    def _type_text(self, compose_selector: str, message: str) -> None:
+        """Teclea el mensaje línea a línea (saltos de línea con Shift+Enter)."""
         lines = message.split("\n")
         for idx, line in enumerate(lines):
             if line:
@@ -154,21 +413,48 @@ class ChatPage(BasePage):
                 self.page.keyboard.up("Shift")
                 time.sleep(0.05)
 
-        self.sleep(0.8)
+    @telemetry.traced("compose.focus")
+    def _focus_compose(self) -> str:
+        """Localiza y enfoca la caja de redacción; retorna el selector que coincidió."""
+        telemetry.event("compose.focus", "💬 Localizando cuadro de redacción de mensaje...", level="debug")
+
+        match = self.resolve_selector(self.MESSAGE_INPUT_SELECTORS, timeout_ms=self.ui_timeout_ms, key="ChatPage.MESSAGE_INPUT_SELECTORS")
+        if not match:
+            raise RuntimeError("No se encontró la caja de redacción del mensaje en el chat abierto.")
+
+        # Enfocar la caja de texto
+        self.page.locator(match.selector).first.click()
+        return match.selector
 
-        # Enviar mensaje con Enter
-        print("📤 Enviando mensaje...")
+    @telemetry.traced("compose.confirm")
+    def _submit(self, compose_selector: str, message: str) -> bool:
+        """
+        Envía el contenido de la caja de redacción con Enter y confirma el envío cuando aparece
+        en la conversación una burbuja saliente nueva con el mismo texto (registra la latencia).
+        Si no aparece, intenta con el botón de enviar; retorna False si tampoco se confirma.
+        """
+        telemetry.event("compose.submit", "📤 Enviando mensaje...", level="debug")
+        before = self.page.evaluate(_OUTGOING_SNAPSHOT_JS, self.OUTGOING_MESSAGE_SELECTORS)
+        appeared_arg = [self.OUTGOING_MESSAGE_SELECTORS, before, message]
+        start = time.perf_counter()
         self.page.keyboard.press("Enter")
-        self.sleep(self.wait_time)
+        sent = self.wait_for_condition(_OUTGOING_APPEARED_JS, arg=appeared_arg, timeout_ms=self.ui_timeout_ms)
 
-        # Si aún estuviera visible el botón de enviar, hacer clic
-        send_btn = self.find_first_visible(self.SEND_BUTTON_SELECTORS, timeout_ms=2000)
-        if send_btn and send_btn.is_visible():
-            try:
-                send_btn.click()
-                self.sleep(self.wait_time)
-            except Exception:
-                pass
+        # Si el Enter no produjo la burbuja y el botón de enviar sigue visible, hacer clic
+        if not sent:
+            send_btn = self.find_first_visible(self.SEND_BUTTON_SELECTORS, timeout_ms=0, key="ChatPage.SEND_BUTTON_SELECTORS")
+            if send_btn:
+                try:
+                    send_btn.click()
+                    sent = self.wait_for_condition(_OUTGOING_APPEARED_JS, arg=appeared_arg, timeout_ms=self.ui_timeout_ms)
+                except Exception as e:
+                    logger.debug(f"Error al pulsar el botón de enviar: {e}")
+
+        if not sent:
+            self.last_send_latency = None
+            telemetry.event("compose.unconfirmed", "⚠️ No se detectó el mensaje enviado en la conversación.", level="warning")
+            return False
 
-        print("✅ Mensaje enviado exitosamente a través de la interfaz.")
+        self.last_send_latency = time.perf_counter() - start
+        telemetry.event("compose.confirmed", f"✅ Mensaje enviado exitosamente a través de la interfaz ({self.last_send_latency:.2f} s).", latency=self.last_send_latency)
         return True
@@ -0,0 +1,55 @@
+"""
+Módulo LoginDom - Contrato con el DOM de WhatsApp Web para la autenticación
+Selectores y sondas JavaScript compartidos por LoginPage y AsyncLoginPage, sin importar Playwright.
+"""
+
+from typing import List
+
+
+# Sonda única en el navegador: origen correcto y lista de chats renderizada
+_SESSION_READY_JS = """
+([origin, selectors]) => {
+    if (window.location.origin !== origin) return false;
+    for (const selector of selectors) {
+        let el = null;
+        try { el = document.querySelector(selector); } catch (e) { continue; }
+        if (el && el.getClientRects().length > 0) return true;
+    }
+    return false;
+}
+"""
+
+
+class LoginSelectors:
+    """Selectores del código QR, de la sesión activa y de los modales de bienvenida."""
+
+    # Selectores para el código QR
+    QR_SELECTORS: List[str] = [
+        'div[data-ref*="@"] canvas[role="img"]',
+        'div._akau canvas[aria-label*="QR"]',
+        'canvas[aria-label*="Scan me"]',
+        'canvas[role="img"]',
+        'div[data-testid="qrcode"]'
+    ]
+
+    # Selectores que confirman que la sesión ya está activa
+    LOGGED_IN_SELECTORS: List[str] = [
+        'div[data-testid="chat-list"]',
+        'div[role="grid"]',
+        'div[aria-label*="chat" i]',
+        'div[data-tab="3"][role="textbox"]',
+        'div[contenteditable="true"][data-tab="3"]',
+        'header[data-testid="chatlist-header"]'
+    ]
+
+    # Selectores para modales / diálogos post-login
+    MODAL_SELECTORS: List[str] = [
+        'div[role="dialog"]',
+        'div[data-testid="popup-contents"]'
+    ]
+
+    MODAL_CLOSE_BUTTONS: List[str] = [
+        'div[role="dialog"] button',
+        'div[role="dialog"] div[role="button"]',
+        'div[role="button"][tabindex="0"]'
+    ]
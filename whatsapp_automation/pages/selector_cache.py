@@ -0,0 +1,91 @@
+"""
+Módulo SelectorCache - Orden adaptativo de selectores alternativos
+Registra qué alternativa de cada lista de selectores coincidió, con conteo de aciertos y latencia,
+y reordena las listas para probar primero la ganadora. Las puntuaciones decaen con cada registro
+para que el orden se recupere cuando el DOM de WhatsApp Web vuelva a cambiar.
+"""
+
+import os
+import json
+import logging
+import tempfile
+import threading
+from typing import Dict, List, Optional, Sequence
+
+logger = logging.getLogger("WhatsAppBot.SelectorCache")
+
+
+class SelectorCache:
+    """Estadísticas persistentes de aciertos por lista de selectores (clave → selector → métricas)."""
+
+    def __init__(self, path: Optional[str] = None, decay: float = 0.8):
+        self.path = os.path.abspath(path) if path else None
+        self.decay = decay
+        self._stats: Dict[str, Dict[str, Dict[str, float]]] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        if self.path:
+            self.load()
+
+    @staticmethod
+    def default_path(session_dir: str) -> str:
+        """Archivo de estadísticas junto al directorio de sesión (`<session_dir>.selectors.json`)."""
+        return os.path.abspath(session_dir).rstrip(os.sep) + ".selectors.json"
+
+    def order(self, key: str, selectors: Sequence[str]) -> List[str]:
+        """
+        Retorna los selectores ordenados por puntuación descendente.
+        Los empates y los selectores sin historial conservan el orden original de la lista.
+        """
+        stats = self._stats.get(key)
+        if not stats:
+            return list(selectors)
+        return sorted(selectors, key=lambda sel: -stats.get(sel, {}).get("score", 0.0))
+
+    def record(self, key: str, selectors: Sequence[str], matched: str, latency_ms: float) -> None:
+        """Registra un acierto: decaen todas las puntuaciones de la lista y la ganadora suma uno."""
+        with self._lock:
+            stats = self._stats.setdefault(key, {})
+            # Olvidar selectores que ya no forman parte de la lista
+            for stale in [sel for sel in stats if sel not in selectors]:
+                del stats[stale]
+            for entry in stats.values():
+                entry["score"] *= self.decay
+            entry = stats.setdefault(matched, {"score": 0.0, "hits": 0, "latency_ms": latency_ms})
+            entry["score"] += 1.0
+            entry["hits"] += 1
+            entry["latency_ms"] = 0.8 * entry["latency_ms"] + 0.2 * latency_ms
+            self._dirty = True
+
+    def stats(self, key: str) -> Dict[str, Dict[str, float]]:
+        """Copia de las métricas registradas para una lista de selectores."""
+        return {sel: dict(entry) for sel, entry in self._stats.get(key, {}).items()}
+
+    def load(self) -> None:
+        """Carga las estadísticas desde disco si el archivo existe."""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._stats = json.load(f)
+        except Exception as e:
+            logger.debug(f"No se pudo leer la caché de selectores: {e}")
+            self._stats = {}
+
+    def save(self) -> None:
+        """Guarda las estadísticas de forma atómica si hubo cambios."""
+        if not self.path or not self._dirty:
+            return
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(self._stats, f, indent=2)
+                os.replace(tmp_path, self.path)
+                self._dirty = False
+            except Exception as e:
+                logger.debug(f"No se pudo guardar la caché de selectores: {e}")
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
@@ -0,0 +1,86 @@
+"""
+Módulo SelectorEngine - Motor de resolución de selectores alternativos
+Piezas comunes de BasePage (playwright.sync_api) y AsyncBasePage (playwright.async_api): origen de
+WhatsApp Web, la sonda JavaScript que evalúa todas las alternativas en un solo viaje y el orden
+adaptativo con SelectorCache. No importa ninguna de las dos API de Playwright; cada clase base solo
+aporta la llamada (síncrona o asíncrona) al navegador.
+"""
+
+import os
+import time
+from typing import List, NamedTuple, Optional, Sequence
+
+from .selector_cache import SelectorCache
+
+
+# Evalúa todas las alternativas en orden dentro del navegador y retorna la primera que
+# cumple el estado. La visibilidad replica la de Playwright: caja no vacía y sin visibility:hidden.
+RESOLVE_SELECTORS_JS = """
+([selectors, state]) => {
+    const isVisible = (el) => {
+        if (!el) return false;
+        if (window.getComputedStyle(el).visibility === 'hidden') return false;
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0;
+    };
+    for (let i = 0; i < selectors.length; i++) {
+        let el = null;
+        try { el = document.querySelector(selectors[i]); } catch (e) { continue; }
+        const visible = isVisible(el);
+        if ((state === 'visible' && visible) || (state === 'hidden' && !visible)) {
+            return { index: i };
+        }
+    }
+    return null;
+}
+"""
+
+
+class SelectorMatch(NamedTuple):
+    """Alternativa que resolvió una lista de selectores: posición en la lista y selector."""
+
+    index: int
+    selector: str
+
+
+class SelectorPlan(NamedTuple):
+    """Resolución en curso: lista original, orden de prueba y si se registra en la caché adaptativa."""
+
+    original: List[str]
+    ordered: List[str]
+    key: Optional[str]
+    adaptive: bool
+    start: float
+
+
+class SelectorEngine:
+    """Orden adaptativo y traducción de resultados de la sonda, comunes a los Page Objects."""
+
+    # Origen de WhatsApp Web; WHATSAPP_URL permite apuntar a un sustituto local (benchmarks sin red)
+    WHATSAPP_URL: str = os.environ.get("WHATSAPP_URL", "https://web.whatsapp.com").rstrip("/")
+
+    # Intervalo de sondeo dentro del navegador mientras se espera una lista de selectores
+    RESOLVE_POLLING_MS: int = 50
+
+    selector_cache: Optional[SelectorCache] = None
+
+    def _plan_selectors(self, selectors: Sequence[str], state: str, key: Optional[str]) -> Optional[SelectorPlan]:
+        """
+        Orden de prueba de las alternativas. Con `key` y una SelectorCache se prueba primero la
+        alternativa ganadora de ejecuciones anteriores. Retorna None si no hay alternativas.
+        """
+        original = list(selectors)
+        if not original:
+            return None
+        adaptive = bool(key and self.selector_cache and state == "visible")
+        ordered = self.selector_cache.order(key, original) if adaptive else original
+        return SelectorPlan(original, ordered, key, adaptive, time.perf_counter())
+
+    def _selector_match(self, plan: SelectorPlan, found) -> Optional[SelectorMatch]:
+        """Traduce el resultado de la sonda a la alternativa de la lista original y registra el acierto."""
+        if not found:
+            return None
+        selector = plan.ordered[int(found["index"])]
+        if plan.adaptive:
+            self.selector_cache.record(plan.key, plan.original, selector, (time.perf_counter() - plan.start) * 1000.0)
+        return SelectorMatch(index=plan.original.index(selector), selector=selector)
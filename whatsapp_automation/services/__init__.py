@@ -1,15 +1,54 @@
-from .message_builder import (
-    MessageBuilder,
-    IMessageStrategy,
-    TechnicalReportStrategy,
-    CustomMessageStrategy,
-    create_technical_report_message
-)
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
+
+
+_EXPORTS = {
+    "MessageBuilder": ".message_builder",
+    "IMessageStrategy": ".message_builder",
+    "TechnicalReportStrategy": ".message_builder",
+    "CustomMessageStrategy": ".message_builder",
+    "TemplateStrategy": ".message_builder",
+    "MessageTemplate": ".message_builder",
+    "create_technical_report_message": ".message_builder",
+    "split_message": ".message_builder",
+    "normalize_phone": ".recipients",
+    "is_phone_number": ".recipients",
+    "MailMerge": ".mail_merge",
+    "ContactIndex": ".contact_index",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .message_builder import (
+        MessageBuilder,
+        IMessageStrategy,
+        TechnicalReportStrategy,
+        CustomMessageStrategy,
+        TemplateStrategy,
+        MessageTemplate,
+        create_technical_report_message,
+        split_message
+    )
+    from .recipients import (
+        normalize_phone,
+        is_phone_number
+    )
+    from .mail_merge import MailMerge
+    from .contact_index import ContactIndex
 
 __all__ = [
     "MessageBuilder",
     "IMessageStrategy",
     "TechnicalReportStrategy",
     "CustomMessageStrategy",
+    "TemplateStrategy",
+    "MessageTemplate",
     "create_technical_report_message",
+    "split_message",
+    "normalize_phone",
+    "is_phone_number",
+    "MailMerge",
+    "ContactIndex",
 ]
@@ -0,0 +1,204 @@
+"""
+Módulo de Servicios: Índice de contactos y chats
+Índice en memoria de las filas de la lista de chats de WhatsApp Web (título visible y posición en la
+lista virtualizada), con búsqueda exacta por número normalizado o por nombre y búsqueda aproximada.
+Permite abrir un chat conocido sin pasar por la barra de búsqueda y verificar que un resultado de
+búsqueda corresponde realmente al destinatario antes de hacer clic en él.
+"""
+
+import re
+import difflib
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+
+from .recipients import normalize_phone
+
+
+def normalize_name(value: str) -> str:
+    """Clave de comparación de un nombre: sin acentos, sin mayúsculas y con espacios simples."""
+    decomposed = unicodedata.normalize("NFKD", value or "")
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(stripped.casefold().split())
+
+
+@dataclass
+class ContactEntry:
+    """Fila de la lista de chats: título visible, número E.164 (si el título es un número) y posición."""
+
+    title: str
+    key: str
+    phone: Optional[str] = None
+    offset: Optional[float] = None
+
+
+class ContactIndex:
+    """
+    Índice de la lista de chats: número normalizado → fila y nombre normalizado → fila.
+
+    Args:
+        default_country_code: Código de país para normalizar números locales de consultas y títulos
+        fuzzy_cutoff: Similitud mínima (0-1) de una coincidencia aproximada por nombre
+        fuzzy_margin: Ventaja mínima del mejor candidato aproximado sobre el segundo; si dos nombres
+            quedan igual de cerca la búsqueda no decide (evita envíos al contacto equivocado)
+    """
+
+    def __init__(
+        self,
+        default_country_code: Optional[str] = None,
+        fuzzy_cutoff: float = 0.85,
+        fuzzy_margin: float = 0.05
+    ):
+        self.default_country_code = default_country_code
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self.fuzzy_margin = fuzzy_margin
+        self._by_title: Dict[str, ContactEntry] = {}
+        self._by_phone: Dict[str, ContactEntry] = {}
+        self._by_key: Dict[str, List[ContactEntry]] = {}
+
+    def __len__(self) -> int:
+        return len(self._by_title)
+
+    def __contains__(self, query: str) -> bool:
+        return self.lookup(query, fuzzy=False) is not None
+
+    def entries(self) -> List[ContactEntry]:
+        return list(self._by_title.values())
+
+    def add(self, title: str, offset: Optional[float] = None) -> Optional[ContactEntry]:
+        """Registra (o actualiza la posición de) una fila por su título visible."""
+        title = (title or "").strip()
+        if not title:
+            return None
+        entry = self._by_title.get(title)
+        if entry is not None:
+            entry.offset = offset if offset is not None else entry.offset
+            return entry
+        entry = ContactEntry(
+            title=title,
+            key=normalize_name(title),
+            phone=normalize_phone(title, self.default_country_code),
+            offset=offset
+        )
+        self._by_title[title] = entry
+        self._by_key.setdefault(entry.key, []).append(entry)
+        if entry.phone:
+            self._by_phone[entry.phone] = entry
+        return entry
+
+    def update(self, rows: Iterable[Mapping]) -> int:
+        """Registra filas `{"title", "offset"}` leídas del DOM; retorna cuántas eran nuevas."""
+        before = len(self._by_title)
+        for row in rows:
+            self.add(row.get("title", ""), row.get("offset"))
+        return len(self._by_title) - before
+
+    def remove(self, title: str) -> None:
+        """Descarta una fila (p. ej. un chat que ya no aparece donde el índice lo situaba)."""
+        entry = self._by_title.pop(title, None)
+        if entry is None:
+            return
+        same_key = [e for e in self._by_key.get(entry.key, []) if e is not entry]
+        if same_key:
+            self._by_key[entry.key] = same_key
+        else:
+            self._by_key.pop(entry.key, None)
+        if entry.phone and self._by_phone.get(entry.phone) is entry:
+            del self._by_phone[entry.phone]
+
+    def clear(self) -> None:
+        self._by_title.clear()
+        self._by_phone.clear()
+        self._by_key.clear()
+
+    def lookup(self, query: str, fuzzy: bool = True) -> Optional[ContactEntry]:
+        """
+        Fila del destinatario: primero por número normalizado, después por nombre exacto
+        (sin acentos ni mayúsculas) y, con `fuzzy`, por el nombre más parecido si es inequívoco.
+        Retorna None si no hay coincidencia o si varios chats comparten el mismo nombre.
+        """
+        phone = normalize_phone(query, self.default_country_code)
+        if phone:
+            return self._by_phone.get(phone)
+        key = normalize_name(query)
+        if not key:
+            return None
+        exact = self._by_key.get(key, [])
+        if exact:
+            return exact[0] if len(exact) == 1 else None
+        if not fuzzy:
+            return None
+        best = _best_fuzzy(key, list(self._by_key), self.fuzzy_cutoff, self.fuzzy_margin)
+        if best is None or len(self._by_key[best]) != 1:
+            return None
+        return self._by_key[best][0]
+
+
+def _best_fuzzy(key: str, candidates: Sequence[str], cutoff: float, margin: float) -> Optional[str]:
+    """Candidato más parecido a `key` si supera `cutoff` y aventaja al segundo en `margin`."""
+    scores = []
+    matcher = difflib.SequenceMatcher(b=key, autojunk=False)
+    for candidate in candidates:
+        matcher.set_seq1(candidate)
+        # Cotas baratas antes del cálculo completo de la similitud
+        if matcher.real_quick_ratio() < cutoff or matcher.quick_ratio() < cutoff:
+            continue
+        ratio = matcher.ratio()
+        if ratio >= cutoff:
+            scores.append((ratio, candidate))
+    if not scores:
+        return None
+    scores.sort(reverse=True)
+    if len(scores) > 1 and scores[0][0] - scores[1][0] < margin:
+        return None
+    return scores[0][1]
+
+
+def pick_result(
+    titles: Sequence[str],
+    query: str,
+    default_country_code: Optional[str] = None,
+    fuzzy_cutoff: float = 0.85
+) -> Optional[int]:
+    """
+    Posición del resultado de búsqueda que corresponde a `query`, o None si ninguno es inequívoco.
+    Un número coincide con un título que contiene sus dígitos; si el número pertenece a un contacto
+    guardado (el título es su nombre), solo se acepta cuando la búsqueda dejó un único resultado.
+    Del mismo modo, un nombre parcial ("Juan") acepta el único resultado que lo contiene como
+    palabras completas ("Juan Pérez"), pero no como fragmento de otra palabra ("Ana" → "Mariana").
+    """
+    if not titles:
+        return None
+    phone = normalize_phone(query, default_country_code)
+    if phone:
+        digits = phone.lstrip("+")
+        for index, title in enumerate(titles):
+            if digits and digits in "".join(ch for ch in title if ch.isdigit()):
+                return index
+        return 0 if len(titles) == 1 else None
+
+    key = normalize_name(query)
+    keys = [normalize_name(title) for title in titles]
+    exact = [index for index, candidate in enumerate(keys) if candidate == key]
+    if exact:
+        return exact[0] if len(exact) == 1 else None
+    best = _best_fuzzy(key, list(dict.fromkeys(keys)), fuzzy_cutoff, 0.05)
+    if best is not None and keys.count(best) == 1:
+        return keys.index(best)
+    return 0 if len(titles) == 1 and contains_words(keys[0], key) else None
+
+
+def contains_words(text_key: str, key: str) -> bool:
+    """Indica si la clave `key` aparece en `text_key` como palabras completas ("ana" no está en "mariana")."""
+    return bool(key) and re.search(rf"(?<!\w){re.escape(key)}(?!\w)", text_key) is not None
+
+
+def title_matches(text: str, query: str, default_country_code: Optional[str] = None) -> bool:
+    """
+    Indica si un texto visible (p. ej. la cabecera del chat abierto) nombra al destinatario:
+    los dígitos del número o el nombre como palabras completas, con la misma regla que `pick_result`.
+    """
+    phone = normalize_phone(query, default_country_code)
+    if phone:
+        return phone.lstrip("+") in "".join(ch for ch in text if ch.isdigit())
+    return contains_words(normalize_name(text), normalize_name(query))
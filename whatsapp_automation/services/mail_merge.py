@@ -0,0 +1,237 @@
+"""
+Módulo de Servicios: Combinación de correspondencia (mail-merge) en streaming
+Lee destinatarios y variables de exportaciones CSV o JSONL fila a fila, valida y normaliza
+cada destinatario, renderiza el mensaje con MessageBuilder y produce SendJob bajo demanda para
+WhatsAppBotFacade.iter_send. La memoria es constante con independencia del tamaño del archivo;
+opcionalmente una lectura anticipada en segundo plano solapa lectura y renderizado con el envío.
+"""
+
+import os
+import csv
+import json
+import queue
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from .message_builder import MessageBuilder
+from .recipients import normalize_phone
+from ..core.jobs import SendJob
+
+logger = logging.getLogger("WhatsAppBot.MailMerge")
+
+# Extensión → formato de la fuente
+SOURCE_FORMATS = {
+    ".csv": "csv",
+    ".tsv": "tsv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+}
+
+
+@dataclass
+class RejectedRow:
+    """Fila descartada por la validación, con su número de línea en la fuente."""
+
+    line: int
+    row: Dict[str, Any]
+    reason: str
+
+
+def detect_format(path: str) -> str:
+    """Formato de la fuente según su extensión (csv, tsv o jsonl)."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in SOURCE_FORMATS:
+        raise ValueError(f"Formato de fuente no soportado: '{extension}' (usa .csv, .tsv o .jsonl).")
+    return SOURCE_FORMATS[extension]
+
+
+def read_rows(path: str, source_format: Optional[str] = None, encoding: str = "utf-8-sig") -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Lee la fuente fila a fila y produce `(línea, fila)`. La primera fila de un CSV es la cabecera
+    y las celdas ausentes se omiten de la fila; las líneas vacías de un JSONL se omiten y una línea
+    JSON inválida se produce con la clave `__error__` para que la validación la descarte sin
+    detener la lectura.
+    """
+    source_format = source_format or detect_format(path)
+    with open(path, "r", encoding=encoding, newline="") as f:
+        if source_format in ("csv", "tsv"):
+            reader = csv.DictReader(f, delimiter="\t" if source_format == "tsv" else ",")
+            for row in reader:
+                # Filas cortas (celdas ausentes) o con columnas de más: solo se conservan las celdas con cabecera y valor
+                if None in row or None in row.values():
+                    row = {key: value for key, value in row.items() if key is not None and value is not None}
+                yield reader.line_num, row
+        elif source_format == "jsonl":
+            for line_num, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError as e:
+                    row = {"__error__": f"JSON inválido: {e}"}
+                if not isinstance(row, dict):
+                    row = {"__error__": "La línea no es un objeto JSON."}
+                yield line_num, row
+        else:
+            raise ValueError(f"Formato de fuente no soportado: '{source_format}'.")
+
+
+def read_ahead(items: Iterable[Any], size: int) -> Iterator[Any]:
+    """
+    Consume `items` en un hilo en segundo plano con hasta `size` elementos adelantados, de modo
+    que la lectura y el renderizado se solapan con el trabajo del consumidor (la interfaz).
+    Las excepciones del productor se relanzan en el consumidor; cerrar el generador detiene el hilo.
+    """
+    if size <= 0:
+        yield from items
+        return
+
+    buffer: "queue.Queue" = queue.Queue(maxsize=size)
+    stop = threading.Event()
+    done = object()
+
+    def offer(entry) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in items:
+                if not offer((item, None)):
+                    return
+            offer((done, None))
+        except BaseException as e:
+            offer((done, e))
+
+    thread = threading.Thread(target=produce, name="whatsapp-mail-merge", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = buffer.get()
+            if item is done:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+class MailMerge:
+    """
+    Canal de combinación de correspondencia: fuente CSV/JSONL → validación → MessageBuilder → SendJob.
+
+    Args:
+        source: Ruta del archivo CSV/TSV/JSONL o iterable de diccionarios ya leídos
+        builder: MessageBuilder con la estrategia o plantilla a renderizar por fila; sin él se usa
+            la columna `message_field` tal cual
+        phone_field: Columna con el número o nombre del destinatario
+        message_field: Columna con el texto ya preparado (si no hay builder)
+        id_field: Columna opcional con el identificador del trabajo (por defecto `<fuente>:<línea>`)
+        default_country_code: Código de país para números locales con prefijo troncal `0`
+        allow_contact_names: Aceptar destinatarios que no son números (se abren por búsqueda)
+        source_format: Forzar el formato ("csv", "tsv" o "jsonl") en lugar de deducirlo de la extensión
+        on_reject: Callback opcional invocado con cada RejectedRow
+    """
+
+    def __init__(
+        self,
+        source,
+        builder: Optional[MessageBuilder] = None,
+        phone_field: str = "phone",
+        message_field: str = "message",
+        id_field: Optional[str] = "job_id",
+        default_country_code: Optional[str] = None,
+        allow_contact_names: bool = False,
+        source_format: Optional[str] = None,
+        on_reject: Optional[Callable[[RejectedRow], None]] = None
+    ):
+        self.source = source
+        self.builder = builder
+        self.phone_field = phone_field
+        self.message_field = message_field
+        self.id_field = id_field
+        self.default_country_code = default_country_code
+        self.allow_contact_names = allow_contact_names
+        self.source_format = source_format
+        self.on_reject = on_reject
+        self.source_name = os.path.basename(source) if isinstance(source, str) else "rows"
+        self.read = 0
+        self.accepted = 0
+        self.rejected = 0
+
+    def rows(self) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Filas de la fuente como `(línea, fila)`."""
+        if isinstance(self.source, str):
+            return read_rows(self.source, self.source_format)
+        return enumerate(self.source, 1)
+
+    def _reject(self, line: int, row: Dict[str, Any], reason: str) -> None:
+        self.rejected += 1
+        logger.warning(f"Fila {line} descartada: {reason}")
+        if self.on_reject:
+            self.on_reject(RejectedRow(line=line, row=row, reason=reason))
+
+    def _recipient(self, row: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+        """Destinatario normalizado de la fila, o `(None, motivo)` si no es válido."""
+        if "__error__" in row:
+            return None, row["__error__"]
+        raw = row.get(self.phone_field)
+        raw = "" if raw is None else str(raw).strip()
+        if not raw:
+            return None, f"Falta el destinatario (columna '{self.phone_field}')."
+        phone = normalize_phone(raw, self.default_country_code)
+        if phone:
+            return phone, None
+        if self.allow_contact_names:
+            return raw, None
+        return None, f"Número telefónico inválido: '{raw}'."
+
+    def _render(self, row: Dict[str, Any]) -> str:
+        if self.builder is None:
+            message = row.get(self.message_field)
+            if message is None or not str(message).strip():
+                raise ValueError(f"Falta el mensaje (columna '{self.message_field}').")
+            return str(message)
+        return next(self.builder.render_many((row,)))
+
+    def _jobs(self) -> Iterator[SendJob]:
+        for line, row in self.rows():
+            self.read += 1
+            phone, reason = self._recipient(row)
+            if phone is None:
+                self._reject(line, row, reason)
+                continue
+            try:
+                message = self._render(row)
+            except (KeyError, ValueError, TypeError) as e:
+                self._reject(line, row, e.args[0] if e.args else str(e))
+                continue
+            if not message.strip():
+                self._reject(line, row, "El mensaje renderizado está vacío.")
+                continue
+            job_id = row.get(self.id_field) if self.id_field else None
+            self.accepted += 1
+            yield SendJob(phone=phone, message=message, job_id=str(job_id) if job_id else f"{self.source_name}:{line}")
+
+    def jobs(self, read_ahead_size: int = 0) -> Iterator[SendJob]:
+        """
+        Trabajos de envío bajo demanda. Con `read_ahead_size > 0` la lectura, validación y
+        renderizado de hasta ese número de filas se adelantan en segundo plano.
+        """
+        return read_ahead(self._jobs(), read_ahead_size)
+
+    def __iter__(self) -> Iterator[SendJob]:
+        return self.jobs()
+
+    def stats(self) -> Dict[str, int]:
+        """Filas leídas, aceptadas y descartadas hasta el momento."""
+        return {"read": self.read, "accepted": self.accepted, "rejected": self.rejected}
@@ -5,8 +5,99 @@ de los patrones de diseño, datos del desarrollador (Jose Rivero) y enlace al re
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from string import Formatter
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
 import datetime
+import time
+
+
+# Longitud máxima de un mensaje de texto en WhatsApp
+WHATSAPP_MAX_MESSAGE_CHARS = 65536
+
+
+class MessageTemplate:
+    """
+    Plantilla compilada: el texto se analiza una sola vez en segmentos estáticos y variables
+    (`{nombre}`, `{nombre:formato}`; `{{` y `}}` son llaves literales). Renderizar solo rellena
+    las posiciones variables de una lista precalculada y la une.
+
+    Args:
+        source: Texto de la plantilla
+        defaults: Valores por defecto de las variables
+    """
+
+    _formatter = Formatter()
+
+    def __init__(self, source: str, defaults: Optional[Mapping[str, Any]] = None):
+        self.source = source
+        self.defaults: Dict[str, Any] = dict(defaults or {})
+        parts: List[Optional[str]] = []
+        slots: List[Tuple[int, str, str]] = []
+        literal = ""
+        for text, field, spec, conversion in self._formatter.parse(source):
+            literal += text
+            if field is None:
+                continue
+            if not field.isidentifier() or conversion:
+                raise ValueError(f"Variable de plantilla no soportada: {{{field}{'!' + conversion if conversion else ''}}}")
+            if literal:
+                parts.append(literal)
+                literal = ""
+            slots.append((len(parts), field, spec or ""))
+            parts.append(None)
+        if literal:
+            parts.append(literal)
+        self._parts = parts
+        self._slots = tuple(slots)
+        self.fields = tuple(dict.fromkeys(field for _, field, _ in slots))
+
+    def __repr__(self) -> str:
+        return f"MessageTemplate(fields={self.fields!r})"
+
+    def _fill(self, row: Mapping[str, Any], common: Mapping[str, Any]) -> str:
+        parts = self._parts.copy()
+        defaults = self.defaults
+        for index, field, spec in self._slots:
+            if field in row:
+                value = row[field]
+            elif field in common:
+                value = common[field]
+            elif field in defaults:
+                value = defaults[field]
+            else:
+                raise KeyError(f"Falta la variable de plantilla '{field}'.")
+            parts[index] = value if spec == "" and type(value) is str else format(value, spec)
+        return "".join(parts)
+
+    def render(self, values: Optional[Mapping[str, Any]] = None, **kwargs) -> str:
+        """Renderiza la plantilla con `values` y/o argumentos con nombre (estos tienen prioridad)."""
+        return self._fill(kwargs, values or {})
+
+    def render_many(self, rows: Iterable[Mapping[str, Any]], **common) -> Iterator[str]:
+        """
+        Renderiza un mensaje por fila bajo demanda (generador): no materializa la lista completa.
+        Las variables de cada fila tienen prioridad sobre `common` y ambas sobre los valores por defecto.
+        """
+        fill = self._fill
+        for row in rows:
+            yield fill(row, common)
+
+
+def escape_template(text: str) -> str:
+    """Escapa las llaves de un texto para incluirlo literalmente en una plantilla."""
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+_timestamp_cache: Tuple[int, str] = (-1, "")
+
+
+def _current_timestamp() -> str:
+    """Fecha y hora de ejecución; `strftime` solo se recalcula cuando cambia el segundo."""
+    global _timestamp_cache
+    second = int(time.time())
+    if _timestamp_cache[0] != second:
+        _timestamp_cache = (second, datetime.datetime.fromtimestamp(second).strftime("%d/%m/%Y %H:%M:%S"))
+    return _timestamp_cache[1]
 
 
 class IMessageStrategy(ABC):
@@ -17,50 +108,73 @@ class IMessageStrategy(ABC):
         """Construye el contenido del mensaje como cadena de texto."""
         pass
 
+    def render_many(self, rows: Iterable[Mapping[str, Any]], **common) -> Iterator[str]:
+        """Construye un mensaje por fila bajo demanda; las estrategias compiladas lo especializan."""
+        for row in rows:
+            yield self.build(**{**common, **row})
+
+
+DEFAULT_PATTERNS: List[Dict[str, str]] = [
+    {
+        "name": "Page Object Model (POM)",
+        "type": "Estructural / UI Automation",
+        "desc": "Separa la lógica de automatización de los selectores web (BasePage, LoginPage, ChatPage)."
+    },
+    {
+        "name": "Facade Pattern (Fachada)",
+        "type": "Estructural",
+        "desc": "WhatsAppBotFacade ofrece una interfaz unificada y de alto nivel que oculta la complejidad interna de Playwright."
+    },
+    {
+        "name": "Singleton Pattern",
+        "type": "Creacional",
+        "desc": "SessionManager centraliza la gestión del perfil de usuario, cookies de sesión e IndexedDB en disco."
+    },
+    {
+        "name": "Builder / Strategy Pattern",
+        "type": "Creacional / Comportamiento",
+        "desc": "MessageBuilder desacopla la construcción y parametrización de mensajes dinámicos."
+    }
+]
+
 
 class TechnicalReportStrategy(IMessageStrategy):
     """
     Estrategia de mensaje para el reporte técnico de la solución RPA,
     incluyendo el saludo a Merza, autor, repositorio y desglose de patrones de diseño.
+    El banner y la lista de patrones se compilan una vez en una MessageTemplate; por mensaje
+    solo se rellenan destinatario, desarrollador, repositorio y fecha.
     """
-    
+
+    DEFAULTS = {
+        "recipient": "Merza",
+        "developer": "Jose Rivero",
+        "repo_url": "https://github.com/jrivero20/whatsapp_automation",
+    }
+    NOTE_TEMPLATE = MessageTemplate("\n\n📝 *Nota adicional:* {custom_note}")
+
+    # Plantilla de los patrones por defecto, compartida por todas las instancias
+    _default_template: Optional[MessageTemplate] = None
+
     def __init__(self, patterns: Optional[List[Dict[str, str]]] = None):
-        self.patterns = patterns or [
-            {
-                "name": "Page Object Model (POM)",
-                "type": "Estructural / UI Automation",
-                "desc": "Separa la lógica de automatización de los selectores web (BasePage, LoginPage, ChatPage)."
-            },
-            {
-                "name": "Facade Pattern (Fachada)",
-                "type": "Estructural",
-                "desc": "WhatsAppBotFacade ofrece una interfaz unificada y de alto nivel que oculta la complejidad interna de Playwright."
-            },
-            {
-                "name": "Singleton Pattern",
-                "type": "Creacional",
-                "desc": "SessionManager centraliza la gestión del perfil de usuario, cookies de sesión e IndexedDB en disco."
-            },
-            {
-                "name": "Builder / Strategy Pattern",
-                "type": "Creacional / Comportamiento",
-                "desc": "MessageBuilder desacopla la construcción y parametrización de mensajes dinámicos."
-            }
-        ]
+        self.patterns = patterns or DEFAULT_PATTERNS
+        if patterns:
+            self.template = self.compile(self.patterns)
+        else:
+            if TechnicalReportStrategy._default_template is None:
+                TechnicalReportStrategy._default_template = self.compile(DEFAULT_PATTERNS)
+            self.template = TechnicalReportStrategy._default_template
 
-    def build(self, **kwargs) -> str:
-        recipient = kwargs.get("recipient", "Merza")
-        developer = kwargs.get("developer", "Jose Rivero")
-        repo_url = kwargs.get("repo_url", "https://github.com/jrivero20/whatsapp_automation")
-        timestamp = datetime.datetime.now().strftime("%d/%m/%Y %H:%M:%S")
-        
+    @classmethod
+    def compile(cls, patterns: List[Dict[str, str]]) -> MessageTemplate:
+        """Compila el reporte con la lista de patrones fija en la parte estática."""
         lines = [
-            f"Hola {recipient},",
+            "Hola {recipient},",
             "",
             "🤖 *BOT DE AUTOMATIZACIÓN WHATSAPP (RPA)*",
-            f"👤 *Desarrollador:* {developer}",
-            f"🔗 *Repositorio:* {repo_url}",
-            f"📅 _Ejecución automatizada: {timestamp}_",
+            "👤 *Desarrollador:* {developer}",
+            "🔗 *Repositorio:* {repo_url}",
+            "📅 _Ejecución automatizada: {timestamp}_",
             "",
             "━━━━━━━━━━━━━━━━━━━━━━━━━━━━",
             "📐 *PATRONES DE DISEÑO IMPLEMENTADOS*",
@@ -68,22 +182,29 @@ class TechnicalReportStrategy(IMessageStrategy):
             ""
         ]
         
-        for idx, pattern in enumerate(self.patterns, 1):
-            lines.append(f"*{idx}. {pattern['name']}* [{pattern['type']}]")
-            lines.append(f"   ↳ {pattern['desc']}")
+        for idx, pattern in enumerate(patterns, 1):
+            lines.append(escape_template(f"*{idx}. {pattern['name']}* [{pattern['type']}]"))
+            lines.append(escape_template(f"   ↳ {pattern['desc']}"))
             lines.append("")
             
         lines.append("━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
         lines.append("✅ *Persistencia de Sesión:* Cookies, LocalStorage e IndexedDB guardados en perfil local.")
         lines.append("🚀 *Entregable:* Ejecutable interactivo `.bat` para escritorio.")
         lines.append("━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
-        
-        custom_note = kwargs.get("custom_note")
-        if custom_note:
-            lines.append("")
-            lines.append(f"📝 *Nota adicional:* {custom_note}")
-            
-        return "\n".join(lines)
+        return MessageTemplate("\n".join(lines), defaults=cls.DEFAULTS)
+
+    def build(self, **kwargs) -> str:
+        return next(self.render_many((kwargs,)))
+
+    def render_many(self, rows: Iterable[Mapping[str, Any]], **common) -> Iterator[str]:
+        fill = self.template._fill
+        note = self.NOTE_TEMPLATE._fill
+        for row in rows:
+            # La fecha se resuelve por mensaje (cacheada por segundo) salvo que se indique
+            values = row if "timestamp" in row or "timestamp" in common else {**row, "timestamp": _current_timestamp()}
+            message = fill(values, common)
+            custom_note = row.get("custom_note", common.get("custom_note"))
+            yield message + note(values, common) if custom_note else message
 
 
 class CustomMessageStrategy(IMessageStrategy):
@@ -94,6 +215,24 @@ class CustomMessageStrategy(IMessageStrategy):
         return text
 
 
+class TemplateStrategy(IMessageStrategy):
+    """
+    Estrategia de mensaje personalizado a partir de una plantilla compilada.
+
+    Args:
+        template: MessageTemplate o texto de la plantilla (se compila una vez)
+    """
+
+    def __init__(self, template):
+        self.template = template if isinstance(template, MessageTemplate) else MessageTemplate(template)
+
+    def build(self, **kwargs) -> str:
+        return self.template.render(kwargs)
+
+    def render_many(self, rows: Iterable[Mapping[str, Any]], **common) -> Iterator[str]:
+        return self.template.render_many(rows, **common)
+
+
 class MessageBuilder:
     """
     Patrón Builder para configurar y producir mensajes para el Bot de WhatsApp.
@@ -127,6 +266,11 @@ class MessageBuilder:
         self._params["text"] = text
         return self
 
+    def set_template(self, template) -> "MessageBuilder":
+        """Usa una plantilla compilada (MessageTemplate o texto) como estrategia."""
+        self._strategy = TemplateStrategy(template)
+        return self
+
     def add_custom_param(self, key: str, value: any) -> "MessageBuilder":
         self._params[key] = value
         return self
@@ -135,6 +279,13 @@ class MessageBuilder:
         """Genera el mensaje final formateado."""
         return self._strategy.build(**self._params)
 
+    def render_many(self, rows: Iterable[Mapping[str, Any]]) -> Iterator[str]:
+        """
+        Genera un mensaje por fila (variables por destinatario) bajo demanda; los parámetros
+        configurados en el builder actúan como valores comunes.
+        """
+        return self._strategy.render_many(rows, **self._params)
+
 
 def create_technical_report_message(
     recipient: str = "Merza",
@@ -150,3 +301,31 @@ def create_technical_report_message(
     if custom_note:
         builder.set_custom_note(custom_note)
     return builder.build()
+
+
+def split_message(text: str, limit: int = WHATSAPP_MAX_MESSAGE_CHARS) -> List[str]:
+    """
+    Divide un mensaje que supera el límite de longitud de WhatsApp en partes enviables.
+    Corta preferentemente en saltos de línea; una línea más larga que el límite se corta a la fuerza.
+    """
+    if limit < 1:
+        raise ValueError("El límite de longitud debe ser positivo.")
+    if len(text) <= limit:
+        return [text]
+
+    parts: List[str] = []
+    current = ""
+    for line in text.split("\n"):
+        candidate = f"{current}\n{line}" if current else line
+        if len(candidate) <= limit:
+            current = candidate
+            continue
+        if current:
+            parts.append(current)
+        while len(line) > limit:
+            parts.append(line[:limit])
+            line = line[limit:]
+        current = line
+    if current:
+        parts.append(current)
+    return parts
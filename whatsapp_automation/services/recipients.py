@@ -0,0 +1,52 @@
+"""
+Módulo de Servicios: Normalización de Destinatarios
+Distingue entre números telefónicos y nombres de contacto, y normaliza los números a formato E.164
+para abrir la conversación directamente mediante la ruta de envío por número de WhatsApp Web.
+"""
+
+import re
+from typing import Optional
+
+# Separadores habituales al escribir números: espacios, guiones, puntos, paréntesis y barras
+_PHONE_SEPARATORS = re.compile(r"[\s\-\.\(\)/]")
+
+# E.164: como máximo 15 dígitos; se exige un mínimo razonable para no confundir nombres cortos
+MIN_PHONE_DIGITS = 8
+MAX_PHONE_DIGITS = 15
+
+
+def normalize_phone(value: str, default_country_code: Optional[str] = None) -> Optional[str]:
+    """
+    Normaliza un número telefónico a E.164 (`+<código país><número>`).
+    Acepta prefijos `+` o `00` y separadores comunes.
+
+    Regla de `default_country_code`: solo se aplica a números nacionales escritos con el prefijo
+    troncal `0` (p. ej. `0412-1234567` → `+584121234567` con `58`). Un número sin `+`, `00` ni
+    `0` inicial se interpreta como internacional sin signo (`584121234567`) y NUNCA recibe el
+    código de país: así un número ya completo no se duplica (`58584...`). Los números locales sin
+    prefijo troncal deben escribirse con su código de país.
+    Retorna None si el valor no es un número telefónico válido (p. ej. un nombre de contacto).
+    """
+    if not value:
+        return None
+    compact = _PHONE_SEPARATORS.sub("", value.strip())
+
+    if compact.startswith("+"):
+        digits = compact[1:]
+    elif compact.startswith("00"):
+        digits = compact[2:]
+    else:
+        digits = compact
+        if default_country_code and digits.startswith("0"):
+            digits = default_country_code.lstrip("+") + digits.lstrip("0")
+
+    if not digits.isdigit() or digits.startswith("0"):
+        return None
+    if not MIN_PHONE_DIGITS <= len(digits) <= MAX_PHONE_DIGITS:
+        return None
+    return f"+{digits}"
+
+
+def is_phone_number(value: str, default_country_code: Optional[str] = None) -> bool:
+    """Indica si el destinatario es un número telefónico (y no un nombre de contacto)."""
+    return normalize_phone(value, default_country_code) is not None